@@ -0,0 +1,87 @@
+"""
+Benchmark: task context assembly with 200 tasks of 20 KB outputs.
+
+Compares the previous string-concatenation approach against the
+segment-based ContextAssembler used by Process._build_task_context.
+
+Usage:
+    python benchmarks/context_assembly_benchmark.py [--tasks 200] [--size 20480] [--budget 8000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("OPENAI_API_KEY", "not-needed")
+
+from praisonaiagents.task.task import Task
+from praisonaiagents.process.process import Process
+from praisonaiagents.main import TaskOutput
+
+
+def build_tasks(count, size, budget):
+    tasks = []
+    for i in range(count):
+        task = Task(
+            name=f"task_{i}",
+            description=f"Task {i}",
+            retain_full_context=True,
+            context_token_budget=budget,
+            status="completed",
+        )
+        task.result = TaskOutput(description=task.description, raw=chr(97 + i % 26) * size, agent="bench")
+        task.previous_tasks = [f"task_{j}" for j in range(i)]
+        tasks.append(task)
+    return {t.id: t for t in tasks}
+
+
+def naive_context(tasks, current_task):
+    """The previous implementation: linear name scan plus repeated +="""
+    context = "\nInput data from previous tasks:"
+    for prev_name in current_task.previous_tasks:
+        prev_task = next((t for t in tasks.values() if t.name == prev_name), None)
+        if prev_task and prev_task.result:
+            context += f"\n{prev_name}: {prev_task.result.raw}"
+    return context
+
+
+def measure(label, fn, tasks, repeats):
+    tracemalloc.start()
+    start = time.perf_counter()
+    total_chars = 0
+    for _ in range(repeats):
+        for task in tasks.values():
+            total_chars += len(fn(task))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed * 1000:>10.1f} ms   peak {peak / 1e6:>8.1f} MB   chars {total_chars / 1e6:>9.1f} M")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--size", type=int, default=20 * 1024, help="bytes per task output")
+    parser.add_argument("--budget", type=int, default=8000, help="context token budget per task")
+    parser.add_argument("--repeats", type=int, default=2, help="passes over all tasks (later passes hit the cache)")
+    args = parser.parse_args()
+
+    print(f"{args.tasks} tasks x {args.size // 1024} KB outputs, {args.repeats} passes\n")
+
+    unbounded = build_tasks(args.tasks, args.size, None)
+    measure("naive += (unbounded)", lambda t: naive_context(unbounded, t), unbounded, args.repeats)
+
+    process = Process(tasks=unbounded, agents=[])
+    measure("assembler (unbounded)", process._build_task_context, unbounded, args.repeats)
+
+    budgeted = build_tasks(args.tasks, args.size, args.budget)
+    process = Process(tasks=budgeted, agents=[])
+    measure(f"assembler (budget {args.budget})", process._build_task_context, budgeted, args.repeats)
+    print(f"\nassembler stats: {process.context_assembler.stats}")
+
+
+if __name__ == "__main__":
+    main()
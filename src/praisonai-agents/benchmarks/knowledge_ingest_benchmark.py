@@ -0,0 +1,88 @@
+"""
+Benchmark: adding a directory of files to Knowledge, one by one vs. the staged pipeline.
+
+--files text files are written to a temporary directory and added to a
+Knowledge whose vector store is simulated: each stored chunk takes --store
+seconds, like an embedding request followed by a write. The files are
+added once through the sequential single-file path, and once through
+Knowledge.ingest for each --write-workers value. Reported are documents/sec
+and chunks/sec, and how long re-adding the unchanged directory takes.
+
+Usage:
+    python benchmarks/knowledge_ingest_benchmark.py [--files 200] [--store 0.01] [--write-workers 1 8 32]
+"""
+import argparse
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("OPENAI_API_KEY", "not-needed")
+
+
+class SimulatedStore:
+    def __init__(self, delay):
+        self.delay = delay
+        self.ids = itertools.count()
+        self.lock = threading.Lock()
+
+    def add(self, messages, **kwargs):
+        time.sleep(self.delay)
+        with self.lock:
+            memory_id = str(next(self.ids))
+        return {"results": [{"id": memory_id, "memory": messages[0]["content"], "event": "ADD"}]}
+
+    def delete(self, memory_id):
+        pass
+
+
+def make_knowledge(directory, collection, delay):
+    from praisonaiagents.knowledge import Knowledge
+
+    knowledge = Knowledge(config={"vector_store": {"provider": "chroma", "config": {
+        "collection_name": collection, "path": os.path.join(directory, "store")}}})
+    knowledge.memory = SimulatedStore(delay)
+    return knowledge
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--store", type=float, default=0.01, help="seconds per stored chunk")
+    parser.add_argument("--write-workers", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        docs = os.path.join(directory, "docs")
+        os.makedirs(docs)
+        for i in range(args.files):
+            with open(os.path.join(docs, f"doc{i}.md"), "w") as f:
+                f.write(f"# Document {i}\n\n" + "Some knowledge. " * 50)
+        paths = [os.path.join(docs, name) for name in sorted(os.listdir(docs))]
+
+        knowledge = make_knowledge(directory, "sequential", args.store)
+        start = time.perf_counter()
+        for path in paths:
+            knowledge._process_single_input(path)
+        elapsed = time.perf_counter() - start
+        print(f"{'one file at a time':<24} {len(paths) / elapsed:>8.1f} docs/sec {len(paths) / elapsed:>8.1f} chunks/sec")
+
+        for workers in args.write_workers:
+            knowledge = make_knowledge(directory, f"pipeline{workers}", args.store)
+            stats = knowledge.ingest(docs, write_workers=workers)["stats"]
+            print(f"{f'pipeline, {workers} writers':<24} {stats['docs_per_sec']:>8.1f} docs/sec "
+                  f"{stats['chunks_per_sec']:>8.1f} chunks/sec")
+        start = time.perf_counter()
+        stats = knowledge.ingest(docs)["stats"]
+        print(f"{'re-add unchanged':<24} {(time.perf_counter() - start) * 1000:>8.1f} ms for {stats['skipped']} files")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: streamable HTTP versus SSE MCP transport against an in-process server.
+
+For each transport this connects --clients unshared clients (the gateway
+case: many MCP instances fronting servers), then measures sequential call
+latency and concurrent throughput of --calls calls issued with asyncio.gather.
+
+Usage:
+    python benchmarks/mcp_http_benchmark.py [--clients 20] [--calls 200] [--delay 0.01]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("OPENAI_API_KEY", "not-needed")
+
+
+def start_server(app):
+    import uvicorn
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return port
+
+
+def build_app(transport, delay):
+    try:
+        from mcp.server.fastmcp import FastMCP
+    except ImportError:  # mcp>=2 renamed FastMCP
+        from mcp.server.mcpserver import MCPServer as FastMCP
+
+    server = FastMCP("echo", log_level="WARNING")
+
+    @server.tool()
+    async def echo(text: str) -> str:
+        """Return the text unchanged."""
+        if delay:
+            await asyncio.sleep(delay)
+        return text
+
+    return server.streamable_http_app() if transport == "http" else server.sse_app()
+
+
+def measure(label, url, transport, clients, calls):
+    from praisonaiagents.mcp import MCP
+
+    start = time.perf_counter()
+    connections = [MCP(url, transport=transport, shared=False, cache_tools=False, timeout=30) for _ in range(clients)]
+    connect = (time.perf_counter() - start) / clients
+    tool = next(t for t in connections[0] if t.__name__ == "echo")
+    tool(text="warmup")
+
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        tool(text=str(i))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    tools = [next(t for t in c if t.__name__ == "echo") for c in connections]
+
+    async def burst():
+        return await asyncio.gather(*[tools[i % clients].acall(text=str(i)) for i in range(calls)])
+
+    start = time.perf_counter()
+    results = asyncio.run(burst())
+    elapsed = time.perf_counter() - start
+    mismatched = sum(r != str(i) for i, r in enumerate(results))
+
+    print(f"{label:<18} connect {connect * 1000:>7.1f} ms/client   p50 {statistics.median(latencies) * 1000:>6.2f} ms   "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>6.2f} ms   "
+          f"{calls / elapsed:>8.1f} calls/s concurrent   mismatched {mismatched}")
+    for c in connections:
+        c.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.01, help="seconds the server sleeps per echo")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients, {args.calls} calls, server delay {args.delay * 1000:.0f} ms\n")
+    sse_port = start_server(build_app("sse", args.delay))
+    http_port = start_server(build_app("http", args.delay))
+    measure("sse", f"http://127.0.0.1:{sse_port}/sse", "sse", args.clients, args.calls)
+    measure("streamable http", f"http://127.0.0.1:{http_port}/mcp", "http", args.clients, args.calls)
+
+
+if __name__ == "__main__":
+    main()
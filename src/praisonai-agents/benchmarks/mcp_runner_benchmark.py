@@ -0,0 +1,146 @@
+"""
+Benchmark: MCP tool-call latency and throughput against a local stdio echo server.
+
+Compares the previous queue-polling runner (one call at a time, 10 ms sleep
+between polls) with the event-driven MCPToolRunner.
+
+Usage:
+    python benchmarks/mcp_runner_benchmark.py [--calls 200] [--threads 16] [--delay 0.02]
+
+The echo server is this file run with --serve; --delay makes each echo take
+that long on the server, so the concurrency of each runner shows up in the
+throughput numbers.
+"""
+import argparse
+import asyncio
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("OPENAI_API_KEY", "not-needed")
+
+
+def serve(delay):
+    try:
+        from mcp.server.fastmcp import FastMCP
+    except ImportError:  # mcp>=2 renamed FastMCP
+        from mcp.server.mcpserver import MCPServer as FastMCP
+
+    server = FastMCP("echo")
+
+    @server.tool()
+    async def echo(text: str) -> str:
+        """Return the text unchanged."""
+        if delay:
+            await asyncio.sleep(delay)
+        return text
+
+    server.run()
+
+
+class PollingRunner(threading.Thread):
+    """The previous implementation: a polled queue and a single shared result queue"""
+
+    def __init__(self, server_params):
+        super().__init__(daemon=True)
+        self.server_params = server_params
+        self.queue = queue.Queue()
+        self.result_queue = queue.Queue()
+        self.initialized = threading.Event()
+        self.start()
+
+    def run(self):
+        asyncio.run(self._run_async())
+
+    async def _run_async(self):
+        from mcp import ClientSession
+        from mcp.client.stdio import stdio_client
+        async with stdio_client(self.server_params) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                self.initialized.set()
+                while True:
+                    try:
+                        item = self.queue.get(block=False)
+                        if item is None:
+                            break
+                        result = await session.call_tool(*item)
+                        self.result_queue.put(result.content[0].text)
+                    except queue.Empty:
+                        pass
+                    await asyncio.sleep(0.01)
+
+    def call_tool(self, tool_name, arguments):
+        self.queue.put((tool_name, arguments))
+        return self.result_queue.get()
+
+    def shutdown(self):
+        self.queue.put(None)
+
+
+def measure(label, runner, calls, threads):
+    runner.call_tool("echo", {"text": "warmup"})
+
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        runner.call_tool("echo", {"text": str(i)})
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    mismatched = 0
+
+    def one(i):
+        nonlocal mismatched
+        if runner.call_tool("echo", {"text": str(i)}) != str(i):
+            mismatched += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(calls)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<16} p50 {statistics.median(latencies) * 1000:>7.2f} ms   "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>7.2f} ms   "
+          f"{calls / elapsed:>8.1f} calls/s with {threads} threads   mismatched {mismatched}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds the server sleeps per echo")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.delay)
+        return
+
+    from mcp import StdioServerParameters
+    from praisonaiagents.mcp.mcp import MCPToolRunner
+
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[os.path.abspath(__file__), "--serve", "--delay", str(args.delay)],
+    )
+    print(f"{args.calls} calls, server delay {args.delay * 1000:.0f} ms\n")
+
+    polling = PollingRunner(params)
+    polling.initialized.wait(30)
+    measure("polling (old)", polling, args.calls, args.threads)
+    polling.shutdown()
+
+    runner = MCPToolRunner(params, timeout=30)
+    runner.initialized.wait(30)
+    measure("event-driven", runner, args.calls, args.threads)
+    runner.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark: an agent served with launch(protocol="mcp") under many SSE clients.
+
+The agent simulates an LLM that streams --tokens tokens, --delay seconds
+apart, and counts the turns in its own history. For each --concurrency value
+an MCP server is launched and --clients local SSE clients connect at once,
+each calling the agent's tool --calls times in a row. Reported per run:
+
+- throughput and p50/p99 call latency
+- calls rejected because the worker pool and queue were full
+- isolation: every client must see its own history (turns 1..--calls)
+- cancellation: --drop further clients start a call and disconnect before
+  it can finish; reported are the calls cancelled out of those the server
+  had received, and the time until none is running any more (the agent
+  threads stopped rather than finishing their answers)
+
+Usage:
+    python benchmarks/mcp_serving_benchmark.py [--clients 50] [--calls 4] [--concurrency 4 16 64]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("OPENAI_API_KEY", "not-needed")
+
+
+def make_agent(tokens, delay):
+    from praisonaiagents import Agent
+    from praisonaiagents.streaming import relay_stream
+
+    class SimulatedAgent(Agent):
+        def chat(self, prompt, *args, **kwargs):
+            chunks = (SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="."))])
+                      for _ in range(tokens))
+            for _ in relay_stream(chunks):
+                time.sleep(delay)
+            self.chat_history.append({"role": "user", "content": prompt})
+            self.chat_history.append({"role": "assistant", "content": prompt})
+            return f"{len(self.chat_history) // 2}:{prompt}"
+
+    return SimulatedAgent(name="Bench", llm="gpt-4o-mini")
+
+
+def launch(agent, concurrency, queue):
+    import httpx
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    threading.Thread(target=agent.launch, daemon=True, kwargs=dict(
+        path="/bench", port=port, host="127.0.0.1", protocol="mcp",
+        max_concurrency=concurrency, max_queue=queue)).start()
+    base = f"http://127.0.0.1:{port}/bench"
+    while True:
+        try:
+            httpx.get(base + "/metrics")
+            return base
+        except httpx.HTTPError:
+            time.sleep(0.1)
+
+
+def metric(base, name):
+    import httpx
+
+    for line in httpx.get(base + "/metrics").text.splitlines():
+        if line.startswith(name + "{"):
+            return float(line.rsplit(" ", 1)[1])
+
+
+async def client(url, calls, latencies, name, give_up=None, ready=None, go=None):
+    from mcp import ClientSession
+    from mcp.client.sse import sse_client
+
+    async with sse_client(url, timeout=60, sse_read_timeout=600) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            if ready is not None:
+                # Connecting is timed separately; all clients start calling together
+                ready()
+                await go.wait()
+            answers = []
+            for i in range(calls):
+                start = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(
+                        session.call_tool("execute_bench_task", {"prompt": f"{name}-{i}"}), give_up)
+                except asyncio.TimeoutError:
+                    return answers  # leaving the context disconnects mid-call
+                latencies.append(time.perf_counter() - start)
+                answers.append(result.content[0].text)
+            return answers
+
+
+def run(args, concurrency):
+    agent = make_agent(args.tokens, args.delay)
+    base = launch(agent, concurrency, args.queue)
+    latencies = []
+
+    timings = {}
+
+    async def main():
+        go, connected = asyncio.Event(), []
+
+        def ready():
+            connected.append(1)
+            if len(connected) == args.clients:
+                timings["calls"] = time.perf_counter()
+                go.set()
+
+        timings["connect"] = time.perf_counter()
+        return await asyncio.gather(*[client(base + "/sse", args.calls, latencies, f"c{c}", ready=ready, go=go)
+                                      for c in range(args.clients)])
+
+    results = asyncio.run(main())
+    elapsed = time.perf_counter() - timings["calls"]
+    connect = timings["calls"] - timings["connect"]
+    answers = [a for r in results for a in r]
+    busy = sum(a.startswith("Error: server busy") for a in answers)
+    # Each client's answered calls must count 1, 2, 3... turns of its own history
+    turns = [[int(a.split(":", 1)[0]) for a in r if not a.startswith("Error")] for r in results]
+    isolated = all(t == list(range(1, len(t) + 1)) for t in turns)
+    latencies.sort()
+
+    async def disconnects():
+        await asyncio.gather(*[client(base + "/sse", 1, [], "dropped", give_up=args.tokens * args.delay * 0.8)
+                               for _ in range(args.drop)])
+
+    before = metric(base, "praisonai_requests_total")
+    asyncio.run(disconnects())
+    # Calls still in flight on the client when it left; the others never reached the server
+    admitted = int(metric(base, "praisonai_requests_total") - before)
+    start = time.perf_counter()
+    while metric(base, "praisonai_requests_in_progress") or metric(base, "praisonai_requests_queued"):
+        time.sleep(0.01)
+    settled = time.perf_counter() - start
+
+    print(f"concurrency {concurrency:>3}: connect {connect:>5.2f} s   {len(answers) / elapsed:>7.1f} calls/s   "
+          f"p50 {statistics.median(latencies) * 1000:>7.1f} ms   p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>7.1f} ms   "
+          f"busy {busy:>3}   isolated {'yes' if isolated else 'NO'}   "
+          f"cancelled {int(metric(base, 'praisonai_requests_cancelled_total'))}/{admitted}, idle {settled * 1000:.0f} ms after disconnect")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--calls", type=int, default=4, help="sequential calls per client")
+    parser.add_argument("--tokens", type=int, default=20, help="tokens the simulated LLM streams per answer")
+    parser.add_argument("--delay", type=float, default=0.005, help="seconds between simulated tokens")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 16, 64], help="worker pool sizes to compare")
+    parser.add_argument("--queue", type=int, default=256, help="calls allowed to wait for a worker")
+    parser.add_argument("--drop", type=int, default=10, help="clients that disconnect mid-call")
+    args = parser.parse_args()
+
+    import logging
+    # Per-request access and info logs would dominate the timings
+    logging.disable(logging.INFO)
+    print(f"{args.clients} clients x {args.calls} calls, {args.tokens} tokens x {args.delay * 1000:.0f} ms per answer\n")
+    for concurrency in args.concurrency:
+        run(args, concurrency)
+
+
+if __name__ == "__main__":
+    main()
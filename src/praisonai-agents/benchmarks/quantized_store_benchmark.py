@@ -0,0 +1,80 @@
+"""
+Benchmark: quantized vs. unquantized storage in the local vector store.
+
+--vectors random embeddings of --dims dimensions, grouped around 64 topics,
+are inserted into a QuantizedVectorStore without quantization, with int8
+and with binary codes. --queries queries near the stored vectors are then
+searched for their --k nearest neighbours. For each store the report shows:
+
+- memory: the vector data held in RAM
+- disk: the size of the collection's files
+- p50/p95: query latency
+- recall@k: the share of the exact top --k found
+
+Usage:
+    python benchmarks/quantized_store_benchmark.py [--vectors 100000] [--dims 768] [--k 10] [--oversample N]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("OPENAI_API_KEY", "not-needed")
+
+
+def make_vectors(np, count, dims, seed):
+    centers = np.random.default_rng(0).normal(size=(64, dims))
+    rng = np.random.default_rng(seed)
+    return (centers[rng.integers(0, 64, count)] + rng.normal(size=(count, dims))).astype(np.float32)
+
+
+def disk_bytes(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--oversample", type=int, default=None,
+                        help="candidates re-scored per result (the store's default if not given)")
+    args = parser.parse_args()
+
+    import numpy as np
+    from praisonaiagents.knowledge.vector_store import QuantizedVectorStore
+
+    vectors = make_vectors(np, args.vectors, args.dims, seed=1)
+    queries = make_vectors(np, args.queries, args.dims, seed=2)
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    exact = [set(np.argsort(-(unit @ q))[:args.k].tolist()) for q in queries]
+    ids = [str(i) for i in range(args.vectors)]
+
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"{args.vectors} vectors x {args.dims} dims, float32 data {vectors.nbytes / 2**20:.1f} MiB")
+        print(f"{'storage':<10} {'memory':>10} {'disk':>10} {'p50':>9} {'p95':>9} {'recall@' + str(args.k):>10}")
+        for quantization in (None, "int8", "binary"):
+            store = QuantizedVectorStore(quantization or "none", directory, quantization, args.oversample)
+            for start in range(0, args.vectors, 10000):
+                store.insert(vectors[start:start + 10000], ids=ids[start:start + 10000])
+            store.search(vectors=queries[0], limit=args.k)  # page the map in
+            latencies, recall = [], []
+            for query, truth in zip(queries, exact):
+                started = time.perf_counter()
+                found = store.search(vectors=query, limit=args.k)
+                latencies.append((time.perf_counter() - started) * 1000)
+                recall.append(len({int(r.id) for r in found} & truth) / args.k)
+            p50, p95 = np.percentile(latencies, [50, 95])
+            print(f"{quantization or 'float32':<10} {store.memory_bytes / 2**20:>8.1f}MiB "
+                  f"{disk_bytes(store.directory) / 2**20:>8.1f}MiB {p50:>7.2f}ms {p95:>7.2f}ms {np.mean(recall):>10.3f}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
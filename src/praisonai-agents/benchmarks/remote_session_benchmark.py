@@ -0,0 +1,94 @@
+"""
+Benchmark: driving an agent served with launch() through a remote Session.
+
+The agent answers after --delay seconds. --messages messages are sent:
+
+- one at a time, each with a new connection (how Session.chat used to work)
+- one at a time with Session.chat, on pooled keep-alive connections
+- with Session.chat_many, for each --concurrency value
+
+Reported are messages per second and the mean latency of sequential calls.
+
+Usage:
+    python benchmarks/remote_session_benchmark.py [--messages 200] [--delay 0] [--concurrency 1 8 32]
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("OPENAI_API_KEY", "not-needed")
+
+
+def make_agent(delay):
+    from praisonaiagents import Agent
+
+    class SimulatedAgent(Agent):
+        def chat(self, prompt, *args, **kwargs):
+            time.sleep(delay)
+            return prompt
+
+    return SimulatedAgent(name="Bench", llm="gpt-4o-mini")
+
+
+def launch(agent, concurrency):
+    import httpx
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    threading.Thread(target=agent.launch, daemon=True, kwargs=dict(
+        path="/bench", port=port, host="127.0.0.1", max_concurrency=concurrency, max_queue=4096)).start()
+    while True:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health")
+            return f"127.0.0.1:{port}/bench"
+        except httpx.HTTPError:
+            time.sleep(0.1)
+
+
+def report(label, count, elapsed):
+    print(f"{label:<28} {count / elapsed:>8.1f} msg/s   {elapsed / count * 1000:>7.2f} ms/msg")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds the simulated agent takes per answer")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="chat_many concurrency values")
+    args = parser.parse_args()
+
+    import logging
+    # Per-request access and info logs would dominate the timings
+    logging.disable(logging.INFO)
+    import httpx
+    from praisonaiagents import Session
+
+    url = launch(make_agent(args.delay), max(args.concurrency))
+    session = Session(agent_url=url)
+    messages = [f"m{i}" for i in range(args.messages)]
+    session.chat("warmup")
+
+    start = time.perf_counter()
+    for message in messages:
+        httpx.post(f"http://{url}", json={"query": message, "session_id": session.session_id})
+    report("new connection per message", len(messages), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for message in messages:
+        session.chat(message)
+    report("Session.chat (pooled)", len(messages), time.perf_counter() - start)
+
+    for concurrency in args.concurrency:
+        start = time.perf_counter()
+        answers = session.chat_many(messages, max_concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+        assert answers == messages
+        report(f"chat_many x{concurrency}", len(messages), elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from .knowledge.knowledge import Knowledge
 from .knowledge.chunking import Chunking
 from .mcp.mcp import MCP
 from .session import Session
+from .process_pool import ProcessPool, process_tool
 from .memory.memory import Memory
 from .guardrails import GuardrailResult, LLMGuardrail
 from .main import (
@@ -85,6 +86,8 @@ __all__ = [
     'ReflectionOutput',
     'AutoAgents',
     'Session',
+    'ProcessPool',
+    'process_tool',
     'Memory',
     'display_interaction',
     'display_self_reflection',
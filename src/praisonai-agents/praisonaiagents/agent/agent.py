@@ -19,14 +19,17 @@ from ..main import (
     adisplay_instruction,
     approval_callback
 )
+from ..process_pool import run_tool, arun_tool
+from ..streaming import emit_event, relay_stream
 import inspect
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 # Global variables for API server
 _server_started = {}  # Dict of port -> started boolean
 _registered_agents = {}  # Dict of port -> Dict of path -> agent_id
 _shared_apps = {}  # Dict of port -> FastAPI app
+_agent_servers = {}  # Dict of port -> Dict of path -> AgentServer
 
 # Don't import FastAPI dependencies here - use lazy loading instead
 
@@ -360,7 +363,7 @@ class Agent:
         respect_context_window: bool = True,
         code_execution_mode: Literal["safe", "unsafe"] = "safe",
         embedder_config: Optional[Dict[str, Any]] = None,
-        knowledge: Optional[List[str]] = None,
+        knowledge: Optional[List[Any]] = None,
         knowledge_config: Optional[Dict[str, Any]] = None,
         use_system_prompt: Optional[bool] = True,
         markdown: bool = True,
@@ -427,10 +430,15 @@ class Agent:
                 "safe" restricts dangerous operations, "unsafe" allows full code execution. Defaults to "safe".
             embedder_config (Optional[Dict[str, Any]], optional): Configuration dictionary for
                 text embedding models used in knowledge retrieval and similarity search. Defaults to None.
-            knowledge (Optional[List[str]], optional): List of knowledge sources (file paths, URLs,
-                or text content) to be processed and made available to the agent. Defaults to None.
+            knowledge (Optional[List[Any]], optional): List of knowledge sources (file paths, URLs,
+                or text content) to be processed and made available to the agent. Knowledge objects
+                (or KnowledgeSource entries) in the list are searched as separate collections, concurrently
+                with the agent's own, under the agent's user_id unless a KnowledgeSource sets its own
+                filters. Defaults to None.
             knowledge_config (Optional[Dict[str, Any]], optional): Configuration for knowledge
-                processing and retrieval system including chunking and indexing parameters. Defaults to None.
+                processing and retrieval system including chunking and indexing parameters, and
+                {"federated": {"timeout": ..., "limit": ...}} for searches over several collections.
+                Defaults to None.
             use_system_prompt (Optional[bool], optional): Whether to include system prompts in
                 conversations to establish agent behavior and context. Defaults to True.
             markdown (bool, optional): Enable markdown formatting in agent responses for better
@@ -551,6 +559,8 @@ class Agent:
         self.code_execution_mode = code_execution_mode
         self.embedder_config = embedder_config
         self.knowledge = knowledge
+        # Context appended by the last knowledge search, with the tokens packing saved
+        self.last_knowledge_context = None
         self.use_system_prompt = use_system_prompt
         self.chat_history = []
         self.markdown = markdown
@@ -584,14 +594,20 @@ Your Goal: {self.goal}
         if not knowledge:
             self.knowledge = None
         else:
-            # Initialize Knowledge with provided or default config
-            from praisonaiagents.knowledge import Knowledge
-            self.knowledge = Knowledge(knowledge_config or None)
-            
-            # Handle knowledge
-            if knowledge:
-                for source in knowledge:
+            # Knowledge objects are searched as collections of their own, alongside the sources added here
+            collections = [source for source in knowledge if not isinstance(source, str)]
+            sources = [source for source in knowledge if isinstance(source, str)]
+            self.knowledge = None
+            if sources:
+                # Initialize Knowledge with provided or default config
+                from praisonaiagents.knowledge import Knowledge
+                self.knowledge = Knowledge(knowledge_config or None)
+
+                # Handle knowledge
+                for source in sources:
                     self._process_knowledge(source)
+            if collections:
+                self.knowledge = self._federate_knowledge(collections, knowledge_config)
 
     def _process_knowledge(self, knowledge_item):
         """Process and store knowledge from a file path, URL, or string."""
@@ -608,6 +624,43 @@ Your Goal: {self.goal}
         except Exception as e:
             logging.error(f"Error processing knowledge item: {knowledge_item}, error: {e}")
 
+    def _federate_knowledge(self, collections, knowledge_config=None):
+        """Search the agent's own knowledge and the given collections together.
+
+        The agent's own knowledge is searched under its agent_id, which it was
+        stored with. The given collections were not populated by this agent,
+        so those without their own ``KnowledgeSource.filters`` are searched
+        under the agent's user_id.
+        """
+        from praisonaiagents.knowledge import FederatedKnowledge, KnowledgeSource
+        config = knowledge_config or {}
+        options = dict(config.get("federated") or {})
+        context = config.get("context") or {}
+        if "token_budget" in context:
+            options.setdefault("token_budget", context["token_budget"])
+        sources = []
+        if self.knowledge is not None:
+            sources.append(KnowledgeSource(self.knowledge, filters={"agent_id": self.agent_id}))
+        for collection in collections:
+            if not isinstance(collection, KnowledgeSource):
+                collection = KnowledgeSource(collection)
+            if collection.filters is None:
+                collection = replace(collection, filters={"user_id": self.user_id})
+            sources.append(collection)
+        return FederatedKnowledge(sources, **options)
+
+    def _add_knowledge(self, prompt):
+        """Append the knowledge relevant to the prompt, packed into the knowledge token budget."""
+        search_results = self.knowledge.search(prompt, agent_id=self.agent_id)
+        if not search_results:
+            return prompt
+        context = self.knowledge.pack(search_results)
+        self.last_knowledge_context = context
+        logging.debug(f"{self.name}: {context}")
+        if not context.text:
+            return prompt
+        return f"{prompt}\n\nKnowledge: {context.text}"
+
     def _setup_guardrail(self):
         """Setup the guardrail function based on the provided guardrail parameter."""
         if self.guardrail is None:
@@ -808,6 +861,13 @@ Your Goal: {self.goal}
         """
         Execute a tool dynamically based on the function name and arguments.
         """
+        # Report the call to a streaming client, if one is listening
+        emit_event("tool_call", name=function_name, arguments=arguments)
+        result = self._execute_tool(function_name, arguments)
+        emit_event("tool_result", name=function_name, result=result)
+        return result
+
+    def _execute_tool(self, function_name, arguments):
         logging.debug(f"{self.name} executing tool {function_name} with arguments: {arguments}")
 
         # Check if approval is required for this tool
@@ -898,7 +958,7 @@ Your Goal: {self.goal}
                 # Otherwise treat as regular function
                 elif callable(func):
                     casted_arguments = self._cast_arguments(func, arguments)
-                    return func(**casted_arguments)
+                    return run_tool(func, casted_arguments)
             except Exception as e:
                 error_msg = str(e)
                 logging.error(f"Error executing tool {function_name}: {error_msg}")
@@ -939,7 +999,7 @@ Your Goal: {self.goal}
                 vertical_overflow="ellipsis",
                 auto_refresh=True
             ) as live:
-                for chunk in response_stream:
+                for chunk in relay_stream(response_stream):
                     chunks.append(chunk)
                     if chunk.choices[0].delta.content:
                         full_response_text += chunk.choices[0].delta.content
@@ -1140,18 +1200,7 @@ Your Goal: {self.goal}
         reasoning_steps = reasoning_steps or self.reasoning_steps
         # Search for existing knowledge if any knowledge is provided
         if self.knowledge:
-            search_results = self.knowledge.search(prompt, agent_id=self.agent_id)
-            if search_results:
-                # Check if search_results is a list of dictionaries or strings
-                if isinstance(search_results, dict) and 'results' in search_results:
-                    # Extract memory content from the results
-                    knowledge_content = "\n".join([result['memory'] for result in search_results['results']])
-                else:
-                    # If search_results is a list of strings, join them directly
-                    knowledge_content = "\n".join(search_results)
-                
-                # Append found knowledge to the prompt
-                prompt = f"{prompt}\n\nKnowledge: {knowledge_content}"
+            prompt = self._add_knowledge(prompt)
 
         if self._using_custom_llm:
             try:
@@ -1440,13 +1489,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
 
             # Search for existing knowledge if any knowledge is provided
             if self.knowledge:
-                search_results = self.knowledge.search(prompt, agent_id=self.agent_id)
-                if search_results:
-                    if isinstance(search_results, dict) and 'results' in search_results:
-                        knowledge_content = "\n".join([result['memory'] for result in search_results['results']])
-                    else:
-                        knowledge_content = "\n".join(search_results)
-                    prompt = f"{prompt}\n\nKnowledge: {knowledge_content}"
+                prompt = self._add_knowledge(prompt)
 
             if self._using_custom_llm:
                 try:
@@ -1697,9 +1740,8 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     if asyncio.iscoroutinefunction(tool):
                         result = await tool(**arguments)
                     else:
-                        # Run sync function in executor to avoid blocking
-                        loop = asyncio.get_event_loop()
-                        result = await loop.run_in_executor(None, lambda: tool(**arguments))
+                        # Awaits tools with a native async path, others run in an executor
+                        result = await arun_tool(tool, arguments)
                     
                     results.append(result)
                 except Exception as e:
@@ -1813,8 +1855,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     result = await func(**arguments)
                 else:
                     logging.debug(f"Executing sync function in executor: {function_name}")
-                    loop = asyncio.get_event_loop()
-                    result = await loop.run_in_executor(None, lambda: func(**arguments))
+                    result = await arun_tool(func, arguments)
                 
                 # Ensure result is JSON serializable
                 logging.debug(f"Raw result from tool: {result}")
@@ -1835,36 +1876,50 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             logging.error(f"Error in execute_tool_async: {str(e)}", exc_info=True)
             return {"error": f"Error in execute_tool_async: {str(e)}"}
 
-    def launch(self, path: str = '/', port: int = 8000, host: str = '0.0.0.0', debug: bool = False, protocol: str = "http"):
+    def launch(self, path: str = '/', port: int = 8000, host: str = '0.0.0.0', debug: bool = False, protocol: str = "http",
+               max_concurrency: Optional[int] = None, max_queue: int = 64, max_sessions: int = 1024,
+               session_ttl: Optional[float] = None):
         """
         Launch the agent as an HTTP API endpoint or an MCP server.
         
+        In HTTP mode each ``session_id`` sent with a query gets its own copy of
+        this agent, so concurrent users keep separate chat histories. Request
+        counts and latency histograms are served on ``/metrics``. Queries sent
+        with ``"stream": true`` (or ``?stream=true``) get tokens and tool-call
+        events as Server-Sent Events, or as newline-delimited JSON when the
+        client accepts ``application/x-ndjson``; disconnecting stops the LLM call.
+        
+        In MCP mode each client connection gets its own copy of the agent in
+        the same way, calls run on the same bounded worker pool, and a client
+        disconnecting cancels its calls. Metrics are served on ``<path>/metrics``.
+        
         Args:
             path: API endpoint path (default: '/') for HTTP, or base path for MCP.
             port: Server port (default: 8000)
             host: Server host (default: '0.0.0.0')
             debug: Enable debug mode for uvicorn (default: False)
             protocol: "http" to launch as FastAPI, "mcp" to launch as MCP server.
+            max_concurrency: Requests (or MCP calls) processed at once (default: min(32, CPUs + 4))
+            max_queue: Requests allowed to wait for a worker before new ones
+                are rejected, with 429 over HTTP (default: 64)
+            max_sessions: Sessions kept in memory; the least recently used idle
+                session is dropped beyond this (default: 1024)
+            session_ttl: Seconds an idle session is kept (default: no limit)
             
         Returns:
             None
         """
         if protocol == "http":
-            global _server_started, _registered_agents, _shared_apps
+            global _server_started, _registered_agents, _shared_apps, _agent_servers
             
             # Try to import FastAPI dependencies - lazy loading
             try:
                 import uvicorn
-                from fastapi import FastAPI, HTTPException, Request
-                from fastapi.responses import JSONResponse
-                from pydantic import BaseModel
+                from fastapi import FastAPI
+                from fastapi.responses import PlainTextResponse
                 import threading
                 import time
-                import asyncio
-                
-                # Define the request model here since we need pydantic
-                class AgentQuery(BaseModel):
-                    query: str
+                from .serving import AgentServer, mount_agent, render_metrics
                     
             except ImportError as e:
                 # Check which specific module is missing
@@ -1880,6 +1935,7 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             # Initialize port-specific collections if needed
             if port not in _registered_agents:
                 _registered_agents[port] = {}
+                _agent_servers[port] = {}
                 
             # Initialize shared FastAPI app if not already created for this port
             if _shared_apps.get(port) is None:
@@ -1903,6 +1959,14 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                         "status": "ok", 
                         "endpoints": list(_registered_agents[port].keys())
                     }
+                
+                # Prometheus metrics for every agent served on this port
+                @_shared_apps[port].get("/metrics")
+                async def metrics():
+                    return PlainTextResponse(
+                        render_metrics(_agent_servers[port]),
+                        media_type="text/plain; version=0.0.4"
+                    )
             
             # Normalize path to ensure it starts with /
             if not path.startswith('/'):
@@ -1920,43 +1984,13 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             
             # Register the agent to this path
             _registered_agents[port][path] = self.agent_id
+            server = AgentServer(
+                self, max_concurrency=max_concurrency, max_queue=max_queue,
+                max_sessions=max_sessions, session_ttl=session_ttl
+            )
+            _agent_servers[port][path] = server
             
-            # Define the endpoint handler
-            @_shared_apps[port].post(path)
-            async def handle_agent_query(request: Request, query_data: Optional[AgentQuery] = None):
-                # Handle both direct JSON with query field and form data
-                if query_data is None:
-                    try:
-                        request_data = await request.json()
-                        if "query" not in request_data:
-                            raise HTTPException(status_code=400, detail="Missing 'query' field in request")
-                        query = request_data["query"]
-                    except:
-                        # Fallback to form data or query params
-                        form_data = await request.form()
-                        if "query" in form_data:
-                            query = form_data["query"]
-                        else:
-                            raise HTTPException(status_code=400, detail="Missing 'query' field in request")
-                else:
-                    query = query_data.query
-                    
-                try:
-                    # Use async version if available, otherwise use sync version
-                    if asyncio.iscoroutinefunction(self.chat):
-                        response = await self.achat(query)
-                    else:
-                        # Run sync function in a thread to avoid blocking
-                        loop = asyncio.get_event_loop()
-                        response = await loop.run_in_executor(None, lambda p=query: self.chat(p))
-                    
-                    return {"response": response}
-                except Exception as e:
-                    logging.error(f"Error processing query: {str(e)}", exc_info=True)
-                    return JSONResponse(
-                        status_code=500,
-                        content={"error": f"Error processing query: {str(e)}"}
-                    )
+            mount_agent(_shared_apps[port], path, server)
             
             print(f"🚀 Agent '{self.name}' available at http://{host}:{port}")
             
@@ -2030,16 +2064,15 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
         elif protocol == "mcp":
             try:
                 import uvicorn
-                from mcp.server.fastmcp import FastMCP
-                from mcp.server.sse import SseServerTransport
-                from starlette.applications import Starlette
-                from starlette.requests import Request
-                from starlette.routing import Mount, Route
-                from mcp.server import Server as MCPServer # Alias to avoid conflict
+                try:
+                    from mcp.server.fastmcp import Context, FastMCP
+                except ImportError:  # mcp>=2 renamed FastMCP
+                    from mcp.server.mcpserver import Context, MCPServer as FastMCP
+                import starlette
                 import threading
                 import time
                 import inspect
-                import asyncio  # Import asyncio in the MCP scope
+                from .serving import AgentServer, QueueFullError, answer_mcp_call, mcp_sse_app
                 # logging is already imported at the module level
                 
             except ImportError as e:
@@ -2058,21 +2091,22 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             actual_mcp_tool_name = f"execute_{self.name.lower().replace(' ', '_').replace('-', '_')}_task" if self.name \
                 else "execute_task"
 
+            # Each client connection gets its own copy of this agent; calls share a bounded worker pool
+            server = AgentServer(
+                self, max_concurrency=max_concurrency, max_queue=max_queue,
+                max_sessions=max_sessions, session_ttl=session_ttl
+            )
+
             @mcp.tool(name=actual_mcp_tool_name)
-            async def execute_agent_task(prompt: str) -> str:
+            async def execute_agent_task(prompt: str, ctx: Context) -> str:
                 """Executes the agent's primary task with the given prompt."""
                 logging.info(f"MCP tool '{actual_mcp_tool_name}' called with prompt: {prompt}")
                 try:
-                    # Ensure self.achat is used as it's the async version and pass its tools
-                    if hasattr(self, 'achat') and asyncio.iscoroutinefunction(self.achat):
-                        response = await self.achat(prompt, tools=self.tools)
-                    elif hasattr(self, 'chat'): # Fallback for synchronous chat
-                        loop = asyncio.get_event_loop()
-                        response = await loop.run_in_executor(None, lambda p=prompt: self.chat(p, tools=self.tools))
-                    else:
-                        logging.error(f"Agent {self.name} has no suitable chat or achat method for MCP tool.")
-                        return f"Error: Agent {self.name} misconfigured for MCP."
+                    response = await answer_mcp_call(server, prompt, ctx)
                     return response if response is not None else "Agent returned no response."
+                except QueueFullError:
+                    logging.warning(f"Rejecting MCP call to '{actual_mcp_tool_name}': server busy")
+                    return "Error: server busy, retry later"
                 except Exception as e:
                     logging.error(f"Error in MCP tool '{actual_mcp_tool_name}': {e}", exc_info=True)
                     return f"Error executing task: {str(e)}"
@@ -2086,28 +2120,8 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
             if not messages_path_prefix.endswith('/'):
                 messages_path_prefix += '/'
 
-
-            sse_transport = SseServerTransport(messages_path_prefix) # Pass the full prefix
-
-            async def handle_sse_connection(request: Request) -> None:
-                logging.debug(f"SSE connection request received from {request.client} for path {request.url.path}")
-                async with sse_transport.connect_sse(
-                        request.scope,
-                        request.receive,
-                        request._send,  # noqa: SLF001
-                ) as (read_stream, write_stream):
-                    await mcp._mcp_server.run( # Use the underlying server from FastMCP
-                        read_stream,
-                        write_stream,
-                        mcp._mcp_server.create_initialization_options(),
-                    )
-            
-            starlette_app = Starlette(
-                debug=debug,
-                routes=[
-                    Route(sse_path, endpoint=handle_sse_connection),
-                    Mount(messages_path_prefix, app=sse_transport.handle_post_message),
-                ],
+            starlette_app = mcp_sse_app(
+                mcp, server, sse_path, messages_path_prefix, f"{base_path}/metrics", debug=debug
             )
 
             print(f"🚀 Agent '{self.name}' MCP server starting on http://{host}:{port}")
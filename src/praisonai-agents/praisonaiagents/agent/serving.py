@@ -0,0 +1,576 @@
+"""
+Request scheduling for agents served over HTTP by ``Agent.launch``.
+
+Each session gets its own clone of the launched agent, so concurrent users
+no longer share one ``chat_history``. Requests run on a bounded worker pool
+behind a bounded queue; when the queue is full the server answers 429
+instead of piling up threads. Latency histograms are exported in the
+Prometheus text format on ``/metrics``. With ``stream`` set, tokens and
+tool-call events are sent to the client as they are produced.
+
+``launch(protocol="mcp")`` uses the same scheduler: each MCP client
+connection is a session, and its calls are cancelled when it disconnects.
+"""
+
+import asyncio
+import bisect
+import copy
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..streaming import CancelToken, EventStream, StreamCancelled, emit_event, stream_events
+
+if TYPE_CHECKING:
+    from .agent import Agent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+# Methods telemetry replaces with wrappers bound to the instrumented agent
+_INSTANCE_WRAPPERS = ("chat", "start", "run", "execute_tool")
+
+
+def clone_agent(agent: "Agent") -> "Agent":
+    """A shallow copy of ``agent`` with its own chat history.
+
+    Instance-level method wrappers (telemetry's) still call the original
+    agent, so they are dropped from the copy and the copy is instrumented
+    again on its own.
+    """
+    clone = copy.copy(agent)
+    clone.chat_history = list(agent.chat_history)
+    attributes = vars(clone)
+    for name in _INSTANCE_WRAPPERS:
+        attributes.pop(name, None)
+    if attributes.pop("_telemetry_instrumented", None):
+        from ..telemetry.integration import instrument_agent
+        instrument_agent(clone)
+    return clone
+
+
+class QueueFullError(Exception):
+    """Raised when a request arrives while every worker and queue slot is taken"""
+
+
+class LatencyHistogram:
+    """Cumulative histogram of durations in seconds, Prometheus style"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # the last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile, or None if empty"""
+        with self._lock:
+            if not self.count:
+                return None
+            target, seen = q * self.count, 0
+            for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+                seen += n
+                if seen >= target:
+                    return bound
+        return float("inf")
+
+    def render(self, name: str, labels: str) -> List[str]:
+        with self._lock:
+            lines, cumulative = [], 0
+            for bound, n in zip(self.buckets, self.counts):
+                cumulative += n
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+            lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+            lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class AgentPool:
+    """Per-session clones of a template agent.
+
+    Requests with a ``session_id`` always get that session's clone, so its
+    chat history carries over between requests. Requests without one borrow
+    an idle clone whose history is reset to the template's afterwards.
+
+    Args:
+        template: The agent to clone.
+        max_sessions: Sessions kept before the least recently used idle one
+            is dropped.
+        session_ttl: Seconds a session may stay idle before it is dropped,
+            or None to keep sessions until evicted by ``max_sessions``.
+    """
+
+    def __init__(self, template: "Agent", max_sessions: int = 1024, session_ttl: Optional[float] = None):
+        self.template = template
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self._sessions: "OrderedDict[str, Tuple[Agent, asyncio.Lock, float]]" = OrderedDict()
+        self._idle: List["Agent"] = []
+        self._lock = threading.Lock()
+
+    def clone(self) -> "Agent":
+        """A copy of the template with its own chat history"""
+        return clone_agent(self.template)
+
+    def session(self, session_id: str) -> Tuple["Agent", asyncio.Lock]:
+        """The agent for ``session_id`` and the lock serialising its requests"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is None or (self.session_ttl and now - entry[2] > self.session_ttl):
+                entry = (self.clone(), asyncio.Lock(), now)
+            self._sessions[session_id] = (entry[0], entry[1], now)
+            self._evict(now)
+            return entry[0], entry[1]
+
+    def _evict(self, now: float) -> None:
+        for session_id, (_, lock, last_used) in list(self._sessions.items()):
+            over_capacity = len(self._sessions) > self.max_sessions
+            expired = self.session_ttl and now - last_used > self.session_ttl
+            if not (over_capacity or expired):
+                break
+            if not lock.locked():
+                del self._sessions[session_id]
+
+    def discard(self, session_id: str) -> None:
+        """Forget a session, e.g. when the client holding it disconnects"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def borrow(self) -> "Agent":
+        with self._lock:
+            return self._idle.pop() if self._idle else self.clone()
+
+    def give_back(self, agent: "Agent") -> None:
+        agent.chat_history = list(self.template.chat_history)
+        with self._lock:
+            self._idle.append(agent)
+
+    @property
+    def sessions(self) -> int:
+        return len(self._sessions)
+
+
+class AgentChain:
+    """Agents answering one after another, each given the previous answer.
+
+    Lets AgentServer serve a multi-agent workflow (``PraisonAIAgents.agents``)
+    like a single agent: copying a chain copies every agent in it, so each
+    session gets its own histories. The answer has the same shape as the
+    ``PraisonAIAgents.launch`` endpoint's.
+    """
+
+    def __init__(self, agents: Sequence["Agent"], name: Optional[str] = None):
+        self.agents = list(agents)
+        self.name = name or ", ".join(agent.name for agent in self.agents)
+        self._initial = [list(agent.chat_history) for agent in self.agents]
+
+    def __copy__(self) -> "AgentChain":
+        chain = AgentChain.__new__(AgentChain)
+        chain.name = self.name
+        chain._initial = self._initial
+        chain.agents = [clone_agent(agent) for agent in self.agents]
+        return chain
+
+    @property
+    def chat_history(self) -> List[Dict[str, Any]]:
+        return [message for agent in self.agents for message in agent.chat_history]
+
+    @chat_history.setter
+    def chat_history(self, _history: List[Dict[str, Any]]) -> None:
+        # AgentPool resets an agent by assigning the template's history
+        for agent, history in zip(self.agents, self._initial):
+            agent.chat_history = list(history)
+
+    def chat(self, query: str) -> Dict[str, Any]:
+        current_input, results = query, []
+        for agent in self.agents:
+            # Tells a streaming client whose tokens follow
+            emit_event("agent", name=agent.name)
+            try:
+                response = agent.chat(current_input)
+                results.append({"agent": agent.name, "response": response})
+                current_input = response
+            except Exception as e:
+                logger.error(f"Error with agent {agent.name}: {e}", exc_info=True)
+                results.append({"agent": agent.name, "error": str(e)})
+        return {"query": query, "results": results, "final_response": current_input}
+
+
+class AgentServer:
+    """Bounded concurrency, queueing and metrics for one served agent.
+
+    Args:
+        agent: The template agent.
+        max_concurrency: Requests processed at once (default: the size of
+            Python's default thread pool, min(32, CPUs + 4)).
+        max_queue: Requests allowed to wait for a worker; beyond that
+            ``submit`` raises QueueFullError.
+        max_sessions: See AgentPool.
+        session_ttl: See AgentPool.
+    """
+
+    def __init__(self, agent: "Agent", max_concurrency: Optional[int] = None, max_queue: int = 64,
+                 max_sessions: int = 1024, session_ttl: Optional[float] = None):
+        self.pool = AgentPool(agent, max_sessions=max_sessions, session_ttl=session_ttl)
+        self.max_concurrency = max_concurrency or min(32, (os.cpu_count() or 1) + 4)
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="praison-serve")
+        self._pending = 0
+        self._running = 0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.queue_wait = LatencyHistogram()
+        self.latency = LatencyHistogram()
+
+    @property
+    def queued(self) -> int:
+        return self._pending - self._running
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_concurrency + self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(f"{self._pending} requests in progress or queued")
+            self._pending += 1
+            self.requests += 1
+
+    def _run(self, agent: "Agent", query: str, enqueued: float,
+             stream: Optional[Union[EventStream, CancelToken]] = None) -> Any:
+        # Runs on one of the max_concurrency executor threads
+        self.queue_wait.observe(time.perf_counter() - enqueued)
+        if stream is not None and stream.cancelled:
+            raise StreamCancelled()
+        with self._lock:
+            self._running += 1
+        try:
+            with stream_events(stream):
+                return agent.chat(query)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    async def _execute(self, query: str, session_id: Optional[str], enqueued: float,
+                       stream: Optional[Union[EventStream, CancelToken]] = None) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            if session_id is None:
+                agent = self.pool.borrow()
+                try:
+                    return await loop.run_in_executor(self.executor, self._run, agent, query, enqueued, stream)
+                finally:
+                    self.pool.give_back(agent)
+            agent, lock = self.pool.session(session_id)
+            # Requests in one session run in order; their history depends on it
+            async with lock:
+                return await loop.run_in_executor(self.executor, self._run, agent, query, enqueued, stream)
+        except StreamCancelled:
+            self.cancelled += 1
+            raise
+        except asyncio.CancelledError:
+            # The caller went away; the agent thread stops at its next token or tool call
+            if stream is not None:
+                stream.cancel()
+            self.cancelled += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.latency.observe(time.perf_counter() - enqueued)
+            with self._lock:
+                self._pending -= 1
+
+    async def submit(self, query: str, session_id: Optional[str] = None) -> Any:
+        """Answer ``query`` on the session's agent, waiting for a free worker.
+
+        Cancelling the awaiting task (the client disconnected) stops the
+        agent at its next token or tool call, or before it starts if the
+        request is still queued.
+
+        Raises:
+            QueueFullError: Every worker is busy and the queue is full.
+        """
+        self._admit()
+        return await self._execute(query, session_id, time.perf_counter(), CancelToken())
+
+    def stream(self, query: str, session_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Like submit, but returns the agent's events as they happen.
+
+        Admission is checked immediately, so QueueFullError is raised here
+        rather than from the iterator. The events end with
+        ``{"type": "response", ...}`` or ``{"type": "error", ...}``. Closing
+        the iterator early cancels the agent's LLM call.
+        """
+        self._admit()
+        enqueued = time.perf_counter()
+        return relay_events(lambda stream: self._execute(query, session_id, enqueued, stream))
+
+    def metrics(self, path: str, labels: str = "") -> List[str]:
+        """Prometheus text lines for this endpoint, with optional extra ``labels``"""
+        labels = f'path="{path}"' + (f",{labels}" if labels else "")
+        return [
+            f"praisonai_requests_total{{{labels}}} {self.requests}",
+            f"praisonai_requests_rejected_total{{{labels}}} {self.rejected}",
+            f"praisonai_request_errors_total{{{labels}}} {self.errors}",
+            f"praisonai_requests_cancelled_total{{{labels}}} {self.cancelled}",
+            f"praisonai_requests_in_progress{{{labels}}} {self._running}",
+            f"praisonai_requests_queued{{{labels}}} {self.queued}",
+            f"praisonai_sessions{{{labels}}} {self.pool.sessions}",
+            *self.queue_wait.render("praisonai_queue_wait_seconds", labels),
+            *self.latency.render("praisonai_request_duration_seconds", labels),
+        ]
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False)
+
+
+METRIC_HELP = {
+    "praisonai_requests_total": ("counter", "Requests accepted"),
+    "praisonai_requests_rejected_total": ("counter", "Requests rejected with 429 because the queue was full"),
+    "praisonai_request_errors_total": ("counter", "Requests that raised an error"),
+    "praisonai_requests_cancelled_total": ("counter", "Streaming requests stopped because the client disconnected"),
+    "praisonai_requests_in_progress": ("gauge", "Requests being processed"),
+    "praisonai_requests_queued": ("gauge", "Requests waiting for a worker"),
+    "praisonai_sessions": ("gauge", "Sessions with their own agent"),
+    "praisonai_queue_wait_seconds": ("histogram", "Time from arrival until a worker picked the request up"),
+    "praisonai_request_duration_seconds": ("histogram", "Time from arrival until the response was ready"),
+}
+
+
+def render_metrics(servers: Dict[str, AgentServer], labels: str = "") -> str:
+    """Prometheus exposition text for every served endpoint"""
+    return format_metrics([line for path, server in servers.items() for line in server.metrics(path, labels)])
+
+
+def format_metrics(series: Iterable[str]) -> str:
+    """Group sample lines (possibly from several processes) under their HELP and TYPE headers"""
+    by_metric: Dict[str, List[str]] = {name: [] for name in METRIC_HELP}
+    for line in series:
+        name = line.split("{", 1)[0]
+        for suffix in ("_bucket", "_sum", "_count"):
+            if name.endswith(suffix) and name[: -len(suffix)] in METRIC_HELP:
+                name = name[: -len(suffix)]
+        if name in by_metric:
+            by_metric[name].append(line)
+    lines = []
+    for name, (kind, help_text) in METRIC_HELP.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(by_metric[name])
+    return "\n".join(lines) + "\n"
+
+
+async def relay_events(start: Callable[[EventStream], Awaitable[Any]]) -> AsyncIterator[Dict[str, Any]]:
+    """Run ``start(stream)`` and yield the events it reports, then its result.
+
+    If the consumer stops iterating (the client disconnected), the stream
+    is cancelled so the agent stops at its next token or tool call.
+    """
+    stream = EventStream()
+    task = asyncio.ensure_future(start(stream))
+    task.add_done_callback(lambda _: stream.close())
+    try:
+        async for event in stream:
+            yield event
+        try:
+            yield {"type": "response", "response": await task}
+        except StreamCancelled:
+            return
+        except Exception as e:
+            logger.error(f"Error processing streamed query: {e}", exc_info=True)
+            yield {"type": "error", "error": str(e)}
+    finally:
+        if not task.done():
+            stream.cancel()
+            # Retrieve the StreamCancelled the task ends with, so it is not reported as unhandled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+def run_streamed(func: Callable[..., Any], *args: Any, executor=None) -> AsyncIterator[Dict[str, Any]]:
+    """Events of a blocking agent call made on ``executor`` (default: the loop's pool)"""
+    def call(stream):
+        with stream_events(stream):
+            if stream.cancelled:
+                raise StreamCancelled()
+            return func(*args)
+
+    return relay_events(lambda stream: asyncio.get_running_loop().run_in_executor(executor, call, stream))
+
+
+def format_event(event: Dict[str, Any], media_type: str) -> str:
+    """Encode an event as a Server-Sent Event or as one line of newline-delimited JSON"""
+    data = json.dumps(event, default=str)
+    if media_type == "application/x-ndjson":
+        return data + "\n"
+    return f"event: {event['type']}\ndata: {data}\n\n"
+
+
+def mount_agent(app: Any, path: str, server: AgentServer) -> None:
+    """Answer queries for ``server`` on ``POST path`` of a FastAPI app.
+
+    The body is JSON ``{"query": ..., "session_id": ..., "stream": ...}`` or
+    the same fields as form data; ``?stream=true`` also asks for a stream.
+    Streams are Server-Sent Events, or newline-delimited JSON when the client
+    accepts ``application/x-ndjson``. A full queue is answered with 429.
+    """
+    from fastapi import HTTPException, Request
+    from fastapi.responses import JSONResponse, StreamingResponse
+    from pydantic import BaseModel
+
+    class AgentQuery(BaseModel):
+        query: str
+        session_id: Optional[str] = None
+        stream: bool = False
+
+    @app.post(path)
+    async def handle_agent_query(request: Request, query_data: Optional[AgentQuery] = None):
+        # Handle both direct JSON with query field and form data
+        if query_data is None:
+            try:
+                request_data = await request.json()
+                if "query" not in request_data:
+                    raise HTTPException(status_code=400, detail="Missing 'query' field in request")
+                query = request_data["query"]
+                session_id = request_data.get("session_id")
+                stream = bool(request_data.get("stream", False))
+            except:
+                # Fallback to form data or query params
+                form_data = await request.form()
+                if "query" in form_data:
+                    query = form_data["query"]
+                    session_id = form_data.get("session_id")
+                    stream = str(form_data.get("stream", "")).lower() in ("1", "true")
+                else:
+                    raise HTTPException(status_code=400, detail="Missing 'query' field in request")
+        else:
+            query = query_data.query
+            session_id = query_data.session_id
+            stream = query_data.stream
+        stream = stream or request.query_params.get("stream", "").lower() in ("1", "true")
+
+        try:
+            if stream:
+                media_type = "application/x-ndjson" if "application/x-ndjson" in request.headers.get("accept", "") else "text/event-stream"
+                events = server.stream(query, session_id=session_id)
+                # Starlette stops iterating when the client disconnects, which cancels the agent
+                return StreamingResponse(
+                    (format_event(event, media_type) async for event in events),
+                    media_type=media_type,
+                    headers={"Cache-Control": "no-cache"}
+                )
+            # Runs on this endpoint's worker pool, on the session's own agent
+            response = await server.submit(query, session_id=session_id)
+            result = {"response": response}
+            if session_id is not None:
+                result["session_id"] = session_id
+            return result
+        except QueueFullError as e:
+            logger.warning(f"Rejecting query on {path}: {e}")
+            return JSONResponse(
+                status_code=429,
+                content={"error": "Server busy, retry later"},
+                headers={"Retry-After": "1"}
+            )
+        except Exception as e:
+            logger.error(f"Error processing query: {str(e)}", exc_info=True)
+            return JSONResponse(
+                status_code=500,
+                content={"error": f"Error processing query: {str(e)}"}
+            )
+
+
+_SSE_SESSION_ID = re.compile(rb"session_id=([0-9a-f]{32})")
+
+
+def mcp_client_id(ctx: Any) -> Optional[str]:
+    """The SSE connection an MCP tool call arrived on, from its FastMCP Context"""
+    request = getattr(ctx.request_context, "request", None) if ctx is not None else None
+    return request.query_params.get("session_id") if request is not None else None
+
+
+async def answer_mcp_call(server: AgentServer, query: str, ctx: Any) -> Any:
+    """Answer an MCP tool call on the session of the client connection that made it"""
+    return await server.submit(query, session_id=mcp_client_id(ctx))
+
+
+def mcp_sse_app(mcp_server: Any, server: AgentServer, sse_path: str, messages_path: str,
+                metrics_path: str, debug: bool = False) -> Any:
+    """Starlette app serving an MCP server over SSE with one agent session per connection.
+
+    The tool calls made over one SSE connection share a session of
+    ``server`` (tools pass their Context to ``answer_mcp_call``), so a
+    client keeps its own history and never sees another client's. Calls run
+    on the server's bounded worker pool. When the connection closes, the
+    client's calls still queued or running are cancelled and its session
+    is dropped.
+
+    Args:
+        mcp_server: The FastMCP (``MCPServer`` in mcp 2) instance.
+        server: Scheduler the tools submit their calls to.
+        sse_path: Path of the SSE endpoint.
+        messages_path: Prefix clients post their messages to.
+        metrics_path: Path of the Prometheus metrics endpoint.
+        debug: Starlette debug mode.
+    """
+    from mcp.server.sse import SseServerTransport
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import PlainTextResponse, Response
+    from starlette.routing import Mount, Route
+
+    transport = SseServerTransport(messages_path)
+    # FastMCP's low-level server; mcp 2 renamed the attribute
+    lowlevel = getattr(mcp_server, "_mcp_server", None) or mcp_server._lowlevel_server
+
+    async def handle_sse_connection(request: Request) -> Response:
+        logger.debug(f"SSE connection request received from {request.client} for path {request.url.path}")
+        client_ids: List[str] = []
+
+        async def send(message):
+            # The first event tells the client where to post, including its session id
+            if not client_ids and message["type"] == "http.response.body":
+                match = _SSE_SESSION_ID.search(message.get("body", b""))
+                if match:
+                    client_ids.append(match.group(1).decode())
+            await request._send(message)  # noqa: SLF001
+
+        try:
+            async with transport.connect_sse(request.scope, request.receive, send) as (read_stream, write_stream):
+                await lowlevel.run(read_stream, write_stream, lowlevel.create_initialization_options())
+        finally:
+            # The client's calls in progress were cancelled along with the connection
+            for client_id in client_ids:
+                server.pool.discard(client_id)
+        return Response()
+
+    async def metrics(request: Request) -> Response:
+        return PlainTextResponse(render_metrics({sse_path: server}), media_type="text/plain; version=0.0.4")
+
+    return Starlette(
+        debug=debug,
+        routes=[
+            Route(sse_path, endpoint=handle_sse_connection),
+            Mount(messages_path, app=transport.handle_post_message),
+            Route(metrics_path, endpoint=metrics),
+        ],
+    )
@@ -1,5 +1,7 @@
 """Agents module for managing multiple AI agents"""
 from .agents import PraisonAIAgents
 from .autoagents import AutoAgents
+from .executor import AsyncTaskExecutor, LoopLagProbe
+from .speculation import SpeculationConfig, SpeculationMetrics
 
-__all__ = ['PraisonAIAgents', 'AutoAgents'] 
\ No newline at end of file
+__all__ = ['PraisonAIAgents', 'AutoAgents', 'AsyncTaskExecutor', 'LoopLagProbe', 'SpeculationConfig', 'SpeculationMetrics']
@@ -11,6 +11,10 @@ from ..main import display_error, TaskOutput, error_logs, client
 from ..agent.agent import Agent
 from ..task.task import Task
 from ..process.process import Process, LoopItems
+from ..process.context import ContextAssembler
+from .executor import AsyncTaskExecutor
+from ..process_pool import tool_executor
+from .speculation import BranchSpeculator, SpeculationConfig, SpeculationMetrics
 import asyncio
 import uuid
 from enum import Enum
@@ -27,6 +31,9 @@ class TaskStatus(Enum):
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Rendering of a completed task's result inside a prompt's Context section
+PREVIOUS_RESULT_TEMPLATE = "Result of previous task {source}:\n{text}"
+
 # Global variables for managing the shared servers
 _agents_server_started = {}  # Dict of port -> started boolean
 _agents_registered_endpoints = {}  # Dict of port -> Dict of path -> endpoint_id
@@ -81,7 +88,7 @@ def process_task_context(context_item, verbose=0, user_id=None):
         task_name = context_item.name if context_item.name else context_item.description
         
         if context_item.result and task_status == TaskStatus.COMPLETED.value:
-            return f"Result of previous task {task_name}:\n{context_item.result.raw}"
+            return PREVIOUS_RESULT_TEMPLATE.format(source=task_name, text=context_item.result.raw)
         elif task_status == TaskStatus.COMPLETED.value and not context_item.result:
             return f"Previous task {task_name} completed but produced no result."
         else:
@@ -108,7 +115,7 @@ def process_task_context(context_item, verbose=0, user_id=None):
         return str(context_item)  # Fallback for unknown types
 
 class PraisonAIAgents:
-    def __init__(self, agents, tasks=None, verbose=0, completion_checker=None, max_retries=5, process="sequential", manager_llm=None, memory=False, memory_config=None, embedder=None, user_id=None, max_iter=10, stream=True, name: Optional[str] = None):
+    def __init__(self, agents, tasks=None, verbose=0, completion_checker=None, max_retries=5, process="sequential", manager_llm=None, memory=False, memory_config=None, embedder=None, user_id=None, max_iter=10, stream=True, name: Optional[str] = None, context_summarizer=None, manager_mode: str = "single", max_concurrency: Optional[int] = None, speculative=False):
         # Add check at the start if memory is requested
         if memory:
             try:
@@ -142,7 +149,20 @@ class PraisonAIAgents:
         self.process = process
         self.stream = stream
         self.name = name  # Store the name for the Agents collection
+        # Shared across runs so previous results are rendered into context only once
+        self.context_assembler = ContextAssembler(summarizer=context_summarizer)
         
+        # "single": one manager call per task, "batch": concurrent batches of assignments
+        self.manager_mode = manager_mode
+        # Limit on tasks in flight in arun_all_tasks (None for no limit)
+        self.max_concurrency = max_concurrency
+        self.loop_lag_stats = {}
+        # Opt-in speculative execution of decision branches in workflow mode
+        if speculative is True:
+            speculative = SpeculationConfig()
+        self.speculation_config: Optional[SpeculationConfig] = speculative or None
+        self.speculation_metrics: Optional[SpeculationMetrics] = None
+
         # Check for manager_llm in environment variable if not provided
         self.manager_llm = manager_llm or os.getenv('OPENAI_MODEL_NAME', 'gpt-4o')
         
@@ -267,6 +287,40 @@ class PraisonAIAgents:
             return True
         return len(agent_output.strip()) > 0
 
+    def _build_context_section(self, task_id, task):
+        """Assemble the 'Context' section of a task prompt from cached segments.
+
+        Completed task results are rendered once by the shared context assembler
+        and reused across tasks. Results the workflow process has already
+        embedded in the task description are skipped, and the task's
+        ``context_token_budget`` is applied to what remains.
+        """
+        already_embedded = {key[1:] for key in self.context_assembler.rendered_keys(task.id)}
+        segments = {}
+        for i, context_item in enumerate(task.context):
+            if (hasattr(context_item, 'result') and context_item.result
+                    and getattr(context_item, 'status', None) == TaskStatus.COMPLETED.value):
+                task_name = context_item.name if context_item.name else context_item.description
+                if (task_name, context_item.result.raw) in already_embedded:
+                    continue
+                seg = self.context_assembler.segment(task_name, context_item.result.raw, template=PREVIOUS_RESULT_TEMPLATE)
+            else:
+                # Use the centralized helper function
+                context_str = process_task_context(context_item, self.verbose, self.user_id)
+                seg = self.context_assembler.segment(f"context_{i}", context_str, template="{text}")
+            segments.setdefault(seg.text, seg)  # Remove duplicates
+
+        if self.verbose >= 3:
+            logger.info(f"Task {task_id} context items: {len(segments)}")
+            for i, ctx in enumerate(segments):
+                logger.info(f"Context {i+1}: {ctx[:100]}...")
+        return self.context_assembler.assemble(
+            f"{task.id}:prompt",
+            segments.values(),
+            token_budget=task.context_token_budget,
+            separator="\n\n"
+        )
+
     async def aexecute_task(self, task_id):
         """Async version of execute_task method"""
         if task_id not in self.tasks:
@@ -301,23 +355,12 @@ You need to do the following task: {task.description}.
 Expected Output: {task.expected_output}.
 """
         if task.context:
-            context_results = []  # Use list to avoid duplicates
-            for context_item in task.context:
-                # Use the centralized helper function
-                context_str = process_task_context(context_item, self.verbose, self.user_id)
-                context_results.append(context_str)
-            
-            # Join unique context results with proper formatting
-            unique_contexts = list(dict.fromkeys(context_results))  # Remove duplicates
-            if self.verbose >= 3:
-                logger.info(f"Task {task_id} context items: {len(unique_contexts)}")
-                for i, ctx in enumerate(unique_contexts):
-                    logger.info(f"Context {i+1}: {ctx[:100]}...")
-            context_separator = '\n\n'
-            task_prompt += f"""
+            context_text = self._build_context_section(task_id, task)
+            if context_text:
+                task_prompt += f"""
 Context:
 
-{context_separator.join(unique_contexts)}
+{context_text}
 """
         task_prompt += "Please provide only the final result of your work. Do not add any conversation or extra explanation."
 
@@ -358,19 +401,21 @@ Context:
                         })
                 return content
 
-            agent_output = await executor_agent.achat(
-                _get_multimodal_message(task_prompt, task.images),
-                tools=tools,
-                output_json=task.output_json,
-                output_pydantic=task.output_pydantic
-            )
+            with tool_executor(task.executor):
+                agent_output = await executor_agent.achat(
+                    _get_multimodal_message(task_prompt, task.images),
+                    tools=tools,
+                    output_json=task.output_json,
+                    output_pydantic=task.output_pydantic
+                )
         else:
-            agent_output = await executor_agent.achat(
-                task_prompt,
-                tools=tools,
-                output_json=task.output_json,
-                output_pydantic=task.output_pydantic
-            )
+            with tool_executor(task.executor):
+                agent_output = await executor_agent.achat(
+                    task_prompt,
+                    tools=tools,
+                    output_json=task.output_json,
+                    output_pydantic=task.output_pydantic
+                )
 
         if agent_output:
             task_output = TaskOutput(
@@ -408,6 +453,38 @@ Context:
             task.status = "failed"
             return None
 
+    def _finalize_task(self, task_id, task_output):
+        """Mark a task completed and run its memory callback, callback and file output"""
+        task = self.tasks[task_id]
+        task.status = "completed"
+        # Run execute_callback for memory operations
+        try:
+            # Use the new sync wrapper to avoid pending coroutine issues
+            task.execute_callback_sync(task_output)
+        except Exception as e:
+            logger.error(f"Error executing memory callback for task {task_id}: {e}")
+            logger.exception(e)
+
+        # Run task callback if exists
+        if task.callback:
+            try:
+                if asyncio.iscoroutinefunction(task.callback):
+                    try:
+                        loop = asyncio.get_running_loop()
+                        loop.create_task(task.callback(task_output))
+                    except RuntimeError:
+                        # No event loop running, create new one
+                        asyncio.run(task.callback(task_output))
+                else:
+                    task.callback(task_output)
+            except Exception as e:
+                logger.error(f"Error executing task callback for task {task_id}: {e}")
+                logger.exception(e)
+
+        self.save_output_to_file(task, task_output)
+        if self.verbose >= 1:
+            logger.info(f"Task {task_id} completed successfully.")
+
     async def arun_task(self, task_id):
         """Async version of run_task method"""
         if task_id not in self.tasks:
@@ -424,34 +501,7 @@ Context:
             if task.status in ["not started", "in progress"]:
                 task_output = await self.aexecute_task(task_id)
                 if task_output and self.completion_checker(task, task_output.raw):
-                    task.status = "completed"
-                    # Run execute_callback for memory operations
-                    try:
-                        # Use the new sync wrapper to avoid pending coroutine issues
-                        task.execute_callback_sync(task_output)
-                    except Exception as e:
-                        logger.error(f"Error executing memory callback for task {task_id}: {e}")
-                        logger.exception(e)
-                    
-                    # Run task callback if exists
-                    if task.callback:
-                        try:
-                            if asyncio.iscoroutinefunction(task.callback):
-                                try:
-                                    loop = asyncio.get_running_loop()
-                                    loop.create_task(task.callback(task_output))
-                                except RuntimeError:
-                                    # No event loop running, create new one
-                                    asyncio.run(task.callback(task_output))
-                            else:
-                                task.callback(task_output)
-                        except Exception as e:
-                            logger.error(f"Error executing task callback for task {task_id}: {e}")
-                            logger.exception(e)
-                            
-                    self.save_output_to_file(task, task_output)
-                    if self.verbose >= 1:
-                        logger.info(f"Task {task_id} completed successfully.")
+                    self._finalize_task(task_id, task_output)
                 else:
                     task.status = "in progress"
                     if self.verbose >= 1:
@@ -469,50 +519,90 @@ Context:
         if retries == self.max_retries and task.status != "completed":
             logger.info(f"Task {task_id} failed after {self.max_retries} retries.")
 
+    async def _adispatch_task(self, executor, task_id):
+        """Schedule one task without blocking the event loop"""
+        if self.tasks[task_id].async_execution:
+            return await executor.run_async(self.arun_task, task_id)
+        return await executor.run_sync(self.run_task, task_id)
+
+    async def _arun_workflow_task(self, executor, speculator, task_id):
+        """Async version of _run_workflow_task"""
+        if speculator is None:
+            await self._adispatch_task(executor, task_id)
+            return
+        if await executor.run_sync(self._adopt_speculative_result, speculator, task_id):
+            return
+        task = self.tasks[task_id]
+        if speculator.is_decision(task):
+            speculator.start(task)
+            await self._adispatch_task(executor, task_id)
+            speculator.resolve(task)
+        else:
+            await self._adispatch_task(executor, task_id)
+
+    async def _arun_task_batch(self, executor, task_ids):
+        """Run a batch of independent tasks concurrently"""
+        await asyncio.gather(*[self._adispatch_task(executor, tid) for tid in task_ids])
+
     async def arun_all_tasks(self):
-        """Async version of run_all_tasks method"""
+        """Async version of run_all_tasks method
+
+        Async tasks are awaited natively and sync tasks run in the executor's
+        thread pool, so the event loop (and any server started by launch())
+        stays responsive. Loop lag measured during the run is stored in
+        ``self.loop_lag_stats``.
+        """
         process = Process(
             tasks=self.tasks,
             agents=self.agents,
             manager_llm=self.manager_llm,
             verbose=self.verbose,
-            max_iter=self.max_iter
+            max_iter=self.max_iter,
+            context_assembler=self.context_assembler,
+            manager_mode=self.manager_mode
         )
-        
-        if self.process == "workflow":
-            # Collect all tasks that should run in parallel
-            parallel_tasks = []
-            async for task_id in process.aworkflow():
-                if self.tasks[task_id].async_execution and self.tasks[task_id].is_start:
-                    parallel_tasks.append(task_id)
-                elif parallel_tasks:
-                    # Execute collected parallel tasks
-                    await asyncio.gather(*[self.arun_task(t) for t in parallel_tasks])
+
+        async with AsyncTaskExecutor(max_concurrency=self.max_concurrency) as executor:
+            if self.process == "workflow":
+                speculator = BranchSpeculator(self, self.speculation_config) if self.speculation_config else None
+                try:
+                    # Collect all tasks that should run in parallel
                     parallel_tasks = []
-                    # Run the current non-parallel task
-                    if self.tasks[task_id].async_execution:
-                        await self.arun_task(task_id)
+                    async for task_id in process.aworkflow():
+                        if self.tasks[task_id].async_execution and self.tasks[task_id].is_start:
+                            parallel_tasks.append(task_id)
+                            continue
+                        if parallel_tasks:
+                            # Execute collected parallel tasks
+                            await self._arun_task_batch(executor, parallel_tasks)
+                            parallel_tasks = []
+                        # Run the current non-parallel task
+                        await self._arun_workflow_task(executor, speculator, task_id)
+
+                    # Execute any remaining parallel tasks
+                    if parallel_tasks:
+                        await self._arun_task_batch(executor, parallel_tasks)
+                finally:
+                    if speculator:
+                        speculator.shutdown()
+                        self.speculation_metrics = speculator.metrics
+
+            elif self.process == "sequential":
+                async for task_id in process.asequential():
+                    await self._adispatch_task(executor, task_id)
+            elif self.process == "hierarchical":
+                async for task_id in process.ahierarchical():
+                    if isinstance(task_id, Task):
+                        task_id = self.add_task(task_id)
+                    if isinstance(task_id, list):
+                        await self._arun_task_batch(executor, task_id)
                     else:
-                        self.run_task(task_id)
-            
-            # Execute any remaining parallel tasks
-            if parallel_tasks:
-                await asyncio.gather(*[self.arun_task(t) for t in parallel_tasks])
-                
-        elif self.process == "sequential":
-            async for task_id in process.asequential():
-                if self.tasks[task_id].async_execution:
-                    await self.arun_task(task_id)
-                else:
-                    self.run_task(task_id)
-        elif self.process == "hierarchical":
-            async for task_id in process.ahierarchical():
-                if isinstance(task_id, Task):
-                    task_id = self.add_task(task_id)
-                if self.tasks[task_id].async_execution:
-                    await self.arun_task(task_id)
-                else:
-                    self.run_task(task_id)
+                        await self._adispatch_task(executor, task_id)
+
+        if executor.probe:
+            self.loop_lag_stats = executor.probe.stats()
+            if self.verbose >= 3:
+                logger.info(f"Event loop lag during run: {self.loop_lag_stats}")
 
     async def astart(self, content=None, return_dict=False, **kwargs):
         """Async version of start method
@@ -563,12 +653,19 @@ Context:
             except Exception as e:
                 display_error(f"Error saving task output to file: {e}")
 
-    def execute_task(self, task_id):
-        """Synchronous version of execute_task method"""
+    def execute_task(self, task_id, task=None, stream=None):
+        """Synchronous version of execute_task method
+
+        Args:
+            task_id: ID of the task to execute
+            task: Optional stand-in Task object to execute instead of
+                ``self.tasks[task_id]`` (used for speculative runs)
+            stream: Overrides the collection's ``stream`` setting
+        """
         if task_id not in self.tasks:
             display_error(f"Error: Task with ID {task_id} does not exist")
             return
-        task = self.tasks[task_id]
+        task = task if task is not None else self.tasks[task_id]
         
         logger.info(f"Starting execution of task {task_id}")
         logger.info(f"Task config: {task.config}")
@@ -601,23 +698,12 @@ You need to do the following task: {task.description}.
 Expected Output: {task.expected_output}.
 """
         if task.context:
-            context_results = []  # Use list to avoid duplicates
-            for context_item in task.context:
-                # Use the centralized helper function
-                context_str = process_task_context(context_item, self.verbose, self.user_id)
-                context_results.append(context_str)
-            
-            # Join unique context results with proper formatting
-            unique_contexts = list(dict.fromkeys(context_results))  # Remove duplicates
-            if self.verbose >= 3:
-                logger.info(f"Task {task_id} context items: {len(unique_contexts)}")
-                for i, ctx in enumerate(unique_contexts):
-                    logger.info(f"Context {i+1}: {ctx[:100]}...")
-            context_separator = '\n\n'
-            task_prompt += f"""
+            context_text = self._build_context_section(task_id, task)
+            if context_text:
+                task_prompt += f"""
 Context:
 
-{context_separator.join(unique_contexts)}
+{context_text}
 """
 
         # Add memory context if available
@@ -668,20 +754,22 @@ Context:
                         })
                 return content
 
-            agent_output = executor_agent.chat(
-                _get_multimodal_message(task_prompt, task.images),
-                tools=task.tools,
-                output_json=task.output_json,
-                output_pydantic=task.output_pydantic
-            )
+            with tool_executor(task.executor):
+                agent_output = executor_agent.chat(
+                    _get_multimodal_message(task_prompt, task.images),
+                    tools=task.tools,
+                    output_json=task.output_json,
+                    output_pydantic=task.output_pydantic
+                )
         else:
-            agent_output = executor_agent.chat(
-                task_prompt,
-                tools=task.tools,
-                output_json=task.output_json,
-                output_pydantic=task.output_pydantic,
-                stream=self.stream,
-            )
+            with tool_executor(task.executor):
+                agent_output = executor_agent.chat(
+                    task_prompt,
+                    tools=task.tools,
+                    output_json=task.output_json,
+                    output_pydantic=task.output_pydantic,
+                    stream=self.stream if stream is None else stream,
+                )
 
         if agent_output:
             # Store the response in memory
@@ -746,34 +834,7 @@ Context:
             if task.status in ["not started", "in progress"]:
                 task_output = self.execute_task(task_id)
                 if task_output and self.completion_checker(task, task_output.raw):
-                    task.status = "completed"
-                    # Run execute_callback for memory operations
-                    try:
-                        # Use the new sync wrapper to avoid pending coroutine issues
-                        task.execute_callback_sync(task_output)
-                    except Exception as e:
-                        logger.error(f"Error executing memory callback for task {task_id}: {e}")
-                        logger.exception(e)
-                    
-                    # Run task callback if exists
-                    if task.callback:
-                        try:
-                            if asyncio.iscoroutinefunction(task.callback):
-                                try:
-                                    loop = asyncio.get_running_loop()
-                                    loop.create_task(task.callback(task_output))
-                                except RuntimeError:
-                                    # No event loop running, create new one
-                                    asyncio.run(task.callback(task_output))
-                            else:
-                                task.callback(task_output)
-                        except Exception as e:
-                            logger.error(f"Error executing task callback for task {task_id}: {e}")
-                            logger.exception(e)
-                            
-                    self.save_output_to_file(task, task_output)
-                    if self.verbose >= 1:
-                        logger.info(f"Task {task_id} completed successfully.")
+                    self._finalize_task(task_id, task_output)
                 else:
                     task.status = "in progress"
                     if self.verbose >= 1:
@@ -791,6 +852,48 @@ Context:
         if retries == self.max_retries and task.status != "completed":
             logger.info(f"Task {task_id} failed after {self.max_retries} retries.")
 
+    def _adopt_speculative_result(self, speculator, task_id):
+        """Complete a task from its speculative run; returns False if it must run normally"""
+        task_output = speculator.adopt(task_id)
+        if task_output is None:
+            return False
+        task = self.tasks[task_id]
+        task.result = task_output
+        if not self.completion_checker(task, task_output.raw):
+            task.result = None
+            return False
+        if task.memory:
+            try:
+                task.store_in_memory(content=task_output.raw, agent_name=task_output.agent, task_id=task_id)
+            except Exception as e:
+                logger.error(f"Failed to store agent output in memory: {e}")
+        self._finalize_task(task_id, task_output)
+        return True
+
+    def _run_workflow_task(self, speculator, task_id):
+        """Run a workflow task, adopting a speculative result or speculating on a decision's branches"""
+        if speculator is None:
+            self.run_task(task_id)
+            return
+        if self._adopt_speculative_result(speculator, task_id):
+            return
+        task = self.tasks[task_id]
+        if speculator.is_decision(task):
+            speculator.start(task)
+            self.run_task(task_id)
+            speculator.resolve(task)
+        else:
+            self.run_task(task_id)
+
+    def _run_task_batch(self, task_ids):
+        """Run a batch of independent tasks concurrently in worker threads"""
+        if len(task_ids) == 1:
+            self.run_task(task_ids[0])
+            return
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=len(task_ids), thread_name_prefix="praison-batch") as pool:
+            list(pool.map(self.run_task, task_ids))
+
     def run_all_tasks(self):
         """Synchronous version of run_all_tasks method"""
         process = Process(
@@ -798,12 +901,20 @@ Context:
             agents=self.agents,
             manager_llm=self.manager_llm,
             verbose=self.verbose,
-            max_iter=self.max_iter
+            max_iter=self.max_iter,
+            context_assembler=self.context_assembler,
+            manager_mode=self.manager_mode
         )
         
         if self.process == "workflow":
-            for task_id in process.workflow():
-                self.run_task(task_id)
+            speculator = BranchSpeculator(self, self.speculation_config) if self.speculation_config else None
+            try:
+                for task_id in process.workflow():
+                    self._run_workflow_task(speculator, task_id)
+            finally:
+                if speculator:
+                    speculator.shutdown()
+                    self.speculation_metrics = speculator.metrics
         elif self.process == "sequential":
             for task_id in process.sequential():
                 self.run_task(task_id)
@@ -811,7 +922,10 @@ Context:
             for task_id in process.hierarchical():
                 if isinstance(task_id, Task):
                     task_id = self.add_task(task_id)
-                self.run_task(task_id)
+                if isinstance(task_id, list):
+                    self._run_task_batch(task_id)
+                else:
+                    self.run_task(task_id)
 
     def get_task_status(self, task_id):
         if task_id in self.tasks:
@@ -992,11 +1106,17 @@ Context:
         
         return False
         
-    def launch(self, path: str = '/agents', port: int = 8000, host: str = '0.0.0.0', debug: bool = False, protocol: str = "http"):
+    def launch(self, path: str = '/agents', port: int = 8000, host: str = '0.0.0.0', debug: bool = False, protocol: str = "http",
+               max_concurrency: Optional[int] = None, max_queue: int = 64, max_sessions: int = 1024,
+               session_ttl: Optional[float] = None):
         """
         Launch all agents as a single API endpoint (HTTP) or an MCP server. 
         In HTTP mode, the endpoint accepts a query and processes it through all agents in sequence.
+        With ``"stream": true`` (or ``?stream=true``) each agent's tokens and tool calls are sent as
+        Server-Sent Events, or newline-delimited JSON for ``Accept: application/x-ndjson``.
         In MCP mode, an MCP server is started, exposing a tool to run the agent workflow.
+        Each MCP client connection gets its own copies of the agents, calls run on a
+        bounded worker pool, and a client disconnecting cancels its calls.
         
         Args:
             path: API endpoint path (default: '/agents') for HTTP, or base path for MCP.
@@ -1004,6 +1124,11 @@ Context:
             host: Server host (default: '0.0.0.0')
             debug: Enable debug mode for uvicorn (default: False)
             protocol: "http" to launch as FastAPI, "mcp" to launch as MCP server.
+            max_concurrency: MCP calls processed at once (default: min(32, CPUs + 4))
+            max_queue: MCP calls allowed to wait for a worker before new ones are
+                rejected (default: 64)
+            max_sessions: MCP client sessions kept in memory (default: 1024)
+            session_ttl: Seconds an idle MCP client session is kept (default: no limit)
             
         Returns:
             None
@@ -1019,15 +1144,18 @@ Context:
             try:
                 import uvicorn
                 from fastapi import FastAPI, HTTPException, Request
-                from fastapi.responses import JSONResponse
+                from fastapi.responses import JSONResponse, StreamingResponse
                 from pydantic import BaseModel
                 import threading
                 import time
                 import asyncio # Ensure asyncio is imported for HTTP mode too
+                from ..agent.serving import format_event, run_streamed
+                from ..streaming import emit_event
                 
                 # Define the request model here since we need pydantic
                 class AgentQuery(BaseModel):
                     query: str
+                    stream: bool = False
                     
             except ImportError as e:
                 # Check which specific module is missing
@@ -1096,15 +1224,42 @@ Context:
                         if "query" not in request_data:
                             raise HTTPException(status_code=400, detail="Missing 'query' field in request")
                         query = request_data["query"]
+                        stream = bool(request_data.get("stream", False))
                     except:
                         # Fallback to form data or query params
                         form_data = await request.form()
                         if "query" in form_data:
                             query = form_data["query"]
+                            stream = str(form_data.get("stream", "")).lower() in ("1", "true")
                         else:
                             raise HTTPException(status_code=400, detail="Missing 'query' field in request")
                 else:
                     query = query_data.query
+                    stream = query_data.stream
+                stream = stream or request.query_params.get("stream", "").lower() in ("1", "true")
+                
+                if stream:
+                    def run_chain(current_input):
+                        results = []
+                        for agent_instance in self.agents:
+                            # Tells the client whose tokens follow
+                            emit_event("agent", name=agent_instance.name)
+                            try:
+                                response = agent_instance.chat(current_input)
+                                results.append({"agent": agent_instance.name, "response": response})
+                                current_input = response
+                            except Exception as e:
+                                logging.error(f"Error with agent {agent_instance.name}: {str(e)}", exc_info=True)
+                                results.append({"agent": agent_instance.name, "error": str(e)})
+                        return {"query": query, "results": results, "final_response": current_input}
+                    
+                    media_type = "application/x-ndjson" if "application/x-ndjson" in request.headers.get("accept", "") else "text/event-stream"
+                    # Starlette stops iterating when the client disconnects, which cancels the agents
+                    return StreamingResponse(
+                        (format_event(event, media_type) async for event in run_streamed(run_chain, query)),
+                        media_type=media_type,
+                        headers={"Cache-Control": "no-cache"}
+                    )
                 
                 try:
                     # Process the query sequentially through all agents
@@ -1233,16 +1388,15 @@ Context:
 
             try:
                 import uvicorn
-                from mcp.server.fastmcp import FastMCP
-                from mcp.server.sse import SseServerTransport
-                from starlette.applications import Starlette
-                from starlette.requests import Request
-                from starlette.routing import Mount, Route
-                # from mcp.server import Server as MCPServer # Not directly needed if using FastMCP's server
+                try:
+                    from mcp.server.fastmcp import Context, FastMCP
+                except ImportError:  # mcp>=2 renamed FastMCP
+                    from mcp.server.mcpserver import Context, MCPServer as FastMCP
+                import starlette
                 import threading
                 import time
                 import inspect
-                import asyncio
+                from ..agent.serving import AgentChain, AgentServer, QueueFullError, answer_mcp_call, mcp_sse_app
                 # logging is already imported at the module level
                 
             except ImportError as e:
@@ -1260,36 +1414,28 @@ Context:
             actual_mcp_tool_name = (f"execute_{self.name.lower().replace(' ', '_').replace('-', '_')}_workflow" if self.name 
                                     else "execute_workflow")
 
+            # Each client connection gets its own copies of the agents; calls share a bounded worker pool
+            server = AgentServer(
+                AgentChain(self.agents), max_concurrency=max_concurrency, max_queue=max_queue,
+                max_sessions=max_sessions, session_ttl=session_ttl
+            )
+
             @mcp_instance.tool(name=actual_mcp_tool_name)
-            async def execute_workflow_tool(query: str) -> str: # Renamed for clarity
+            async def execute_workflow_tool(query: str, ctx: Context) -> str: # Renamed for clarity
                 """Executes the defined agent workflow with the given query."""
                 logging.info(f"MCP tool '{actual_mcp_tool_name}' called with query: {query}")
-                current_input = query
-                final_response = "No agents in workflow or workflow did not produce a final response."
-
-                for agent_instance in self.agents:
-                    try:
-                        logging.debug(f"Processing with agent: {agent_instance.name}")
-                        if hasattr(agent_instance, 'achat') and asyncio.iscoroutinefunction(agent_instance.achat):
-                            response = await agent_instance.achat(current_input, tools=agent_instance.tools)
-                        elif hasattr(agent_instance, 'chat'): # Fallback to sync chat if achat not suitable
-                            loop = asyncio.get_event_loop()
-                            response = await loop.run_in_executor(None, lambda ci=current_input: agent_instance.chat(ci, tools=agent_instance.tools))
-                        else:
-                            logging.warning(f"Agent {agent_instance.name} has no suitable chat or achat method.")
-                            response = f"Error: Agent {agent_instance.name} has no callable chat method."
-                        
-                        current_input = response if response is not None else "Agent returned no response."
-                        final_response = current_input # Keep track of the last valid response
-                        logging.debug(f"Agent {agent_instance.name} responded. Current intermediate output: {current_input}")
-
-                    except Exception as e:
-                        logging.error(f"Error during agent {agent_instance.name} execution in MCP workflow: {str(e)}", exc_info=True)
-                        current_input = f"Error from agent {agent_instance.name}: {str(e)}"
-                        final_response = current_input # Update final response to show error
-                        # Optionally break or continue based on desired error handling for the workflow
-                        # For now, we continue, and the error is passed to the next agent or returned.
-                
+                try:
+                    # The agents run in sequence, each given the previous one's answer
+                    result = await answer_mcp_call(server, query, ctx)
+                except QueueFullError:
+                    logging.warning(f"Rejecting MCP call to '{actual_mcp_tool_name}': server busy")
+                    return "Error: server busy, retry later"
+                for step in result["results"]:
+                    if "error" in step:
+                        logging.error(f"Error during agent {step['agent']} execution in MCP workflow: {step['error']}")
+                final_response = result["final_response"]
+                if final_response is None:
+                    final_response = "Agent returned no response."
                 logging.info(f"MCP tool '{actual_mcp_tool_name}' completed. Final response: {final_response}")
                 return final_response
 
@@ -1299,23 +1445,8 @@ Context:
             if not messages_mcp_path_prefix.endswith('/'):
                 messages_mcp_path_prefix += '/'
 
-            sse_transport_mcp = SseServerTransport(messages_mcp_path_prefix)
-
-            async def handle_mcp_sse_connection(request: Request) -> None:
-                logging.debug(f"MCP SSE connection request from {request.client} for path {request.url.path}")
-                async with sse_transport_mcp.connect_sse(
-                        request.scope, request.receive, request._send,
-                ) as (read_stream, write_stream):
-                    await mcp_instance._mcp_server.run(
-                        read_stream, write_stream, mcp_instance._mcp_server.create_initialization_options(),
-                    )
-            
-            starlette_mcp_app = Starlette(
-                debug=debug,
-                routes=[
-                    Route(sse_mcp_path, endpoint=handle_mcp_sse_connection),
-                    Mount(messages_mcp_path_prefix, app=sse_transport_mcp.handle_post_message),
-                ],
+            starlette_mcp_app = mcp_sse_app(
+                mcp_instance, server, sse_mcp_path, messages_mcp_path_prefix, f"{base_mcp_path}/metrics", debug=debug
             )
 
             print(f"🚀 PraisonAIAgents MCP Workflow server starting on http://{host}:{port}")
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagProbe:
+    """Measures event-loop lag.
+
+    A callback is scheduled every ``interval`` seconds; the difference between
+    when it was due and when it actually ran is the time the loop was blocked.
+
+    Args:
+        interval: Seconds between samples.
+        max_samples: Number of most recent samples kept for percentiles.
+    """
+
+    def __init__(self, interval: float = 0.05, max_samples: int = 2048):
+        self.interval = interval
+        self.max_samples = max_samples
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+        self._total_lag = 0.0
+        self._count = 0
+        self._max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start sampling on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(loop.time() - expected, 0.0))
+
+    def record(self, lag: float) -> None:
+        self._count += 1
+        self._total_lag += lag
+        self._max_lag = max(self._max_lag, lag)
+        self._samples.append(lag)
+
+    def stats(self) -> Dict[str, float]:
+        """Lag statistics in milliseconds"""
+        ordered = sorted(self._samples)
+
+        def pct(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(int(p * len(ordered)), len(ordered) - 1)] * 1000
+
+        return {
+            "samples": self._count,
+            "mean_ms": (self._total_lag / self._count * 1000) if self._count else 0.0,
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+            "max_ms": self._max_lag * 1000,
+        }
+
+
+class AsyncTaskExecutor:
+    """Async-first executor that never runs blocking work on the event loop.
+
+    Coroutines are awaited natively; sync callables are sent to a thread pool
+    owned by the executor. Both share one concurrency limit, and an optional
+    ``LoopLagProbe`` measures how responsive the loop stays while work runs.
+
+    Args:
+        max_concurrency: Maximum tasks in flight at once (None for no limit).
+        max_workers: Size of the thread pool for sync work. Defaults to
+            ``max_concurrency`` or ``min(32, cpu_count + 4)``.
+        probe_interval: Seconds between loop-lag samples, or None to disable.
+
+    Example:
+        async with AsyncTaskExecutor(max_concurrency=4) as executor:
+            await executor.run_sync(agent.chat, "hello")
+            print(executor.probe.stats())
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, max_workers: Optional[int] = None, probe_interval: Optional[float] = 0.05):
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_workers = max_workers or max_concurrency or min(32, (os.cpu_count() or 1) + 4)
+        self.probe = LoopLagProbe(probe_interval) if probe_interval else None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.completed = 0
+
+    async def __aenter__(self) -> "AsyncTaskExecutor":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.shutdown()
+
+    def start(self) -> None:
+        """Create the thread pool and start the lag probe on the running loop"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="praison-task")
+        if self.max_concurrency and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.probe:
+            self.probe.start()
+
+    async def shutdown(self) -> None:
+        """Stop the probe and release the thread pool"""
+        if self.probe:
+            await self.probe.stop()
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.get_running_loop().run_in_executor(None, pool.shutdown, True)
+
+    async def _limited(self, make_awaitable: Callable[[], Awaitable[Any]]) -> Any:
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            return await make_awaitable()
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+            logger.debug(f"Executor job finished in {time.perf_counter() - start:.3f}s ({self.in_flight} in flight)")
+
+    async def run_sync(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking callable in the executor's thread pool"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        return await self._limited(lambda: loop.run_in_executor(self._pool, fn, *args))
+
+    async def run_async(self, coro_fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Await a coroutine function natively under the concurrency limit"""
+        self.start()
+        return await self._limited(lambda: coro_fn(*args))
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Dispatch to run_async or run_sync depending on ``fn``"""
+        if asyncio.iscoroutinefunction(fn):
+            return await self.run_async(fn, *args)
+        return await self.run_sync(fn, *args)
+
+    async def gather(self, calls: List[tuple]) -> List[Any]:
+        """Run ``(fn, *args)`` tuples concurrently and return their results"""
+        return await asyncio.gather(*[self.run(fn, *args) for fn, *args in calls])
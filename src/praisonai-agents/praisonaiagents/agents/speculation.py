@@ -0,0 +1,268 @@
+import copy
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from ..agent.serving import clone_agent
+from ..process.context import estimate_tokens
+
+if TYPE_CHECKING:
+    from ..main import TaskOutput
+    from ..task.task import Task
+    from .agents import PraisonAIAgents
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpeculationConfig:
+    """Settings for speculative execution of decision-task branches.
+
+    Args:
+        max_branches: How many branches to start per decision, most often
+            chosen first.
+        max_seconds: Wall-clock cap per branch. A branch still running when
+            the cap is hit is discarded and the task runs normally.
+        max_tokens: Cap on a branch's estimated prompt + output tokens. A
+            branch whose prompt alone is over the cap is not started, and
+            one whose output takes it over the cap is discarded.
+    """
+    max_branches: int = 2
+    max_seconds: Optional[float] = None
+    max_tokens: Optional[int] = None
+
+
+@dataclass
+class SpeculationMetrics:
+    """Counters comparing speculation cost with the latency it saved"""
+    decisions: int = 0
+    branches_started: int = 0
+    branches_used: int = 0
+    branches_discarded: int = 0
+    branches_over_budget: int = 0
+    used_tokens: int = 0
+    wasted_tokens: int = 0
+    wasted_seconds: float = 0.0
+    latency_saved_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _Branch:
+    def __init__(self, task_id, decision_name: str, agent: Any, prompt_tokens: int = 0):
+        self.task_id = task_id
+        self.decision_name = decision_name
+        self.agent = agent
+        # The branch runs on a copy of the agent, so its chat history stays
+        # out of the real agent's until the branch is adopted
+        self.clone = clone_agent(agent)
+        self.history_len = len(getattr(agent, "chat_history", None) or [])
+        self.prompt_tokens = prompt_tokens
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.decision_finished: Optional[float] = None
+        self.output: Optional["TaskOutput"] = None
+        self.tokens = 0
+        self.discarded = False
+        self.chosen = False
+        self.future = None
+        self.lock = threading.Lock()
+
+
+class BranchSpeculator:
+    """Starts the likely branches of a decision task while the decision runs.
+
+    Branches run on stand-in copies of their tasks (no memory writes, no
+    streaming), each on a copy of its agent, so nothing is visible until the
+    decision picks a branch. The chosen branch's output, and the chat history
+    it added, are adopted when the workflow reaches it; the others are
+    discarded. A discarded branch that is already running cannot be
+    interrupted: it finishes on its copy of the agent, apart from the real
+    run, and its cost is counted as wasted then. Branches do not see the
+    decision's output, so this suits branches that do not depend on it.
+
+    Args:
+        owner: The PraisonAIAgents instance whose tasks are speculated.
+        config: Limits for branch count, time and tokens.
+    """
+
+    def __init__(self, owner: "PraisonAIAgents", config: Optional[SpeculationConfig] = None):
+        self.owner = owner
+        self.config = config or SpeculationConfig()
+        self.metrics = SpeculationMetrics()
+        self._history: Dict[str, Counter] = defaultdict(Counter)
+        self._branches: Dict[Any, _Branch] = {}
+        self._metrics_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(self.config.max_branches, 1), thread_name_prefix="praison-speculate")
+
+    def is_decision(self, task: "Task") -> bool:
+        return task.task_type == "decision" and bool(task.condition)
+
+    def _target_name(self, task: "Task", decision: Optional[str]) -> Optional[str]:
+        targets = task.condition.get(decision, []) if decision else []
+        target = targets[0] if isinstance(targets, list) and targets else targets
+        if not target or target == "exit":
+            return None
+        return target
+
+    def _candidates(self, decision_task: "Task") -> List[Any]:
+        by_name = {t.name: tid for tid, t in self.owner.tasks.items()}
+        seen = self._history[decision_task.name]
+        names = []
+        for decision in decision_task.condition:
+            name = self._target_name(decision_task, decision)
+            if name and name in by_name and name not in names:
+                names.append(name)
+        # Most frequently chosen branches first; stable for ties
+        names.sort(key=lambda n: -seen[n])
+
+        candidates, busy_agents = [], {id(decision_task.agent)}
+        for name in names:
+            tid = by_name[name]
+            agent = self.owner.tasks[tid].agent
+            # Copies of an agent still share its LLM client and tools, so each branch needs its own
+            if agent is None or id(agent) in busy_agents:
+                continue
+            busy_agents.add(id(agent))
+            candidates.append(tid)
+            if len(candidates) >= self.config.max_branches:
+                break
+        return candidates
+
+    def start(self, decision_task: "Task") -> None:
+        """Launch speculative runs for the decision's likely branches"""
+        for tid in self._candidates(decision_task):
+            if tid in self._branches:
+                continue
+            task = self.owner.tasks[tid]
+            prompt_tokens = self._prompt_tokens(task)
+            if self.config.max_tokens and prompt_tokens > self.config.max_tokens:
+                continue
+            branch = _Branch(tid, decision_task.name, task.agent, prompt_tokens)
+            branch.future = self._pool.submit(self._run_branch, branch)
+            self._branches[tid] = branch
+            self.metrics.branches_started += 1
+            logger.debug(f"Speculatively started {task.name} for decision {decision_task.name}")
+
+    @staticmethod
+    def _prompt_tokens(task: "Task") -> int:
+        """Estimated tokens the branch sends: the task, its context and the agent's instructions and history"""
+        parts = [task.description, task.expected_output]
+        for item in task.context or []:
+            result = getattr(item, "result", None)
+            parts.append(getattr(result, "raw", None) if result is not None else item if isinstance(item, str) else None)
+        agent = task.agent
+        parts.extend(getattr(agent, name, None) for name in ("role", "goal", "backstory", "instructions"))
+        parts.extend(message.get("content") for message in getattr(agent, "chat_history", None) or []
+                     if isinstance(message, dict))
+        return sum(estimate_tokens(part) for part in parts if isinstance(part, str))
+
+    def _run_branch(self, branch: _Branch) -> None:
+        shadow = copy.copy(self.owner.tasks[branch.task_id])
+        shadow.agent = branch.clone
+        shadow.memory = None
+        shadow.config = {k: v for k, v in shadow.config.items() if k != "memory_config"}
+        shadow.status = "not started"
+        shadow.result = None
+        try:
+            output = self.owner.execute_task(branch.task_id, task=shadow, stream=False)
+        except Exception as e:
+            logger.debug(f"Speculative run of task {branch.task_id} failed: {e}")
+            output = None
+        with branch.lock:
+            branch.finished = time.perf_counter()
+            branch.output = output
+            if output is not None:
+                branch.tokens = branch.prompt_tokens + estimate_tokens(output.raw)
+            if branch.discarded:
+                # Discarded while running: its cost is only known now
+                self._charge_waste(branch)
+
+    def _charge_waste(self, branch: _Branch) -> None:
+        with self._metrics_lock:
+            self.metrics.wasted_seconds += branch.finished - branch.started
+            self.metrics.wasted_tokens += branch.tokens
+
+    def _discard(self, branch: _Branch, over_budget: bool = False) -> None:
+        with branch.lock:
+            if branch.discarded:
+                return
+            branch.discarded = True
+            with self._metrics_lock:
+                if over_budget:
+                    self.metrics.branches_over_budget += 1
+                else:
+                    self.metrics.branches_discarded += 1
+            # A branch that has not started yet costs nothing; one that is
+            # running is charged by _run_branch when it finishes
+            if not branch.future.cancel() and branch.finished is not None:
+                self._charge_waste(branch)
+        self._branches.pop(branch.task_id, None)
+
+    def resolve(self, decision_task: "Task") -> None:
+        """Keep the branch the decision chose and discard the rest"""
+        self.metrics.decisions += 1
+        decision = None
+        if decision_task.result:
+            pydantic_output = decision_task.result.pydantic
+            if pydantic_output is not None and hasattr(pydantic_output, "decision"):
+                decision = str(pydantic_output.decision).lower()
+            elif decision_task.result.raw:
+                decision = decision_task.result.raw.lower()
+        chosen = self._target_name(decision_task, decision)
+        if chosen:
+            self._history[decision_task.name][chosen] += 1
+
+        now = time.perf_counter()
+        for branch in list(self._branches.values()):
+            if branch.decision_name != decision_task.name:
+                continue
+            if chosen and self.owner.tasks[branch.task_id].name == chosen:
+                branch.chosen = True
+                branch.decision_finished = now
+            else:
+                self._discard(branch)
+
+    def adopt(self, task_id) -> Optional["TaskOutput"]:
+        """Return the chosen branch's output for ``task_id``, waiting if it is still running.
+
+        Returns None when there is no usable speculative result; the caller
+        then runs the task normally.
+        """
+        branch = self._branches.get(task_id)
+        if branch is None or not branch.chosen:
+            return None
+        timeout = None
+        if self.config.max_seconds is not None:
+            timeout = max(self.config.max_seconds - (time.perf_counter() - branch.started), 0)
+        try:
+            branch.future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self._discard(branch, over_budget=True)
+            return None
+        if branch.output is None:
+            self._discard(branch)
+            return None
+        if self.config.max_tokens and branch.tokens > self.config.max_tokens:
+            self._discard(branch, over_budget=True)
+            return None
+
+        self._branches.pop(task_id, None)
+        history = getattr(branch.agent, "chat_history", None)
+        if history is not None:
+            history.extend(branch.clone.chat_history[branch.history_len:])
+        self.metrics.branches_used += 1
+        self.metrics.used_tokens += branch.tokens
+        self.metrics.latency_saved_seconds += min(branch.finished, branch.decision_finished) - branch.started
+        return branch.output
+
+    def shutdown(self) -> None:
+        """Discard branches that were never adopted and stop the worker threads"""
+        for branch in list(self._branches.values()):
+            self._discard(branch)
+        self._pool.shutdown(wait=False, cancel_futures=True)
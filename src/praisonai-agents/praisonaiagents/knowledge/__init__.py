@@ -4,5 +4,6 @@ PraisonAI Knowledge - Advanced knowledge management system with configurable fea
 
 from praisonaiagents.knowledge.knowledge import Knowledge
 from praisonaiagents.knowledge.chunking import Chunking
+from praisonaiagents.knowledge.federated import FederatedKnowledge, KnowledgeSource
 
-__all__ = ["Knowledge", "Chunking"] 
\ No newline at end of file
+__all__ = ["Knowledge", "Chunking", "FederatedKnowledge", "KnowledgeSource"] 
\ No newline at end of file
@@ -1,6 +1,12 @@
-from typing import List, Union, Optional, Dict, Any
+from typing import List, Union, Optional, Dict, Any, Iterable, Iterator, IO
 from functools import cached_property
+import codecs
 import importlib
+import mmap
+import os
+
+from ..process.context import CHARS_PER_TOKEN
+from .registry import freeze, get_embedding_model, get_tokenizer, shared
 
 class Chunking:
     """A unified class for text chunking with various chunking strategies."""
@@ -69,14 +75,10 @@ class Chunking:
         
     @cached_property
     def embedding_model(self):
-        """Lazy load the embedding model."""
+        """Lazy load the embedding model, shared by every chunker of the process."""
         if self._embedding_model is None and self.chunker_type in ['semantic', 'sdpm', 'late']:
-            from chonkie.embeddings import AutoEmbeddings
-            return AutoEmbeddings.get_embeddings("all-MiniLM-L6-v2")
-        elif isinstance(self._embedding_model, str):
-            from chonkie.embeddings import AutoEmbeddings
-            return AutoEmbeddings.get_embeddings(self._embedding_model)
-        return self._embedding_model
+            return get_embedding_model("all-MiniLM-L6-v2")
+        return get_embedding_model(self._embedding_model)
 
     def _get_chunker_params(self) -> Dict[str, Any]:
         """Get the appropriate parameters for the current chunker type."""
@@ -87,9 +89,9 @@ class Chunking:
             params['chunk_overlap'] = self.chunk_overlap
             
         if 'tokenizer_or_token_counter' in allowed_params:
-            params['tokenizer_or_token_counter'] = self.tokenizer_or_token_counter
+            params['tokenizer_or_token_counter'] = get_tokenizer(self.tokenizer_or_token_counter)
         elif 'tokenizer' in allowed_params:
-            params['tokenizer'] = self.tokenizer_or_token_counter
+            params['tokenizer'] = get_tokenizer(self.tokenizer_or_token_counter)
                 
         if 'embedding_model' in allowed_params:
             params['embedding_model'] = self.embedding_model
@@ -103,13 +105,18 @@ class Chunking:
 
     @cached_property
     def chunker(self):
-        """Lazy load the chunker instance."""
+        """Lazy load the chunker instance, shared by every Chunking with the same configuration."""
         if self._chunker is None:
-            chunker_cls = self.SUPPORTED_CHUNKERS[self.chunker_type]
-            common_params = self._get_chunker_params()
-            self._chunker = chunker_cls(**common_params)
+            key = (self.chunker_type, self.chunk_size, self.chunk_overlap,
+                   freeze(self.tokenizer_or_token_counter), freeze(self._embedding_model), freeze(self.kwargs))
+            self._chunker = shared('chunker', key, self._create_chunker)
         
         return self._chunker
+
+    def _create_chunker(self):
+        chunker_cls = self.SUPPORTED_CHUNKERS[self.chunker_type]
+        common_params = self._get_chunker_params()
+        return chunker_cls(**common_params)
     
     # NOTE: OverlapRefinery is not supported, disabled for now
     # As soon as Chonkie is updated to support it, we can re-enable it! 
@@ -177,6 +184,111 @@ class Chunking:
                 
         return chunks
     
+    def iter_chunks(
+        self,
+        source: Union[str, "os.PathLike", IO, Iterable[str]],
+        window_size: Optional[int] = None,
+        encoding: str = 'utf-8'
+    ) -> Iterator[Any]:
+        """Chunk a document of any size lazily, a window at a time.
+
+        Args:
+            source: A file path (memory-mapped), a text or binary file
+                object, or an iterable of text pieces
+            window_size: Characters handed to the chunker at once. Defaults
+                to 16 chunks' worth.
+            encoding: Encoding of paths and binary streams
+
+        Yields:
+            Chunks as produced by ``chunk``. The last chunk of each window
+            may be cut by the window boundary, so it is not yielded but
+            chunked again together with the next window; overlap between
+            chunks is therefore kept across windows. Start and end indexes
+            are relative to the whole document.
+        """
+        window_size = window_size or 16 * self.chunk_size * CHARS_PER_TOKEN
+        carry, offset = "", 0
+        windows = self._iter_windows(source, window_size, encoding)
+        window = next(windows, None)
+        while window is not None:
+            following = next(windows, None)
+            final = following is None
+            text = carry + window
+            chunks = list(self.chunk(text))
+            if not final and len(chunks) > 1:
+                last_start = self._chunk_start(chunks[-1], text)
+                chunks.pop()
+            elif not final:
+                last_start = 0  # one chunk so far: wait for more text
+                chunks = []
+            for chunk in chunks:
+                yield self._shift(chunk, offset)
+            if final:
+                return
+            carry, offset = text[last_start:], offset + last_start
+            window = following
+
+    @staticmethod
+    def _iter_windows(source: Any, window_size: int, encoding: str) -> Iterator[str]:
+        """Text of ``source`` in pieces of about ``window_size`` characters"""
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+                    for position in range(0, len(mapped), window_size):
+                        final = position + window_size >= len(mapped)
+                        text = decoder.decode(mapped[position:position + window_size], final=final)
+                        if text:
+                            yield text
+            return
+        if hasattr(source, 'read'):
+            decoder = None
+            while True:
+                block = source.read(window_size)
+                if not block:
+                    if decoder is not None:
+                        tail = decoder.decode(b'', final=True)
+                        if tail:
+                            yield tail
+                    return
+                if isinstance(block, bytes):
+                    decoder = decoder or codecs.getincrementaldecoder(encoding)(errors='replace')
+                    block = decoder.decode(block)
+                if block:
+                    yield block
+        pieces: List[str] = []
+        size = 0
+        for piece in source:
+            pieces.append(piece)
+            size += len(piece)
+            if size >= window_size:
+                yield "".join(pieces)
+                pieces, size = [], 0
+        if pieces:
+            yield "".join(pieces)
+
+    @staticmethod
+    def _chunk_start(chunk: Any, text: str) -> int:
+        start = getattr(chunk, 'start_index', None)
+        if isinstance(start, int):
+            return start
+        # Chunkers returning plain strings: the last occurrence is the last chunk
+        return max(text.rfind(str(chunk)), 0)
+
+    @staticmethod
+    def _shift(chunk: Any, offset: int) -> Any:
+        if offset:
+            for attribute in ('start_index', 'end_index'):
+                value = getattr(chunk, attribute, None)
+                if isinstance(value, int):
+                    try:
+                        setattr(chunk, attribute, value + offset)
+                    except AttributeError:
+                        break
+        return chunk
+
     def __call__(
         self,
         text: Union[str, List[str]],
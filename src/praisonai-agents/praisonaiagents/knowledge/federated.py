@@ -0,0 +1,218 @@
+"""
+Federated search over several Knowledge collections.
+
+An agent with several knowledge sources can keep each in its own collection
+(or store) and search them together. ``FederatedKnowledge`` queries every
+source at once on a thread pool and merges what comes back:
+
+1. timeouts: each source has a deadline (``timeout`` seconds from the start
+   of the search). A source that misses it is left out of this turn's
+   results; while its search is still running, later searches skip it
+   instead of piling more threads onto it
+2. normalization: a source's scores are min-max scaled to 0..1 (1 for its
+   best result), flipped for stores whose mem0 scores are distances, and
+   multiplied by the source's ``weight``. Results without scores are scored
+   by rank
+3. merge: the ``limit`` best results over all sources are taken with a heap
+
+Each merged result keeps its store score as ``raw_score`` and names its
+source in ``collection``. ``search`` also reports, per source, whether it
+answered (``ok``), timed out, failed or was skipped as ``busy``.
+"""
+
+import heapq
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .knowledge import DEFAULT_CONTEXT_BUDGET, Knowledge
+from .packing import PackedContext, pack_results
+
+logger = logging.getLogger(__name__)
+
+# Seconds a source may take before the search goes on without it
+DEFAULT_SOURCE_TIMEOUT = 5.0
+
+# Results kept after merging, unless configured
+DEFAULT_FEDERATED_LIMIT = 20
+
+# mem0 vector stores whose search scores are distances (lower is better)
+DISTANCE_PROVIDERS = ("chroma", "pgvector")
+
+
+@dataclass
+class KnowledgeSource:
+    """One collection searched by ``FederatedKnowledge``.
+
+    Args:
+        knowledge: The ``Knowledge`` (or anything with a compatible ``search``).
+        name: Reported in results as ``collection``.
+        timeout: Seconds this source may take; the federation's default if None.
+        weight: Multiplies the source's normalized scores.
+        filters: ``user_id``/``agent_id``/``run_id`` always used for this
+            source, in place of those of the search call.
+        lower_is_better: Whether the store's scores are distances; inferred
+            from a Knowledge's vector store provider if None, otherwise
+            scores are taken as similarities.
+    """
+    knowledge: Any
+    name: Optional[str] = None
+    timeout: Optional[float] = None
+    weight: float = 1.0
+    filters: Optional[Dict[str, Any]] = None
+    lower_is_better: Optional[bool] = None
+
+    def __post_init__(self):
+        if self.lower_is_better is None:
+            self.lower_is_better = _reports_distances(self.knowledge)
+
+
+def _reports_distances(knowledge: Any) -> bool:
+    if not isinstance(knowledge, Knowledge):
+        return False
+    config = knowledge._config or {}
+    vector_store = config.get('vector_store', {})
+    if vector_store.get('config', {}).get('quantization'):
+        return False  # the quantized store scores by cosine similarity
+    return vector_store.get('provider', 'chroma') in DISTANCE_PROVIDERS
+
+
+def _collection_name(knowledge: Any) -> Optional[str]:
+    config = getattr(knowledge, '_config', None) or {}
+    return config.get('vector_store', {}).get('config', {}).get('collection_name')
+
+
+def normalize_scores(results: List[Dict[str, Any]], lower_is_better: bool = False,
+                     weight: float = 1.0) -> List[float]:
+    """Scores of ``results`` scaled to 0..``weight``, best highest; by rank where scores are missing"""
+    raw = [r.get('score') if isinstance(r, dict) else None for r in results]
+    if not raw:
+        return []
+    if any(not isinstance(score, (int, float)) for score in raw):
+        return [weight * (1.0 - rank / len(raw)) for rank in range(len(raw))]
+    low, high = min(raw), max(raw)
+    if high == low:
+        return [weight] * len(raw)
+    scaled = [(score - low) / (high - low) for score in raw]
+    return [weight * ((1.0 - s) if lower_is_better else s) for s in scaled]
+
+
+class FederatedKnowledge:
+    """Searches several Knowledge collections concurrently and merges the results.
+
+    Has the ``search`` and ``pack`` methods of ``Knowledge``, so an agent can
+    use it in place of a single collection.
+
+    Args:
+        sources: ``Knowledge`` objects or ``KnowledgeSource`` entries, or a
+            dict naming them.
+        timeout: Default seconds per source.
+        limit: Results kept after merging.
+        token_budget: Default budget for ``pack``; None for no limit.
+        max_workers: Threads running source searches; two per source by default.
+    """
+
+    def __init__(self, sources: Union[Sequence[Any], Dict[str, Any]], timeout: float = DEFAULT_SOURCE_TIMEOUT,
+                 limit: int = DEFAULT_FEDERATED_LIMIT, token_budget: Optional[int] = DEFAULT_CONTEXT_BUDGET,
+                 max_workers: Optional[int] = None):
+        items = sources.items() if isinstance(sources, dict) else ((None, source) for source in sources)
+        self.sources: List[KnowledgeSource] = []
+        for name, source in items:
+            if not isinstance(source, KnowledgeSource):
+                source = KnowledgeSource(source)
+            source.name = name or source.name or _collection_name(source.knowledge) or f"knowledge_{len(self.sources)}"
+            self.sources.append(source)
+        names = [source.name for source in self.sources]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Knowledge source names must be unique: {names}")
+        self.timeout = timeout
+        self.limit = limit
+        self.token_budget = token_budget
+        # Searches that outlived their timeout and are still running, by source name
+        self._running: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or max(4, 2 * len(self.sources)),
+                                            thread_name_prefix="knowledge-search")
+        # Stop the threads when the federation is dropped (e.g. with its agent) or at exit
+        self._finalizer = weakref.finalize(self, self._executor.shutdown, wait=False)
+
+    def _search_source(self, source: KnowledgeSource, query: str, filters: Dict[str, Any], kwargs: Dict[str, Any]):
+        scope = source.filters if source.filters is not None else filters
+        results = source.knowledge.search(query, **scope, **kwargs)
+        return results.get('results', []) if isinstance(results, dict) else list(results or [])
+
+    def search(self, query, user_id=None, agent_id=None, run_id=None, limit=None, timeout=None, **kwargs):
+        """Search every source at once and merge the best results.
+
+        Args:
+            query: The search query string
+            user_id, agent_id, run_id: Scope of the search, for sources
+                without their own ``filters``
+            limit: Results to keep; defaults to the federation's ``limit``
+            timeout: Seconds per source, overriding the sources' own and the
+                federation's default
+            **kwargs: Passed to every source's ``search``, with ``limit``
+
+        Returns:
+            ``{"results": [...], "sources": {name: {"status", "seconds", "results"}}}``
+        """
+        filters = {k: v for k, v in (('user_id', user_id), ('agent_id', agent_id), ('run_id', run_id)) if v}
+        limit = limit or self.limit
+        kwargs['limit'] = limit  # no source needs to return more
+        started = time.perf_counter()
+        report: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        with self._lock:
+            for order, source in enumerate(self.sources):
+                running = self._running.get(source.name)
+                if running is not None and not running.done():
+                    report[source.name] = {'status': 'busy', 'seconds': 0.0, 'results': 0}
+                    continue
+                self._running.pop(source.name, None)
+                future = self._executor.submit(self._search_source, source, query, filters, kwargs)
+                deadline = started + (timeout if timeout is not None else
+                                      source.timeout if source.timeout is not None else self.timeout)
+                pending.append((deadline, order, source, future))
+
+        candidates = []
+        for deadline, order, source, future in sorted(pending, key=lambda entry: entry[:2]):
+            try:
+                results = future.result(timeout=max(deadline - time.perf_counter(), 0))
+            except FutureTimeoutError:
+                with self._lock:
+                    self._running[source.name] = future
+                logger.warning(f"Knowledge source {source.name} timed out; searching without it")
+                report[source.name] = {'status': 'timeout', 'seconds': time.perf_counter() - started, 'results': 0}
+                continue
+            except Exception as e:
+                logger.error(f"Error searching knowledge source {source.name}: {e}")
+                report[source.name] = {'status': 'error', 'seconds': time.perf_counter() - started, 'results': 0,
+                                       'error': str(e)}
+                continue
+            report[source.name] = {'status': 'ok', 'seconds': time.perf_counter() - started, 'results': len(results)}
+            scores = normalize_scores(results, source.lower_is_better, source.weight)
+            for rank, (result, score) in enumerate(zip(results, scores)):
+                candidates.append((score, -order, -rank, result, source.name))
+
+        merged = []
+        for score, _, _, result, name in heapq.nlargest(limit, candidates, key=lambda c: c[:3]):
+            item = dict(result) if isinstance(result, dict) else {'memory': str(result)}
+            item['raw_score'] = item.get('score')
+            item['score'] = score
+            item['collection'] = name
+            merged.append(item)
+        return {'results': merged, 'sources': report}
+
+    def pack(self, search_results, token_budget=None) -> PackedContext:
+        """Pack merged search results into prompt context, like ``Knowledge.pack``"""
+        if token_budget is None:
+            token_budget = self.token_budget
+        return pack_results(search_results, token_budget)
+
+    def close(self) -> None:
+        """Stop the search threads, without waiting for timed-out searches"""
+        self._finalizer()
@@ -0,0 +1,339 @@
+"""
+Staged, parallel ingestion of many files into Knowledge.
+
+    paths -> convert (process pool) -> chunk (threads) -> store (threads, batched)
+
+Each arrow is a bounded queue, so a slow stage holds back the ones before it
+instead of letting converted text or chunks pile up in memory. Documents
+(PDF, Office, media) are converted with MarkItDown on a process pool; text
+files are streamed section by section by the chunking threads. Files the
+manifest shows unchanged are skipped before any conversion.
+"""
+
+import glob
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
+from .manifest import ChunkPlan
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+_markitdown = None
+
+
+@dataclass
+class FileJob:
+    """A file on its way through Knowledge.add: its chunks and what the manifest knows of it"""
+    path: str
+    file_ext: str
+    metadata: Dict[str, Any]
+    manifest_key: Optional[str] = None
+    entry: Optional[Dict[str, Any]] = None
+    stat: Optional[os.stat_result] = None
+    digest: Optional[str] = None
+    plan: Optional[ChunkPlan] = None
+    chunks: int = 0
+    failed: int = 0
+    pending: int = 0
+    sealed: bool = False
+    error: bool = False
+
+
+@dataclass
+class IngestStats:
+    """Throughput and outcome of one ingestion run"""
+    documents: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def docs_per_sec(self) -> float:
+        return self.documents / self.seconds if self.seconds else 0.0
+
+    @property
+    def chunks_per_sec(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "skipped": self.skipped,
+            "chunks": self.chunks,
+            "failed": dict(self.failed),
+            "seconds": self.seconds,
+            "docs_per_sec": self.docs_per_sec,
+            "chunks_per_sec": self.chunks_per_sec,
+        }
+
+    def __str__(self) -> str:
+        return (f"Ingested {self.documents} documents ({self.chunks} chunks) in {self.seconds:.2f}s: "
+                f"{self.docs_per_sec:.1f} docs/sec, {self.chunks_per_sec:.1f} chunks/sec; "
+                f"{self.skipped} unchanged, {len(self.failed)} failed")
+
+
+def expand_inputs(inputs: Sequence[Any], extensions: Tuple[str, ...]) -> List[Any]:
+    """Replace directories and glob patterns by the files they contain.
+
+    Directories and patterns only contribute files with one of
+    ``extensions``. A pattern matching no file, and anything else, is kept
+    as it is.
+    """
+    expanded = []
+    for item in inputs:
+        if not isinstance(item, str):
+            expanded.append(item)
+        elif os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                expanded.extend(os.path.join(root, name) for name in sorted(files)
+                                if name.lower().endswith(extensions))
+        elif '\n' not in item and glob.has_magic(item):
+            matches = sorted(path for path in glob.glob(item, recursive=True) if os.path.isfile(path))
+            if matches:
+                expanded.extend(path for path in matches if path.lower().endswith(extensions))
+            else:
+                expanded.append(item)
+        else:
+            expanded.append(item)
+    return expanded
+
+
+def convert_document(path: str) -> str:
+    """Convert a document to text with MarkItDown; runs in a worker process"""
+    global _markitdown
+    if _markitdown is None:
+        try:
+            from markitdown import MarkItDown
+        except ImportError:
+            raise ImportError(
+                "Required packages not installed. Please install using: "
+                'pip install "praisonaiagents[knowledge]"'
+            )
+        _markitdown = MarkItDown()
+    return _markitdown.convert(path).text_content
+
+
+class IngestionPipeline:
+    """Adds files to a Knowledge instance through parallel stages.
+
+    Args:
+        knowledge: The Knowledge instance to store into.
+        processes: Conversion processes; 0 converts in threads. Defaults to
+            the CPU count, capped at the number of documents to convert.
+        chunk_workers: Chunking threads.
+        write_workers: Storing threads.
+        batch_size: Chunks per write batch.
+        queue_size: Files waiting between conversion and chunking; the chunk
+            queue holds two batches per writer.
+    """
+
+    def __init__(self, knowledge: Any, processes: Optional[int] = None, chunk_workers: int = 4,
+                 write_workers: int = 4, batch_size: int = 32, queue_size: int = 64):
+        self.knowledge = knowledge
+        self.processes = processes
+        self.chunk_workers = max(1, chunk_workers)
+        self.write_workers = max(1, write_workers)
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        # Reentrant: a write that completes a file finishes it under the same lock
+        self._lock = threading.RLock()
+
+    def run(self, inputs: Union[Any, Sequence[Any]], user_id=None, agent_id=None, run_id=None,
+            metadata=None) -> Dict[str, Any]:
+        """Add ``inputs`` and return ``{'results', 'relations', 'stats'}``"""
+        from .knowledge import SUPPORTED_EXTENSIONS
+        from ..process_pool import ProcessPool
+
+        knowledge = self.knowledge
+        self._scope = dict(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        self._metadata = metadata
+        self._results: List[Dict[str, Any]] = []
+        self.stats = IngestStats()
+        start = time.perf_counter()
+
+        items = expand_inputs(inputs if isinstance(inputs, (list, tuple)) else [inputs], SUPPORTED_EXTENSIONS)
+        files = [item for item in items if knowledge._is_supported_file(item)]
+        # Raw text and URLs are handled one by one as before
+        for item in items:
+            if not knowledge._is_supported_file(item):
+                try:
+                    result = knowledge._process_single_input(item, metadata=metadata, **self._scope)
+                    self._results.extend(result.get('results', []))
+                except Exception as e:
+                    self.stats.failed[str(item)] = str(e)
+
+        conversions = sum(knowledge._needs_conversion(path) for path in files)
+        processes = self.processes
+        if processes is None:
+            processes = min(os.cpu_count() or 1, conversions)
+        if files:
+            self._resolve(knowledge, convert_locally=not processes and conversions)
+        # Started before any thread so the workers fork from a quiet process
+        self._pool = ProcessPool(max_workers=processes, preload=("markitdown",)) if processes and conversions else None
+        if self._pool is not None:
+            self._pool.start()
+
+        self._paths: "queue.Queue" = queue.Queue(self.queue_size)
+        self._converted: "queue.Queue" = queue.Queue(self.queue_size)
+        self._chunks: "queue.Queue" = queue.Queue(2 * self.batch_size * self.write_workers)
+        self._progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            transient=True
+        )
+        convert_workers = self._pool.max_workers if self._pool is not None else self.chunk_workers
+        try:
+            with self._progress:
+                self._task = self._progress.add_task(f"Adding {len(files)} files to Knowledge", total=len(files))
+                stages = [
+                    (self._paths, self._start(self._convert_worker, convert_workers, "convert")),
+                    (self._converted, self._start(self._chunk_worker, self.chunk_workers, "chunk")),
+                    (self._chunks, self._start(self._write_worker, self.write_workers, "write")),
+                ]
+                for path in files:
+                    self._paths.put(path)
+                # Each stage is drained before the next is told to stop
+                for inbox, threads in stages:
+                    for _ in threads:
+                        inbox.put(_DONE)
+                    for thread in threads:
+                        thread.join()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+            if knowledge.manifest is not None:
+                knowledge.manifest.save()
+
+        self.stats.seconds = time.perf_counter() - start
+        knowledge._log(str(self.stats), level=1)
+        return {'results': self._results, 'relations': [], 'stats': self.stats.to_dict()}
+
+    @staticmethod
+    def _resolve(knowledge, convert_locally: bool) -> None:
+        """Build the Knowledge parts the stage threads share before any thread starts.
+
+        They are cached_properties, which are not locked on Python 3.12+:
+        threads reading one first at the same time could each build it, and
+        records written to a duplicate manifest would be lost. A part that
+        fails to build is left to fail in the stage that uses it.
+        """
+        parts = ['manifest', 'chunker', 'writer', '_collection_key'] + (['markdown'] if convert_locally else [])
+        for name in parts:
+            try:
+                getattr(knowledge, name)
+            except Exception as e:
+                logger.debug(f"Could not prepare Knowledge.{name} for ingestion: {e}")
+
+    @staticmethod
+    def _start(target, count: int, name: str) -> List[threading.Thread]:
+        threads = [threading.Thread(target=target, name=f"praisonai-ingest-{name}-{i}", daemon=True)
+                   for i in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _fail(self, path: str, error: Exception) -> None:
+        logger.error(f"Error processing input {path}: {str(error)}")
+        with self._lock:
+            self.stats.failed[path] = str(error)
+        self._progress.advance(self._task)
+
+    def _convert_worker(self) -> None:
+        knowledge = self.knowledge
+        while (path := self._paths.get()) is not _DONE:
+            try:
+                job = knowledge._open_file(path, metadata=self._metadata, **self._scope)
+                if job is None:
+                    with self._lock:
+                        self.stats.skipped += 1
+                    self._progress.advance(self._task)
+                    continue
+                content = None
+                if knowledge._needs_conversion(path):
+                    if self._pool is not None:
+                        content = self._pool.run(convert_document, path)
+                    else:
+                        content = knowledge._read(job)
+            except Exception as e:
+                self._fail(path, e)
+                continue
+            # Text files are read while they are chunked
+            self._converted.put((job, content))
+
+    def _chunk_worker(self) -> None:
+        knowledge = self.knowledge
+        while (item := self._converted.get()) is not _DONE:
+            job, content = item
+            try:
+                for text in knowledge._iter_memories(job, content):
+                    store, digest = knowledge._plan_chunk(job, text)
+                    if store:
+                        with self._lock:
+                            job.pending += 1
+                        self._chunks.put((job, text, digest, knowledge._chunk_metadata(job)))
+                knowledge._seal(job)
+            except Exception as e:
+                self._fail(job.path, e)
+                # Chunks already queued are still stored; the file is retried next time
+                job.error = True
+                job.failed += 1
+            with self._lock:
+                job.sealed = True
+                if job.pending == 0:
+                    self._done(job)
+
+    def _write_worker(self) -> None:
+        while True:
+            item = self._chunks.get()
+            if item is _DONE:
+                return
+            batch, last = [item], False
+            # Take whatever else is waiting, up to a full batch
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._chunks.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    last = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if last:
+                return
+
+    def _write(self, batch: List[Tuple[FileJob, str, Optional[str], Dict[str, Any]]]) -> None:
+        try:
+            stored = self.knowledge._store_batch([(text, metadata) for _, text, _, metadata in batch], **self._scope)
+        except Exception as e:
+            logger.error(f"Error storing a batch of {len(batch)} chunks: {str(e)}")
+            stored = [[] for _ in batch]
+        with self._lock:
+            for (job, _, digest, _), results in zip(batch, stored):
+                self._results.extend(results)
+                self.knowledge._stored(job, digest, results)
+                if results:
+                    self.stats.chunks += 1
+                job.pending -= 1
+                if job.pending == 0 and job.sealed:
+                    self._done(job)
+
+    def _done(self, job: FileJob) -> None:
+        with self._lock:
+            self.knowledge._finish(job, save=False)
+            if job.error:
+                return  # already reported as failed
+            self.stats.documents += 1
+        self._progress.advance(self._task)
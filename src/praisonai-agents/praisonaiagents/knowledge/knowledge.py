@@ -1,13 +1,39 @@
+import io
 import os
 import logging
 import uuid
 import time
-from .chunking import Chunking
+from ..process.context import CHARS_PER_TOKEN
+from .ingest import FileJob, IngestionPipeline, expand_inputs
+from .manifest import ChunkPlan, Manifest, chunk_digest, file_digest
+from .packing import pack_results
+from .readers import STRUCTURED_EXTENSIONS, iter_sections
+from .registry import DEFAULT_CHUNKING, freeze, get_chunking, shared
+from .search_cache import SearchCache, bump_version
+from .writer import VectorStoreWriter
 from functools import cached_property
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
 logger = logging.getLogger(__name__)
 
+# Define supported file extensions
+DOCUMENT_EXTENSIONS = {
+    'document': ('.pdf', '.ppt', '.pptx', '.doc', '.docx', '.xls', '.xlsx'),
+    'media': ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.mp3', '.wav', '.ogg', '.m4a'),
+    'text': ('.txt', '.csv', '.json', '.xml', '.md', '.html', '.htm'),
+    'archive': ('.zip',)
+}
+SUPPORTED_EXTENSIONS = tuple(ext for exts in DOCUMENT_EXTENSIONS.values() for ext in exts)
+
+# Tokens of knowledge appended to a prompt, unless configured
+DEFAULT_CONTEXT_BUDGET = 2048
+
+# Chunks of a single file stored together
+STORE_BATCH_SIZE = 32
+
+# Vector store options read by Knowledge itself, not passed to mem0
+LOCAL_STORE_OPTIONS = ("quantization", "oversample")
+
 class CustomMemory:
     @classmethod
     def from_config(cls, config):
@@ -125,9 +151,9 @@ class Knowledge:
             
                 if "config" in self._config["vector_store"]:
                     config_copy = self._config["vector_store"]["config"].copy()
-                    # Only exclude client as it's managed internally
-                    if "client" in config_copy:
-                        del config_copy["client"]
+                    # Exclude client as it's managed internally, and the quantized store's options
+                    for key in ("client",) + LOCAL_STORE_OPTIONS:
+                        config_copy.pop(key, None)
                     base_config["vector_store"]["config"].update(config_copy)
             
             # Merge embedder config if provided
@@ -150,7 +176,7 @@ class Knowledge:
     @cached_property
     def memory(self):
         try:
-            return CustomMemory.from_config(self.config)
+            memory = CustomMemory.from_config(self.config)
         except (NotImplementedError, ValueError) as e:
             if "list_collections" in str(e) or "Extra fields not allowed" in str(e):
                 # Keep only allowed fields
@@ -160,8 +186,91 @@ class Knowledge:
                 }
                 self.config["vector_store"]["config"] = vector_store_config
                 from mem0 import Memory
-                return Memory.from_config(self.config)
-            raise
+                memory = Memory.from_config(self.config)
+            else:
+                raise
+        if self.quantized_store is not None:
+            memory.vector_store = self.quantized_store
+        return memory
+
+    @cached_property
+    def quantized_store(self):
+        """Local quantized vector store replacing mem0's, or None.
+
+        Enabled with ``"quantization": "int8"`` or ``"binary"`` (and
+        optionally ``"oversample"``) in the ``vector_store`` config. Vectors
+        are kept under ``<path>/vectors/<collection_name>``; instances on the
+        same collection share the store.
+        """
+        store_config = (self._config or {}).get("vector_store", {}).get("config", {})
+        quantization = store_config.get("quantization")
+        if not quantization:
+            return None
+        from .vector_store import QuantizedVectorStore
+        collection = store_config.get("collection_name") or self.config["vector_store"]["config"]["collection_name"]
+        path = os.path.join(store_config.get("path") or ".praison", "vectors")
+        oversample = store_config.get("oversample")
+        return shared('vector_store', (os.path.abspath(path), collection, quantization, oversample),
+                      lambda: QuantizedVectorStore(collection, path, quantization, oversample))
+
+    @cached_property
+    def writer(self):
+        """Writer inserting file chunks straight into the vector store, or None.
+
+        Used when the memory is a mem0 ``Memory``; disabled with
+        ``{"direct_writes": False}`` to store chunks through ``Memory.add``.
+        """
+        if not (self._config or {}).get("direct_writes", True) or not VectorStoreWriter.supports(self.memory):
+            return None
+        return VectorStoreWriter(self.memory)
+
+    @cached_property
+    def manifest(self):
+        """Files indexed into the configured collection, or None.
+
+        Only kept for a collection named in the config: the default one is
+        new for every instance. Disabled with ``{"manifest": False}``.
+        """
+        config = self._config or {}
+        store_config = config.get("vector_store", {}).get("config", {})
+        if not config.get("manifest", True) or not store_config.get("collection_name"):
+            return None
+        path = os.path.join(store_config.get("path") or ".praison", "manifests",
+                            f"{store_config['collection_name']}.json")
+        return Manifest(path)
+
+    @cached_property
+    def _collection_key(self):
+        """Identity of the collection, whose version guards cached search results"""
+        vector_store = (self._config or {}).get("vector_store", {})
+        store_config = {k: v for k, v in vector_store.get("config", {}).items() if k != "client"}
+        if not store_config.get("collection_name"):
+            return ("instance", id(self))  # a new collection for every instance
+        return (vector_store.get("provider", "chroma"), freeze(store_config))
+
+    @cached_property
+    def search_cache(self):
+        """Cache of search results, or None.
+
+        Configured with ``{"search_cache": {"max_size": 256, "ttl": 300}}``
+        and disabled with ``{"search_cache": False}``. Instances on the same
+        named collection share it.
+        """
+        config = self._config or {}
+        options = config.get("search_cache", {})
+        if options is False:
+            return None
+        options = options if isinstance(options, dict) else {}
+        max_size, ttl = options.get("max_size", 256), options.get("ttl", 300.0)
+        collection = self._collection_key
+        if collection[0] == "instance":
+            return SearchCache(collection, max_size, ttl)
+        key = (collection, freeze(config.get("embedder")), freeze(config.get("reranker")), max_size, ttl)
+        return shared('search_cache', key, lambda: SearchCache(collection, max_size, ttl))
+
+    def _changed(self):
+        """Invalidate the cached search results of the collection after a write"""
+        bump_version(self._collection_key)
 
     @cached_property
     def markdown(self):
@@ -169,11 +278,8 @@ class Knowledge:
 
     @cached_property
     def chunker(self):
-        return Chunking(
-            chunker_type='recursive',
-            chunk_size=512,
-            chunk_overlap=50
-        )
+        # Shared process-wide: the tokenizer is loaded once, not per instance
+        return get_chunking(**DEFAULT_CHUNKING)
 
     def _log(self, message, level=2):
         """Internal logging helper"""
@@ -208,6 +314,8 @@ class Knowledge:
                     result = self.memory.add(content, user_id=user_id, agent_id=agent_id, run_id=run_id, metadata=metadata)
                 else:
                     raise
+            finally:
+                self._changed()
             self._log(f"Store operation result: {result}")
             return result
         except Exception as e:
@@ -222,7 +330,7 @@ class Knowledge:
         """Retrieve a specific memory by ID."""
         return self.memory.get(memory_id)
 
-    def search(self, query, user_id=None, agent_id=None, run_id=None, rerank=None, **kwargs):
+    def search(self, query, user_id=None, agent_id=None, run_id=None, rerank=None, cache=True, **kwargs):
         """Search for memories related to a query.
         
         Args:
@@ -231,6 +339,7 @@ class Knowledge:
             agent_id: Optional agent ID for agent-specific search  
             run_id: Optional run ID for run-specific search
             rerank: Whether to use Mem0's advanced reranking. If None, uses config default
+            cache: Whether to answer from, and fill, the search result cache
             **kwargs: Additional search parameters to pass to Mem0 (keyword_search, filter_memories, etc.)
         
         Returns:
@@ -239,12 +348,43 @@ class Knowledge:
         # Use config default if rerank not explicitly specified
         if rerank is None:
             rerank = self.config.get("reranker", {}).get("default_rerank", False)
-        
-        return self.memory.search(query, user_id=user_id, agent_id=agent_id, run_id=run_id, rerank=rerank, **kwargs)
+
+        search_cache = self.search_cache if cache else None
+        if search_cache is not None:
+            key = (query, user_id, agent_id, run_id, rerank, freeze(kwargs))
+            # Taken before searching: results of a search overlapping a write are not kept
+            version = search_cache.version
+            found, results = search_cache.get(key)
+            if found:
+                return results
+
+        results = self.memory.search(query, user_id=user_id, agent_id=agent_id, run_id=run_id, rerank=rerank, **kwargs)
+        if search_cache is not None:
+            search_cache.put(key, results, version)
+        return results
+
+    def pack(self, search_results, token_budget=None):
+        """Pack search results into prompt context within a token budget.
+
+        Args:
+            search_results: What ``search`` returned
+            token_budget: Tokens the context may take. Defaults to the
+                ``{"context": {"token_budget": ...}}`` config, 2048 tokens.
+                None in the config means no limit.
+
+        Returns:
+            PackedContext with the text and the tokens it saved
+        """
+        if token_budget is None:
+            token_budget = ((self._config or {}).get("context") or {}).get("token_budget", DEFAULT_CONTEXT_BUDGET)
+        return pack_results(search_results, token_budget)
 
     def update(self, memory_id, data):
         """Update a memory."""
-        return self.memory.update(memory_id, data)
+        try:
+            return self.memory.update(memory_id, data)
+        finally:
+            self._changed()
 
     def history(self, memory_id):
         """Get the history of changes for a memory."""
@@ -252,15 +392,30 @@ class Knowledge:
 
     def delete(self, memory_id):
         """Delete a memory."""
-        self.memory.delete(memory_id)
+        try:
+            self.memory.delete(memory_id)
+        finally:
+            self._changed()
 
     def delete_all(self, user_id=None, agent_id=None, run_id=None):
         """Delete all memories."""
-        self.memory.delete_all(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        try:
+            self.memory.delete_all(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        finally:
+            self._changed()
+        if self.manifest is not None:
+            self.manifest.forget(user_id=user_id, agent_id=agent_id, run_id=run_id)
+            self.manifest.save()
 
     def reset(self):
         """Reset all memories."""
-        self.memory.reset()
+        try:
+            self.memory.reset()
+        finally:
+            self._changed()
+        if self.manifest is not None:
+            self.manifest.clear()
+            self.manifest.save()
 
     def normalize_content(self, content):
         """Normalize content for consistent storage."""
@@ -269,76 +424,206 @@ class Knowledge:
 
     def add(self, file_path, user_id=None, agent_id=None, run_id=None, metadata=None):
         """Read file content and store it in memory.
+
+        With a named collection, files recorded in the manifest as unchanged
+        (same mtime and size, or same content) are skipped, and for changed
+        files only the chunks that differ are stored or deleted. Lists,
+        directories and glob patterns go through the parallel ingestion
+        pipeline (see ``ingest``).
         
         Args:
             file_path: Can be:
                 - A string path to local file
                 - A URL string
+                - A directory or glob pattern
                 - A list containing file paths and/or URLs
         """
-        if isinstance(file_path, (list, tuple)):
-            results = []
-            for path in file_path:
-                result = self._process_single_input(path, user_id, agent_id, run_id, metadata)
-                results.extend(result.get('results', []))
-            return {'results': results, 'relations': []}
+        if isinstance(file_path, (list, tuple)) or (isinstance(file_path, str) and expand_inputs([file_path], SUPPORTED_EXTENSIONS) != [file_path]):
+            return self.ingest(file_path, user_id=user_id, agent_id=agent_id, run_id=run_id, metadata=metadata)
         
         return self._process_single_input(file_path, user_id, agent_id, run_id, metadata)
 
+    def ingest(self, inputs, user_id=None, agent_id=None, run_id=None, metadata=None, processes=None,
+               chunk_workers=4, write_workers=4, batch_size=32, queue_size=64):
+        """Add many files through a staged pipeline.
+
+        Documents are converted on a process pool, chunked on a thread pool
+        and stored in batches by writer threads; bounded queues between the
+        stages keep memory flat. Files that fail are logged and reported in
+        the stats instead of stopping the others.
+
+        Args:
+            inputs: File paths, directories, glob patterns or raw text (one
+                or a list)
+            processes: Conversion processes; 0 converts in threads. Defaults
+                to the CPU count, capped at the number of documents.
+            chunk_workers: Chunking threads
+            write_workers: Storing threads
+            batch_size: Chunks per write batch
+            queue_size: Capacity of each queue between stages
+
+        Returns:
+            ``{'results': [...], 'relations': [], 'stats': {...}}`` where the
+            stats hold documents/sec and chunks/sec
+        """
+        pipeline = IngestionPipeline(self, processes=processes, chunk_workers=chunk_workers,
+                                     write_workers=write_workers, batch_size=batch_size, queue_size=queue_size)
+        return pipeline.run(inputs, user_id=user_id, agent_id=agent_id, run_id=run_id, metadata=metadata)
+
+    @staticmethod
+    def _is_supported_file(input_path):
+        return isinstance(input_path, str) and input_path.lower().endswith(SUPPORTED_EXTENSIONS)
+
+    @staticmethod
+    def _needs_conversion(input_path):
+        """Whether a file is converted with MarkItDown rather than read as text"""
+        return not input_path.lower().endswith(DOCUMENT_EXTENSIONS['text'])
+
+    def _open_file(self, input_path, user_id=None, agent_id=None, run_id=None, metadata=None):
+        """Start indexing a file; returns None when the manifest shows it unchanged."""
+        if not os.path.exists(input_path):
+            logger.error(f"File not found: {input_path}")
+            raise FileNotFoundError(f"File not found: {input_path}")
+
+        file_ext = '.' + input_path.lower().split('.')[-1]  # Get extension reliably
+        # Set metadata for file
+        metadata = dict(metadata or {})
+        metadata['file_type'] = file_ext.lstrip('.')
+        metadata['filename'] = os.path.basename(input_path)
+        job = FileJob(path=input_path, file_ext=file_ext, metadata=metadata)
+
+        manifest = self.manifest
+        if manifest is not None:
+            job.manifest_key = manifest.key(input_path, user_id, agent_id, run_id)
+            job.entry = manifest.get(job.manifest_key)
+            job.stat = os.stat(input_path)
+            if job.entry and manifest.same_stat(job.entry, job.stat):
+                self._log(f"Skipping unchanged file: {input_path}")
+                return None
+            job.digest = file_digest(input_path)
+            if job.entry and job.entry['sha256'] == job.digest:
+                # Touched but not modified
+                self._log(f"Skipping unchanged file: {input_path}")
+                manifest.record(job.manifest_key, job.stat, job.digest, job.entry['chunks'])
+                return None
+            job.plan = ChunkPlan(job.entry['chunks'] if job.entry else [])
+        return job
+
+    def _read(self, job):
+        """The text of a document, converted with MarkItDown"""
+        return self.markdown.convert(job.path).text_content
+
+    def _iter_memories(self, job, content=None):
+        """Yield the chunks of a file to store.
+
+        Text files (``content`` None) are streamed: structured formats in
+        format-aware sections, stored as they are when they fit in a chunk,
+        and large plain text through ``Chunking.iter_chunks``. Converted
+        documents are chunked lazily too.
+        """
+        max_chars = self.chunker.chunk_size * CHARS_PER_TOKEN
+        if content is not None:
+            if not content.strip():
+                raise ValueError("No content could be extracted from file")
+            chunks = self.chunker.iter_chunks(io.StringIO(content))
+        elif not job.path.lower().endswith(STRUCTURED_EXTENSIONS) and os.path.getsize(job.path) > max_chars:
+            chunks = self.chunker.iter_chunks(job.path)
+        else:
+            chunks = self._iter_sections(job.path, max_chars)
+        for chunk in chunks:
+            text = chunk.text.strip() if hasattr(chunk, 'text') else str(chunk).strip()
+            if text:
+                job.chunks += 1
+                yield text
+        if not job.chunks and content is None:
+            raise ValueError("Empty text file")
+
+    def _iter_sections(self, path, max_chars):
+        for section in iter_sections(path, max_chars):
+            section = section.strip()
+            if len(section) <= max_chars:
+                yield section
+            else:
+                yield from self.chunker.chunk(section)
+
+    @staticmethod
+    def _chunk_metadata(job):
+        """Metadata of the chunk ``_iter_memories`` just yielded: the file's, plus its position"""
+        return dict(job.metadata, chunk_index=job.chunks - 1)
+
+    def _plan_chunk(self, job, text):
+        """Whether a chunk must be stored, and its hash for the manifest"""
+        if job.plan is None:
+            return True, None
+        digest = chunk_digest(text, job.metadata)
+        return job.plan.needs_store(digest), digest
+
+    def _seal(self, job):
+        """Delete the chunks of a file that its new content no longer has"""
+        if job.plan is None:
+            return
+        stale = job.plan.stale()
+        self._log(f"{job.path}: {job.chunks} chunks, {len(job.plan.kept)} already stored, {len(stale)} to delete")
+        for chunk in stale:
+            for memory_id in chunk['ids']:
+                try:
+                    self.delete(memory_id)
+                except Exception as e:
+                    logger.warning(f"Error deleting stale chunk {memory_id} of {job.path}: {e}")
+
+    def _store_batch(self, chunks, user_id=None, agent_id=None, run_id=None):
+        """Store ``(text, metadata)`` chunks; returns the stored results of each"""
+        writer = self.writer
+        if writer is not None:
+            try:
+                return writer.write(chunks, user_id=user_id, agent_id=agent_id, run_id=run_id)
+            except Exception as e:
+                logger.error(f"Error storing {len(chunks)} chunks: {str(e)}")
+                return [[] for _ in chunks]
+            finally:
+                self._changed()
+        stored = []
+        for text, metadata in chunks:
+            memory_result = self.store(text, user_id=user_id, agent_id=agent_id, run_id=run_id, metadata=metadata)
+            stored.append(memory_result.get('results', []) if memory_result else [])
+        return stored
+
+    def _stored(self, job, digest, results):
+        """Record the outcome of storing one of a file's chunks"""
+        if job.plan is None:
+            return
+        if results:
+            job.plan.kept.append({'hash': digest, 'ids': [r['id'] for r in results if 'id' in r]})
+        else:
+            job.failed += 1
+
+    def _finish(self, job, save=True):
+        """Record in the manifest what is now stored from a file"""
+        manifest = self.manifest
+        if manifest is None or job.plan is None:
+            return
+        if job.failed:
+            # Without the file's state the next add re-plans it and retries the missing chunks
+            manifest.record(job.manifest_key, None, None, job.plan.kept)
+        else:
+            manifest.record(job.manifest_key, job.stat, job.digest, job.plan.kept)
+        if save:
+            manifest.save()
+
     def _process_single_input(self, input_path, user_id=None, agent_id=None, run_id=None, metadata=None):
         """Process a single input which can be a file path or URL."""
         try:
-            # Define supported file extensions
-            DOCUMENT_EXTENSIONS = {
-                'document': ('.pdf', '.ppt', '.pptx', '.doc', '.docx', '.xls', '.xlsx'),
-                'media': ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.mp3', '.wav', '.ogg', '.m4a'),
-                'text': ('.txt', '.csv', '.json', '.xml', '.md', '.html', '.htm'),
-                'archive': '.zip'
-            }
-
             # Check if input is URL
             if isinstance(input_path, str) and (input_path.startswith('http://') or input_path.startswith('https://')):
                 self._log(f"Processing URL: {input_path}")
                 raise NotImplementedError("URL processing not yet implemented")
 
-            # Check if input ends with any supported extension
-            is_supported_file = any(input_path.lower().endswith(ext) 
-                                  for exts in DOCUMENT_EXTENSIONS.values()
-                                  for ext in (exts if isinstance(exts, tuple) else (exts,)))
-            
-            if is_supported_file:
-                self._log(f"Processing as file path: {input_path}")
-                if not os.path.exists(input_path):
-                    logger.error(f"File not found: {input_path}")
-                    raise FileNotFoundError(f"File not found: {input_path}")
-                
-                file_ext = '.' + input_path.lower().split('.')[-1]  # Get extension reliably
-                
-                # Process file based on type
-                if file_ext in DOCUMENT_EXTENSIONS['text']:
-                    with open(input_path, 'r', encoding='utf-8') as file:
-                        content = file.read().strip()
-                    if not content:
-                        raise ValueError("Empty text file")
-                    memories = [self.normalize_content(content)]
-                else:
-                    # Use MarkItDown for documents and media
-                    result = self.markdown.convert(input_path)
-                    content = result.text_content
-                    if not content:
-                        raise ValueError("No content could be extracted from file")
-                    chunks = self.chunker.chunk(content)
-                    memories = [chunk.text.strip() if hasattr(chunk, 'text') else str(chunk).strip() 
-                              for chunk in chunks if chunk]
-
-                # Set metadata for file
-                if not metadata:
-                    metadata = {}
-                metadata['file_type'] = file_ext.lstrip('.')
-                metadata['filename'] = os.path.basename(input_path)
-            else:
+            if not self._is_supported_file(input_path):
                 # Treat as raw text content only if no file extension
-                memories = [self.normalize_content(input_path)]
+                memory = self.normalize_content(input_path)
+                memory_result = self.store(memory, user_id=user_id, agent_id=agent_id, run_id=run_id,
+                                           metadata=metadata) if memory else None
+                return {'results': memory_result.get('results', []) if memory_result else [], 'relations': []}
 
             # Create progress display
             progress = Progress(
@@ -349,20 +634,44 @@ class Knowledge:
                 transient=True
             )
 
-            # Store memories with progress bar
+            self._log(f"Processing as file path: {input_path}")
+            job = self._open_file(input_path, user_id, agent_id, run_id, metadata)
+            if job is None:
+                if self.manifest is not None:
+                    self.manifest.save()
+                return {'results': [], 'relations': []}
+            content = self._read(job) if self._needs_conversion(input_path) else None
+
+            # Store chunks in batches as they are produced, with progress bar
             all_results = []
+            batch = []
+
+            def flush():
+                stored = self._store_batch([(text, meta) for text, meta, _ in batch], user_id=user_id,
+                                           agent_id=agent_id, run_id=run_id)
+                for (_, _, digest), results in zip(batch, stored):
+                    all_results.extend(results)
+                    self._stored(job, digest, results)
+                progress.advance(store_task, len(batch))
+                batch.clear()
+
             with progress:
-                store_task = progress.add_task(f"Adding to Knowledge from {os.path.basename(input_path)}", total=len(memories))
-                for memory in memories:
-                    if memory:
-                        memory_result = self.store(memory, user_id=user_id, agent_id=agent_id, 
-                                                 run_id=run_id, metadata=metadata)
-                        if memory_result:
-                            all_results.extend(memory_result.get('results', []))
+                store_task = progress.add_task(f"Adding to Knowledge from {os.path.basename(input_path)}", total=None)
+                for text in self._iter_memories(job, content):
+                    store, digest = self._plan_chunk(job, text)
+                    if not store:
                         progress.advance(store_task)
+                        continue
+                    batch.append((text, self._chunk_metadata(job), digest))
+                    if len(batch) >= STORE_BATCH_SIZE:
+                        flush()
+                if batch:
+                    flush()
 
+            self._seal(job)
+            self._finish(job)
             return {'results': all_results, 'relations': []}
 
         except Exception as e:
             logger.error(f"Error processing input {input_path}: {str(e)}", exc_info=True)
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,153 @@
+"""
+Manifest of the files Knowledge.add has indexed into a collection.
+
+For every file (per user/agent/run scope) it records the mtime, size and
+content hash, and the hash and memory ids of each chunk stored from it.
+Re-adding a file whose mtime and size are unchanged then costs one stat();
+a changed file is re-chunked and only the chunks that differ are stored or
+deleted.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's content, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_digest(text: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """Hash of a chunk as stored: its text and the metadata stored with it"""
+    payload = json.dumps([text, metadata or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ChunkPlan:
+    """Matches a file's new chunks, as they are produced, against the chunks stored from it before.
+
+    Repeated chunks are matched one for one.
+    """
+
+    def __init__(self, old_chunks: List[Dict[str, Any]]):
+        self._available = defaultdict(list)
+        for chunk in old_chunks:
+            self._available[chunk['hash']].append(chunk)
+        self.kept: List[Dict[str, Any]] = []
+
+    def needs_store(self, digest: str) -> bool:
+        """Whether a new chunk must be stored; if not, its stored copy is kept"""
+        if self._available[digest]:
+            self.kept.append(self._available[digest].pop())
+            return False
+        return True
+
+    def stale(self) -> List[Dict[str, Any]]:
+        """Stored chunks no new chunk matched, to be deleted"""
+        return [chunk for chunks in self._available.values() for chunk in chunks]
+
+
+def plan_chunks(
+    old_chunks: List[Dict[str, Any]], hashes: List[str]
+) -> Tuple[List[Dict[str, Any]], List[int], List[Dict[str, Any]]]:
+    """Match a file's new chunk hashes against the chunks stored from it before.
+
+    Returns the stored chunks to keep, the indexes of the new chunks that
+    must be stored, and the stored chunks that must be deleted.
+    """
+    plan = ChunkPlan(old_chunks)
+    to_store = [index for index, digest in enumerate(hashes) if plan.needs_store(digest)]
+    return plan.kept, to_store, plan.stale()
+
+
+class Manifest:
+    """The files indexed into one collection, persisted as JSON.
+
+    Args:
+        path: JSON file holding the manifest; created on first save.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._files: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable knowledge manifest {self.path}: {e}")
+            return {}
+        if data.get('version') != MANIFEST_VERSION:
+            return {}
+        return data.get('files', {})
+
+    @staticmethod
+    def key(file_path: str, user_id=None, agent_id=None, run_id=None) -> str:
+        """Entry key: the same file added for different scopes is stored separately"""
+        return json.dumps([os.path.abspath(file_path), user_id, agent_id, run_id])
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._files.get(key)
+
+    @staticmethod
+    def same_stat(entry: Dict[str, Any], stat: os.stat_result) -> bool:
+        return entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size
+
+    def record(self, key: str, stat: Optional[os.stat_result], digest: Optional[str],
+               chunks: List[Dict[str, Any]]) -> None:
+        """Remember a file's state and the chunks now stored from it.
+
+        Without ``stat`` and ``digest`` the file never counts as unchanged.
+        """
+        with self._lock:
+            self._files[key] = {
+                'mtime_ns': stat.st_mtime_ns if stat else None,
+                'size': stat.st_size if stat else None,
+                'sha256': digest,
+                'chunks': chunks,
+            }
+
+    def forget(self, user_id=None, agent_id=None, run_id=None) -> None:
+        """Drop the entries of a scope whose memories were deleted"""
+        scope = [user_id, agent_id, run_id]
+        with self._lock:
+            for key in list(self._files):
+                entry_scope = json.loads(key)[1:]
+                if all(want is None or want == have for want, have in zip(scope, entry_scope)):
+                    del self._files[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'files': self._files}, f)
+            os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self._files)
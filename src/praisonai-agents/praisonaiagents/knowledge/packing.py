@@ -0,0 +1,186 @@
+"""
+Token-budgeted packing of Knowledge search results into prompt context.
+
+Search results come back best first, often with the same text several times
+(a fact stored from two files, overlapping chunks) and with neighbouring
+chunks of one file as separate results. Packing turns them into the context
+appended to a prompt:
+
+1. rank: results keep the order the store returned them in
+2. dedupe: a result whose text is contained in a better one is dropped
+3. pack: results are added best first while they fit the token budget; the
+   best one is truncated if it does not fit on its own
+4. merge: packed chunks of the same file that are adjacent (consecutive
+   ``chunk_index``) or overlap are joined into one passage, in file order
+   and without the overlap, which leaves room for more results
+
+Tokens are estimated at about four characters per token.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from ..process.context import CHARS_PER_TOKEN, TRUNCATION_MARKER, estimate_tokens
+
+# Shortest suffix/prefix overlap taken as two chunks overlapping, in characters
+MIN_OVERLAP = 32
+
+_SPACES = re.compile(r"\s+")
+
+
+@dataclass
+class Passage:
+    """One or more merged search results"""
+    text: str
+    rank: int
+    source: Optional[str] = None
+    first: Optional[int] = None
+    last: Optional[int] = None
+
+    @property
+    def normalized(self) -> str:
+        return _SPACES.sub(" ", self.text).strip().lower()
+
+
+@dataclass
+class PackedContext:
+    """The packed context of one search and what packing saved"""
+    text: str
+    tokens: int
+    original_tokens: int
+    results: int
+    passages: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.original_tokens - self.tokens, 0)
+
+    def __str__(self) -> str:
+        return (f"Knowledge context: {self.passages} passages from {self.results} results, "
+                f"{self.tokens} tokens ({self.tokens_saved} saved)")
+
+
+def pack_results(search_results: Any, token_budget: Optional[int] = None, separator: str = "\n") -> PackedContext:
+    """Pack ``Knowledge.search`` results into at most ``token_budget`` tokens.
+
+    Args:
+        search_results: A ``{'results': [...]}`` dict of mem0 results, or a
+            list of results or strings.
+        token_budget: Tokens the context may take, or None for no limit
+            (results are still deduplicated and merged).
+        separator: Placed between passages.
+    """
+    items = search_results.get('results', []) if isinstance(search_results, dict) else list(search_results or [])
+    passages = _passages(items)
+    original_tokens = estimate_tokens(separator.join(p.text for p in passages))
+    sep_tokens = estimate_tokens(separator)
+
+    def size(selected: List[Passage]) -> int:
+        return sum(estimate_tokens(p.text) for p in selected) + sep_tokens * max(len(selected) - 1, 0)
+
+    selected: List[Passage] = []
+    for passage in _dedupe(passages):
+        candidate = _absorb(selected, passage)
+        if token_budget is None or size(candidate) <= token_budget:
+            selected = candidate
+        elif not selected:
+            # The best result alone is over budget: keep its beginning
+            max_chars = max(token_budget * CHARS_PER_TOKEN - len(TRUNCATION_MARKER), 0)
+            passage.text = passage.text[:max_chars] + TRUNCATION_MARKER
+            selected = [passage]
+            break
+    selected.sort(key=lambda p: p.rank)
+    text = separator.join(p.text for p in selected)
+    return PackedContext(text=text, tokens=estimate_tokens(text), original_tokens=original_tokens,
+                         results=len(items), passages=len(selected))
+
+
+def _passages(items: List[Any]) -> List[Passage]:
+    passages = []
+    for rank, item in enumerate(items):
+        if isinstance(item, dict):
+            text = item.get('memory') or item.get('text') or ""
+            metadata = item.get('metadata') or {}
+        else:
+            text, metadata = str(item), {}
+        text = text.strip()
+        if not text:
+            continue
+        index = metadata.get('chunk_index')
+        index = index if isinstance(index, int) else None
+        passages.append(Passage(text, rank, metadata.get('source') or metadata.get('filename'), index, index))
+    return passages
+
+
+def _dedupe(passages: List[Passage]) -> List[Passage]:
+    """Drop passages contained in a better-ranked one; a longer duplicate replaces the text it contains"""
+    kept: List[Passage] = []
+    for passage in passages:
+        text = passage.normalized
+        for other in kept:
+            other_text = other.normalized
+            if text in other_text:
+                break
+            if other_text in text:
+                other.text = passage.text
+                if passage.source == other.source:
+                    other.first, other.last = passage.first, passage.last
+                break
+        else:
+            kept.append(passage)
+    return kept
+
+
+def _overlap(head: str, tail: str) -> int:
+    """Length of the longest suffix of ``head`` that starts ``tail`` (at least MIN_OVERLAP)"""
+    if len(head) < MIN_OVERLAP or len(tail) < MIN_OVERLAP:
+        return 0
+    probe = tail[:MIN_OVERLAP]
+    start = max(len(head) - len(tail), 0)
+    position = head.find(probe, start)
+    while position != -1:
+        if tail.startswith(head[position:]):
+            return len(head) - position
+        position = head.find(probe, position + 1)
+    return 0
+
+
+def _follows(first: Passage, second: Passage) -> int:
+    """Characters of ``second`` repeating the end of ``first`` if it continues it, else -1"""
+    if first.source is None or first.source != second.source:
+        return -1
+    overlap = _overlap(first.text, second.text)
+    if overlap:
+        return overlap
+    if first.last is not None and second.first is not None and second.first == first.last + 1:
+        return 0
+    return -1
+
+
+def _absorb(selected: List[Passage], passage: Passage) -> List[Passage]:
+    """``selected`` plus ``passage``, joined with the passages it continues or is continued by"""
+    merged = passage
+    rest = list(selected)
+    joined = True
+    while joined:
+        joined = False
+        for other in rest:
+            if _follows(other, merged) >= 0:
+                merged = _join(other, merged)
+            elif _follows(merged, other) >= 0:
+                merged = _join(merged, other)
+            else:
+                continue
+            rest.remove(other)
+            joined = True
+            break
+    return rest + [merged]
+
+
+def _join(first: Passage, second: Passage) -> Passage:
+    overlap = _follows(first, second)
+    tail = second.text[overlap:]
+    text = first.text + ("" if overlap else "\n") + tail if tail else first.text
+    return Passage(text, min(first.rank, second.rank), first.source, first.first,
+                   second.last if second.last is not None else first.last)
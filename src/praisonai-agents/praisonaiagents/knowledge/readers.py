@@ -0,0 +1,303 @@
+"""
+Streaming, format-aware readers for text files added to Knowledge.
+
+A reader yields a file's text as sections without loading the whole file,
+so memory stays bounded by the section size whatever the file size:
+
+- CSV: groups of rows, each repeating the header row
+- JSON: records (array elements, JSON Lines, or top-level members, and
+  the pieces of containers too large for a section), several small
+  records per section
+- Markdown: the text under each heading, prefixed with the heading path
+- anything else: windows of whole paragraphs
+
+Structured sections are packed up to ``max_chars`` (a chunk); a single unit
+larger than that (a huge record, a long section) is yielded on its own and
+left to the Chunking engine. Large plain text files skip the readers and
+are chunked directly with ``Chunking.iter_chunks``.
+"""
+
+import csv
+import io
+import json
+import logging
+import re
+from typing import Any, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Formats whose structure decides the sections
+STRUCTURED_EXTENSIONS = ('.csv', '.json', '.jsonl', '.md', '.markdown')
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_BLOCK = 1 << 16
+_NON_SPACE = re.compile(r"\S")
+_DECODER = json.JSONDecoder()
+_DESCEND = object()
+
+
+def pack(pieces: Iterable[str], max_chars: int, prefix: str = "", separator: str = "\n") -> Iterator[str]:
+    """Join consecutive pieces into sections of at most ``max_chars``.
+
+    ``prefix`` (a header row, a heading path) starts every section. A piece
+    that does not fit on its own is yielded alone.
+    """
+    group: List[str] = []
+    size = len(prefix)
+    for piece in pieces:
+        if group and size + len(separator) + len(piece) > max_chars:
+            yield prefix + separator.join(group)
+            group, size = [], len(prefix)
+        group.append(piece)
+        size += len(separator) + len(piece)
+    if group:
+        yield prefix + separator.join(group)
+
+
+def iter_sections(path: str, max_chars: int, window_chars: Optional[int] = None) -> Iterator[str]:
+    """Yield the sections of a text file, chosen by its extension"""
+    lower = path.lower()
+    if lower.endswith('.csv'):
+        return csv_sections(path, max_chars)
+    if lower.endswith(('.json', '.jsonl')):
+        return json_sections(path, max_chars)
+    if lower.endswith(('.md', '.markdown')):
+        return markdown_sections(path, max_chars)
+    return text_sections(path, window_chars or 16 * max_chars)
+
+
+def csv_sections(path: str, max_chars: int) -> Iterator[str]:
+    """Groups of CSV rows, each starting with the header row"""
+    def encode(row: List[str]) -> str:
+        buffer = io.StringIO()
+        # With "\n" as terminator, fields holding newlines get quoted
+        csv.writer(buffer, lineterminator="\n").writerow(row)
+        return buffer.getvalue()[:-1]
+
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        rows = (encode(row) for row in reader if any(cell.strip() for cell in row))
+        sections = pack(rows, max_chars, prefix=encode(header) + "\n")
+        first = next(sections, None)
+        # A header alone is still content
+        yield first if first is not None else encode(header)
+        yield from sections
+
+
+class _JSONRecords:
+    """Reads ``(path, value)`` records from a JSON stream, descending into large containers.
+
+    Values are decoded one at a time. A top-level array yields its elements,
+    and an array or object spanning more than ``max_chars`` of the file is
+    not decoded whole: its elements or members are read one by one. ``path``
+    leads from the top-level value to the record: object keys, and None for
+    the arrays it is in.
+    """
+
+    def __init__(self, file: TextIO, max_chars: int):
+        self.file = file
+        self.max_chars = max_chars
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _more(self) -> None:
+        # Reading at least as much as is buffered keeps re-decoding a long value linear overall
+        block = self.file.read(max(_BLOCK, len(self.buffer) - self.pos))
+        self.buffer = self.buffer[self.pos:] + block
+        self.pos = 0
+        self.eof = not block
+
+    def _peek(self) -> str:
+        """The next non-whitespace character, or '' at the end of the stream"""
+        while True:
+            match = _NON_SPACE.search(self.buffer, self.pos)
+            if match:
+                self.pos = match.start()
+                return self.buffer[self.pos]
+            self.pos = len(self.buffer)
+            if self.eof:
+                return ''
+            self._more()
+
+    def _decode(self, descend: bool) -> Any:
+        """Decode the value at the cursor; _DESCEND for a container to read piece by piece"""
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                if descend and self.buffer[self.pos] in '[{' and len(self.buffer) - self.pos > self.max_chars:
+                    return _DESCEND
+                self._more()
+                continue
+            # A number could continue in the next block
+            if end == len(self.buffer) and not self.eof and not isinstance(value, (dict, list, str)):
+                self._more()
+                continue
+            if descend and value and isinstance(value, (dict, list)) and end - self.pos > self.max_chars:
+                return _DESCEND
+            self.pos = end
+            return value
+
+    def _key(self) -> str:
+        if self._peek() != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", self.buffer, self.pos)
+        key = self._decode(descend=False)
+        if self._peek() != ':':
+            raise json.JSONDecodeError("Expecting ':' delimiter", self.buffer, self.pos)
+        self.pos += 1
+        return key
+
+    def __iter__(self) -> Iterator[Tuple[Tuple, Any]]:
+        # (closing character, path of the records inside) of each container being read
+        stack: List[Tuple[str, Tuple]] = []
+        if self._peek() == '[':
+            stack.append((']', ()))
+            self.pos += 1
+        while True:
+            char = self._peek()
+            path: Tuple = ()
+            if stack:
+                closing, path = stack[-1]
+                if char == ',':
+                    self.pos += 1
+                    continue
+                if char == closing:
+                    self.pos += 1
+                    stack.pop()
+                    if not stack and closing == ']' and not path:
+                        return  # the end of a top-level array
+                    continue
+                if not char:
+                    raise json.JSONDecodeError(f"Expecting '{closing}'", self.buffer, self.pos)
+                if closing == '}':
+                    path = path + (self._key(),)
+                    self._peek()
+            elif not char:
+                return
+            value = self._decode(descend=True)
+            if value is _DESCEND:
+                closing = ']' if self.buffer[self.pos] == '[' else '}'
+                stack.append((closing, path + (None,) if closing == ']' else path))
+                self.pos += 1
+                continue
+            yield path, value
+
+
+def _render(path: Tuple, value: Any) -> str:
+    """A record as JSON, nested in the objects and arrays it came from"""
+    for key in reversed(path):
+        value = [value] if key is None else {key: value}
+    return json.dumps(value, ensure_ascii=False)
+
+
+def json_sections(path: str, max_chars: int) -> Iterator[str]:
+    """JSON records, several small ones per section.
+
+    A single top-level object is split into its members, and arrays or
+    objects too large for a section into their elements or members, each
+    nested in the keys leading to it. A file that is not valid JSON is read
+    as plain text.
+    """
+    def records() -> Iterator[str]:
+        with open(path, 'r', encoding='utf-8') as file:
+            values = iter(_JSONRecords(file, max_chars))
+            first = next(values, None)
+            second = next(values, None) if first is not None else None
+            if first is not None and not first[0] and isinstance(first[1], dict) and second is None:
+                for key, value in first[1].items():
+                    yield _render((key,), value)
+                return
+            for record in (first, second):
+                if record is not None:
+                    yield _render(*record)
+            for record in values:
+                yield _render(*record)
+
+    try:
+        # Text that is not JSON at all fails on the first section
+        sections = pack(records(), max_chars)
+        first = next(sections, None)
+    except json.JSONDecodeError as e:
+        logger.debug(f"{path} is not valid JSON ({e}), reading it as text")
+        yield from text_sections(path, 16 * max_chars)
+        return
+    if first is not None:
+        yield first
+    yield from sections
+
+
+def markdown_sections(path: str, max_chars: int) -> Iterator[str]:
+    """The text under each Markdown heading, prefixed with its heading path"""
+    titles: List[str] = []
+    paragraphs: List[str] = []
+    lines: List[str] = []
+    sizes = {"lines": 0, "paragraphs": 0}
+    fenced = False
+
+    def flush_paragraph() -> None:
+        text = "\n".join(lines).strip()
+        lines.clear()
+        sizes["lines"] = 0
+        if text:
+            paragraphs.append(text)
+            sizes["paragraphs"] += len(text)
+
+    def flush_section() -> Iterator[str]:
+        flush_paragraph()
+        if paragraphs:
+            prefix = " > ".join(titles) + "\n\n" if titles else ""
+            yield from pack(paragraphs, max_chars, prefix=prefix, separator="\n\n")
+            paragraphs.clear()
+            sizes["paragraphs"] = 0
+
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in iter(lambda: file.readline(max_chars), ''):
+            line = line.rstrip('\n')
+            if _FENCE.match(line):
+                fenced = not fenced
+            heading = None if fenced else _HEADING.match(line)
+            if heading:
+                yield from flush_section()
+                # A heading replaces its level and every deeper one in the path
+                titles[len(heading.group(1)) - 1:] = [heading.group(2)]
+            elif not line.strip() and not fenced:
+                flush_paragraph()
+            else:
+                lines.append(line)
+                sizes["lines"] += len(line) + 1
+                if sizes["lines"] > max_chars:
+                    flush_paragraph()
+            # Keep the paragraphs of a long section from accumulating
+            if sizes["paragraphs"] > 4 * max_chars:
+                yield from flush_section()
+        yield from flush_section()
+
+
+def text_sections(path: str, window_chars: int) -> Iterator[str]:
+    """Windows of up to ``window_chars`` of whole paragraphs (long lines are cut)"""
+    def paragraphs() -> Iterator[str]:
+        lines: List[str] = []
+        size = 0
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in iter(lambda: file.readline(window_chars), ''):
+                if not line.strip():
+                    if lines:
+                        yield "".join(lines).strip()
+                    lines, size = [], 0
+                    continue
+                if lines and size + len(line) > window_chars:
+                    yield "".join(lines).strip()
+                    lines, size = [], 0
+                lines.append(line)
+                size += len(line)
+        if lines:
+            yield "".join(lines).strip()
+
+    yield from pack((p for p in paragraphs() if p), window_chars, separator="\n\n")
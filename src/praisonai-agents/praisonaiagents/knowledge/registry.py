@@ -0,0 +1,201 @@
+"""
+Process-wide registry of chunkers, tokenizers and embedding models.
+
+Loading a tokenizer or an embedding model takes from hundreds of
+milliseconds to seconds, and Knowledge instances are created often (one per
+vector-store context item of a task, for instance). Instances are therefore
+shared by every Chunking and Knowledge object of the process, keyed by their
+configuration, and created once even when several threads ask at the same
+time.
+
+Usage:
+    from praisonaiagents.knowledge.registry import get_chunking, warmup
+
+    warmup()  # load the default Knowledge chunker at start-up
+    chunking = get_chunking('semantic', chunk_size=256, embedding_model='all-MiniLM-L6-v2')
+
+Shared instances must not be modified; create a ``Chunking`` directly for a
+private one.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Chunking configuration of Knowledge
+DEFAULT_CHUNKING = {'chunker_type': 'recursive', 'chunk_size': 512, 'chunk_overlap': 50}
+
+# Tokenizer names chonkie handles itself without loading anything
+_BUILTIN_TOKENIZERS = ('character', 'word')
+
+
+def freeze(value: Any) -> Hashable:
+    """A hashable key for a configuration value.
+
+    Mappings and sequences are frozen recursively; objects that are not
+    hashable (a model instance) are keyed by identity.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return ('id', id(value))
+    return value
+
+
+class InstanceRegistry:
+    """Thread-safe store of shared instances, created on first use.
+
+    Each key has its own lock, so loading one model does not hold back
+    threads asking for another, and a key is only ever created once.
+    """
+
+    def __init__(self):
+        self._instances: Dict[Tuple[str, Hashable], Any] = {}
+        self._locks: Dict[Tuple[str, Hashable], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def get(self, kind: str, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the ``kind`` instance for ``key``, calling ``factory`` if there is none"""
+        entry = (kind, key)
+        instance = self._instances.get(entry)
+        if instance is not None:
+            self._count(kind, "hits")
+            return instance
+        with self._lock:
+            lock = self._locks.setdefault(entry, threading.Lock())
+        with lock:
+            instance = self._instances.get(entry)
+            if instance is not None:
+                self._count(kind, "hits")
+                return instance
+            start = time.perf_counter()
+            instance = factory()
+            elapsed = time.perf_counter() - start
+            self._instances[entry] = instance
+        self._count(kind, "created", seconds=elapsed)
+        logger.debug(f"Created shared {kind} {key!r} in {elapsed:.3f}s")
+        return instance
+
+    def _count(self, kind: str, field: str, seconds: float = 0.0) -> None:
+        with self._lock:
+            stats = self.stats.setdefault(kind, {"created": 0, "hits": 0, "load_seconds": 0.0})
+            stats[field] += 1
+            stats["load_seconds"] += seconds
+
+    def __contains__(self, entry: Tuple[str, Hashable]) -> bool:
+        return entry in self._instances
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def clear(self) -> None:
+        """Forget every instance; objects already handed out stay usable"""
+        with self._lock:
+            self._instances.clear()
+            self._locks.clear()
+            self.stats.clear()
+
+
+_registry = InstanceRegistry()
+
+
+def get_registry() -> InstanceRegistry:
+    """Return the process-wide registry"""
+    return _registry
+
+
+def shared(kind: str, key: Hashable, factory: Callable[[], Any]) -> Any:
+    """Return the process-wide ``kind`` instance for ``key``, created by ``factory`` once"""
+    return _registry.get(kind, key, factory)
+
+
+def get_tokenizer(name: Any) -> Any:
+    """Return a shared tokenizer for ``name``.
+
+    Hugging Face ``tokenizers`` are tried first, then ``tiktoken`` encodings,
+    like chonkie does. Names neither can load, chonkie's built-in
+    tokenizers and tokenizer objects are returned as they are.
+    """
+    if not isinstance(name, str) or name in _BUILTIN_TOKENIZERS:
+        return name
+
+    def load() -> Any:
+        try:
+            from tokenizers import Tokenizer
+            return Tokenizer.from_pretrained(name)
+        except Exception as e:
+            logger.debug(f"tokenizers could not load {name}: {e}")
+        try:
+            import tiktoken
+            return tiktoken.get_encoding(name)
+        except Exception as e:
+            logger.debug(f"tiktoken could not load {name}: {e}")
+        return name
+
+    return shared('tokenizer', name, load)
+
+
+def get_embedding_model(name: Any) -> Any:
+    """Return a shared chonkie embedding model for ``name``; model objects are returned as they are"""
+    if not isinstance(name, str):
+        return name
+
+    def load() -> Any:
+        from chonkie.embeddings import AutoEmbeddings
+        return AutoEmbeddings.get_embeddings(name)
+
+    return shared('embedding_model', name, load)
+
+
+def get_chunking(chunker_type: str = 'token', chunk_size: int = 512, chunk_overlap: int = 128,
+                 tokenizer_or_token_counter: str = "gpt2", embedding_model: Optional[Any] = None,
+                 **kwargs) -> Any:
+    """Return the shared ``Chunking`` for this configuration (same arguments as ``Chunking``)"""
+    from .chunking import Chunking
+
+    key = (chunker_type, chunk_size, chunk_overlap, freeze(tokenizer_or_token_counter),
+           freeze(embedding_model), freeze(kwargs))
+    return shared('chunking', key, lambda: Chunking(
+        chunker_type=chunker_type,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        tokenizer_or_token_counter=tokenizer_or_token_counter,
+        embedding_model=embedding_model,
+        **kwargs
+    ))
+
+
+def warmup(*configs: Dict[str, Any], background: bool = False) -> Optional[threading.Thread]:
+    """Load the chunkers of ``configs`` (default: the Knowledge one) ahead of use.
+
+    The tokenizer and embedding model of each configuration are loaded with
+    it. With ``background`` the loading runs in a daemon thread, which is
+    returned; errors (chonkie not installed) are logged, not raised.
+    """
+    configs = configs or (DEFAULT_CHUNKING,)
+
+    def load(configs: Iterable[Dict[str, Any]]) -> None:
+        for config in configs:
+            get_chunking(**config).chunker
+
+    if not background:
+        load(configs)
+        return None
+
+    def run() -> None:
+        try:
+            load(configs)
+        except Exception as e:
+            logger.warning(f"Chunker warmup failed: {e}")
+
+    thread = threading.Thread(target=run, name="praisonai-chunker-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,108 @@
+"""
+Result cache for Knowledge.search.
+
+``Agent.chat`` searches its knowledge on every turn, which embeds the prompt
+and queries the vector store even when the prompt was just asked. Results
+are kept in an LRU cache with a time to live, keyed by the query, its
+filters and the rerank flag.
+
+Each collection has a version, bumped by every write made through Knowledge
+(store, update, delete, reset). Entries remember the version they were
+computed at and are dropped once it changes, so a search never returns
+results from before a write made in this process. Writes made by other
+processes are only picked up when entries expire.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+_versions: Dict[Hashable, int] = {}
+_versions_lock = threading.Lock()
+
+
+def collection_version(collection: Hashable) -> int:
+    """Current version of a collection"""
+    return _versions.get(collection, 0)
+
+
+def bump_version(collection: Hashable) -> int:
+    """Mark a collection as changed; cached results of earlier versions become stale"""
+    with _versions_lock:
+        version = _versions[collection] = _versions.get(collection, 0) + 1
+        return version
+
+
+class SearchCache:
+    """LRU + TTL cache of search results for one collection.
+
+    Args:
+        collection: Key of the collection whose version guards the entries.
+        max_size: Entries kept before the least recently used is evicted.
+        ttl: Seconds an entry stays valid, or None for no limit.
+    """
+
+    def __init__(self, collection: Hashable, max_size: int = 256, ttl: Optional[float] = 300.0):
+        self.collection = collection
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    @property
+    def version(self) -> int:
+        return collection_version(self.collection)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return ``(found, results)``; results are a copy the caller may modify"""
+        now = time.monotonic()
+        version = self.version
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, stored_at, results = entry
+                if entry_version != version:
+                    del self._entries[key]
+                    self._stats["invalidations"] += 1
+                elif self.ttl is not None and now - stored_at > self.ttl:
+                    del self._entries[key]
+                    self._stats["expirations"] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return True, copy.deepcopy(results)
+            self._stats["misses"] += 1
+        return False, None
+
+    def put(self, key: Hashable, results: Any, version: int) -> None:
+        """Keep ``results``, computed at collection ``version``, unless a write happened since"""
+        if version != self.version:
+            return
+        results = copy.deepcopy(results)
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss, eviction counts and the hit rate"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            size = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["size"] = size
+        stats["version"] = self.version
+        return stats
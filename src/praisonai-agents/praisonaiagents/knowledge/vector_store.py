@@ -0,0 +1,397 @@
+"""
+Local vector store keeping quantized embeddings in memory.
+
+A collection of millions of 1536-dimensional float32 embeddings takes about
+6 GB per million vectors, in RAM and on disk. ``QuantizedVectorStore`` keeps
+only a compact code per vector in memory:
+
+- ``int8``: one byte per dimension and a scale per vector (4x smaller)
+- ``binary``: one bit per dimension, the sign (32x smaller), scored
+  against the full-precision query
+
+The full-precision (normalized float32) vectors are appended to a file on
+disk and memory-mapped. A search scores every vector with its code, takes
+``oversample`` times more candidates than asked for, and re-scores those
+against their full-precision vectors, so results are ranked by exact cosine
+similarity. ``quantization=None`` keeps the store unquantized: the
+memory-mapped vectors are scanned directly.
+
+Ids and payloads live in SQLite next to the vectors. The store implements
+the mem0 vector store interface (``insert``, ``search``, ``get``, ``list``,
+``update``, ``delete``, ``reset``), used by Knowledge, and Chroma's
+collection ``add``/``query``, used by Memory. Scores are cosine
+similarities (higher is better); ``query`` reports cosine distances like
+Chroma.
+
+Files in ``<path>/<collection_name>/``: ``vectors.f32``, ``codes.bin``,
+``scales.f32`` and ``items.db``.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATIONS = ("int8", "binary")
+
+# Candidates re-scored per requested result; sign bits rank far more loosely than int8
+DEFAULT_OVERSAMPLE = {"int8": 4, "binary": 16}
+
+# Rows scored at once, keeping the temporary arrays of a scan in cache
+_BLOCK_ROWS = 1 << 12
+
+_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "numpy is required for the quantized vector store. Please install using: "
+            'pip install "praisonaiagents[knowledge]"'
+        )
+    return numpy
+
+
+def _where(filters: Optional[Dict[str, Any]]) -> str:
+    """SQL condition matching payload fields (dotted keys reach nested fields)"""
+    for key in filters or {}:
+        if not _KEY.match(key):
+            raise ValueError(f"Invalid filter key: {key!r}")
+    return " AND ".join(f"json_extract(payload, '$.{key}') = ?" for key in filters or {})
+
+
+class _Rows:
+    """Array grown by appending rows, with spare capacity like a list"""
+
+    def __init__(self, np, initial):
+        self.np = np
+        self._buffer = initial
+        self.size = len(initial)
+
+    @property
+    def array(self):
+        return self._buffer[:self.size]
+
+    def extend(self, rows) -> None:
+        needed = self.size + len(rows)
+        if needed > len(self._buffer):
+            grown = self.np.empty((max(needed, 2 * len(self._buffer)),) + self._buffer.shape[1:], self._buffer.dtype)
+            grown[:self.size] = self._buffer[:self.size]
+            self._buffer = grown
+        self._buffer[self.size:needed] = rows
+        self.size = needed
+
+
+@dataclass
+class VectorRecord:
+    """A stored vector's id, payload and, for searches, its score (mem0's OutputData)"""
+    id: str
+    score: Optional[float]
+    payload: Dict[str, Any]
+
+
+class QuantizedVectorStore:
+    """Vector store with quantized in-memory codes and memory-mapped full vectors.
+
+    Args:
+        collection_name: Name of the collection (a directory under ``path``).
+        path: Directory holding the collections.
+        quantization: ``"int8"``, ``"binary"`` or None for no quantization.
+        oversample: Candidates re-scored per requested result (4 for int8
+            and 16 for binary by default).
+        embedding_model_dims: Dimensions of the vectors; taken from the first
+            insert if not given.
+    """
+
+    def __init__(self, collection_name: str = "praison", path: str = ".praison/vectors",
+                 quantization: Optional[str] = "int8", oversample: Optional[int] = None,
+                 embedding_model_dims: Optional[int] = None):
+        if quantization is not None and quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unsupported quantization: {quantization}. Must be one of: {list(QUANTIZATIONS)} or None")
+        self.np = _numpy()
+        self.path = path
+        self.collection_name = collection_name
+        self.quantization = quantization
+        self.oversample = max(1, oversample or DEFAULT_OVERSAMPLE.get(quantization, 1))
+        self._lock = threading.RLock()
+        self.create_col(collection_name, embedding_model_dims)
+
+    # -- storage -----------------------------------------------------------
+
+    def create_col(self, name: str, vector_size: Optional[int] = None, distance: str = "cosine") -> None:
+        """Open collection ``name``, creating it if needed"""
+        with self._lock:
+            self.collection_name = name
+            self.directory = os.path.join(self.path, name)
+            os.makedirs(self.directory, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(self.directory, "items.db"), check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS items (id TEXT PRIMARY KEY, row INTEGER UNIQUE, payload TEXT)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)")
+            info = dict(self._db.execute("SELECT key, value FROM info").fetchall())
+            stored = info.get("quantization", self.quantization or "none")
+            if stored != (self.quantization or "none"):
+                raise ValueError(f"Collection {name} is stored with quantization {stored}, not {self.quantization}")
+            self._db.execute("INSERT OR IGNORE INTO info VALUES ('quantization', ?)", (stored,))
+            self._db.commit()
+            self.dims = int(info["dims"]) if "dims" in info else vector_size
+            self._load()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @property
+    def _code_width(self) -> int:
+        if self.quantization == "binary":
+            return (self.dims + 7) // 8
+        return self.dims
+
+    def _load(self) -> None:
+        np = self.np
+        self._rows = 0
+        self._full = None
+        self._codes = self._scales = None
+        self._live = _Rows(np, np.zeros(0, dtype=bool))
+        if not self.dims:
+            return
+        vectors = self._file("vectors.f32")
+        rows = os.path.getsize(vectors) // (4 * self.dims) if os.path.exists(vectors) else 0
+        code_type = np.uint8 if self.quantization == "binary" else np.int8
+        codes = np.zeros((0, self._code_width), dtype=code_type)
+        scales = np.zeros(0, dtype=np.float32)
+        if self.quantization and rows:
+            codes = np.fromfile(self._file("codes.bin"), dtype=code_type)[:rows * self._code_width]
+            codes = codes.reshape(rows, self._code_width)
+            if self.quantization == "int8":
+                scales = np.fromfile(self._file("scales.f32"), dtype=np.float32)[:rows]
+        if self.quantization:
+            self._codes = _Rows(np, codes)
+        if self.quantization == "int8":
+            self._scales = _Rows(np, scales)
+        self._rows = rows
+        alive = np.zeros(rows, dtype=bool)
+        alive[[row for (row,) in self._db.execute("SELECT row FROM items") if row < rows]] = True
+        self._live = _Rows(np, alive)
+
+    @property
+    def _alive(self):
+        return self._live.array
+
+    def _full_vectors(self):
+        """Memory map of the full-precision vectors, re-opened after appends"""
+        if self._full is None or len(self._full) != self._rows:
+            self._full = self.np.memmap(self._file("vectors.f32"), dtype=self.np.float32, mode="r",
+                                        shape=(self._rows, self.dims)) if self._rows else None
+        return self._full
+
+    def _quantize(self, vectors):
+        np = self.np
+        if self.quantization == "binary":
+            return np.packbits(vectors > 0, axis=1), None
+        peak = np.abs(vectors).max(axis=1)
+        scales = np.where(peak > 0, 127.0 / np.maximum(peak, 1e-12), 1.0).astype(np.float32)
+        codes = np.clip(np.rint(vectors * scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales
+
+    def _append(self, vectors) -> List[int]:
+        """Write normalized vectors and their codes; returns their rows"""
+        np = self.np
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2:
+            vectors = vectors.reshape(len(vectors), -1)
+        if not self.dims:
+            self.dims = vectors.shape[1]
+            self._db.execute("INSERT OR REPLACE INTO info VALUES ('dims', ?)", (str(self.dims),))
+            self._load()
+        if vectors.shape[1] != self.dims:
+            raise ValueError(f"Expected vectors of {self.dims} dimensions, got {vectors.shape[1]}")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1.0)
+        with open(self._file("vectors.f32"), "ab") as file:
+            file.write(vectors.tobytes())
+        if self.quantization:
+            codes, scales = self._quantize(vectors)
+            with open(self._file("codes.bin"), "ab") as file:
+                file.write(codes.tobytes())
+            self._codes.extend(codes)
+            if scales is not None:
+                with open(self._file("scales.f32"), "ab") as file:
+                    file.write(scales.tobytes())
+                self._scales.extend(scales)
+        rows = list(range(self._rows, self._rows + len(vectors)))
+        self._rows += len(vectors)
+        self._live.extend(np.ones(len(vectors), dtype=bool))
+        return rows
+
+    # -- mem0 interface ----------------------------------------------------
+
+    def insert(self, vectors: Sequence[Sequence[float]], payloads: Optional[Sequence[Dict]] = None,
+               ids: Optional[Sequence[str]] = None) -> None:
+        """Add vectors with their payloads and ids (an existing id is replaced)"""
+        if not len(vectors):
+            return
+        ids = list(ids) if ids is not None else [str(uuid.uuid4()) for _ in vectors]
+        payloads = list(payloads) if payloads is not None else [{} for _ in vectors]
+        with self._lock:
+            self._release(ids)
+            rows = self._append(vectors)
+            self._db.executemany("INSERT INTO items VALUES (?, ?, ?)",
+                                 [(i, row, json.dumps(p, default=str)) for i, row, p in zip(ids, rows, payloads)])
+            self._db.commit()
+
+    def _release(self, ids: Sequence[str]) -> None:
+        """Forget the rows of ``ids``; their space is not reclaimed"""
+        marks = ",".join("?" * len(ids))
+        rows = [row for (row,) in self._db.execute(f"SELECT row FROM items WHERE id IN ({marks})", list(ids))]
+        if rows:
+            self._alive[rows] = False
+            self._db.execute(f"DELETE FROM items WHERE id IN ({marks})", list(ids))
+
+    def _filter_mask(self, filters: Optional[Dict[str, Any]]):
+        if not filters:
+            return self._alive
+        clauses = _where(filters)
+        rows = [row for (row,) in self._db.execute(f"SELECT row FROM items WHERE {clauses}", list(filters.values()))]
+        mask = self.np.zeros(self._rows, dtype=bool)
+        mask[rows] = True
+        return mask & self._alive
+
+    def _byte_table(self, query):
+        """Sum of the query's components under each of the 256 bit patterns of each code byte"""
+        np = self.np
+        padded = np.zeros(self._code_width * 8, dtype=np.float32)
+        padded[:self.dims] = query
+        bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).astype(np.float32)
+        return (padded.reshape(-1, 8) @ bits.T).ravel()
+
+    def _scores(self, query, start: int, stop: int, table=None):
+        """Approximate scores of rows ``start:stop`` (exact when unquantized)"""
+        np = self.np
+        if self.quantization == "binary":
+            # Asymmetric: the signs of the stored vectors against the full-precision query
+            offsets = np.arange(0, 256 * self._code_width, 256, dtype=np.intp)
+            return table[self._codes.array[start:stop] + offsets].sum(axis=1)
+        if self.quantization == "int8":
+            return (self._codes.array[start:stop].astype(np.float32) @ query) / self._scales.array[start:stop]
+        return self._full_vectors()[start:stop] @ query
+
+    def search(self, query: str = None, vectors: Sequence[float] = None, limit: int = 5,
+               filters: Optional[Dict[str, Any]] = None) -> List[VectorRecord]:
+        """The ``limit`` vectors most similar to ``vectors``, matching ``filters``"""
+        np = self.np
+        with self._lock:
+            if not self._rows or vectors is None:
+                return []
+            mask = self._filter_mask(filters)
+            if not mask.any():
+                return []
+            q = np.asarray(vectors, dtype=np.float32).reshape(-1)
+            q = q / (np.linalg.norm(q) or 1.0)
+            table = self._byte_table(q) if self.quantization == "binary" else None
+            scores = np.empty(self._rows, dtype=np.float32)
+            for start in range(0, self._rows, _BLOCK_ROWS):
+                scores[start:start + _BLOCK_ROWS] = self._scores(q, start, min(start + _BLOCK_ROWS, self._rows), table)
+            scores[~mask] = -np.inf
+            wanted = min(limit * (self.oversample if self.quantization else 1), int(mask.sum()))
+            candidates = np.argpartition(-scores, wanted - 1)[:wanted] if wanted < self._rows else np.flatnonzero(mask)
+            candidates = np.sort(candidates[mask[candidates]])
+            # Re-score the candidates against their full-precision vectors
+            exact = self._full_vectors()[candidates] @ q
+            best = np.argsort(-exact)[:limit]
+            rows = [int(candidates[i]) for i in best]
+            records = self._records(rows)
+        return [VectorRecord(records[row][0], float(exact[i]), records[row][1]) for i, row in zip(best, rows)]
+
+    def _records(self, rows: Sequence[int]) -> Dict[int, tuple]:
+        marks = ",".join("?" * len(rows))
+        return {row: (memory_id, json.loads(payload)) for memory_id, row, payload in
+                self._db.execute(f"SELECT id, row, payload FROM items WHERE row IN ({marks})", list(rows))}
+
+    def get(self, vector_id: str) -> Optional[VectorRecord]:
+        with self._lock:
+            found = self._db.execute("SELECT payload FROM items WHERE id = ?", (vector_id,)).fetchone()
+        return VectorRecord(vector_id, None, json.loads(found[0])) if found else None
+
+    def list(self, filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> List[List[VectorRecord]]:
+        """Records matching ``filters``, wrapped in a list like mem0's Chroma store"""
+        with self._lock:
+            clauses = _where(filters)
+            sql = "SELECT id, payload FROM items" + (f" WHERE {clauses}" if clauses else "") + " ORDER BY row"
+            if limit:
+                sql += f" LIMIT {int(limit)}"
+            found = self._db.execute(sql, list((filters or {}).values())).fetchall()
+        return [[VectorRecord(memory_id, None, json.loads(payload)) for memory_id, payload in found]]
+
+    def update(self, vector_id: str, vector: Optional[Sequence[float]] = None, payload: Optional[Dict] = None) -> None:
+        with self._lock:
+            if vector is not None:
+                current = self.get(vector_id)
+                self.insert([vector], [payload if payload is not None else (current.payload if current else {})], [vector_id])
+            elif payload is not None:
+                self._db.execute("UPDATE items SET payload = ? WHERE id = ?", (json.dumps(payload, default=str), vector_id))
+                self._db.commit()
+
+    def delete(self, vector_id: str) -> None:
+        with self._lock:
+            self._release([vector_id])
+            self._db.commit()
+
+    def delete_col(self) -> None:
+        """Delete the collection's files"""
+        with self._lock:
+            self._db.close()
+            self._full = None
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def reset(self) -> None:
+        """Delete every vector, keeping the collection"""
+        with self._lock:
+            dims = self.dims
+            self.delete_col()
+            self.create_col(self.collection_name, dims)
+
+    def col_info(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        return {"name": self.collection_name, "count": count, "rows": self._rows, "dims": self.dims,
+                "quantization": self.quantization, "memory_bytes": self.memory_bytes}
+
+    def list_cols(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.path) if os.path.isdir(os.path.join(self.path, name)))
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes of vector data held in memory (codes, scales and the live mask)"""
+        held = [self._alive] + [rows.array for rows in (self._codes, self._scales) if rows is not None]
+        if not self.quantization and self._full is not None:
+            held.append(self._full)  # the scan pages the whole map in
+        return int(sum(array.nbytes for array in held if array is not None))
+
+    # -- Chroma collection interface (Memory) ------------------------------
+
+    def add(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]], documents: Optional[Sequence[str]] = None,
+            metadatas: Optional[Sequence[Dict]] = None) -> None:
+        documents = documents or [None] * len(ids)
+        metadatas = metadatas or [{} for _ in ids]
+        self.insert(embeddings, [{"document": d, "metadata": m} for d, m in zip(documents, metadatas)], ids)
+
+    def query(self, query_embeddings: Sequence[Sequence[float]], n_results: int = 10,
+              include: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None) -> Dict[str, List[List]]:
+        response = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        filters = {f"metadata.{key}": value for key, value in (where or {}).items()}
+        for embedding in query_embeddings:
+            records = self.search(vectors=embedding, limit=n_results, filters=filters)
+            response["ids"].append([r.id for r in records])
+            response["documents"].append([r.payload.get("document") for r in records])
+            response["metadatas"].append([r.payload.get("metadata") or {} for r in records])
+            response["distances"].append([1.0 - r.score for r in records])
+        return response
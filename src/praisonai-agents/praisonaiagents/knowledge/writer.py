@@ -0,0 +1,84 @@
+"""
+Direct vector-store writes for Knowledge chunks.
+
+Storing a chunk through mem0's ``Memory.add`` formats it as a message,
+embeds it on its own, inserts it alone and records a history row, on top of
+the ``add`` wrapper's own bookkeeping. None of that is needed for document
+chunks. ``VectorStoreWriter`` embeds a batch of chunks at once (one request
+for OpenAI-style embedders) and inserts them with a single call to the
+configured mem0 vector store.
+
+Payloads have the layout mem0 itself writes (``data``, ``hash``,
+``created_at``, the user/agent/run ids and the metadata), so the chunks are
+found by ``Memory.search``, ``get_all`` and ``delete`` as before. They have
+no history rows.
+"""
+
+import hashlib
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Inputs per embedding request (the OpenAI API accepts up to 2048)
+MAX_EMBED_BATCH = 256
+
+
+class VectorStoreWriter:
+    """Writes chunks straight into the vector store of a mem0 ``Memory``.
+
+    Args:
+        memory: The mem0 memory whose ``embedding_model`` and
+            ``vector_store`` are used.
+    """
+
+    def __init__(self, memory: Any):
+        self.embedding_model = memory.embedding_model
+        self.vector_store = memory.vector_store
+
+    @staticmethod
+    def supports(memory: Any) -> bool:
+        """Whether ``memory`` exposes an embedder and a vector store to write to"""
+        return (hasattr(getattr(memory, 'vector_store', None), 'insert')
+                and hasattr(getattr(memory, 'embedding_model', None), 'embed'))
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed ``texts``, in as few requests as the embedder allows"""
+        model = self.embedding_model
+        client = getattr(model, 'client', None)
+        config = getattr(model, 'config', None)
+        create = getattr(getattr(client, 'embeddings', None), 'create', None)
+        if callable(create) and getattr(config, 'model', None):
+            # OpenAI and Azure OpenAI embedders: one request per batch, as mem0 would send each text
+            kwargs = {'model': config.model}
+            if getattr(config, 'embedding_dims', None):
+                kwargs['dimensions'] = config.embedding_dims
+            vectors = []
+            for start in range(0, len(texts), MAX_EMBED_BATCH):
+                batch = [text.replace("\n", " ") for text in texts[start:start + MAX_EMBED_BATCH]]
+                response = create(input=batch, **kwargs)
+                vectors.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+            return vectors
+        return [model.embed(text, memory_action="add") for text in texts]
+
+    def write(self, chunks: Sequence[Tuple[str, Optional[Dict[str, Any]]]], user_id=None, agent_id=None,
+              run_id=None) -> List[List[Dict[str, Any]]]:
+        """Insert ``(text, metadata)`` chunks; returns mem0-style results for each"""
+        texts = [text for text, _ in chunks]
+        vectors = self.embed(texts)
+        created_at = datetime.now(timezone.utc).isoformat()
+        scope = {key: value for key, value in
+                 (('user_id', user_id), ('agent_id', agent_id), ('run_id', run_id)) if value}
+        ids, payloads = [], []
+        for text, metadata in chunks:
+            payload = dict(metadata or {}, **scope)
+            payload['data'] = text
+            payload['hash'] = hashlib.md5(text.encode()).hexdigest()
+            payload['created_at'] = created_at
+            ids.append(str(uuid.uuid4()))
+            payloads.append(payload)
+        self.vector_store.insert(vectors=vectors, payloads=payloads, ids=ids)
+        logger.debug(f"Inserted {len(ids)} chunks into the vector store")
+        return [[{'id': memory_id, 'memory': text, 'event': 'ADD'}] for memory_id, text in zip(ids, texts)]
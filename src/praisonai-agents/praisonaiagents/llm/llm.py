@@ -16,6 +16,7 @@ from ..main import (
 )
 from rich.console import Console
 from rich.live import Live
+from ..streaming import relay_stream
 
 # Disable litellm telemetry before any imports
 os.environ["LITELLM_TELEMETRY"] = "False"
@@ -482,7 +483,7 @@ class LLM:
                         if verbose:
                             with Live(display_generating("", current_time), console=console, refresh_per_second=4) as live:
                                 response_text = ""
-                                for chunk in litellm.completion(
+                                for chunk in relay_stream(litellm.completion(
                                     **self._build_completion_params(
                                         messages=messages,
                                         tools=formatted_tools,
@@ -490,7 +491,7 @@ class LLM:
                                         stream=True,
                                         **kwargs
                                     )
-                                ):
+                                )):
                                     if chunk and chunk.choices and chunk.choices[0].delta.content:
                                         content = chunk.choices[0].delta.content
                                         response_text += content
@@ -498,7 +499,7 @@ class LLM:
                         else:
                             # Non-verbose mode, just collect the response
                             response_text = ""
-                            for chunk in litellm.completion(
+                            for chunk in relay_stream(litellm.completion(
                                 **self._build_completion_params(
                                     messages=messages,
                                     tools=formatted_tools,
@@ -506,7 +507,7 @@ class LLM:
                                     stream=True,
                                     **kwargs
                                 )
-                            ):
+                            )):
                                 if chunk and chunk.choices and chunk.choices[0].delta.content:
                                     response_text += chunk.choices[0].delta.content
 
@@ -631,26 +632,26 @@ class LLM:
                                     if verbose:
                                         with Live(display_generating("", start_time), console=console, refresh_per_second=4) as live:
                                             response_text = ""
-                                            for chunk in litellm.completion(
+                                            for chunk in relay_stream(litellm.completion(
                                                 **self._build_completion_params(
                                                     messages=follow_up_messages,
                                                     temperature=temperature,
                                                     stream=True
                                                 )
-                                            ):
+                                            )):
                                                 if chunk and chunk.choices and chunk.choices[0].delta.content:
                                                     content = chunk.choices[0].delta.content
                                                     response_text += content
                                                     live.update(display_generating(response_text, start_time))
                                     else:
                                         response_text = ""
-                                        for chunk in litellm.completion(
+                                        for chunk in relay_stream(litellm.completion(
                                             **self._build_completion_params(
                                                 messages=follow_up_messages,
                                                 temperature=temperature,
                                                 stream=True
                                             )
-                                        ):
+                                        )):
                                             if chunk and chunk.choices and chunk.choices[0].delta.content:
                                                 response_text += chunk.choices[0].delta.content
                             except (json.JSONDecodeError, KeyError):
@@ -694,7 +695,7 @@ class LLM:
                             if verbose:
                                 with Live(display_generating("", current_time), console=console, refresh_per_second=4) as live:
                                     final_response_text = ""
-                                    for chunk in litellm.completion(
+                                    for chunk in relay_stream(litellm.completion(
                                         **self._build_completion_params(
                                             messages=messages,
                                             tools=formatted_tools,
@@ -702,14 +703,14 @@ class LLM:
                                             stream=True,
                                             **kwargs
                                         )
-                                    ):
+                                    )):
                                         if chunk and chunk.choices and chunk.choices[0].delta.content:
                                             content = chunk.choices[0].delta.content
                                             final_response_text += content
                                             live.update(display_generating(final_response_text, current_time))
                             else:
                                 final_response_text = ""
-                                for chunk in litellm.completion(
+                                for chunk in relay_stream(litellm.completion(
                                     **self._build_completion_params(
                                         messages=messages,
                                         tools=formatted_tools,
@@ -717,7 +718,7 @@ class LLM:
                                         stream=True,
                                         **kwargs
                                     )
-                                ):
+                                )):
                                     if chunk and chunk.choices and chunk.choices[0].delta.content:
                                         final_response_text += chunk.choices[0].delta.content
                             
@@ -889,28 +890,28 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                     if verbose:
                         with Live(display_generating("", time.time()), console=console, refresh_per_second=4) as live:
                             response_text = ""
-                            for chunk in litellm.completion(
+                            for chunk in relay_stream(litellm.completion(
                                 **self._build_completion_params(
                                     messages=messages,
                                     temperature=temperature,
                                     stream=True,
                                     **kwargs
                                 )
-                            ):
+                            )):
                                 if chunk and chunk.choices and chunk.choices[0].delta.content:
                                     content = chunk.choices[0].delta.content
                                     response_text += content
                                     live.update(display_generating(response_text, time.time()))
                     else:
                         response_text = ""
-                        for chunk in litellm.completion(
+                        for chunk in relay_stream(litellm.completion(
                             **self._build_completion_params(
                                 messages=messages,
                                 temperature=temperature,
                                 stream=True,
                                 **kwargs
                             )
-                        ):
+                        )):
                             if chunk and chunk.choices and chunk.choices[0].delta.content:
                                 response_text += chunk.choices[0].delta.content
                     
@@ -1686,27 +1687,27 @@ Output MUST be JSON with 'reflection' and 'satisfactory'.
                 response_text = ""
                 if verbose:
                     with Live(display_generating("", start_time), console=console or self.console, refresh_per_second=4) as live:
-                        for chunk in litellm.completion(
+                        for chunk in relay_stream(litellm.completion(
                             **self._build_completion_params(
                                 messages=messages,
                                 temperature=temperature,
                                 stream=True,
                                 **kwargs
                             )
-                        ):
+                        )):
                             if chunk and chunk.choices and chunk.choices[0].delta.content:
                                 content = chunk.choices[0].delta.content
                                 response_text += content
                                 live.update(display_generating(response_text, start_time))
                 else:
-                    for chunk in litellm.completion(
+                    for chunk in relay_stream(litellm.completion(
                         **self._build_completion_params(
                             messages=messages,
                             temperature=temperature,
                             stream=True,
                             **kwargs
                         )
-                    ):
+                    )):
                         if chunk and chunk.choices and chunk.choices[0].delta.content:
                             response_text += chunk.choices[0].delta.content
             else:
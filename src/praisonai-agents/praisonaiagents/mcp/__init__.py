@@ -5,5 +5,6 @@ This package provides classes and utilities for connecting to MCP servers
 using different transport methods (stdio, SSE, etc.).
 """
 from .mcp import MCP
+from .manager import MCPConnectionManager, get_connection_manager
 
-__all__ = ["MCP"]
+__all__ = ["MCP", "MCPConnectionManager", "get_connection_manager"]
@@ -0,0 +1,122 @@
+"""
+On-disk cache of MCP tool catalogs.
+
+Listing tools is the slowest part of connecting to a server with many tools.
+The catalog of each server is saved after every successful ``list_tools`` so
+the next start can use it immediately while the live listing refreshes it in
+the background.
+
+Catalogs are keyed by the server's identity (command, args and working
+directory, or URL), not by its version. After a server is upgraded, the
+tools saved for the old version are offered until the live listing replaces
+them. Pass ``cache_tools=False`` to MCP, or delete the catalog, to avoid that.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("mcp-wrapper")
+
+DEFAULT_CATALOG_DIR = os.path.join(".praison", "mcp_catalogs")
+
+
+class CachedTool:
+    """A tool definition loaded from the catalog, shaped like ``mcp.types.Tool``"""
+
+    def __init__(self, name: str, description: Optional[str] = None, inputSchema: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.description = description
+        self.inputSchema = inputSchema or {"type": "object", "properties": {}}
+
+    def __repr__(self) -> str:
+        return f"CachedTool(name={self.name!r})"
+
+
+def server_identity(server_params) -> Dict[str, Any]:
+    """Stable identity of a stdio server.
+
+    The environment is left out: MCP passes a copy of os.environ, which
+    differs between shells and would make every start a cache miss.
+    """
+    return {
+        "command": server_params.command,
+        "args": list(server_params.args or ()),
+        "cwd": str(getattr(server_params, "cwd", None) or ""),
+    }
+
+
+class ToolCatalogCache:
+    """Tool catalogs keyed by server identity, with the server version recorded.
+
+    Args:
+        directory: Where catalogs are stored, one JSON file per server.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or DEFAULT_CATALOG_DIR
+        self._lock = threading.Lock()
+
+    def _path(self, identity: Dict[str, Any]) -> str:
+        digest = hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:32]
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def load(self, identity: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return ``{"server": ..., "tools": [CachedTool], "saved_at": ...}`` or None"""
+        try:
+            with open(self._path(identity), encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable MCP tool catalog: {e}")
+            return None
+        if entry.get("identity") != identity:
+            return None
+        entry["tools"] = [CachedTool(**tool) for tool in entry.get("tools", [])]
+        return entry
+
+    def save(self, identity: Dict[str, Any], tools: Sequence[Any], server: Optional[Dict[str, Any]] = None) -> None:
+        """Write the catalog atomically so concurrent readers never see a partial file"""
+        entry = {
+            "identity": identity,
+            "server": server or {},
+            "saved_at": time.time(),
+            "tools": [
+                {
+                    "name": tool.name,
+                    "description": getattr(tool, "description", None),
+                    "inputSchema": getattr(tool, "inputSchema", None),
+                }
+                for tool in tools
+            ],
+        }
+        path = self._path(identity)
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entry, f)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning(f"Could not save MCP tool catalog: {e}")
+
+    def invalidate(self, identity: Dict[str, Any]) -> None:
+        try:
+            os.remove(self._path(identity))
+        except FileNotFoundError:
+            pass
+
+
+def tool_signature(tools: Sequence[Any]) -> List[tuple]:
+    """Comparable summary of a catalog, used to detect changes"""
+    return [
+        (tool.name, getattr(tool, "description", None), json.dumps(getattr(tool, "inputSchema", None), sort_keys=True))
+        for tool in tools
+    ]
@@ -0,0 +1,307 @@
+"""
+Process-wide manager for MCP server connections.
+
+Every ``MCP("python app.py")`` used to start its own server and repeat
+``initialize`` and ``list_tools``. The manager keys servers by command, args,
+env and cwd, so agents configured with the same server share one warm
+pool of sessions. Each pool can run several replicas of the server, spreads
+calls across them, and restarts replicas that crash or stop answering pings.
+SSE and streamable HTTP servers are shared the same way, one session per
+URL; calls on that session run concurrently.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .mcp import MCPToolRunner
+
+logger = logging.getLogger("mcp-wrapper")
+
+
+def connection_key(server_params) -> Tuple:
+    """Identity of a stdio server: command, args, env and working directory"""
+    env = getattr(server_params, "env", None) or {}
+    return (
+        server_params.command,
+        tuple(server_params.args or ()),
+        tuple(sorted(env.items())),
+        str(getattr(server_params, "cwd", None) or ""),
+    )
+
+
+class MCPServerPool:
+    """Replicas of one MCP server with load balancing and health checks.
+
+    Exposes the same interface as MCPToolRunner (``tools``, ``initialized``,
+    ``call_tool``, ``acall_tool``, ``shutdown``), so MCP uses either one.
+
+    Args:
+        server_params: StdioServerParameters for the server.
+        timeout: Initialization and default per-call timeout in seconds.
+        replicas: Number of server processes to run.
+        health_interval: Seconds between pings of each replica, or None to
+            only check liveness when a call is dispatched.
+        catalog: ToolCatalogCache shared by the replicas.
+        tools: Tools to expose until a replica has listed them (from the catalog).
+    """
+
+    def __init__(self, server_params, timeout: float = 60, replicas: int = 1,
+                 health_interval: Optional[float] = 30.0, catalog=None, tools=None):
+        if replicas < 1:
+            raise ValueError("replicas must be at least 1")
+        self.server_params = server_params
+        self.timeout = timeout
+        self.health_interval = health_interval
+        self.catalog = catalog
+        self._preloaded_tools = list(tools or [])
+        self.restarts = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self.replicas: List[MCPToolRunner] = [self._spawn() for _ in range(replicas)]
+        self.initialized = threading.Event()
+        self._watcher = None
+        threading.Thread(target=self._wait_ready, daemon=True).start()
+
+    def _spawn(self) -> MCPToolRunner:
+        known = self.tools if getattr(self, "replicas", None) else self._preloaded_tools
+        return MCPToolRunner(self.server_params, self.timeout, catalog=self.catalog, tools=known)
+
+    def _wait_ready(self) -> None:
+        for runner in self.replicas:
+            runner.initialized.wait(self.timeout)
+        self.initialized.set()
+        if self.health_interval:
+            self._watcher = threading.Thread(target=self._watch, daemon=True)
+            self._watcher.start()
+
+    def _tools_source(self) -> Optional[MCPToolRunner]:
+        # Prefer a replica that has listed tools live over one still using the catalog
+        ready = [r for r in self.replicas if r.tools and r.session is not None]
+        return (ready or [r for r in self.replicas if r.tools] or [None])[0]
+
+    @property
+    def tools(self) -> List[Any]:
+        source = self._tools_source()
+        return source.tools if source is not None else self._preloaded_tools
+
+    @property
+    def tools_version(self) -> Tuple[int, int]:
+        """Changes whenever the tools returned by ``tools`` may have changed"""
+        source = self._tools_source()
+        return (id(source), source.tools_version if source is not None else 0)
+
+    @property
+    def init_error(self) -> Optional[str]:
+        return next((r.init_error for r in self.replicas if r.init_error), None)
+
+    @staticmethod
+    def _alive(runner: MCPToolRunner) -> bool:
+        return runner.is_alive() and (runner.session is not None or not runner.initialized.is_set())
+
+    def _restart(self, index: int, runner: MCPToolRunner) -> MCPToolRunner:
+        with self._lock:
+            if self.replicas[index] is not runner or self._closed.is_set():
+                return self.replicas[index]
+            logger.warning(f"Restarting MCP server replica {index} for {self.server_params.command}")
+            runner.shutdown()
+            fresh = self._spawn()
+            self.replicas[index] = fresh
+            self.restarts += 1
+        fresh.initialized.wait(self.timeout)
+        return fresh
+
+    def _pick(self) -> MCPToolRunner:
+        """The live replica with the fewest calls in flight, restarting dead ones"""
+        for index, runner in enumerate(list(self.replicas)):
+            if not self._alive(runner):
+                self._restart(index, runner)
+        replicas = list(self.replicas)
+        # Rotate the starting point so ties are spread round-robin
+        start, self._next = self._next % len(replicas), self._next + 1
+        replicas = replicas[start:] + replicas[:start]
+        return min(replicas, key=lambda r: (not self._alive(r), r.in_flight))
+
+    def _after_error(self, runner: MCPToolRunner, result: Any) -> None:
+        """Restart a replica whose call failed because the server went away"""
+        if isinstance(result, str) and result.startswith("Error:") and not runner.ping(timeout=1):
+            for index, current in enumerate(list(self.replicas)):
+                if current is runner:
+                    self._restart(index, runner)
+
+    def call_tool(self, tool_name, arguments, timeout=None):
+        """Call a tool on the least busy replica"""
+        self.initialized.wait(self.timeout)
+        runner = self._pick()
+        result = runner.call_tool(tool_name, arguments, timeout)
+        self._after_error(runner, result)
+        return result
+
+    async def acall_tool(self, tool_name, arguments, timeout=None):
+        """Async version of call_tool"""
+        if not self.initialized.is_set():
+            await asyncio.to_thread(self.initialized.wait, self.timeout)
+        # Picking may restart a replica and wait for it to start: not on the caller's loop
+        runner = await asyncio.to_thread(self._pick)
+        result = await runner.acall_tool(tool_name, arguments, timeout)
+        await asyncio.to_thread(self._after_error, runner, result)
+        return result
+
+    def check_health(self) -> List[bool]:
+        """Ping every replica, restarting any that are down or do not answer"""
+        healthy = []
+        for index, runner in enumerate(list(self.replicas)):
+            ok = self._alive(runner) and runner.ping(timeout=min(self.timeout, 10))
+            if not ok and not self._closed.is_set():
+                runner = self._restart(index, runner)
+                ok = self._alive(runner)
+            healthy.append(ok)
+        return healthy
+
+    def _watch(self) -> None:
+        while not self._closed.wait(self.health_interval):
+            try:
+                self.check_health()
+            except Exception as e:
+                logger.error(f"MCP health check failed: {e}")
+
+    def shutdown(self) -> None:
+        """Stop every replica"""
+        self._closed.set()
+        for runner in self.replicas:
+            runner.shutdown()
+
+
+class MCPConnectionManager:
+    """Shares MCPServerPools across every MCP instance in the process.
+
+    Pools are reference counted: ``acquire`` returns the existing pool for a
+    server (growing it if more replicas are requested) and ``release`` shuts
+    it down when the last user lets go.
+    """
+
+    def __init__(self):
+        self._pools: Dict[Tuple, MCPServerPool] = {}
+        self._refs: Dict[Tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, server_params, timeout: float = 60, replicas: int = 1,
+                health_interval: Optional[float] = 30.0, catalog=None, tools=None) -> MCPServerPool:
+        key = connection_key(server_params)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None or pool._closed.is_set():
+                pool = MCPServerPool(server_params, timeout, replicas, health_interval, catalog, tools)
+                self._pools[key] = pool
+                self._refs[key] = 0
+            else:
+                with pool._lock:
+                    while len(pool.replicas) < replicas:
+                        pool.replicas.append(pool._spawn())
+            self._refs[key] += 1
+            return pool
+
+    def acquire_remote(self, server_url: str, timeout: float = 60, debug: bool = False, catalog=None,
+                       transport: str = "sse", retry_interrupted_calls: bool = False):
+        """Return the shared client for ``server_url``, connecting on first use.
+
+        ``transport`` is "sse" or "http" (streamable HTTP). Users that retry
+        interrupted calls get a separate client from those that do not.
+        """
+        if transport == "http":
+            from .mcp_http import HTTPStreamMCPClient as client_class
+        else:
+            from .mcp_sse import SSEMCPClient as client_class
+
+        key = (transport, server_url, retry_interrupted_calls)
+        with self._lock:
+            client = self._pools.get(key)
+            if client is not None:
+                self._refs[key] += 1
+                return client
+        # Connect outside the lock so a slow server does not block other acquires
+        fresh = client_class(server_url, debug=debug, timeout=timeout, catalog=catalog,
+                             retry_interrupted_calls=retry_interrupted_calls)
+        with self._lock:
+            client = self._pools.get(key)
+            if client is None:
+                client = self._pools[key] = fresh
+                self._refs[key] = 0
+            self._refs[key] += 1
+        if client is not fresh:
+            fresh.close()
+        return client
+
+    def release(self, pool) -> None:
+        """Drop one reference to a pool or SSE client, closing it after the last"""
+        with self._lock:
+            key = next((k for k, p in self._pools.items() if p is pool), None)
+            if key is None:
+                return
+            self._refs[key] -= 1
+            if self._refs[key] > 0:
+                return
+            del self._pools[key]
+            del self._refs[key]
+        self._close(pool)
+
+    @staticmethod
+    def _close(pool) -> None:
+        if isinstance(pool, MCPServerPool):
+            pool.shutdown()
+        else:
+            pool.close()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-server replica count, users, restarts and calls in flight"""
+        stats = []
+        with self._lock:
+            for key, pool in self._pools.items():
+                if isinstance(pool, MCPServerPool):
+                    stats.append({
+                        "command": key[0],
+                        "args": list(key[1]),
+                        "users": self._refs[key],
+                        "replicas": len(pool.replicas),
+                        "restarts": pool.restarts,
+                        "in_flight": sum(r.in_flight for r in pool.replicas),
+                    })
+                else:
+                    stats.append({"url": key[1], "transport": key[0], "users": self._refs[key]})
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop every managed server"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+            self._refs.clear()
+        for pool in pools:
+            self._close(pool)
+
+
+_manager: Optional[MCPConnectionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_connection_manager() -> MCPConnectionManager:
+    """Return the process-wide connection manager"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = MCPConnectionManager()
+        return _manager
+
+
+def _forget_after_fork() -> None:
+    # Runner threads do not survive fork; a child process starts its own servers
+    global _manager, _manager_lock
+    _manager = None
+    _manager_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_after_fork)
@@ -1,6 +1,6 @@
 import asyncio
+import concurrent.futures
 import threading
-import queue
 import time
 import inspect
 import shlex
@@ -12,80 +12,132 @@ from functools import wraps, partial
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.types import ToolListChangedNotification
+
+from .catalog import ToolCatalogCache, server_identity, tool_signature
 
 class MCPToolRunner(threading.Thread):
-    """A dedicated thread for running MCP operations."""
+    """A dedicated thread running the MCP session's event loop.
+
+    Callers on any thread submit calls to the loop with
+    ``asyncio.run_coroutine_threadsafe``; each call gets its own future, so
+    many ``session.call_tool`` requests run concurrently over the one session
+    and results can never reach the wrong caller.
+
+    Args:
+        server_params: StdioServerParameters for the server process.
+        timeout: Seconds to wait for initialization and, by default, per call.
+        max_concurrency: Maximum calls in flight at once (None for no limit).
+        catalog: ToolCatalogCache that receives every fresh tool listing.
+        tools: Tools to expose until the live listing arrives (from the catalog).
+    """
     
-    def __init__(self, server_params, timeout=60):
+    def __init__(self, server_params, timeout=60, max_concurrency=None, catalog=None, tools=None):
         super().__init__(daemon=True)
         self.server_params = server_params
-        self.queue = queue.Queue()
-        self.result_queue = queue.Queue()
         self.initialized = threading.Event()
-        self.tools = []
+        self.tools = list(tools or [])
+        self.tools_version = 0
+        self.server_info = None
+        self.catalog = catalog
+        self._background = set()
         self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.loop = None
+        self.session = None
+        self.init_error = None
+        self._stop_event = None
+        self._semaphore = None
+        self._closing = False
+        self.in_flight = 0
         self.start()
         
     def run(self):
-        """Main thread function that processes MCP requests."""
+        """Main thread function that runs the session until shutdown."""
         asyncio.run(self._run_async())
         
     async def _run_async(self):
         """Async entry point for MCP operations."""
+        self.loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        if self.max_concurrency:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
         try:
             # Set up MCP session
             async with stdio_client(self.server_params) as (read, write):
-                async with ClientSession(read, write) as session:
+                async with ClientSession(read, write, message_handler=self._handle_message) as session:
                     # Initialize connection
-                    await session.initialize()
+                    init_result = await session.initialize()
+                    server_info = getattr(init_result, 'serverInfo', None)
+                    if server_info is not None:
+                        self.server_info = {"name": server_info.name, "version": server_info.version}
                     
                     # Get tools
-                    tools_result = await session.list_tools()
-                    self.tools = tools_result.tools
+                    await self._refresh_tools(session)
+                    self.session = session
                     
                     # Signal that initialization is complete
                     self.initialized.set()
                     
-                    # Process requests
-                    while True:
-                        try:
-                            # Check for new requests
-                            try:
-                                item = self.queue.get(block=False)
-                                if item is None:  # Shutdown signal
-                                    break
-                                
-                                tool_name, arguments = item
-                                try:
-                                    result = await session.call_tool(tool_name, arguments)
-                                    self.result_queue.put((True, result))
-                                except Exception as e:
-                                    self.result_queue.put((False, str(e)))
-                            except queue.Empty:
-                                pass
-                            
-                            # Give other tasks a chance to run
-                            await asyncio.sleep(0.01)
-                        except asyncio.CancelledError:
-                            break
+                    # Calls run as their own tasks; just wait for shutdown
+                    if not self._closing:
+                        await self._stop_event.wait()
         except Exception as e:
+            self.init_error = f"MCP initialization error: {str(e)}"
+            logging.error(self.init_error)
+        finally:
+            self.session = None
             self.initialized.set()  # Ensure we don't hang
-            self.result_queue.put((False, f"MCP initialization error: {str(e)}"))
     
-    def call_tool(self, tool_name, arguments):
-        """Call an MCP tool and wait for the result."""
+    async def _refresh_tools(self, session):
+        """List tools, bumping tools_version if they changed and updating the catalog."""
+        tools_result = await session.list_tools()
+        # Save first, so the catalog is current by the time the new tools are visible
+        if self.catalog is not None:
+            self.catalog.save(server_identity(self.server_params), tools_result.tools, self.server_info)
+        if tool_signature(tools_result.tools) != tool_signature(self.tools):
+            self.tools = tools_result.tools
+            self.tools_version += 1
+    
+    async def _handle_message(self, message):
+        """Refresh the tool list when the server sends tools/list_changed."""
+        notification = getattr(message, 'root', message)
+        if isinstance(notification, ToolListChangedNotification) and self.session is not None:
+            task = asyncio.ensure_future(self._refresh_tools(self.session))
+            self._background.add(task)
+            task.add_done_callback(self._refresh_done)
+    
+    def _refresh_done(self, task):
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.warning(f"MCP tool list refresh failed: {task.exception()}")
+    
+    async def _call(self, tool_name, arguments, timeout):
+        self.in_flight += 1
+        try:
+            if self._semaphore is not None:
+                async with self._semaphore:
+                    return await asyncio.wait_for(self.session.call_tool(tool_name, arguments), timeout)
+            return await asyncio.wait_for(self.session.call_tool(tool_name, arguments), timeout)
+        finally:
+            self.in_flight -= 1
+    
+    def _submit(self, tool_name, arguments, timeout):
+        """Schedule a call on the session loop; returns (future, error message)"""
         if not self.initialized.is_set():
-            self.initialized.wait(timeout=self.timeout)
-            if not self.initialized.is_set():
-                return f"Error: MCP initialization timed out after {self.timeout} seconds"
-        
-        # Put request in queue
-        self.queue.put((tool_name, arguments))
-        
-        # Wait for result
-        success, result = self.result_queue.get()
-        if not success:
-            return f"Error: {result}"
+            return None, f"Error: MCP initialization timed out after {self.timeout} seconds"
+        if self.session is None:
+            return None, f"Error: {self.init_error or 'MCP session is closed'}"
+        timeout = self.timeout if timeout is None else timeout
+        return asyncio.run_coroutine_threadsafe(self._call(tool_name, arguments, timeout), self.loop), None
+    
+    def _format_result(self, tool_name, future):
+        try:
+            result = future.result()
+        except (asyncio.TimeoutError, TimeoutError):
+            return f"Error: MCP tool {tool_name} timed out"
+        except Exception as e:
+            return f"Error: {str(e)}"
         
         # Process result
         if hasattr(result, 'content') and result.content:
@@ -94,9 +146,49 @@ class MCPToolRunner(threading.Thread):
             return str(result.content[0])
         return str(result)
     
+    def call_tool(self, tool_name, arguments, timeout=None):
+        """Call an MCP tool and wait for the result.
+        
+        Safe to call from many threads at once; ``timeout`` overrides the
+        runner's per-call timeout.
+        """
+        self.initialized.wait(timeout=self.timeout)
+        future, error = self._submit(tool_name, arguments, timeout)
+        if error:
+            return error
+        concurrent.futures.wait([future])
+        return self._format_result(tool_name, future)
+    
+    async def acall_tool(self, tool_name, arguments, timeout=None):
+        """Async version of call_tool for callers running their own event loop."""
+        if not self.initialized.is_set():
+            await asyncio.to_thread(self.initialized.wait, self.timeout)
+        future, error = self._submit(tool_name, arguments, timeout)
+        if error:
+            return error
+        await asyncio.wait([asyncio.wrap_future(future)])
+        return self._format_result(tool_name, future)
+    
+    def ping(self, timeout=10):
+        """Return True if the server answers a ping within ``timeout`` seconds."""
+        if self.session is None or self.loop is None:
+            return False
+        future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(self.session.send_ping(), timeout), self.loop)
+        try:
+            future.result()
+            return True
+        except Exception as e:
+            logging.debug(f"MCP ping failed: {e}")
+            return False
+    
     def shutdown(self):
         """Signal the thread to shut down."""
-        self.queue.put(None)
+        self._closing = True
+        if self.loop is not None and self._stop_event is not None:
+            try:
+                self.loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                pass  # loop already closed
 
 
 class MCP:
@@ -135,11 +227,20 @@ class MCP:
             tools=MCP("http://localhost:8080/sse")
         )
         
+        # Method 4: Using a streamable HTTP endpoint
+        agent = Agent(
+            instructions="You are a helpful assistant...",
+            llm="gpt-4o-mini",
+            tools=MCP("http://localhost:8080/mcp", transport="http")
+        )
+        
         agent.start("What is the stock price of Tesla?")
         ```
     """
     
-    def __init__(self, command_or_string=None, args=None, *, command=None, timeout=60, debug=False, **kwargs):
+    def __init__(self, command_or_string=None, args=None, *, command=None, timeout=60, debug=False,
+                 shared=True, replicas=1, health_interval=30.0, cache_tools=True, catalog_dir=None,
+                 transport=None, retry_interrupted_calls=False, **kwargs):
         """
         Initialize the MCP connection and get tools.
         
@@ -153,6 +254,18 @@ class MCP:
             command: Alternative parameter name for backward compatibility
             timeout: Timeout in seconds for MCP server initialization and tool calls (default: 60)
             debug: Enable debug logging for MCP operations (default: False)
+            shared: Share one warm server pool with every other MCP instance using the
+                    same command, args and env, or one session per SSE URL (default: True)
+            replicas: Number of server processes to run and balance calls across (default: 1)
+            health_interval: Seconds between health pings of shared servers; crashed
+                             servers are restarted (default: 30, None to disable)
+            cache_tools: Load the tool catalog saved by a previous run so tools are available
+                         without waiting for list_tools; it is refreshed in the background (default: True)
+            catalog_dir: Directory for saved tool catalogs (default: .praison/mcp_catalogs)
+            transport: Transport for URLs: "sse" (default) or "http" for streamable HTTP,
+                       which pools keep-alive connections and resumes dropped sessions
+            retry_interrupted_calls: For URLs, also retry a tool call whose connection dropped
+                       after it was sent; the tool may then run twice (default: False)
             **kwargs: Additional parameters for StdioServerParameters
         """
         # Handle backward compatibility with named parameter 'command'
@@ -163,35 +276,57 @@ class MCP:
         if debug:
             logging.getLogger("mcp-wrapper").setLevel(logging.DEBUG)
             logging.getLogger("mcp-sse").setLevel(logging.DEBUG)
+            logging.getLogger("mcp-http").setLevel(logging.DEBUG)
             logging.getLogger("mcp.client").setLevel(logging.DEBUG)
             logging.getLogger("sse").setLevel(logging.DEBUG)
             logging.getLogger("mcp-server").setLevel(logging.DEBUG)
             logging.getLogger("mcp-client").setLevel(logging.DEBUG)
             logging.getLogger("_client").setLevel(logging.DEBUG)
             logging.getLogger("httpx").setLevel(logging.DEBUG)
+            logging.getLogger("httpx2").setLevel(logging.DEBUG)
             logging.getLogger("llm").setLevel(logging.DEBUG)
         else:
             # Set all MCP-related loggers to WARNING level by default
             logging.getLogger("mcp-wrapper").setLevel(logging.WARNING)
             logging.getLogger("mcp-sse").setLevel(logging.WARNING)
+            logging.getLogger("mcp-http").setLevel(logging.WARNING)
             logging.getLogger("mcp.client").setLevel(logging.WARNING)
             logging.getLogger("sse").setLevel(logging.WARNING)
             logging.getLogger("mcp-server").setLevel(logging.WARNING)
             logging.getLogger("mcp-client").setLevel(logging.WARNING)
             logging.getLogger("_client").setLevel(logging.WARNING)
             logging.getLogger("httpx").setLevel(logging.WARNING)
+            logging.getLogger("httpx2").setLevel(logging.WARNING)
             logging.getLogger("llm").setLevel(logging.WARNING)
         
         # Store additional parameters
         self.timeout = timeout
         self.debug = debug
+        self._wrappers = None
+        self._openai_tools = None
+        catalog = ToolCatalogCache(catalog_dir) if cache_tools else None
         
-        # Check if this is an SSE URL
+        # Check if this is a URL (SSE or streamable HTTP)
         if isinstance(command_or_string, str) and re.match(r'^https?://', command_or_string):
-            # Import the SSE client implementation
-            from .mcp_sse import SSEMCPClient
-            self.sse_client = SSEMCPClient(command_or_string, debug=debug, timeout=timeout)
-            self._tools = list(self.sse_client.tools)
+            transport = {None: "sse", "streamable-http": "http"}.get(transport, transport)
+            if transport not in ("sse", "http"):
+                raise ValueError(f"Unknown MCP transport {transport!r}; expected 'sse' or 'http'")
+            self.transport = transport
+            if shared:
+                from .manager import get_connection_manager
+                self.sse_client = get_connection_manager().acquire_remote(
+                    command_or_string, timeout, debug=debug, catalog=catalog, transport=transport,
+                    retry_interrupted_calls=retry_interrupted_calls
+                )
+            elif transport == "http":
+                from .mcp_http import HTTPStreamMCPClient
+                self.sse_client = HTTPStreamMCPClient(command_or_string, debug=debug, timeout=timeout, catalog=catalog,
+                                                      retry_interrupted_calls=retry_interrupted_calls)
+            else:
+                from .mcp_sse import SSEMCPClient
+                self.sse_client = SSEMCPClient(command_or_string, debug=debug, timeout=timeout, catalog=catalog,
+                                               retry_interrupted_calls=retry_interrupted_calls)
+            self._shared = shared
             self.is_sse = True
             self.is_npx = False
             return
@@ -229,10 +364,21 @@ class MCP:
             args=arguments,
             **kwargs
         )
-        self.runner = MCPToolRunner(self.server_params, timeout)
+        cached = catalog.load(server_identity(self.server_params)) if catalog else None
+        runner_options = {"catalog": catalog, "tools": cached["tools"] if cached else None}
+        if shared or replicas > 1:
+            from .manager import get_connection_manager
+            self.runner = get_connection_manager().acquire(
+                self.server_params, timeout, replicas=replicas, health_interval=health_interval,
+                **runner_options
+            )
+            self._shared = True
+        else:
+            self.runner = MCPToolRunner(self.server_params, timeout, **runner_options)
+            self._shared = False
         
-        # Wait for initialization
-        if not self.runner.initialized.wait(timeout=self.timeout):
+        # Wait for initialization, unless a saved catalog already lists the tools
+        if not self.runner.tools and not self.runner.initialized.wait(timeout=self.timeout):
             print(f"Warning: MCP initialization timed out after {self.timeout} seconds")
         
         # Automatically detect if this is an NPX command
@@ -242,9 +388,16 @@ class MCP:
         if self.is_npx:
             self._function_declarations = []
             self._initialize_npx_mcp_tools(cmd, arguments)
-        else:
-            # Generate tool functions immediately and store them
-            self._tools = self._generate_tool_functions()
+    
+    @property
+    def _tools(self) -> List[Callable]:
+        """Tool functions, generated on first use and again whenever the server's tools change."""
+        if self.is_sse:
+            return list(self.sse_client.tools)
+        version = self.runner.tools_version
+        if self._wrappers is None or self._wrappers[0] != version:
+            self._wrappers = (version, self._generate_tool_functions())
+        return self._wrappers[1]
     
     def _generate_tool_functions(self) -> List[Callable]:
         """
@@ -347,8 +500,13 @@ class MCP:
             # Call the tool
             return self.runner.call_tool(tool.name, all_args)
         
+        async def acall(**kwargs):
+            # Awaited by execute_tool_async without tying up an executor thread
+            return await self.runner.acall_tool(tool.name, kwargs)
+        
         # Make sure the wrapper has the correct signature for inspection
         wrapper.__signature__ = inspect.Signature(params)
+        wrapper.acall = acall
         
         return wrapper
     
@@ -361,7 +519,7 @@ class MCP:
                 logging.debug(f"Initializing NPX MCP tools with command: {cmd} {' '.join(arguments)}")
             
             # Generate tool functions using the regular MCP approach
-            self._tools = self._generate_tool_functions()
+            self._wrappers = (self.runner.tools_version, self._generate_tool_functions())
             
             if self.debug:
                 logging.debug(f"Generated {len(self._tools)} NPX MCP tools")
@@ -398,6 +556,10 @@ class MCP:
             logging.warning("No MCP tools available to convert to OpenAI format")
             return None
             
+        version = self.runner.tools_version
+        if self._openai_tools is not None and self._openai_tools[0] == version:
+            return self._openai_tools[1]
+        
         # Convert all tools to OpenAI format
         openai_tools = []
         for tool in self.runner.tools:
@@ -422,9 +584,22 @@ class MCP:
                 }
             })
         
+        self._openai_tools = (version, openai_tools)
         return openai_tools
     
+    def close(self):
+        """Release the server connection; shared servers stop when their last user closes."""
+        runner = self.__dict__.pop('runner', None) or self.__dict__.pop('sse_client', None)
+        if runner is None:
+            return
+        if getattr(self, '_shared', False):
+            from .manager import get_connection_manager
+            get_connection_manager().release(runner)
+        elif getattr(self, 'is_sse', False):
+            runner.close()
+        else:
+            runner.shutdown()
+    
     def __del__(self):
         """Clean up resources when the object is garbage collected."""
-        if hasattr(self, 'runner'):
-            self.runner.shutdown() 
\ No newline at end of file
+        self.close() 
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""
+Streamable HTTP client implementation for MCP (Model Context Protocol).
+
+Unlike the legacy SSE transport, every request is a plain HTTP POST, so
+connections to all servers go through one process-wide keep-alive pool and
+concurrent calls on a session share pooled connections (multiplexed over
+HTTP/2 when ``h2`` is installed). When the connection drops the client
+reconnects with backoff and resumes the same server session through the
+``Mcp-Session-Id`` header; if the server no longer knows the session a new
+one is started. A call is retried after reconnecting only if it never
+reached the server (it could not connect, or the server rejected the
+expired session), unless ``retry_interrupted_calls`` is set.
+"""
+
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from mcp import ClientSession
+
+try:  # mcp>=2 uses httpx2 and renamed the transport
+    import httpx2 as httpx
+    from mcp.client.streamable_http import streamable_http_client
+    _LEGACY_TRANSPORT = False
+except ImportError:
+    import httpx
+    from mcp.client.streamable_http import streamablehttp_client
+    _LEGACY_TRANSPORT = True
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from .mcp_sse import SSEMCPClient
+
+logger = logging.getLogger("mcp-http")
+
+SESSION_HEADER = "mcp-session-id"
+
+_pool = None
+
+
+def get_http_pool():
+    """Return the keep-alive connection pool shared by every HTTP MCP client.
+
+    The pool is bound to the MCP event loop, which all clients run on.
+    """
+    global _pool
+    if _pool is None:
+        _pool = httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60.0),
+        )
+    return _pool
+
+
+def _forget_pool_after_fork():
+    # The pool's connections belong to the parent's event loop
+    global _pool
+    _pool = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pool_after_fork)
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Sends a client's requests through the shared pool; closing the client leaves the pool open"""
+
+    async def handle_async_request(self, request):
+        return await get_http_pool().handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+
+class HTTPStreamMCPClient(SSEMCPClient):
+    """A client for connecting to an MCP server over streamable HTTP."""
+
+    def __init__(self, server_url: str, debug: bool = False, timeout: int = 60, catalog=None,
+                 headers: Optional[Dict[str, str]] = None, max_retries: int = 5,
+                 retry_interrupted_calls: bool = False):
+        """
+        Initialize a streamable HTTP MCP client.
+
+        Args:
+            server_url: The URL of the MCP endpoint (e.g. "http://localhost:8080/mcp")
+            debug: Whether to enable debug logging
+            timeout: Timeout in seconds for operations (default: 60)
+            catalog: ToolCatalogCache; a saved catalog makes the tools available
+                     without waiting for the connection
+            headers: Extra HTTP headers sent with every request (e.g. authorization)
+            max_retries: Consecutive failed connection attempts before giving up
+            retry_interrupted_calls: Also retry a call whose connection dropped
+                     after it was sent (the tool may then run twice)
+        """
+        self.headers = dict(headers or {})
+        self.session_id = None
+        self._expired = False
+        super().__init__(server_url, debug=debug, timeout=timeout, catalog=catalog, max_retries=max_retries,
+                         retry_interrupted_calls=retry_interrupted_calls)
+        if debug:
+            logger.setLevel(logging.DEBUG)
+        else:
+            logger.setLevel(logging.WARNING)
+
+    async def _remember_session(self, response):
+        session_id = response.headers.get(SESSION_HEADER)
+        if session_id:
+            self.session_id = session_id
+        elif response.status_code == 404 and SESSION_HEADER in response.request.headers:
+            # The server restarted or expired the session
+            self._expired = True
+
+    def _http_client(self, headers=None, timeout=None, auth=None):
+        request_headers = dict(self.headers)
+        request_headers.update(headers or {})
+        if self.session_id:
+            # Resume the server-side session instead of starting a new one
+            request_headers[SESSION_HEADER] = self.session_id
+        return httpx.AsyncClient(
+            transport=_SharedTransport(),
+            headers=request_headers,
+            timeout=timeout or httpx.Timeout(30.0, read=300.0),
+            auth=auth,
+            event_hooks={"response": [self._remember_session]},
+        )
+
+    @asynccontextmanager
+    async def _open_streams(self):
+        # The session is terminated explicitly on close(), not when a dropped
+        # connection is torn down, so it can be resumed
+        if _LEGACY_TRANSPORT:
+            async with streamablehttp_client(
+                self.server_url, terminate_on_close=False, httpx_client_factory=self._http_client
+            ) as (read, write, _):
+                yield read, write
+        else:
+            async with self._http_client() as client:
+                async with streamable_http_client(
+                    self.server_url, http_client=client, terminate_on_close=False
+                ) as (read, write):
+                    yield read, write
+
+    async def _run_session(self):
+        """Keep a session open until close() is called, reconnecting when it drops."""
+        failures = 0
+        while not self._closed.is_set():
+            resuming = self.session_id is not None
+            try:
+                async with self._open_streams() as (read, write):
+                    async with ClientSession(read, write, message_handler=self._handle_message) as session:
+                        init_result = await session.initialize()
+                        server_info = getattr(init_result, 'serverInfo', None)
+                        if server_info is not None:
+                            self.server_info = {"name": server_info.name, "version": server_info.version}
+                        await self._refresh_tools(session)
+                        if resuming:
+                            logger.debug(f"Resumed MCP session {self.session_id} at {self.server_url}")
+                        self.session = session
+                        self._expired = False
+                        self._lost.clear()
+                        self._connected.set()
+                        if not self.session_ready.done():
+                            self.session_ready.set_result(session)
+                        failures = 0
+                        await self._wait_closed_or_lost()
+            except Exception as e:
+                if resuming and self._expired:
+                    # The server restarted or expired the session; start a fresh one
+                    logger.debug(f"Could not resume MCP session {self.session_id}: {e}")
+                    self.session_id = None
+                    self._expired = False
+                    continue
+                failures += 1
+                self.error = e
+                if failures > self.max_retries:
+                    logger.error(f"MCP HTTP connection to {self.server_url} failed: {e}")
+                    if not self.session_ready.done():
+                        self.session_ready.set_exception(e)
+                    break
+            finally:
+                self.session = None
+                self._connected.clear()
+            if not self._closed.is_set():
+                self.reconnects += 1
+                await self._sleep_unless_closed(min(0.1 * 2 ** failures, 5.0))
+        self._connected.set()  # wake callers waiting for a session that will not come
+        if self._closed.is_set() and self.session_id:
+            await self._terminate_session()
+
+    async def _terminate_session(self):
+        try:
+            async with self._http_client() as client:
+                await client.delete(self.server_url)
+        except Exception as e:
+            logger.debug(f"MCP session termination failed: {e}")
+        self.session_id = None
+
+    @staticmethod
+    def _connection_failed(error):
+        return SSEMCPClient._connection_failed(error) or isinstance(error, httpx.TransportError)
+
+    def _not_sent(self, error):
+        # A 404 for an expired session means the server did not run the call
+        return self._expired or isinstance(error, httpx.ConnectError) or super()._not_sent(error)
+
+    def _reconnect(self, session):
+        if self.session is session and self._expired:
+            self.session_id = None
+        super()._reconnect(session)
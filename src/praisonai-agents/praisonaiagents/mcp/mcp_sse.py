@@ -2,22 +2,41 @@
 SSE (Server-Sent Events) client implementation for MCP (Model Context Protocol).
 This module provides the necessary classes and functions to connect to an MCP server
 over SSE transport.
+
+When an established stream drops, the client reconnects with backoff and
+starts a new session. A tool call that fails because the connection was
+lost is retried on the new session only if the request never reached the
+server, unless ``retry_interrupted_calls`` is set: otherwise the tool could
+run twice.
 """
 
 import asyncio
+import concurrent.futures
 import logging
 import threading
 import inspect
 import json
+import os
 from typing import List, Dict, Any, Optional, Callable, Iterable
 
+import anyio
 from mcp import ClientSession
 from mcp.client.sse import sse_client
+from mcp.types import CONNECTION_CLOSED, ToolListChangedNotification
+
+try:  # mcp>=2 renamed the exception
+    from mcp.shared.exceptions import MCPError as McpError
+except ImportError:
+    from mcp.shared.exceptions import McpError
+
+from .catalog import tool_signature
 
 logger = logging.getLogger("mcp-sse")
 
 # Global event loop for async operations
 _event_loop = None
+_loop_thread = None
+_loop_lock = threading.Lock()
 
 def get_event_loop():
     """Get or create a global event loop."""
@@ -28,16 +47,43 @@ def get_event_loop():
     return _event_loop
 
 
+def get_running_event_loop():
+    """Return the global event loop, starting its background thread once."""
+    global _loop_thread
+    with _loop_lock:
+        loop = get_event_loop()
+        if _loop_thread is None or not _loop_thread.is_alive():
+            def run_event_loop():
+                asyncio.set_event_loop(loop)
+                loop.run_forever()
+            _loop_thread = threading.Thread(target=run_event_loop, daemon=True)
+            _loop_thread.start()
+        return loop
+
+
+def _forget_loop_after_fork():
+    # The loop's thread does not survive fork; a child process starts its own loop
+    global _event_loop, _loop_thread, _loop_lock
+    _event_loop = None
+    _loop_thread = None
+    _loop_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_loop_after_fork)
+
+
 class SSEMCPTool:
     """A wrapper for an MCP tool that can be used with praisonaiagents."""
     
-    def __init__(self, name: str, description: str, session: ClientSession, input_schema: Optional[Dict[str, Any]] = None, timeout: int = 60):
+    def __init__(self, name: str, description: str, session: Optional[ClientSession], input_schema: Optional[Dict[str, Any]] = None, timeout: int = 60, client: Optional["SSEMCPClient"] = None):
         self.name = name
         self.__name__ = name  # Required for Agent to recognize it as a tool
         self.__qualname__ = name  # Required for Agent to recognize it as a tool
         self.__doc__ = description  # Required for Agent to recognize it as a tool
         self.description = description
         self.session = session
+        self.client = client
         self.input_schema = input_schema or {}
         self.timeout = timeout
         
@@ -72,11 +118,26 @@ class SSEMCPTool:
             logger.error(f"Error calling tool {self.name}: {e}")
             return f"Error: {str(e)}"
     
+    async def acall(self, **kwargs):
+        """Async call for callers on any event loop, without blocking a thread."""
+        loop = self.client.loop if self.client is not None else get_event_loop()
+        try:
+            if asyncio.get_running_loop() is loop:
+                return await asyncio.wait_for(self._async_call(**kwargs), self.timeout)
+            future = asyncio.run_coroutine_threadsafe(self._async_call(**kwargs), loop)
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except Exception as e:
+            logger.error(f"Error calling tool {self.name}: {e}")
+            return f"Error: {str(e)}"
+    
     async def _async_call(self, **kwargs):
         """Call the tool with the provided arguments."""
         logger.debug(f"Async calling tool {self.name} with args: {kwargs}")
         try:
-            result = await self.session.call_tool(self.name, kwargs)
+            if self.client is not None:
+                result = await self.client._call_tool(self.name, kwargs)
+            else:
+                result = await self.session.call_tool(self.name, kwargs)
             
             # Extract text from result
             if hasattr(result, 'content') and result.content:
@@ -103,7 +164,8 @@ class SSEMCPTool:
 class SSEMCPClient:
     """A client for connecting to an MCP server over SSE."""
     
-    def __init__(self, server_url: str, debug: bool = False, timeout: int = 60):
+    def __init__(self, server_url: str, debug: bool = False, timeout: int = 60, catalog=None,
+                 max_retries: int = 5, retry_interrupted_calls: bool = False):
         """
         Initialize an SSE MCP client.
         
@@ -111,12 +173,33 @@ class SSEMCPClient:
             server_url: The URL of the SSE MCP server
             debug: Whether to enable debug logging
             timeout: Timeout in seconds for operations (default: 60)
+            catalog: ToolCatalogCache; a saved catalog makes the tools available
+                     without waiting for the connection
+            max_retries: Consecutive failed connection attempts before giving up
+            retry_interrupted_calls: Also retry a call whose connection dropped
+                     after it was sent (the tool may then run twice)
         """
         self.server_url = server_url
+        self.max_retries = max_retries
+        self.retry_interrupted_calls = retry_interrupted_calls
+        self.reconnects = 0
+        self.error = None
         self.debug = debug
         self.timeout = timeout
+        self.catalog = catalog
+        self.identity = {"url": server_url}
         self.session = None
+        self.session_ready = concurrent.futures.Future()
+        self.server_info = None
         self.tools = []
+        self.tools_version = 0
+        self.loop = None
+        self._background = set()
+        self._closed = None
+        self._connected = None
+        self._lost = None
+        self._session_task = None
+        self._serving_cached = False
         
         # Set up logging
         if debug:
@@ -129,56 +212,187 @@ class SSEMCPClient:
         
     def _initialize(self):
         """Initialize the connection and tools."""
-        # Use the global event loop
-        loop = get_event_loop()
-        
-        # Start a background thread to run the event loop
-        def run_event_loop():
-            asyncio.set_event_loop(loop)
-            loop.run_forever()
-        
-        self.loop_thread = threading.Thread(target=run_event_loop, daemon=True)
-        self.loop_thread.start()
+        # Use the global event loop, running in a background thread
+        loop = self.loop = get_running_event_loop()
+        self.loop_thread = _loop_thread
         
+        cached = self.catalog.load(self.identity) if self.catalog else None
+        if cached:
+            # Use the saved catalog now; the live listing replaces it when connected
+            self._tool_defs = cached["tools"]
+            self.tools = self._wrap_tools(cached["tools"], session=None)
+            self._serving_cached = True
+
         # Run the initialization in the event loop
         future = asyncio.run_coroutine_threadsafe(self._async_initialize(), loop)
-        self.tools = future.result(timeout=self.timeout)
+        if cached:
+            future.add_done_callback(self._log_initialize_error)
+        else:
+            future.result(timeout=self.timeout)
     
-    async def _async_initialize(self):
-        """Asynchronously initialize the connection and tools."""
-        logger.debug(f"Connecting to MCP server at {self.server_url}")
-        
-        # Create SSE client
-        self._streams_context = sse_client(url=self.server_url)
-        streams = await self._streams_context.__aenter__()
-        
-        self._session_context = ClientSession(*streams)
-        self.session = await self._session_context.__aenter__()
-        
-        # Initialize
-        await self.session.initialize()
-        
-        # List available tools
-        logger.debug("Listing tools...")
-        response = await self.session.list_tools()
-        tools_data = response.tools
-        logger.debug(f"Found {len(tools_data)} tools: {[tool.name for tool in tools_data]}")
-        
-        # Create tool wrappers
+    def _log_initialize_error(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Failed to connect to MCP server at {self.server_url}: {future.exception()}")
+    
+    def _wrap_tools(self, tools_data, session):
         tools = []
         for tool in tools_data:
             input_schema = tool.inputSchema if hasattr(tool, 'inputSchema') else None
             wrapper = SSEMCPTool(
                 name=tool.name,
                 description=tool.description if hasattr(tool, 'description') else f"Call the {tool.name} tool",
-                session=self.session,
+                session=session,
                 input_schema=input_schema,
-                timeout=self.timeout
+                timeout=self.timeout,
+                client=self
             )
             tools.append(wrapper)
-            
         return tools
     
+    async def _async_initialize(self):
+        """Asynchronously initialize the connection and tools."""
+        logger.debug(f"Connecting to MCP server at {self.server_url}")
+        self._closed = asyncio.Event()
+        self._connected = asyncio.Event()
+        self._lost = asyncio.Event()
+        self._session_task = asyncio.ensure_future(self._run_session())
+        await asyncio.wrap_future(self.session_ready)
+        return self.tools
+    
+    async def _run_session(self):
+        """Hold the SSE stream and session open until close() is called, reconnecting when it drops."""
+        failures = 0
+        while not self._closed.is_set():
+            try:
+                # Create SSE client
+                async with sse_client(url=self.server_url) as streams:
+                    async with ClientSession(*streams, message_handler=self._handle_message) as session:
+                        # Initialize
+                        init_result = await session.initialize()
+                        server_info = getattr(init_result, 'serverInfo', None)
+                        if server_info is not None:
+                            self.server_info = {"name": server_info.name, "version": server_info.version}
+                        
+                        # List available tools
+                        await self._refresh_tools(session)
+                        self.session = session
+                        self._lost.clear()
+                        self._connected.set()
+                        if not self.session_ready.done():
+                            self.session_ready.set_result(session)
+                        failures = 0
+                        await self._wait_closed_or_lost()
+            except Exception as e:
+                failures += 1
+                self.error = e
+                # A server that cannot be reached at all fails initialization right away,
+                # unless cached tools were handed out: then keep trying to connect
+                if not self.session_ready.done() and not self._serving_cached:
+                    self.session_ready.set_exception(e)
+                    break
+                if failures > self.max_retries:
+                    logger.error(f"MCP SSE connection to {self.server_url} failed: {e}")
+                    if not self.session_ready.done():
+                        self.session_ready.set_exception(e)
+                    break
+            finally:
+                self.session = None
+                self._connected.clear()
+            if not self._closed.is_set():
+                self.reconnects += 1
+                await self._sleep_unless_closed(min(0.1 * 2 ** failures, 5.0))
+        self._connected.set()  # wake callers waiting for a session that will not come
+
+    async def _wait_closed_or_lost(self):
+        waiters = [asyncio.ensure_future(self._closed.wait()), asyncio.ensure_future(self._lost.wait())]
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _sleep_unless_closed(self, delay):
+        try:
+            await asyncio.wait_for(self._closed.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+    
+    def close(self):
+        """Close the SSE stream and session."""
+        if self.loop is not None and self._closed is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._closed.set)
+    
+    async def _wait_session(self):
+        if self.session is None:
+            # Built from a cached catalog, or reconnecting: wait for the connection
+            if not self.session_ready.done():
+                await asyncio.wrap_future(self.session_ready)
+            await asyncio.wait_for(self._connected.wait(), self.timeout)
+        if self.session is None:
+            raise ConnectionError(f"MCP server at {self.server_url} is unavailable: {self.error}")
+        return self.session
+
+    @staticmethod
+    def _connection_failed(error):
+        if isinstance(error, McpError):
+            return error.error.code == CONNECTION_CLOSED
+        return isinstance(error, (ConnectionError, OSError, anyio.ClosedResourceError, anyio.BrokenResourceError))
+
+    def _not_sent(self, error):
+        """Whether the failed request provably never reached the server"""
+        return isinstance(error, (anyio.ClosedResourceError, anyio.BrokenResourceError, ConnectionRefusedError))
+
+    def _reconnect(self, session):
+        """Drop ``session`` and have _run_session open a new one"""
+        if self.session is session:
+            self.session = None
+            self._connected.clear()
+            self._lost.set()
+
+    async def _call_tool(self, name, arguments):
+        """Call a tool, reconnecting if the connection dropped and retrying when that is safe."""
+        session = await self._wait_session()
+        try:
+            return await session.call_tool(name, arguments)
+        except Exception as e:
+            safe = self._not_sent(e)
+            if not (safe or self._connection_failed(e)) or self._closed.is_set():
+                raise
+            logger.warning(f"MCP connection to {self.server_url} lost ({e}); reconnecting")
+            self._reconnect(session)
+            if not (safe or self.retry_interrupted_calls):
+                # The server may have run the tool already; calling it again could run it twice
+                raise
+        return await (await self._wait_session()).call_tool(name, arguments)
+    
+    async def _refresh_tools(self, session):
+        """List tools, rebuilding the wrappers if they changed and saving the catalog."""
+        logger.debug("Listing tools...")
+        response = await session.list_tools()
+        tools_data = response.tools
+        logger.debug(f"Found {len(tools_data)} tools: {[tool.name for tool in tools_data]}")
+        
+        # Save first, so the catalog is current by the time the new tools are visible
+        if self.catalog is not None:
+            self.catalog.save(self.identity, tools_data, self.server_info)
+        if self.session is None or tool_signature(tools_data) != tool_signature(getattr(self, '_tool_defs', [])):
+            self._tool_defs = tools_data
+            self.tools = self._wrap_tools(tools_data, session)
+            self.tools_version += 1
+    
+    async def _handle_message(self, message):
+        """Refresh the tool list on tools/list_changed; reconnect when the stream fails."""
+        if isinstance(message, Exception):
+            logger.debug(f"MCP stream from {self.server_url} failed: {message}")
+            if self.session is not None:
+                self._reconnect(self.session)
+            return
+        notification = getattr(message, 'root', message)
+        if isinstance(notification, ToolListChangedNotification) and self.session is not None:
+            task = asyncio.ensure_future(self._refresh_tools(self.session))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+    
     def __iter__(self):
         """Return an iterator over the tools."""
         return iter(self.tools)
@@ -59,6 +59,7 @@ class Memory:
       "short_db": "short_term.db",
       "long_db": "long_term.db",
       "rag_db_path": "rag_db",   # optional path for local embedding store
+      "quantization": "int8",    # optional: "int8" or "binary" local quantized store instead of Chroma
       "config": {
         "api_key": "...",       # if mem0 usage
         "org_id": "...",
@@ -113,7 +114,9 @@ class Memory:
             
         self.provider = self.cfg.get("provider", "rag")
         self.use_mem0 = (self.provider.lower() == "mem0") and MEM0_AVAILABLE
-        self.use_rag = (self.provider.lower() == "rag") and CHROMADB_AVAILABLE and self.cfg.get("use_embedding", False)
+        self.quantization = self.cfg.get("quantization")
+        self.use_rag = ((self.provider.lower() == "rag") and (CHROMADB_AVAILABLE or bool(self.quantization))
+                        and self.cfg.get("use_embedding", False))
         self.graph_enabled = False  # Initialize graph support flag
 
         # Create .praison directory if it doesn't exist
@@ -220,6 +223,9 @@ class Memory:
 
     def _init_chroma(self):
         """Initialize a local Chroma client for embedding-based search."""
+        if self.quantization:
+            self._init_quantized_store()
+            return
         try:
             # Create directory if it doesn't exist
             rag_path = self.cfg.get("rag_db_path", "chroma_db")
@@ -250,6 +256,21 @@ class Memory:
             self._log_verbose(f"Failed to initialize ChromaDB: {e}", logging.ERROR)
             self.use_rag = False
 
+    def _init_quantized_store(self):
+        """Initialize the local quantized vector store, used like a Chroma collection."""
+        try:
+            from ..knowledge.vector_store import QuantizedVectorStore
+            self.chroma_col = QuantizedVectorStore(
+                "memory_store",
+                self.cfg.get("rag_db_path", "chroma_db"),
+                quantization=self.quantization,
+                oversample=self.cfg.get("oversample")
+            )
+            self._log_verbose(f"Using {self.quantization} quantized vector store")
+        except Exception as e:
+            self._log_verbose(f"Failed to initialize quantized vector store: {e}", logging.ERROR)
+            self.use_rag = False
+
     # -------------------------------------------------------------------------
     #                      Basic Quality Score Computation
     # -------------------------------------------------------------------------
@@ -674,6 +695,8 @@ class Memory:
         if self.use_rag and hasattr(self, "chroma_client"):
             self.chroma_client.reset()  # entire DB
             self._init_chroma()         # re-init fresh
+        elif self.use_rag and self.quantization and hasattr(self, "chroma_col"):
+            self.chroma_col.reset()
 
     # -------------------------------------------------------------------------
     #                       Entity Memory Methods
@@ -0,0 +1,167 @@
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Rough characters-per-token ratio used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARKER = "\n...[truncated]"
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about 4 characters per token)"""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass(frozen=True)
+class ContextSegment:
+    """An immutable, pre-rendered piece of task context.
+
+    Segments are created once per task result and then shared between every
+    task that needs them, so a result is never re-formatted or re-copied.
+    """
+    key: Tuple[str, str, str]
+    source: str
+    text: str
+    tokens: int
+
+
+class ContextAssembler:
+    """Builds task context from cached immutable segments.
+
+    Each previous result is rendered into a ``ContextSegment`` exactly once.
+    Assembling a task's context is a single join over the selected segments,
+    and the joined string is memoised per task until its segments change.
+    An optional token budget keeps the most recent segments intact and
+    truncates (or summarises, if a ``summarizer`` is given) the rest.
+
+    Args:
+        summarizer: Optional callable ``(text, max_tokens) -> str`` used to
+            shrink a segment that does not fit the remaining budget.
+        separator: Default string placed between segments.
+        max_cached_contexts: How many assembled context strings, and the keys
+            of the segments in them, to memoise (least recently used are
+            dropped first).
+    """
+
+    def __init__(self, summarizer: Optional[Callable[[str, int], str]] = None, separator: str = "\n", max_cached_contexts: int = 32):
+        self.summarizer = summarizer
+        self.separator = separator
+        self.max_cached_contexts = max_cached_contexts
+        self._segments: Dict[Tuple[str, str], ContextSegment] = {}
+        self._assembled: "OrderedDict[str, Tuple[Tuple, Optional[int], str]]" = OrderedDict()
+        self._rendered: Dict[str, set] = {}
+        # Tasks may run concurrently (batched managers, speculative branches)
+        self._lock = threading.RLock()
+        self.stats = {"segments_built": 0, "segment_hits": 0, "assembled": 0, "assembly_hits": 0, "truncated": 0}
+
+    def segment(self, source: str, text: str, template: str = "{source}: {text}") -> ContextSegment:
+        """Return the cached segment for ``source``/``text``, creating it on first use.
+
+        Only the latest segment per source is kept, so a re-run task replaces
+        its old segment instead of growing the cache. The segment key holds a
+        reference to ``text`` (not a copy) and the identity check makes
+        repeated lookups of the same result O(1).
+        """
+        slot = (template, source)
+        with self._lock:
+            seg = self._segments.get(slot)
+            if seg is not None and seg.key[2] == text:
+                self.stats["segment_hits"] += 1
+                return seg
+            rendered = template.format(source=source, text=text)
+            seg = ContextSegment(key=(template, source, text), source=source, text=rendered, tokens=estimate_tokens(rendered))
+            self._segments[slot] = seg
+            self.stats["segments_built"] += 1
+            return seg
+
+    def assemble(self, owner: str, segments: Iterable[ContextSegment], header: str = "", token_budget: Optional[int] = None, separator: Optional[str] = None) -> str:
+        """Join ``segments`` into one context string for ``owner``.
+
+        Args:
+            owner: Identifier of the task the context is built for.
+            segments: Segments in chronological order (oldest first).
+            header: Text placed before the first segment.
+            token_budget: Maximum estimated tokens for the segments, or None.
+            separator: Overrides the assembler's default separator.
+
+        Returns:
+            str: The assembled context, or "" if there are no segments.
+        """
+        segments = list(segments)
+        if not segments:
+            return ""
+        signature = tuple(seg.key for seg in segments)
+        with self._lock:
+            cached = self._assembled.get(owner)
+            if cached is not None and cached[0] == signature and cached[1] == token_budget:
+                self._assembled.move_to_end(owner)
+                self.stats["assembly_hits"] += 1
+                return cached[2]
+
+        parts, placed = self._fit_to_budget(segments, token_budget)
+        context = header + (self.separator if separator is None else separator).join(parts)
+        with self._lock:
+            self._assembled[owner] = (signature, token_budget, context)
+            self._assembled.move_to_end(owner)
+            while len(self._assembled) > self.max_cached_contexts:
+                evicted, _ = self._assembled.popitem(last=False)
+                self._rendered.pop(evicted, None)
+            self._rendered[owner] = placed
+            self.stats["assembled"] += 1
+        return context
+
+    def rendered_keys(self, owner: str) -> set:
+        """Keys of the segments placed in ``owner``'s context (none dropped by its budget)."""
+        with self._lock:
+            return set(self._rendered.get(owner, ()))
+
+    def forget(self, owner: str) -> None:
+        """Drop the memoised context for ``owner``."""
+        with self._lock:
+            self._assembled.pop(owner, None)
+            self._rendered.pop(owner, None)
+
+    def clear(self) -> None:
+        """Drop all cached segments and assembled contexts."""
+        with self._lock:
+            self._segments.clear()
+            self._assembled.clear()
+            self._rendered.clear()
+
+    def _fit_to_budget(self, segments: List[ContextSegment], token_budget: Optional[int]) -> Tuple[List[str], set]:
+        """Texts that fit ``token_budget`` and the keys of the segments they came from"""
+        if token_budget is None or sum(seg.tokens for seg in segments) <= token_budget:
+            return [seg.text for seg in segments], {seg.key for seg in segments}
+
+        # Newest segments are the most relevant: fill the budget from the end
+        remaining = max(token_budget, 0)
+        kept: List[str] = []
+        placed = set()
+        for seg in reversed(segments):
+            if remaining <= 0:
+                break
+            placed.add(seg.key)
+            if seg.tokens <= remaining:
+                kept.append(seg.text)
+                remaining -= seg.tokens
+                continue
+            kept.append(self._shrink(seg, remaining))
+            remaining = 0
+        self.stats["truncated"] += 1
+        logging.debug(f"Context trimmed to {token_budget} tokens ({len(kept)}/{len(segments)} segments kept)")
+        kept.reverse()
+        return kept, placed
+
+    def _shrink(self, seg: ContextSegment, max_tokens: int) -> str:
+        if self.summarizer:
+            try:
+                return self.summarizer(seg.text, max_tokens)
+            except Exception as e:
+                logging.warning(f"Context summarizer failed for {seg.source}, truncating instead: {e}")
+        max_chars = max(max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARKER), 0)
+        return seg.text[:max_chars] + TRUNCATION_MARKER
@@ -6,6 +6,7 @@ from pydantic import BaseModel, ConfigDict
 from ..agent.agent import Agent
 from ..task.task import Task
 from ..main import display_error, client
+from .context import ContextAssembler
 import csv
 import os
 from openai import AsyncOpenAI
@@ -14,16 +15,30 @@ class LoopItems(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     items: List[Any]
 
+class ManagerAssignment(BaseModel):
+    task_id: int
+    agent_name: str
+
+class ManagerBatchInstructions(BaseModel):
+    assignments: List[ManagerAssignment]
+    action: str
+
 class Process:
     DEFAULT_RETRY_LIMIT = 3  # Predefined retry limit in a common place
 
-    def __init__(self, tasks: Dict[str, Task], agents: List[Agent], manager_llm: Optional[str] = None, verbose: bool = False, max_iter: int = 10):
+    MANAGER_MODES = ("single", "batch")
+
+    def __init__(self, tasks: Dict[str, Task], agents: List[Agent], manager_llm: Optional[str] = None, verbose: bool = False, max_iter: int = 10, context_assembler: Optional[ContextAssembler] = None, manager_mode: str = "single"):
         logging.debug(f"=== Initializing Process ===")
         logging.debug(f"Number of tasks: {len(tasks)}")
         logging.debug(f"Number of agents: {len(agents)}")
         logging.debug(f"Manager LLM: {manager_llm}")
         logging.debug(f"Verbose mode: {verbose}")
         logging.debug(f"Max iterations: {max_iter}")
+        logging.debug(f"Manager mode: {manager_mode}")
+
+        if manager_mode not in Process.MANAGER_MODES:
+            raise ValueError(f"Invalid manager_mode '{manager_mode}'. Choose one of: {', '.join(Process.MANAGER_MODES)}")
 
         self.tasks = tasks
         self.agents = agents
@@ -32,44 +47,69 @@ class Process:
         self.max_iter = max_iter
         self.task_retry_counter: Dict[str, int] = {} # Initialize retry counter
         self.workflow_finished = False # ADDED: Workflow finished flag
+        self.context_assembler = context_assembler or ContextAssembler()
+        self._name_index: Dict[str, Task] = {}
+        self._name_index_size = -1
+        self.manager_mode = manager_mode
+        self._manager_decision_cache: Dict[tuple, ManagerBatchInstructions] = {}
+
+    def _task_by_name(self, name: str) -> Optional[Task]:
+        """Look up a task by name, rebuilding the name index when tasks are added"""
+        if self._name_index_size != len(self.tasks):
+            index = {}
+            for t in self.tasks.values():
+                index.setdefault(t.name, t)
+            self._name_index = index
+            self._name_index_size = len(self.tasks)
+        return self._name_index.get(name)
 
     def _build_task_context(self, current_task: Task) -> str:
         """Build context for a task based on its retain_full_context setting"""
         if not (current_task.previous_tasks or current_task.context):
             return ""
-            
-        context = "\nInput data from previous tasks:"
-        
+
+        header = "\nInput data from previous tasks:"
+        segments = []
+
         if current_task.retain_full_context:
             # Original behavior: include all previous tasks
             for prev_name in current_task.previous_tasks:
-                prev_task = next((t for t in self.tasks.values() if t.name == prev_name), None)
+                prev_task = self._task_by_name(prev_name)
                 if prev_task and prev_task.result:
-                    context += f"\n{prev_name}: {prev_task.result.raw}"
-                    
+                    segments.append(self.context_assembler.segment(prev_name, prev_task.result.raw))
+
             # Add data from context tasks
             if current_task.context:
                 for ctx_task in current_task.context:
-                    if ctx_task.result and ctx_task.name != current_task.name:
-                        context += f"\n{ctx_task.name}: {ctx_task.result.raw}"
+                    if getattr(ctx_task, 'result', None) and ctx_task.name != current_task.name:
+                        segments.append(self.context_assembler.segment(ctx_task.name, ctx_task.result.raw))
         else:
             # New behavior: only include the most recent previous task
             if current_task.previous_tasks:
                 # Get the most recent previous task (last in the list)
                 prev_name = current_task.previous_tasks[-1]
-                prev_task = next((t for t in self.tasks.values() if t.name == prev_name), None)
+                prev_task = self._task_by_name(prev_name)
                 if prev_task and prev_task.result:
-                    context += f"\n{prev_name}: {prev_task.result.raw}"
-                    
+                    segments.append(self.context_assembler.segment(prev_name, prev_task.result.raw))
+
             # For context tasks, still include the most recent one
             if current_task.context:
                 # Get the most recent context task with a result
                 for ctx_task in reversed(current_task.context):
-                    if ctx_task.result and ctx_task.name != current_task.name:
-                        context += f"\n{ctx_task.name}: {ctx_task.result.raw}"
+                    if getattr(ctx_task, 'result', None) and ctx_task.name != current_task.name:
+                        segments.append(self.context_assembler.segment(ctx_task.name, ctx_task.result.raw))
                         break  # Only include the most recent one
-                        
-        return context
+
+        if not segments:
+            return header
+
+        # Segments are rendered once and joined in a single pass
+        return self.context_assembler.assemble(
+            current_task.id,
+            segments,
+            header=header + "\n",
+            token_budget=current_task.context_token_budget
+        )
 
     def _find_next_not_started_task(self) -> Optional[Task]:
         """Fallback mechanism to find the next 'not started' task."""
@@ -108,12 +148,16 @@ class Process:
                 logging.debug(f"Fallback attempt {fallback_attempts}: No 'not started' task found within retry limit.")
         return None # Return None if no task found after all attempts
 
-    async def _get_manager_instructions_with_fallback_async(self, manager_task, manager_prompt, ManagerInstructions):
+    def _manager_messages(self, manager_task, manager_prompt, history=None):
+        """Build the manager conversation; history holds earlier prompt/response turns"""
+        return [{"role": "system", "content": manager_task.description}] + list(history or []) + [{"role": "user", "content": manager_prompt}]
+
+    async def _get_manager_instructions_with_fallback_async(self, manager_task, manager_prompt, ManagerInstructions, history=None):
         """Async version of getting manager instructions with fallback"""
         try:
             # First try structured output (OpenAI compatible)
             logging.info("Attempting structured output...")
-            return await self._get_structured_response_async(manager_task, manager_prompt, ManagerInstructions)
+            return await self._get_structured_response_async(manager_task, manager_prompt, ManagerInstructions, history)
         except Exception as e:
             logging.info(f"Structured output failed: {e}, falling back to JSON mode...")
             # Fallback to regular JSON mode
@@ -132,23 +176,20 @@ class Process:
                     # Fallback to hardcoded prompt if schema generation fails
                     enhanced_prompt = manager_prompt + "\n\nIMPORTANT: Respond with valid JSON only, using this exact structure: {\"task_id\": <int>, \"agent_name\": \"<string>\", \"action\": \"<execute or stop>\"}"
                 
-                return await self._get_json_response_async(manager_task, enhanced_prompt, ManagerInstructions)
+                return await self._get_json_response_async(manager_task, enhanced_prompt, ManagerInstructions, history)
             except Exception as fallback_error:
                 error_msg = f"Both structured output and JSON fallback failed: {fallback_error}"
                 logging.error(error_msg, exc_info=True)
                 raise Exception(error_msg) from fallback_error
 
-    def _get_manager_instructions_with_fallback(self, manager_task, manager_prompt, ManagerInstructions):
+    def _get_manager_instructions_with_fallback(self, manager_task, manager_prompt, ManagerInstructions, history=None):
         """Sync version of getting manager instructions with fallback"""
         try:
             # First try structured output (OpenAI compatible)
             logging.info("Attempting structured output...")
             manager_response = client.beta.chat.completions.parse(
                 model=self.manager_llm,
-                messages=[
-                    {"role": "system", "content": manager_task.description},
-                    {"role": "user", "content": manager_prompt}
-                ],
+                messages=self._manager_messages(manager_task, manager_prompt, history),
                 temperature=0.7,
                 response_format=ManagerInstructions
             )
@@ -173,10 +214,7 @@ class Process:
                 
                 manager_response = client.chat.completions.create(
                     model=self.manager_llm,
-                    messages=[
-                        {"role": "system", "content": manager_task.description},
-                        {"role": "user", "content": enhanced_prompt}
-                    ],
+                    messages=self._manager_messages(manager_task, enhanced_prompt, history),
                     temperature=0.7,
                     response_format={"type": "json_object"}
                 )
@@ -193,31 +231,25 @@ class Process:
                 logging.error(error_msg, exc_info=True)
                 raise Exception(error_msg) from fallback_error
 
-    async def _get_structured_response_async(self, manager_task, manager_prompt, ManagerInstructions):
+    async def _get_structured_response_async(self, manager_task, manager_prompt, ManagerInstructions, history=None):
         """Async version of structured response"""
         # Create an async client instance for this async method
         async_client = AsyncOpenAI()
         manager_response = await async_client.beta.chat.completions.parse(
             model=self.manager_llm,
-            messages=[
-                {"role": "system", "content": manager_task.description},
-                {"role": "user", "content": manager_prompt}
-            ],
+            messages=self._manager_messages(manager_task, manager_prompt, history),
             temperature=0.7,
             response_format=ManagerInstructions
         )
         return manager_response.choices[0].message.parsed
 
-    async def _get_json_response_async(self, manager_task, enhanced_prompt, ManagerInstructions):
+    async def _get_json_response_async(self, manager_task, enhanced_prompt, ManagerInstructions, history=None):
         """Async version of JSON fallback response"""
         # Create an async client instance for this async method
         async_client = AsyncOpenAI()
         manager_response = await async_client.chat.completions.create(
             model=self.manager_llm,
-            messages=[
-                {"role": "system", "content": manager_task.description},
-                {"role": "user", "content": enhanced_prompt}
-            ],
+            messages=self._manager_messages(manager_task, enhanced_prompt, history),
             temperature=0.7,
             response_format={"type": "json_object"}
         )
@@ -231,6 +263,209 @@ class Process:
             raise Exception(f"Failed to parse JSON response: {json_content}") from e
 
 
+    def _manager_state(self) -> Dict[Any, tuple]:
+        """Compact (status, agent) snapshot of every task the manager controls"""
+        return {
+            tid: (tk.status if tk.status else "not started", tk.agent.name if tk.agent else "No agent")
+            for tid, tk in self.tasks.items()
+            if tk.name != "manager_task"
+        }
+
+    def _batch_manager_prompt(self, state: Dict[Any, tuple], last_state: Optional[Dict[Any, tuple]]) -> str:
+        """First round sends the full task list; later rounds only send what changed"""
+        structure = """
+Provide a JSON with the structure:
+{
+   "assignments": [{"task_id": <int>, "agent_name": "<string>"}],
+   "action": "<execute or stop>"
+}
+"""
+        if last_state is None:
+            tasks_summary = [
+                {
+                    "task_id": tid,
+                    "name": self.tasks[tid].name,
+                    "description": self.tasks[tid].description,
+                    "status": status,
+                    "agent": agent_name
+                }
+                for tid, (status, agent_name) in state.items()
+            ]
+            return f"""
+Here is the current status of all tasks except yours (manager_task):
+{tasks_summary}
+
+Assign every task that can start now. Tasks in one batch run concurrently, so only batch tasks that do not depend on each other.
+{structure}"""
+
+        changes = [
+            {"task_id": tid, "status": status, "agent": agent_name}
+            for tid, (status, agent_name) in state.items()
+            if last_state.get(tid) != (status, agent_name)
+        ]
+        pending = [tid for tid, (status, _) in state.items() if status != "completed"]
+        return f"""
+Status changes since your last assignment: {changes if changes else "none"}
+Tasks not completed yet: {pending}
+
+Assign the next batch using the same JSON structure.
+"""
+
+    def _plan_batch(self, instructions: ManagerBatchInstructions) -> List[Any]:
+        """Apply the manager's assignments and return the task ids that can run together.
+
+        A task is held back for a later round when it depends on another task
+        in the same batch, or when its agent is already busy in this batch
+        (an agent's chat history is not safe to share between threads).
+        """
+        candidates = {}
+        for assignment in instructions.assignments:
+            tid = assignment.task_id
+            if tid not in self.tasks or self.tasks[tid].name == "manager_task":
+                error_msg = f"Manager selected invalid task id {tid}"
+                display_error(error_msg)
+                logging.error(error_msg)
+                continue
+            task = self.tasks[tid]
+            if task.status == "completed" or tid in candidates:
+                continue
+            for a in self.agents:
+                if a.name == assignment.agent_name:
+                    if task.agent is not a:
+                        logging.info(f"Changed agent for task {tid} from {task.agent.name if task.agent else 'None'} to {a.name}")
+                    task.agent = a
+                    break
+            candidates[tid] = task
+
+        candidate_names = {t.name for t in candidates.values()}
+        batch, busy_agents = [], set()
+        for tid, task in candidates.items():
+            depends_on = set(task.previous_tasks) | {c.name for c in task.context if isinstance(c, Task)}
+            if depends_on & (candidate_names - {task.name}):
+                logging.debug(f"Deferring task {task.name}: depends on a task in the same batch")
+                continue
+            if task.agent is not None and id(task.agent) in busy_agents:
+                logging.debug(f"Deferring task {task.name}: agent {task.agent.name} is busy in this batch")
+                continue
+            if task.agent is not None:
+                busy_agents.add(id(task.agent))
+            batch.append(tid)
+        return batch
+
+    def _next_batch_decision(self, state, last_state):
+        """Return (cached decision, state signature, prompt); the prompt is None on a cache hit"""
+        signature = tuple(sorted(state.items(), key=lambda item: str(item[0])))
+        cached = self._manager_decision_cache.get(signature)
+        if cached is not None:
+            logging.info("Manager state unchanged, reusing cached decision")
+            return cached, signature, None
+        return None, signature, self._batch_manager_prompt(state, last_state)
+
+    def _record_batch_decision(self, signature, state, prompt, instructions, history):
+        """Remember a fresh decision and add the exchange to the manager conversation.
+
+        The conversation is sent again with every later request, so the first
+        prompt's task list is kept in it without the task descriptions; later
+        prompts are already just status changes.
+        """
+        if not history:
+            index = [
+                {"task_id": tid, "name": self.tasks[tid].name, "status": status, "agent": agent_name}
+                for tid, (status, agent_name) in state.items()
+            ]
+            prompt = f"Tasks except yours (manager_task): {index}"
+        history.append({"role": "user", "content": prompt})
+        history.append({"role": "assistant", "content": instructions.model_dump_json()})
+        self._manager_decision_cache[signature] = instructions
+
+    def _batch_rounds(self):
+        """Rounds of the batch manager loop, shared by its sync and async drivers.
+
+        Yields ("ask", (prompt, history)) when the manager must be asked, and
+        expects its instructions to be sent back (None if asking failed), and
+        ("run", task_ids) for each batch to dispatch.
+        """
+        history: List[Dict[str, str]] = []
+        last_state = None
+        stalled_rounds = 0
+
+        while True:
+            state = self._manager_state()
+            if all(status == "completed" for status, _ in state.values()):
+                break
+            stalled_rounds = stalled_rounds + 1 if state == last_state else 0
+            if stalled_rounds >= Process.DEFAULT_RETRY_LIMIT:
+                logging.warning("Manager made no progress in batch mode, stopping")
+                break
+
+            instructions, signature, manager_prompt = self._next_batch_decision(state, last_state)
+            if instructions is None:
+                logging.info("Requesting manager batch instructions...")
+                instructions = yield "ask", (manager_prompt, history)
+                if instructions is None:
+                    break
+                logging.info(f"Manager instructions: {instructions}")
+                self._record_batch_decision(signature, state, manager_prompt, instructions, history)
+            last_state = state
+
+            if instructions.action.lower() == "stop":
+                logging.info("Manager decided to stop task execution")
+                break
+
+            batch = self._plan_batch(instructions)
+            if batch:
+                logging.info(f"Dispatching batch of {len(batch)} task(s): {batch}")
+                yield "run", batch
+
+    def _hierarchical_batch(self, manager_task):
+        """Batch manager loop: yields lists of task ids that can run concurrently"""
+        rounds = self._batch_rounds()
+        reply = None
+        while True:
+            try:
+                kind, payload = rounds.send(reply)
+            except StopIteration:
+                return
+            reply = None
+            if kind == "run":
+                yield payload
+                continue
+            manager_prompt, history = payload
+            try:
+                reply = self._get_manager_instructions_with_fallback(
+                    manager_task, manager_prompt, ManagerBatchInstructions, history=history
+                )
+            except Exception as e:
+                display_error(f"Manager parse error: {e}")
+                logging.error(f"Manager parse error: {str(e)}", exc_info=True)
+
+    async def _ahierarchical_batch(self, manager_task):
+        """Async version of _hierarchical_batch"""
+        rounds = self._batch_rounds()
+        reply = None
+        while True:
+            try:
+                kind, payload = rounds.send(reply)
+            except StopIteration:
+                return
+            reply = None
+            if kind == "run":
+                yield payload
+                continue
+            manager_prompt, history = payload
+            try:
+                if manager_task.async_execution:
+                    reply = await self._get_manager_instructions_with_fallback_async(
+                        manager_task, manager_prompt, ManagerBatchInstructions, history=history
+                    )
+                else:
+                    reply = self._get_manager_instructions_with_fallback(
+                        manager_task, manager_prompt, ManagerBatchInstructions, history=history
+                    )
+            except Exception as e:
+                display_error(f"Manager parse error: {e}")
+                logging.error(f"Manager parse error: {str(e)}", exc_info=True)
+
     async def aworkflow(self) -> AsyncGenerator[str, None]:
         """Async version of workflow method"""
         logging.debug("=== Starting Async Workflow ===")
@@ -586,6 +821,13 @@ Workflow Finished: {self.workflow_finished} # ADDED: Workflow Finished Status
         manager_task_id = yield manager_task
         logging.info(f"Created manager task with ID {manager_task_id}")
 
+        if self.manager_mode == "batch":
+            async for batch in self._ahierarchical_batch(manager_task):
+                yield batch
+            self.tasks[manager_task.id].status = "completed"
+            logging.info("Hierarchical task execution finished")
+            return
+
         completed_count = 0
         total_tasks = len(self.tasks) - 1
         logging.info(f"Need to complete {total_tasks} tasks (excluding manager task)")
@@ -1188,6 +1430,12 @@ Workflow Finished: {self.workflow_finished} # ADDED: Workflow Finished Status
         manager_task_id = yield manager_task
         logging.info(f"Created manager task with ID {manager_task_id}")
 
+        if self.manager_mode == "batch":
+            yield from self._hierarchical_batch(manager_task)
+            self.tasks[manager_task.id].status = "completed"
+            logging.info("Hierarchical task execution finished")
+            return
+
         completed_count = 0
         total_tasks = len(self.tasks) - 1
         logging.info(f"Need to complete {total_tasks} tasks (excluding manager task)")
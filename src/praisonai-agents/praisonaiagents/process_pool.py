@@ -0,0 +1,386 @@
+"""
+Process-pool execution for CPU-heavy tools and tasks.
+
+Heavy local work (pandas aggregation, ``execute_code``, document conversion)
+holds the GIL and stalls every other agent thread. This module sends such
+work to a warm ``ProcessPoolExecutor`` instead.
+
+Usage:
+    from praisonaiagents.process_pool import process_tool
+    from praisonaiagents.tools import python_tools
+
+    agent = Agent(tools=[process_tool(python_tools.execute_code, timeout=60)])
+
+    # or run every tool call of a task in the pool
+    Task(description="...", agent=agent, executor="process")
+
+Payloads (the callable, its arguments and its result) must be picklable, so
+tools need to be defined at module level rather than as lambdas or closures.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import pickle
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ("thread", "process")
+
+# Executor requested for tool calls made in the current context (set per task)
+_tool_executor: ContextVar[Optional[str]] = ContextVar("tool_executor", default=None)
+
+
+def _init_worker(memory_limit_mb: Optional[int], preload: Sequence[str]) -> None:
+    """Worker initializer: apply the memory limit and import heavy modules once"""
+    if memory_limit_mb:
+        try:
+            import resource
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            logger.warning(f"Could not apply worker memory limit of {memory_limit_mb} MB: {e}")
+    for module in preload:
+        try:
+            __import__(module)
+        except ImportError as e:
+            logger.warning(f"Could not preload {module} in worker: {e}")
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+class NotPicklableError(TypeError):
+    """Raised when a callable cannot be sent to a worker process"""
+
+
+class _ByName:
+    """Picklable reference to a module attribute, resolved inside the worker.
+
+    Used for functions decorated with ``@process_tool``, whose module
+    attribute is the wrapper rather than the function itself.
+    """
+
+    def __init__(self, module: str, qualname: str):
+        self.module = module
+        self.qualname = qualname
+
+    def resolve(self) -> Callable[..., Any]:
+        import importlib
+        target = importlib.import_module(self.module)
+        for part in self.qualname.split("."):
+            target = getattr(target, part)
+        return target.func if isinstance(target, ProcessTool) else target
+
+
+def _invoke(fn: Callable[..., Any], args: Tuple, kwargs: Dict[str, Any], approved: Sequence[str]) -> Any:
+    """Run ``fn`` in a worker, carrying over approvals granted in the parent"""
+    if isinstance(fn, _ByName):
+        fn = fn.resolve()
+    if approved:
+        from .approval import mark_approved
+        for name in approved:
+            mark_approved(name)
+    return fn(*args, **kwargs)
+
+
+class _TrackedContext:
+    """A multiprocessing context that keeps a handle on every process it starts.
+
+    ProcessPoolExecutor starts its workers through ``mp_context``, so the
+    pool can terminate them without reaching into the executor's internals.
+    """
+
+    def __init__(self, context):
+        self._context = context
+        self._lock = threading.Lock()
+        self._processes = weakref.WeakSet()
+
+    def Process(self, *args: Any, **kwargs: Any):
+        process = self._context.Process(*args, **kwargs)
+        with self._lock:
+            self._processes.add(process)
+        return process
+
+    def processes(self) -> list:
+        """Every worker started so far that has not been garbage collected"""
+        with self._lock:
+            return list(self._processes)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._context, name)
+
+
+class ProcessPool:
+    """A warm process pool with per-call timeouts and per-worker memory limits.
+
+    Workers are started (and ``preload`` modules imported) up front so the
+    first call does not pay the start-up cost. A call that exceeds its
+    timeout cannot be interrupted inside a worker, so the pool is recycled:
+    its workers are terminated and a fresh set started. Other calls running
+    at that moment fail with a RuntimeError.
+
+    Args:
+        max_workers: Number of worker processes. Defaults to the CPU count.
+        timeout: Default seconds allowed per call, None for no limit.
+        memory_limit_mb: Address-space limit per worker (POSIX only). Work
+            that exceeds it fails with MemoryError.
+        max_tasks_per_worker: Recycle a worker after this many calls.
+        preload: Module names imported by each worker at start-up.
+        start_method: multiprocessing start method, or None for the platform
+            default.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: Optional[float] = None,
+                 memory_limit_mb: Optional[int] = None, max_tasks_per_worker: Optional[int] = None,
+                 preload: Sequence[str] = (), start_method: Optional[str] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.preload = tuple(preload)
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._context: Optional[_TrackedContext] = None
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "timeouts": 0, "restarts": 0}
+
+    def __enter__(self) -> "ProcessPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def start(self) -> ProcessPoolExecutor:
+        """Create the pool and wait until every worker is up"""
+        with self._lock:
+            if self._executor is not None:
+                return self._executor
+            import multiprocessing
+            kwargs = {}
+            # Recycling workers needs a start method other than fork, as in ProcessPoolExecutor
+            start_method = self.start_method or ("spawn" if self.max_tasks_per_worker else None)
+            context = _TrackedContext(multiprocessing.get_context(start_method))
+            if self.max_tasks_per_worker:
+                kwargs["max_tasks_per_child"] = self.max_tasks_per_worker
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.memory_limit_mb, self.preload),
+                **kwargs,
+            )
+            pids = {f.result() for f in [executor.submit(_warm) for _ in range(self.max_workers)]}
+            logger.debug(f"Process pool warmed with {len(pids)} workers")
+            self._executor = executor
+            self._context = context
+            return executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return  # another caller already recycled it
+            self._executor = None
+            context = self._context
+        self.stats["restarts"] += 1
+        # A running call cannot be cancelled, so its worker has to be killed
+        for process in context.processes():
+            if process.is_alive():
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn: Callable[..., Any], args: Tuple, kwargs: Dict[str, Any]):
+        try:
+            pickle.dumps(fn)
+        except Exception as e:
+            raise NotPicklableError(
+                f"{getattr(fn, '__name__', fn)!r} cannot run in a process pool because it is not picklable; "
+                f"define it at module level ({e})"
+            ) from e
+        from .approval import _approved_context
+        executor = self.start()
+        self.stats["submitted"] += 1
+        return executor, executor.submit(_invoke, fn, args, kwargs, tuple(_approved_context.get()))
+
+    def _collect(self, executor, future, get_result: Callable[[], Any], timeout: Optional[float]) -> Any:
+        try:
+            result = get_result()
+        except (FutureTimeoutError, asyncio.TimeoutError):
+            self.stats["timeouts"] += 1
+            self._recycle(executor)
+            raise TimeoutError(f"Process pool call exceeded {timeout}s and was terminated") from None
+        except BrokenProcessPool as e:
+            self.stats["failed"] += 1
+            self._recycle(executor)
+            raise RuntimeError(f"Process pool worker died: {e}") from e
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        self.stats["completed"] += 1
+        return result
+
+    def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` in a worker and return its result"""
+        timeout = self.timeout if timeout is None else timeout
+        executor, future = self._submit(fn, args, kwargs)
+        return self._collect(executor, future, lambda: future.result(timeout=timeout), timeout)
+
+    async def arun(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Async version of run; the event loop is never blocked"""
+        timeout = self.timeout if timeout is None else timeout
+        executor, future = self._submit(fn, args, kwargs)
+        waiter = asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        try:
+            result = await waiter
+        except BaseException as e:
+            return self._collect(executor, future, functools.partial(_reraise, e), timeout)
+        return self._collect(executor, future, lambda: result, timeout)
+
+
+def _reraise(error: BaseException) -> Any:
+    raise error
+
+
+_default_pool: Optional[ProcessPool] = None
+_default_lock = threading.Lock()
+
+
+def get_process_pool(**config: Any) -> ProcessPool:
+    """Return the process-wide pool, creating it with ``config`` on first use.
+
+    Passing ``config`` after the pool exists replaces it with a new one.
+    """
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None or config:
+            if _default_pool is not None:
+                _default_pool.shutdown(wait=False)
+            _default_pool = ProcessPool(**config)
+        return _default_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the process-wide pool if it was started"""
+    global _default_pool
+    with _default_lock:
+        pool, _default_pool = _default_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+class ProcessTool:
+    """Wraps a tool so each call runs in the process pool.
+
+    The wrapper keeps the tool's name, docstring and signature, so agents
+    generate the same schema for it. Use ``process_tool`` to create one.
+    """
+
+    executor = "process"
+
+    def __init__(self, func: Callable[..., Any], timeout: Optional[float] = None, pool: Optional[ProcessPool] = None):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.timeout = timeout
+        self.pool = pool
+
+    def _target(self) -> Any:
+        module = getattr(self.func, "__module__", None)
+        qualname = getattr(self.func, "__qualname__", "")
+        if module and "<" not in qualname:
+            import sys
+            owner = sys.modules.get(module)
+            for part in qualname.split("."):
+                owner = getattr(owner, part, None)
+            if owner is self:
+                return _ByName(module, qualname)
+        return self.func
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        pool = self.pool or get_process_pool()
+        return pool.run(self._target(), *args, timeout=self.timeout, **kwargs)
+
+    async def acall(self, *args: Any, **kwargs: Any) -> Any:
+        pool = self.pool or get_process_pool()
+        return await pool.arun(self._target(), *args, timeout=self.timeout, **kwargs)
+
+
+def process_tool(func: Optional[Callable[..., Any]] = None, *, timeout: Optional[float] = None,
+                 pool: Optional[ProcessPool] = None):
+    """Mark a tool to run in the process pool.
+
+    Works on functions and bound methods (such as
+    ``python_tools.execute_code``) and can also be used as a decorator::
+
+        @process_tool(timeout=30)
+        def crunch(path: str) -> dict: ...
+
+    When used as a decorator, workers import the function by name, so it
+    must live in an importable module.
+    """
+    def wrap(f: Callable[..., Any]) -> ProcessTool:
+        return ProcessTool(f, timeout=timeout, pool=pool)
+    return wrap(func) if func is not None else wrap
+
+
+def current_tool_executor() -> Optional[str]:
+    """The executor requested for tool calls in the current context"""
+    return _tool_executor.get()
+
+
+@contextmanager
+def tool_executor(executor: Optional[str]) -> Iterator[None]:
+    """Run the tool calls made inside the block with ``executor``"""
+    if executor is not None and executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {EXECUTORS}, got {executor!r}")
+    token = _tool_executor.set(executor)
+    try:
+        yield
+    finally:
+        _tool_executor.reset(token)
+
+
+def run_tool(func: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+    """Call a tool, sending it to the process pool when requested"""
+    if isinstance(func, ProcessTool):
+        return func(**kwargs)
+    if current_tool_executor() == "process":
+        try:
+            return get_process_pool().run(func, **kwargs)
+        except NotPicklableError as e:
+            logger.warning(f"{e}; running it in-process instead")
+    return func(**kwargs)
+
+
+async def arun_tool(func: Callable[..., Any], kwargs: Dict[str, Any]) -> Any:
+    """Async version of run_tool.
+
+    Tools exposing an async ``acall`` (process tools, MCP tools) are awaited
+    directly; other sync tools run in the loop's default thread pool.
+    """
+    acall = getattr(func, "acall", None)
+    if acall is not None and asyncio.iscoroutinefunction(acall):
+        return await acall(**kwargs)
+    if current_tool_executor() == "process":
+        try:
+            return await get_process_pool().arun(func, **kwargs)
+        except NotPicklableError as e:
+            logger.warning(f"{e}; running it in-process instead")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, **kwargs))
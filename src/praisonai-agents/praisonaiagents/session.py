@@ -5,18 +5,118 @@ A simple wrapper around existing stateful capabilities to provide a unified
 session API for developers building stateful agent applications.
 """
 
+import asyncio
+import atexit
 import json
+import logging
 import os
+import threading
 import time
 import uuid
-from typing import Any, Dict, List, Optional
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
-import requests
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 from .agent import Agent
 from .knowledge import Knowledge
 from .memory import Memory
 
+logger = logging.getLogger(__name__)
+
+# Attempts at a request the remote agent answered with 429 (its queue was full)
+_BUSY_ATTEMPTS = 4
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60.0)
+_client: Optional[httpx.Client] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_client_lock = threading.Lock()
+# Agent URLs whose health probe succeeded, so each is probed once per process
+_reachable = set()
+
+
+def get_remote_client() -> httpx.Client:
+    """Return the keep-alive client shared by every remote session (HTTP/2 when ``h2`` is installed)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(http2=HTTP2_AVAILABLE, limits=_LIMITS)
+        return _client
+
+
+def get_async_remote_client() -> httpx.AsyncClient:
+    """Return the keep-alive client shared by remote sessions on the running event loop.
+
+    Connections belong to the loop that opened them, so each loop has its own.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=_LIMITS)
+    return client
+
+
+async def aclose_async_remote_client() -> None:
+    """Close the running event loop's shared client; call it before the loop ends"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def close_remote_clients() -> None:
+    """Close the shared keep-alive client (run at exit).
+
+    The clients of event loops are closed with ``aclose_async_remote_client``
+    on their loop; those of loops that already ended are dropped.
+    """
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+    for loop in [loop for loop in list(_async_clients.keys()) if loop.is_closed()]:
+        _async_clients.pop(loop, None)
+
+
+atexit.register(close_remote_clients)
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return min(float(response.headers.get("Retry-After", 1)), 30.0)
+    except ValueError:
+        return 1.0
+
+
+def _connection_error(url: str, error: Exception, connecting: bool = False) -> ConnectionError:
+    doing, do = ("connecting to", "connect to") if connecting else ("communicating with", "communicate with")
+    if isinstance(error, ConnectionError):
+        return error
+    if isinstance(error, httpx.TimeoutException):
+        return ConnectionError(f"Timeout {doing} remote agent at {url}")
+    if isinstance(error, httpx.TransportError):
+        return ConnectionError(f"Failed to {do} remote agent at {url}")
+    if isinstance(error, httpx.HTTPStatusError):
+        return ConnectionError(f"HTTP error from remote agent: {error}")
+    return ConnectionError(f"Error {doing} remote agent: {str(error)}")
+
+
+def _parse_event(line: str) -> Optional[Dict[str, Any]]:
+    # Newline-delimited JSON, or the data lines of Server-Sent Events
+    if line.startswith("data:"):
+        line = line[len("data:"):]
+    elif line.startswith(("event:", ":", "id:", "retry:")):
+        return None
+    line = line.strip()
+    return json.loads(line) if line else None
+
 
 class Session:
     """
@@ -37,6 +137,9 @@ class Session:
         # Remote agent session (similar to Google ADK)
         session = Session(agent_url="192.168.1.10:8000/agent")
         response = session.chat("Hello from remote client!")
+        for event in session.stream("Tell me a story"):
+            print(event)
+        answers = session.chat_many(questions, max_concurrency=16)
         
         # Save session state
         session.save_state({"conversation_topic": "AI research"})
@@ -73,8 +176,7 @@ class Session:
             if not self.agent_url.startswith(('http://', 'https://')):
                 # Assume http if no protocol specified
                 self.agent_url = f"http://{self.agent_url}"
-            # Test connectivity to remote agent
-            self._test_remote_connection()
+            # Connectivity is tested lazily, before the first request
 
         # Initialize memory with sensible defaults (only for local sessions)
         if not self.is_remote:
@@ -332,30 +434,114 @@ class Session:
     def _test_remote_connection(self) -> None:
         """
         Test connectivity to the remote agent.
+
+        Probes run lazily, before the first request to an agent URL, and
+        only once per URL in the process.
         
         Raises:
             ConnectionError: If unable to connect to the remote agent
         """
+        if self.agent_url in _reachable:
+            return
+        client = get_remote_client()
         try:
             # Try a simple GET request to check if the server is responding
-            test_url = self.agent_url.rstrip('/') + '/health' if '/health' not in self.agent_url else self.agent_url
-            response = requests.get(test_url, timeout=self.timeout)
+            response = client.get(self._health_url(), timeout=self.timeout)
             if response.status_code != 200:
                 # If health endpoint fails, try the main endpoint
-                response = requests.head(self.agent_url, timeout=self.timeout)
-                if response.status_code not in [200, 405]:  # 405 = Method Not Allowed is OK
-                    raise ConnectionError(f"Remote agent returned status code: {response.status_code}")
-            print(f"✅ Successfully connected to remote agent at {self.agent_url}")
-        except requests.exceptions.Timeout:
-            raise ConnectionError(f"Timeout connecting to remote agent at {self.agent_url}")
-        except requests.exceptions.ConnectionError:
-            raise ConnectionError(f"Failed to connect to remote agent at {self.agent_url}")
+                self._check_probe(client.head(self.agent_url, timeout=self.timeout))
         except Exception as e:
-            raise ConnectionError(f"Error connecting to remote agent: {str(e)}")
+            raise _connection_error(self.agent_url, e, connecting=True)
+        self._mark_reachable()
+
+    async def _atest_remote_connection(self) -> None:
+        """Async variant of _test_remote_connection()"""
+        if self.agent_url in _reachable:
+            return
+        client = get_async_remote_client()
+        try:
+            response = await client.get(self._health_url(), timeout=self.timeout)
+            if response.status_code != 200:
+                self._check_probe(await client.head(self.agent_url, timeout=self.timeout))
+        except Exception as e:
+            raise _connection_error(self.agent_url, e, connecting=True)
+        self._mark_reachable()
+
+    def _health_url(self) -> str:
+        return self.agent_url.rstrip('/') + '/health' if '/health' not in self.agent_url else self.agent_url
+
+    @staticmethod
+    def _check_probe(response: httpx.Response) -> None:
+        if response.status_code not in [200, 405]:  # 405 = Method Not Allowed is OK
+            raise ConnectionError(f"Remote agent returned status code: {response.status_code}")
+
+    def _mark_reachable(self) -> None:
+        _reachable.add(self.agent_url)
+        logger.info(f"Connected to remote agent at {self.agent_url}")
+
+    def _require_remote(self, method: str) -> None:
+        if not self.is_remote:
+            raise ValueError(f"{method}() method is only available for remote agent sessions. Use Agent.chat() for local agents.")
+
+    def _request(self, client: Any, message: str, kwargs: Dict[str, Any], stream: bool = False,
+                 independent: bool = False) -> httpx.Request:
+        payload = {
+            "query": message,
+            "session_id": None if independent else self.session_id,
+            "user_id": self.user_id,
+            **kwargs
+        }
+        headers = {"Content-Type": "application/json"}
+        if stream:
+            payload["stream"] = True
+            headers["Accept"] = "application/x-ndjson"
+        return client.build_request("POST", self.agent_url, json=payload, headers=headers, timeout=self.timeout)
+
+    def _send(self, request: httpx.Request, stream: bool = False) -> httpx.Response:
+        # A 429 means the agent's queue was full: wait as asked and try again
+        client = get_remote_client()
+        for attempt in range(_BUSY_ATTEMPTS):
+            response = client.send(request, stream=stream)
+            if response.status_code != 429 or attempt == _BUSY_ATTEMPTS - 1:
+                break
+            response.close()
+            time.sleep(_retry_after(response))
+        if response.is_error:
+            response.close()
+        response.raise_for_status()
+        return response
+
+    async def _asend(self, request: httpx.Request, stream: bool = False) -> httpx.Response:
+        client = get_async_remote_client()
+        for attempt in range(_BUSY_ATTEMPTS):
+            response = await client.send(request, stream=stream)
+            if response.status_code != 429 or attempt == _BUSY_ATTEMPTS - 1:
+                break
+            await response.aclose()
+            await asyncio.sleep(_retry_after(response))
+        if response.is_error:
+            await response.aclose()
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> str:
+        try:
+            result = response.json()
+        except ValueError:
+            # If response is not JSON, return the raw text
+            return response.text
+        # Extract the agent's response
+        if isinstance(result, dict):
+            return result.get("response", str(result))
+        return str(result)
 
     def chat(self, message: str, **kwargs) -> str:
         """
         Send a message to the remote agent or handle local session.
+
+        Requests share one keep-alive connection pool per process, and are
+        retried while the agent answers that it is busy (HTTP 429).
         
         Args:
             message: The message to send to the agent
@@ -368,49 +554,151 @@ class Session:
             ValueError: If this is not a remote session
             ConnectionError: If unable to communicate with remote agent
         """
-        if not self.is_remote:
-            raise ValueError("chat() method is only available for remote agent sessions. Use Agent.chat() for local agents.")
-        
+        return self._chat(message, kwargs)
+
+    def _chat(self, message: str, kwargs: Dict[str, Any], independent: bool = False) -> str:
+        self._require_remote("chat")
+        self._test_remote_connection()
         try:
-            # Prepare the request payload
-            payload = {
-                "query": message,
-                "session_id": self.session_id,
-                "user_id": self.user_id,
-                **kwargs
-            }
-            
-            # Send POST request to the remote agent
-            response = requests.post(
-                self.agent_url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=self.timeout
-            )
-            
-            # Check if request was successful
-            response.raise_for_status()
-            
-            # Parse the response
-            result = response.json()
-            
-            # Extract the agent's response
-            if isinstance(result, dict):
-                return result.get("response", str(result))
-            else:
-                return str(result)
-                
-        except requests.exceptions.Timeout:
-            raise ConnectionError(f"Timeout communicating with remote agent at {self.agent_url}")
-        except requests.exceptions.ConnectionError:
-            raise ConnectionError(f"Failed to communicate with remote agent at {self.agent_url}")
-        except requests.exceptions.HTTPError as e:
-            raise ConnectionError(f"HTTP error from remote agent: {e}")
-        except json.JSONDecodeError:
-            # If response is not JSON, return the raw text
-            return response.text
+            response = self._send(self._request(get_remote_client(), message, kwargs, independent=independent))
         except Exception as e:
-            raise ConnectionError(f"Error communicating with remote agent: {str(e)}")
+            raise _connection_error(self.agent_url, e)
+        return self._parse_response(response)
+
+    async def achat(self, message: str, **kwargs) -> str:
+        """
+        Async version of chat(), on a connection pool shared per event loop.
+
+        Args:
+            message: The message to send to the agent
+            **kwargs: Additional parameters for the request
+
+        Returns:
+            The agent's response
+
+        Raises:
+            ValueError: If this is not a remote session
+            ConnectionError: If unable to communicate with remote agent
+        """
+        self._require_remote("achat")
+        await self._atest_remote_connection()
+        try:
+            response = await self._asend(self._request(get_async_remote_client(), message, kwargs))
+        except Exception as e:
+            raise _connection_error(self.agent_url, e)
+        return self._parse_response(response)
+
+    def stream(self, message: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Send a message to the remote agent and yield its events as they arrive.
+
+        Events are dicts such as ``{"type": "token", "content": ...}``,
+        ``{"type": "tool_call", ...}`` and ``{"type": "tool_result", ...}``;
+        the last is ``{"type": "response", "response": ...}`` or
+        ``{"type": "error", "error": ...}``. Closing the generator early
+        disconnects, which stops the agent.
+
+        Args:
+            message: The message to send to the agent
+            **kwargs: Additional parameters for the request
+
+        Yields:
+            The agent's events
+
+        Raises:
+            ValueError: If this is not a remote session
+            ConnectionError: If unable to communicate with remote agent
+        """
+        self._require_remote("stream")
+        self._test_remote_connection()
+        try:
+            response = self._send(self._request(get_remote_client(), message, kwargs, stream=True), stream=True)
+            try:
+                for line in response.iter_lines():
+                    event = _parse_event(line)
+                    if event is not None:
+                        yield event
+            finally:
+                response.close()
+        except Exception as e:
+            raise _connection_error(self.agent_url, e)
+
+    async def astream(self, message: str, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Async version of stream().
+
+        Args:
+            message: The message to send to the agent
+            **kwargs: Additional parameters for the request
+
+        Yields:
+            The agent's events
+
+        Raises:
+            ValueError: If this is not a remote session
+            ConnectionError: If unable to communicate with remote agent
+        """
+        self._require_remote("astream")
+        await self._atest_remote_connection()
+        try:
+            response = await self._asend(self._request(get_async_remote_client(), message, kwargs, stream=True),
+                                         stream=True)
+            try:
+                async for line in response.aiter_lines():
+                    event = _parse_event(line)
+                    if event is not None:
+                        yield event
+            finally:
+                await response.aclose()
+        except Exception as e:
+            raise _connection_error(self.agent_url, e)
+
+    def chat_many(
+        self,
+        messages: List[str],
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Send several independent messages to the remote agent concurrently.
+
+        At most ``max_concurrency`` requests are in flight at once, over the
+        pooled connections. The messages are sent without this session's id:
+        the remote agent answers one session's messages one at a time, so
+        each is answered on its own, outside the session's conversation.
+
+        Args:
+            messages: The messages to send
+            max_concurrency: Maximum number of requests in flight
+            return_exceptions: Return a failed message's ConnectionError in
+                its place instead of raising the first one
+            **kwargs: Additional parameters for every request
+
+        Returns:
+            The responses, in the order of ``messages``
+
+        Raises:
+            ValueError: If this is not a remote session
+            ConnectionError: If a message failed and return_exceptions is False
+        """
+        self._require_remote("chat_many")
+        if not messages:
+            return []
+        # Probe before fanning out so a dead agent fails once
+        self._test_remote_connection()
+
+        def send(message: str) -> Any:
+            try:
+                return self._chat(message, kwargs, independent=True)
+            except ConnectionError as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(messages))),
+                                thread_name_prefix="praisonai-remote") as executor:
+            return list(executor.map(send, messages))
 
     def send_message(self, message: str, **kwargs) -> str:
         """
@@ -0,0 +1,162 @@
+"""
+Live forwarding of tokens and tool-call events from a running agent.
+
+A consumer (the streaming HTTP endpoints of ``launch``) creates an
+EventStream and runs the agent inside ``stream_events(stream)`` on the
+worker thread. While it is active, the LLM streaming loops and tool
+execution report to it:
+
+- ``{"type": "token", "content": ...}`` for each piece of generated text
+- ``{"type": "reasoning", "content": ...}`` for reasoning tokens
+- ``{"type": "tool_call", "name": ..., "arguments": ...}`` before a tool runs
+- ``{"type": "tool_result", "name": ..., "result": ...}`` after it returns
+
+Cancelling the stream (the client disconnected) makes the next event raise
+StreamCancelled in the agent's thread, which closes the upstream LLM
+response so generation stops. Callers that only want the answer use a
+CancelToken, which drops the events but can still be cancelled.
+"""
+
+import asyncio
+import contextvars
+import logging
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class StreamCancelled(BaseException):
+    """Raised in the agent's thread when the consumer of its event stream has gone.
+
+    Like asyncio.CancelledError it derives from BaseException, so the
+    ``except Exception`` handlers around LLM calls do not swallow it.
+    """
+
+
+class EventStream:
+    """Thread-safe bridge from an agent thread to an asyncio consumer.
+
+    Args:
+        loop: The consumer's event loop (default: the running loop).
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop or asyncio.get_running_loop()
+        self.queue: "asyncio.Queue" = asyncio.Queue()
+        self.cancelled = False
+        self.closed = False
+
+    def emit(self, event_type: str, **data: Any) -> None:
+        """Send an event to the consumer; raises StreamCancelled once it has gone"""
+        if self.cancelled:
+            raise StreamCancelled()
+        event = {"type": event_type, **data}
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+    def close(self) -> None:
+        """Mark the end of the stream (called by the producer)"""
+        if not self.closed:
+            self.closed = True
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, _DONE)
+
+    def cancel(self) -> None:
+        """Ask the producer to stop at its next event (called by the consumer)"""
+        self.cancelled = True
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        while True:
+            event = await self.queue.get()
+            if event is _DONE:
+                return
+            yield event
+
+
+class CancelToken:
+    """An event stream nobody reads, used only to stop the agent.
+
+    Events are dropped; once ``cancel()`` has been called (the caller went
+    away) the next one raises StreamCancelled, as with EventStream.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self.closed = False
+
+    def emit(self, event_type: str, **data: Any) -> None:
+        if self.cancelled:
+            raise StreamCancelled()
+
+    def close(self) -> None:
+        self.closed = True
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+_current_stream: contextvars.ContextVar[Optional[EventStream]] = contextvars.ContextVar(
+    "praisonai_event_stream", default=None
+)
+
+
+def current_stream() -> Optional[EventStream]:
+    return _current_stream.get()
+
+
+@contextmanager
+def stream_events(stream: Optional[Union[EventStream, CancelToken]]):
+    """Report events from agent calls made in this context to ``stream``"""
+    token = _current_stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _current_stream.reset(token)
+
+
+def emit_event(event_type: str, **data: Any) -> None:
+    """Send an event to the active stream, if there is one"""
+    stream = _current_stream.get()
+    if stream is not None:
+        stream.emit(event_type, **data)
+
+
+def _close_upstream(chunks: Any) -> None:
+    # OpenAI streams expose close(); litellm wraps the provider stream
+    for target in (chunks, getattr(chunks, "completion_stream", None)):
+        close = getattr(target, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"Error closing cancelled LLM stream: {e}")
+            return
+
+
+def relay_stream(chunks: Iterable[Any]) -> Iterator[Any]:
+    """Yield chat-completion chunks unchanged, reporting their text to the active stream.
+
+    When the stream is cancelled the upstream response is closed and
+    StreamCancelled is raised.
+    """
+    stream = _current_stream.get()
+    if stream is None:
+        yield from chunks
+        return
+    try:
+        for chunk in chunks:
+            choices = getattr(chunk, "choices", None)
+            delta = choices[0].delta if choices else None
+            content = getattr(delta, "content", None)
+            reasoning = getattr(delta, "reasoning_content", None)
+            if content:
+                stream.emit("token", content=content)
+            if reasoning:
+                stream.emit("reasoning", content=reasoning)
+            if stream.cancelled:
+                raise StreamCancelled()
+            yield chunk
+    except StreamCancelled:
+        _close_upstream(chunks)
+        raise
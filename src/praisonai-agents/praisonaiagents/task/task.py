@@ -5,6 +5,7 @@ from typing import List, Optional, Dict, Any, Type, Callable, Union, Coroutine,
 from pydantic import BaseModel
 from ..main import TaskOutput
 from ..agent.agent import Agent
+from ..process_pool import EXECUTORS
 import uuid
 import os
 import time
@@ -42,6 +43,8 @@ class Task:
         input_file: Optional[str] = None,
         rerun: bool = False, # Renamed from can_rerun and logic inverted, default True for backward compatibility
         retain_full_context: bool = False, # By default, only use previous task output, not all previous tasks
+        context_token_budget: Optional[int] = None, # Max estimated tokens of previous-task context, None for no limit
+        executor: Optional[str] = None, # "process" runs this task's tool calls in the shared process pool
         guardrail: Optional[Union[Callable[[TaskOutput], Tuple[bool, Any]], str]] = None,
         max_retries: int = 3,
         retry_count: int = 0
@@ -84,6 +87,10 @@ class Task:
         self.quality_check = quality_check
         self.rerun = rerun # Assigning the rerun parameter
         self.retain_full_context = retain_full_context
+        self.context_token_budget = context_token_budget
+        if executor is not None and executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}, got {executor!r}")
+        self.executor = executor
         self.guardrail = guardrail
         self.max_retries = max_retries
         self.retry_count = retry_count
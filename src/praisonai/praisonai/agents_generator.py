@@ -258,17 +258,9 @@ class AgentsGenerator:
 
         This function first loads the agent configuration from the specified file. It then initializes the tools required for the agents based on the specified framework. If the specified framework is "autogen", it loads the LLM configuration dynamically and creates an AssistantAgent for each role in the configuration. It then adds tools to the agents if specified in the configuration. Finally, it prepares tasks for the agents based on the configuration and initiates the tasks using the crew of agents. If the specified framework is not "autogen", it creates a crew of agents and initiates tasks based on the configuration.
         """
-        if self.agent_yaml:
-            config = yaml.safe_load(self.agent_yaml)
-        else:
-            if self.agent_file == '/app/api:app' or self.agent_file == 'api:app':
-                self.agent_file = 'agents.yaml'
-            try:
-                with open(self.agent_file, 'r') as f:
-                    config = yaml.safe_load(f)
-            except FileNotFoundError:
-                print(f"File not found: {self.agent_file}")
-                return
+        config = self._load_config()
+        if config is None:
+            return
 
         topic = config['topic']
         tools_dict = {}
@@ -541,10 +533,64 @@ class AgentsGenerator:
             
         return result
 
+    def _load_config(self):
+        """
+        Parse the agent YAML given as text or as a file path.
+
+        Returns:
+            dict: The parsed configuration, or None if the file does not exist.
+        """
+        if self.agent_yaml:
+            return yaml.safe_load(self.agent_yaml)
+        if self.agent_file == '/app/api:app' or self.agent_file == 'api:app':
+            self.agent_file = 'agents.yaml'
+        try:
+            with open(self.agent_file, 'r') as f:
+                return yaml.safe_load(f)
+        except FileNotFoundError:
+            print(f"File not found: {self.agent_file}")
+            return None
+
+    def build_praisonai_agents(self):
+        """
+        Build the PraisonAIAgents described by the YAML without running them.
+
+        Used by ``praisonai serve``, which creates the agents (and loads
+        tools.py) once in the parent process before forking workers.
+
+        Returns:
+            PraisonAIAgents: The configured agents and tasks.
+
+        Raises:
+            FileNotFoundError: If the agent file does not exist.
+            ImportError: If praisonaiagents is not installed.
+        """
+        if not PRAISONAI_AVAILABLE:
+            raise ImportError("PraisonAI is not installed. Please install it with 'pip install praisonaiagents'")
+        config = self._load_config()
+        if config is None:
+            raise FileNotFoundError(self.agent_file)
+        return self._build_praisonai(config, config['topic'])
+
     def _run_praisonai(self, config, topic, tools_dict):
         """
         Run agents using the PraisonAI framework.
         """
+        agents = self._build_praisonai(config, topic)
+
+        response = agents.start()
+        self.logger.debug(f"Result: {response}")
+        result = ""
+        
+        if AGENTOPS_AVAILABLE:
+            agentops.end_session("Success")
+            
+        return result
+
+    def _build_praisonai(self, config, topic):
+        """
+        Create the PraisonAI agents and tasks described by the configuration.
+        """
         agents = {}
         tasks = []
         tasks_dict = {}
@@ -647,12 +693,4 @@ class AgentsGenerator:
         self.logger.debug("Final Configuration:")
         self.logger.debug(f"Agents: {agents.agents}")
         self.logger.debug(f"Tasks: {agents.tasks}")
-
-        response = agents.start()
-        self.logger.debug(f"Result: {response}")
-        result = ""
-        
-        if AGENTOPS_AVAILABLE:
-            agentops.end_session("Success")
-            
-        return result
\ No newline at end of file
+        return agents
\ No newline at end of file
@@ -507,7 +507,7 @@ class PraisonAI:
             return default_args
         
         # Define special commands
-        special_commands = ['chat', 'code', 'call', 'realtime', 'train', 'ui']
+        special_commands = ['chat', 'code', 'call', 'realtime', 'train', 'ui', 'serve']
         
         parser = argparse.ArgumentParser(prog="praisonai", description="praisonAI command-line interface")
         parser.add_argument("--framework", choices=["crewai", "autogen", "praisonai"], help="Specify the framework")
@@ -635,6 +635,16 @@ class PraisonAI:
                 self.create_chainlit_interface()
                 sys.exit(0)
 
+            elif args.command == 'serve':
+                if not PRAISONAI_AVAILABLE:
+                    print("[red]ERROR: PraisonAI Agents is not installed. Install with:[/red]")
+                    print("\npip install \"praisonaiagents[api]\"\n")
+                    sys.exit(1)
+                from .serve import main as serve_main
+                # The remaining arguments belong to the serve command
+                serve_main(unknown_args, config_list=self.config_list)
+                sys.exit(0)
+
         # Only check framework availability for agent-related operations
         if not args.command and (args.init or args.auto or args.framework):
             if not CREWAI_AVAILABLE and not AUTOGEN_AVAILABLE and not PRAISONAI_AVAILABLE:
@@ -0,0 +1,455 @@
+"""
+``praisonai serve``: a multi-process HTTP server for agents.
+
+    praisonai serve agents.yaml --workers 4 --port 8000
+    praisonai serve my_agents.py
+    praisonai serve myapp.agents:support --workers 8
+
+The parent process loads the agents once (building them, indexing their
+knowledge and importing tools.py and the server libraries) and binds the
+port, then forks the workers, which inherit all of it. Each worker runs its
+own uvicorn server on the shared listening socket and serves every agent
+through ``praisonaiagents.agent.serving``, with per-session agents and a
+bounded queue as in ``Agent.launch``.
+
+Agents with MCP tools are the exception: their server connections are run
+by threads, which a forked process does not inherit, so each worker loads
+the agents again after the fork and starts its own MCP servers.
+
+Sessions live in the worker that serves them. Requests on one keep-alive
+connection stay on one worker, but separate connections are spread across
+the workers, so with ``--workers`` above 1 a session's history is only
+kept while the client reuses its connection; serve conversations that
+need their history on other connections with ``--workers 1``.
+
+Sending SIGHUP to the parent reloads the agent definitions and replaces
+the workers: the new ones accept connections on the same socket before the
+old ones are told to finish their requests and exit. A worker that dies is
+replaced. ``/metrics`` on any worker reports the series of every worker,
+labelled with its pid.
+"""
+
+import argparse
+import importlib
+import importlib.util
+import logging
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _import_module(name: str):
+    """Import a dotted module name or a .py file, re-executing it if already loaded"""
+    if name.endswith(".py") or os.sep in name:
+        path = os.path.abspath(name)
+        directory = os.path.dirname(path)
+        if directory not in sys.path:
+            # Let the file import its neighbours, as ``python file.py`` would
+            sys.path.insert(0, directory)
+        spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+        if spec is None:
+            raise ImportError(f"Cannot load agents from {name}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    if name in sys.modules:
+        return importlib.reload(sys.modules[name])
+    return importlib.import_module(name)
+
+
+def load_targets(source: str, config_list: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """The agents described by ``source``, keyed by the path they are served on.
+
+    Args:
+        source: A YAML workflow (served on ``/agents``), a Python file or
+            module (every Agent and PraisonAIAgents defined at module level,
+            served on ``/<variable name>``), or ``module:variable`` for one
+            of them.
+        config_list: LLM configuration passed to AgentsGenerator for YAML.
+
+    Raises:
+        ValueError: The module defines no agents.
+    """
+    from praisonaiagents import Agent, PraisonAIAgents
+
+    if source.endswith((".yaml", ".yml")):
+        from .agents_generator import AgentsGenerator
+
+        generator = AgentsGenerator(source, "praisonai", config_list or [])
+        return {"/agents": generator.build_praisonai_agents()}
+
+    module_name, _, attribute = source.partition(":")
+    module = _import_module(module_name)
+    if attribute:
+        return {f"/{attribute}": getattr(module, attribute)}
+    targets = {
+        f"/{name}": value for name, value in vars(module).items()
+        if not name.startswith("_") and isinstance(value, (Agent, PraisonAIAgents))
+    }
+    if not targets:
+        raise ValueError(f"No Agent or PraisonAIAgents instances found in {module_name}")
+    return targets
+
+
+def preload(targets: Dict[str, Any]) -> Dict[str, Any]:
+    """Import what the first request would otherwise import in every worker.
+
+    The agents themselves are already built by ``load_targets``; this loads
+    the web stack and, for agents using LiteLLM, its provider tables, so a
+    forked worker shares them with the parent instead of loading its own.
+    """
+    import fastapi  # noqa: F401
+    import uvicorn  # noqa: F401
+    from praisonaiagents import PraisonAIAgents
+    from praisonaiagents.agent import serving  # noqa: F401
+
+    for target in targets.values():
+        agents = target.agents if isinstance(target, PraisonAIAgents) else [target]
+        if any(getattr(agent, "_using_custom_llm", False) for agent in agents):
+            import litellm  # noqa: F401
+    return targets
+
+
+def mcp_tools(targets: Dict[str, Any]) -> List[Any]:
+    """The MCP tool sets used by the agents in ``targets``"""
+    try:
+        from praisonaiagents.mcp import MCP
+    except ImportError:
+        return []
+    from praisonaiagents import PraisonAIAgents
+
+    found = []
+    for target in targets.values():
+        agents = target.agents if isinstance(target, PraisonAIAgents) else [target]
+        for agent in agents:
+            tools = agent.tools if isinstance(agent.tools, (list, tuple)) else [agent.tools]
+            found.extend(tool for tool in tools if isinstance(tool, MCP))
+    return found
+
+
+class WorkerMetrics:
+    """Shares one worker's metrics with its siblings through files in ``directory``.
+
+    Each worker rewrites ``<pid>.prom`` every ``interval`` seconds and when
+    it is scraped, so whichever worker answers ``/metrics`` can report all
+    of them.
+    """
+
+    def __init__(self, directory: str, servers: Dict[str, Any], interval: float = 1.0):
+        self.directory = directory
+        self.servers = servers
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"{os.getpid()}.prom")
+
+    def write(self) -> None:
+        labels = f'worker="{os.getpid()}"'
+        lines = [line for path, server in self.servers.items() for line in server.metrics(path, labels)]
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as f:
+            f.write("\n".join(lines))
+        os.replace(temporary, self.path)
+
+    def collect(self) -> str:
+        """Prometheus exposition text for every live worker"""
+        from praisonaiagents.agent.serving import format_metrics
+
+        self.write()
+        lines = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".prom"):
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        lines.extend(line for line in f.read().splitlines() if line)
+                except OSError:
+                    continue  # the worker exited and the parent removed its file
+        return format_metrics(lines)
+
+    def start(self) -> None:
+        def run():
+            while not self._stopped.wait(self.interval):
+                try:
+                    self.write()
+                except OSError as e:
+                    logger.debug(f"Could not write metrics snapshot: {e}")
+
+        self.write()
+        threading.Thread(target=run, daemon=True, name="praison-metrics").start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+def build_app(targets: Dict[str, Any], max_concurrency: Optional[int] = None, max_queue: int = 64,
+              max_sessions: int = 1024, session_ttl: Optional[float] = None,
+              metrics_dir: Optional[str] = None):
+    """A FastAPI app serving every target on its path.
+
+    Agents are served like ``Agent.launch`` serves them; a PraisonAIAgents
+    workflow runs its agents in sequence, like ``PraisonAIAgents.launch``.
+    With ``metrics_dir`` set, ``/metrics`` includes the sibling workers.
+    """
+    from fastapi import FastAPI
+    from fastapi.responses import PlainTextResponse
+    from praisonaiagents import PraisonAIAgents
+    from praisonaiagents.agent.serving import AgentChain, AgentServer, mount_agent, render_metrics
+
+    app = FastAPI(title="PraisonAI Agents API", description="API for interacting with PraisonAI Agents")
+    servers = {}
+    for path, target in targets.items():
+        agent = AgentChain(target.agents) if isinstance(target, PraisonAIAgents) else target
+        servers[path] = AgentServer(agent, max_concurrency=max_concurrency, max_queue=max_queue,
+                                    max_sessions=max_sessions, session_ttl=session_ttl)
+        mount_agent(app, path, servers[path])
+
+    worker_metrics = None
+    if metrics_dir:
+        worker_metrics = WorkerMetrics(metrics_dir, servers)
+        worker_metrics.start()
+
+    @app.get("/")
+    async def root():
+        return {"message": "Welcome to PraisonAI Agents API. See /docs for usage.", "endpoints": list(servers)}
+
+    @app.get("/health")
+    async def healthcheck():
+        return {"status": "ok", "endpoints": list(servers), "pid": os.getpid()}
+
+    @app.get("/metrics")
+    async def metrics():
+        text = worker_metrics.collect() if worker_metrics else render_metrics(servers)
+        return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
+    app.state.servers = servers
+    return app
+
+
+class Arbiter:
+    """Pre-forking supervisor: loads the agents, binds the port and keeps ``workers`` processes running.
+
+    Args:
+        source: What to serve, see ``load_targets``.
+        host: Interface to bind.
+        port: Port to bind.
+        workers: Worker processes (default: one per CPU).
+        config_list: LLM configuration for YAML workflows.
+        graceful_timeout: Seconds a stopping worker may spend finishing its
+            requests before it is killed.
+        log_level: uvicorn log level in the workers.
+        **server_options: Passed to AgentServer (max_concurrency, max_queue,
+            max_sessions, session_ttl).
+    """
+
+    def __init__(self, source: str, host: str = "0.0.0.0", port: int = 8000, workers: Optional[int] = None,
+                 config_list: Optional[List[Dict[str, Any]]] = None, graceful_timeout: int = 30,
+                 log_level: str = "info", **server_options: Any):
+        self.source = source
+        self.host = host
+        self.port = port
+        self.num_workers = workers or os.cpu_count() or 1
+        self.config_list = config_list
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        self.server_options = server_options
+        self.targets: Dict[str, Any] = {}
+        self.workers: Dict[int, float] = {}  # pid -> start time, current generation
+        self.retiring: Dict[int, float] = {}  # pid -> time it was told to stop
+        self.socket: Optional[socket.socket] = None
+        self.metrics_dir: Optional[str] = None
+        self._stopping = False
+        self._reloading = False
+        self._last_crash = 0.0
+        # Whether workers load the agents themselves, after the fork
+        self.load_in_workers = False
+
+    def load(self) -> None:
+        self.targets = preload(load_targets(self.source, self.config_list))
+        logger.info(f"Loaded {', '.join(self.targets)} from {self.source}")
+        servers = mcp_tools(self.targets)
+        self.load_in_workers = bool(servers)
+        if servers:
+            # Forked workers would inherit the MCP connections without the threads running them
+            logger.info("Agents use MCP tools; each worker loads them after the fork")
+            for server in servers:
+                server.close()
+
+    def bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        self.port = sock.getsockname()[1]
+        return sock
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._serve()
+            except BaseException:
+                logger.exception("Worker failed")
+                code = 1
+            finally:
+                os._exit(code)
+        self.workers[pid] = time.monotonic()
+        return pid
+
+    def _serve(self) -> None:
+        # Runs in the forked worker; uvicorn installs its own SIGINT/SIGTERM handlers
+        import uvicorn
+
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGCHLD):
+            signal.signal(sig, signal.SIG_DFL)
+        if self.load_in_workers:
+            self.targets = load_targets(self.source, self.config_list)
+        app = build_app(self.targets, metrics_dir=self.metrics_dir, **self.server_options)
+        config = uvicorn.Config(app, log_level=self.log_level, timeout_graceful_shutdown=self.graceful_timeout)
+        uvicorn.Server(config).run(sockets=[self.socket])
+
+    def reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid in self.workers:
+                del self.workers[pid]
+                self._last_crash = time.monotonic()
+                logger.warning(f"Worker {pid} exited unexpectedly (status {status}); replacing it")
+            self.retiring.pop(pid, None)
+            try:
+                os.remove(os.path.join(self.metrics_dir, f"{pid}.prom"))
+            except OSError:
+                pass
+
+    def reload(self) -> None:
+        """Load the agents again and replace every worker with one serving them"""
+        self._reloading = False
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f"Reload failed, keeping the current workers: {e}", exc_info=True)
+            return
+        old = list(self.workers)
+        self.workers = {}
+        for _ in range(self.num_workers):
+            self.spawn()
+        # The new workers share the socket, so connections queue for them meanwhile
+        self.retire(old)
+        logger.info(f"Reloaded; retiring workers {old}")
+
+    def retire(self, pids: List[int]) -> None:
+        for pid in pids:
+            self.workers.pop(pid, None)
+            self.retiring[pid] = time.monotonic()
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _kill_stragglers(self) -> None:
+        for pid, since in list(self.retiring.items()):
+            if time.monotonic() - since > self.graceful_timeout + 5:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+    def _on_signal(self, signum, frame) -> None:
+        if signum == signal.SIGHUP:
+            self._reloading = True
+        else:
+            self._stopping = True
+
+    def run(self) -> None:
+        """Load, bind and supervise the workers until SIGINT or SIGTERM"""
+        self.load()
+        self.socket = self.bind()
+        self.metrics_dir = tempfile.mkdtemp(prefix="praisonai-metrics-")
+        for sig in (signal.SIGHUP, signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self._on_signal)
+        print(f"✅ Serving {', '.join(self.targets)} on http://{self.host}:{self.port} "
+              f"with {self.num_workers} workers (pid {os.getpid()})")
+        if self.num_workers > 1:
+            logger.warning("Sessions are kept per worker: with more than one worker, a session's "
+                           "history is only kept while its requests reuse one connection")
+        try:
+            while not self._stopping:
+                self.reap()
+                if self._reloading:
+                    self.reload()
+                # Back off briefly if workers are crashing on start
+                if time.monotonic() - self._last_crash > 1.0:
+                    while len(self.workers) < self.num_workers:
+                        self.spawn()
+                self._kill_stragglers()
+                time.sleep(0.1)
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        """Stop every worker, waiting up to ``graceful_timeout`` for requests in flight"""
+        self.retire(list(self.workers))
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.retiring and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in list(self.retiring):
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self.retiring.clear()
+        if self.socket is not None:
+            self.socket.close()
+        if self.metrics_dir:
+            shutil.rmtree(self.metrics_dir, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None, config_list: Optional[List[Dict[str, Any]]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="praisonai serve", description="Serve agents over HTTP from several worker processes")
+    parser.add_argument("source", help="YAML workflow, Python file or module, or module:variable")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind (default: 8000)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Requests processed at once per agent and worker")
+    parser.add_argument("--max-queue", type=int, default=64, help="Requests waiting per agent and worker before 429")
+    parser.add_argument("--max-sessions", type=int, default=1024,
+                        help="Sessions kept per agent and worker; connections are spread across workers, "
+                             "so use --workers 1 for sessions that span connections")
+    parser.add_argument("--session-ttl", type=float, default=None, help="Seconds an idle session is kept")
+    parser.add_argument("--graceful-timeout", type=int, default=30, help="Seconds workers get to finish requests on reload or stop")
+    parser.add_argument("--log-level", default="info", help="uvicorn log level (default: info)")
+    args = parser.parse_args(argv)
+
+    if not hasattr(os, "fork"):
+        print("praisonai serve needs a POSIX system (os.fork); use Agent.launch() instead")
+        sys.exit(1)
+    Arbiter(
+        args.source, host=args.host, port=args.port, workers=args.workers, config_list=config_list,
+        graceful_timeout=args.graceful_timeout, log_level=args.log_level,
+        max_concurrency=args.max_concurrency, max_queue=args.max_queue,
+        max_sessions=args.max_sessions, session_ttl=args.session_ttl,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
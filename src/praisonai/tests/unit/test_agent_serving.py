@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for per-session agents, bounded concurrency and metrics in Agent.launch
+"""
+
+import sys
+import os
+import time
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+httpx = pytest.importorskip("httpx")
+
+from praisonaiagents import Agent
+from praisonaiagents.agent.serving import AgentServer, LatencyHistogram, QueueFullError
+
+
+class CountingAgent(Agent):
+    """Answers with how many turns its own history holds, after a short delay"""
+
+    delay = 0.0
+
+    def chat(self, prompt, *args, **kwargs):
+        time.sleep(self.delay)
+        self.chat_history.append({"role": "user", "content": prompt})
+        self.chat_history.append({"role": "assistant", "content": prompt})
+        return f"{len(self.chat_history) // 2}:{prompt}"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _launch(agent, path="/", **kwargs):
+    port = _free_port()
+    # launch() blocks the calling thread once the server is up
+    threading.Thread(target=agent.launch, kwargs=dict(path=path, port=port, host="127.0.0.1", **kwargs),
+                     daemon=True).start()
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base}/health").status_code == 200:
+                return base
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    pytest.skip("launch() server did not start")
+
+
+def test_histogram_buckets_and_quantile():
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 0.5, 2.0):
+        histogram.observe(seconds)
+    assert histogram.counts == [1, 2, 1]
+    assert histogram.quantile(0.5) == 1.0
+    lines = histogram.render("latency", 'path="/"')
+    assert 'latency_bucket{path="/",le="1.0"} 3' in lines
+    assert 'latency_bucket{path="/",le="+Inf"} 4' in lines
+
+
+def test_sessions_keep_separate_histories():
+    base = _launch(CountingAgent(name="Counter", llm="gpt-4o-mini"))
+    for expected in ("1", "2"):
+        for session in ("alice", "bob"):
+            reply = httpx.post(base + "/", json={"query": session, "session_id": session}).json()
+            assert reply == {"response": f"{expected}:{session}", "session_id": session}
+    # Without a session id every request starts from the template's history
+    assert httpx.post(base + "/", json={"query": "x"}).json() == {"response": "1:x"}
+
+
+def test_full_queue_is_rejected_and_metrics_recorded():
+    agent = CountingAgent(name="Slow", llm="gpt-4o-mini")
+    agent.delay = 0.5
+    base = _launch(agent, path="/slow", max_concurrency=2, max_queue=1)
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        codes = list(pool.map(lambda i: httpx.post(base + "/slow", json={"query": str(i)}, timeout=10).status_code,
+                              range(6)))
+    assert codes.count(200) == 3
+    assert codes.count(429) == 3
+
+    metrics = httpx.get(base + "/metrics").text
+    assert 'praisonai_requests_total{path="/slow"} 3' in metrics
+    assert 'praisonai_requests_rejected_total{path="/slow"} 3' in metrics
+    assert 'praisonai_request_duration_seconds_count{path="/slow"} 3' in metrics
+    assert "# TYPE praisonai_queue_wait_seconds histogram" in metrics
+
+
+def test_requests_in_one_session_run_in_order():
+    import asyncio
+
+    agent = CountingAgent(name="Ordered", llm="gpt-4o-mini")
+    agent.delay = 0.05
+    server = AgentServer(agent, max_concurrency=4)
+
+    async def main():
+        return await asyncio.gather(*[server.submit(str(i), session_id="s") for i in range(4)])
+
+    assert asyncio.run(main()) == [f"{i + 1}:{i}" for i in range(4)]
+    assert server.pool.sessions == 1
+    assert agent.chat_history == []
+    server.shutdown()
+
+
+def test_admission_limit():
+    server = AgentServer(CountingAgent(name="Limit", llm="gpt-4o-mini"), max_concurrency=1, max_queue=0)
+    server._admit()
+    with pytest.raises(QueueFullError):
+        server._admit()
+    assert server.rejected == 1
+    server.shutdown()
+
+
+def test_clones_are_instrumented_on_their_own():
+    from praisonaiagents.agent.serving import AgentPool
+    from praisonaiagents.telemetry.integration import instrument_agent
+    from praisonaiagents.telemetry.telemetry import MinimalTelemetry
+
+    template = CountingAgent(name="Counter", instructions="Count")
+    telemetry = MinimalTelemetry(enabled=True)
+    vars(template).pop("_telemetry_instrumented", None)
+    instrument_agent(template, telemetry)
+    assert "chat" in vars(template)  # wrapped on the instance, bound to the template
+
+    pool = AgentPool(template)
+    first, second = pool.clone(), pool.clone()
+    assert first.chat("a") == "1:a" and first.chat("b") == "2:b"
+    assert second.chat("c") == "1:c"
+    assert template.chat_history == []
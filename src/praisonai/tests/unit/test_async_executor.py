@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for the async-first task executor and event-loop lag probe
+"""
+
+import sys
+import os
+import time
+import asyncio
+from types import SimpleNamespace
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents.agents import PraisonAIAgents, AsyncTaskExecutor, LoopLagProbe
+from praisonaiagents.task.task import Task
+
+
+class TestLoopLagProbe:
+    @pytest.mark.asyncio
+    async def test_probe_detects_blocking(self):
+        probe = LoopLagProbe(interval=0.01)
+        probe.start()
+        await asyncio.sleep(0.03)
+        time.sleep(0.15)  # block the loop on purpose
+        await asyncio.sleep(0.03)
+        await probe.stop()
+        assert probe.stats()["max_ms"] >= 100
+
+    def test_percentiles_use_the_most_recent_samples(self):
+        probe = LoopLagProbe(max_samples=3)
+        for lag in (0.5, 0.5, 0.001, 0.002, 0.003):
+            probe.record(lag)
+        stats = probe.stats()
+        assert stats["samples"] == 5 and stats["max_ms"] == 500
+        assert stats["p99_ms"] == 3
+
+
+class TestAsyncTaskExecutor:
+    @pytest.mark.asyncio
+    async def test_sync_work_does_not_block_loop(self):
+        async with AsyncTaskExecutor(probe_interval=0.01) as executor:
+            await executor.gather([(time.sleep, 0.1) for _ in range(3)])
+        stats = executor.probe.stats()
+        assert stats["samples"] > 0
+        assert stats["max_ms"] < 80
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        peak = 0
+
+        async def job():
+            nonlocal peak
+            peak = max(peak, executor.in_flight)
+            await asyncio.sleep(0.01)
+
+        async with AsyncTaskExecutor(max_concurrency=2, probe_interval=None) as executor:
+            await executor.gather([(job,) for _ in range(6)])
+        assert peak == 2
+        assert executor.completed == 6
+
+    def test_invalid_limit(self):
+        with pytest.raises(ValueError):
+            AsyncTaskExecutor(max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_arun_all_tasks_offloads_sync_tasks():
+    agent = SimpleNamespace(name="worker")
+    tasks = [Task(name=f"t{i}", description="work", agent=agent) for i in range(3)]
+    agents = PraisonAIAgents(agents=[agent], tasks=tasks, process="sequential", max_concurrency=2)
+    ran = []
+
+    def fake_run_task(task_id):
+        time.sleep(0.05)
+        ran.append(task_id)
+        agents.tasks[task_id].status = "completed"
+
+    agents.run_task = fake_run_task
+    await agents.arun_all_tasks()
+    assert ran == [0, 1, 2]
+    assert agents.loop_lag_stats["max_ms"] < 40
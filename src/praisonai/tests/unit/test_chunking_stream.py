@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for Chunking.iter_chunks, which chunks files and streams a window at a time
+"""
+
+import sys
+import os
+import io
+import itertools
+import tracemalloc
+from dataclasses import dataclass
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents.knowledge import Knowledge
+from praisonaiagents.knowledge.chunking import Chunking
+
+
+@dataclass
+class Chunk:
+    text: str
+    start_index: int
+    end_index: int
+
+
+class CharChunker:
+    """Chunker double: fixed windows of characters with an overlap, cut after a space"""
+
+    def __init__(self, size, overlap):
+        self.size = size
+        self.overlap = overlap
+
+    def __call__(self, text):
+        chunks, start = [], 0
+        while start < len(text):
+            end = min(start + self.size, len(text))
+            if end < len(text):
+                space = text.rfind(" ", start + self.overlap + 1, end)
+                end = space + 1 if space > start else end
+            chunks.append(Chunk(text[start:end], start, end))
+            if end == len(text):
+                break
+            start = end - self.overlap
+        return chunks
+
+
+def _chunking(size=40, overlap=10):
+    chunking = Chunking('token', chunk_size=size, chunk_overlap=overlap)
+    chunking.chunker = CharChunker(size, overlap)
+    return chunking
+
+
+TEXT = " ".join(f"word{i}" for i in range(2000))
+
+
+def _check(chunks, text=TEXT, overlap=10):
+    assert chunks[0].start_index == 0 and chunks[-1].end_index == len(text)
+    for chunk in chunks:
+        assert text[chunk.start_index:chunk.end_index] == chunk.text
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.start_index == previous.end_index - overlap
+
+
+def test_windows_give_the_same_chunks_as_the_whole_text():
+    chunking = _chunking()
+    whole = chunking.chunk(TEXT)
+    streamed = list(chunking.iter_chunks(io.StringIO(TEXT), window_size=100))
+    _check(streamed)
+    assert [c.text for c in streamed] == [c.text for c in whole]
+
+
+def test_paths_are_memory_mapped_and_decoded_across_windows(tmp_path):
+    text = TEXT.replace("word1", "wörd1")  # multi-byte characters straddle windows
+    path = tmp_path / "doc.txt"
+    path.write_text(text, encoding="utf-8")
+    chunking = _chunking()
+    streamed = list(chunking.iter_chunks(str(path), window_size=97))
+    _check(streamed, text)
+    assert list(chunking.iter_chunks(path, window_size=97)) == streamed
+    (tmp_path / "empty.txt").write_text("")
+    assert list(chunking.iter_chunks(str(tmp_path / "empty.txt"))) == []
+
+
+def test_binary_streams_and_generators():
+    chunking = _chunking()
+    from_bytes = list(chunking.iter_chunks(io.BytesIO(TEXT.encode()), window_size=64))
+    _check(from_bytes)
+    pieces = (f"word{i} " if i < 1999 else f"word{i}" for i in range(2000))
+    from_generator = list(chunking.iter_chunks(pieces, window_size=64))
+    _check(from_generator)
+    assert [c.text for c in from_generator] == [c.text for c in from_bytes]
+
+
+def test_chunks_are_yielded_lazily():
+    chunking = _chunking()
+    consumed = []
+
+    def pieces():
+        for i in itertools.count():
+            consumed.append(i)
+            yield f"word{i} "
+
+    first = next(chunking.iter_chunks(pieces(), window_size=100))
+    assert first.text.startswith("word0 ")
+    assert len(consumed) < 50
+
+
+def test_large_files_are_chunked_with_flat_memory(tmp_path):
+    path = tmp_path / "big.txt"
+    with open(path, "w") as f:
+        for i in range(200000):
+            f.write(f"line {i} of a long log file\n")
+    size = os.path.getsize(path)
+    chunking = _chunking(size=400, overlap=50)
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in chunking.iter_chunks(str(path)))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert count > size // 400
+    assert peak < size / 20
+
+
+class ListMemory:
+    def __init__(self):
+        self.texts = []
+
+    def add(self, messages, **kwargs):
+        self.texts.append(messages[0]["content"])
+        return {"results": [{"id": str(len(self.texts)), "memory": "", "event": "ADD"}]}
+
+
+def test_knowledge_streams_large_text_files_through_iter_chunks(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text(TEXT)
+    knowledge = Knowledge()
+    knowledge.memory = memory = ListMemory()
+    knowledge.chunker = _chunking(size=30, overlap=5)
+    calls = []
+    iter_chunks = knowledge.chunker.iter_chunks
+    knowledge.chunker.iter_chunks = lambda source, **kw: calls.append(source) or iter_chunks(source, **kw)
+    knowledge.add(str(path))
+    assert calls == [str(path)]
+    assert memory.texts[0].startswith("word0 ") and memory.texts[-1].endswith("word1999")
+    assert all(len(text) <= 30 for text in memory.texts)
+
+
+def test_real_chunker_keeps_overlap_across_windows():
+    pytest.importorskip("chonkie")
+    chunking = Chunking('token', chunk_size=64, chunk_overlap=16)
+    whole = [c.text for c in chunking.chunk(TEXT)]
+    streamed = list(chunking.iter_chunks(io.StringIO(TEXT), window_size=1000))
+    assert [c.text for c in streamed] == whole
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for segment-based task context assembly
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+from praisonaiagents.task.task import Task
+from praisonaiagents.process.process import Process
+from praisonaiagents.process.context import ContextAssembler, estimate_tokens
+from praisonaiagents.main import TaskOutput
+from praisonaiagents.agent.agent import Agent
+from praisonaiagents.agents.agents import PraisonAIAgents
+
+
+def _completed_task(name, raw):
+    task = Task(name=name, description=f"{name} description", status="completed")
+    task.result = TaskOutput(description=task.description, raw=raw, agent="Test Agent")
+    return task
+
+
+class TestContextAssembler:
+    def test_segments_are_built_once(self):
+        assembler = ContextAssembler()
+        first = assembler.segment("task1", "result one")
+        second = assembler.segment("task1", "result one")
+        assert first is second
+        assert assembler.stats["segments_built"] == 1
+        assert assembler.stats["segment_hits"] == 1
+
+    def test_rerun_replaces_segment(self):
+        assembler = ContextAssembler()
+        assembler.segment("task1", "old")
+        updated = assembler.segment("task1", "new")
+        assert updated.text == "task1: new"
+        assert len(assembler._segments) == 1
+
+    def test_assembly_is_memoised(self):
+        assembler = ContextAssembler()
+        segments = [assembler.segment(f"t{i}", f"r{i}") for i in range(3)]
+        first = assembler.assemble("owner", segments, header="H\n")
+        second = assembler.assemble("owner", segments, header="H\n")
+        assert first == "H\nt0: r0\nt1: r1\nt2: r2"
+        assert first is second
+        assert assembler.stats["assembly_hits"] == 1
+
+    def test_memoised_contexts_are_bounded(self):
+        assembler = ContextAssembler(max_cached_contexts=2)
+        segment = assembler.segment("t", "r")
+        for owner in range(5):
+            assembler.assemble(owner, [segment])
+        assert list(assembler._assembled) == [3, 4]
+        assert set(assembler._rendered) == {3, 4}
+        assert assembler.rendered_keys(4) == {segment.key}
+        assert assembler.rendered_keys(0) == set()
+
+    def test_token_budget_keeps_newest(self):
+        assembler = ContextAssembler()
+        old = assembler.segment("old", "x" * 400)
+        new = assembler.segment("new", "y" * 40)
+        context = assembler.assemble("owner", [old, new], token_budget=30)
+        assert "new: " + "y" * 40 in context
+        assert context.count("x") < 400
+        assert "[truncated]" in context
+        assert estimate_tokens(context) <= 30 + 5
+
+    def test_summarizer_is_used_when_over_budget(self):
+        assembler = ContextAssembler(summarizer=lambda text, max_tokens: "SUMMARY")
+        big = assembler.segment("big", "z" * 1000)
+        assert assembler.assemble("owner", [big], token_budget=10) == "SUMMARY"
+
+
+class TestProcessContext:
+    def test_full_context_format_unchanged(self):
+        t1 = _completed_task("task1", "Result from task 1")
+        t2 = _completed_task("task2", "Result from task 2")
+        t3 = Task(name="task3", description="Third", retain_full_context=True)
+        t3.previous_tasks = ["task1", "task2"]
+        process = Process(tasks={t.id: t for t in (t1, t2, t3)}, agents=[])
+        context = process._build_task_context(t3)
+        assert context == "\nInput data from previous tasks:\ntask1: Result from task 1\ntask2: Result from task 2"
+
+    def test_context_respects_task_budget(self):
+        tasks = [_completed_task(f"task{i}", "r" * 4000) for i in range(10)]
+        last = Task(name="last", description="Last", retain_full_context=True, context_token_budget=2000)
+        last.previous_tasks = [t.name for t in tasks]
+        process = Process(tasks={t.id: t for t in tasks + [last]}, agents=[])
+        context = process._build_task_context(last)
+        assert estimate_tokens(context) < 2100
+        assert "task9: " in context
+
+    def test_string_context_items_are_ignored(self):
+        t1 = _completed_task("task1", "Result from task 1")
+        t2 = Task(name="task2", description="Second", context=["plain input", t1])
+        process = Process(tasks={t.id: t for t in (t1, t2)}, agents=[])
+        assert "task1: Result from task 1" in process._build_task_context(t2)
+
+    def test_results_dropped_by_the_budget_reach_the_prompt(self):
+        agent = Agent(name="Test Agent", llm="gpt-4o-mini")
+        tasks = [_completed_task(f"task{i}", f"{i}" * 400) for i in range(3)]
+        last = Task(name="last", description="Last", agent=agent, context=list(tasks), retain_full_context=True,
+                    context_token_budget=150)
+        team = PraisonAIAgents(agents=[agent], tasks=[last])
+        process = Process(tasks=team.tasks, agents=[agent], context_assembler=team.context_assembler)
+        description = process._build_task_context(last)
+        assert "task0" not in description and "task1: " in description and "task2: " in description
+        section = team._build_context_section(last.id, last)
+        assert "Result of previous task task0:\n" + "0" * 400 in section
+        assert "task1" not in section and "task2" not in section
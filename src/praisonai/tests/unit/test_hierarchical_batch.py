@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched hierarchical manager mode
+"""
+
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents.task.task import Task
+from praisonaiagents.process.process import Process, ManagerBatchInstructions, ManagerAssignment
+
+
+def _setup(count=3, shared_agent=False):
+    agents = [SimpleNamespace(name=f"agent{i}") for i in range(count)]
+    tasks = {}
+    for i in range(count):
+        agent = agents[0] if shared_agent else agents[i]
+        tasks[i] = Task(name=f"task{i}", description=f"Do thing {i}", agent=agent)
+    return tasks, agents
+
+
+def _run(process, tasks, decisions):
+    """Drive the sync hierarchical generator, completing every dispatched task"""
+    prompts, batches = [], []
+
+    def fake_manager(manager_task, prompt, model, history=None):
+        prompts.append((prompt, list(history or [])))
+        return decisions.pop(0)
+
+    process._get_manager_instructions_with_fallback = fake_manager
+    for item in process.hierarchical():
+        if isinstance(item, Task):
+            item.id = len(tasks)
+            tasks[item.id] = item
+            continue
+        batches.append(item)
+        for tid in item:
+            tasks[tid].status = "completed"
+    return prompts, batches
+
+
+def _batch(*pairs, action="execute"):
+    return ManagerBatchInstructions(
+        assignments=[ManagerAssignment(task_id=t, agent_name=a) for t, a in pairs],
+        action=action,
+    )
+
+
+def test_invalid_manager_mode():
+    tasks, agents = _setup()
+    with pytest.raises(ValueError):
+        Process(tasks=tasks, agents=agents, manager_mode="bogus")
+
+
+def test_batch_dispatches_all_tasks_in_one_call():
+    tasks, agents = _setup()
+    process = Process(tasks=tasks, agents=agents, manager_llm="gpt-4o-mini", manager_mode="batch")
+    prompts, batches = _run(process, tasks, [_batch((0, "agent0"), (1, "agent1"), (2, "agent2"))])
+    assert batches == [[0, 1, 2]]
+    assert len(prompts) == 1
+    assert "Do thing 0" in prompts[0][0]
+
+
+def test_dependent_and_same_agent_tasks_are_deferred():
+    tasks, agents = _setup(shared_agent=True)
+    tasks[2].agent = agents[2]
+    tasks[2].previous_tasks = ["task1"]
+    tasks[1].agent = agents[1]
+    process = Process(tasks=tasks, agents=agents, manager_llm="gpt-4o-mini", manager_mode="batch")
+    first = _batch((0, "agent0"), (1, "agent1"), (2, "agent2"))
+    prompts, batches = _run(process, tasks, [first, _batch((2, "agent2"))])
+    assert batches[0] == [0, 1]
+    assert batches[1] == [2]
+
+
+def test_follow_up_prompt_is_a_status_diff():
+    tasks, agents = _setup()
+    process = Process(tasks=tasks, agents=agents, manager_llm="gpt-4o-mini", manager_mode="batch")
+    prompts, _ = _run(process, tasks, [_batch((0, "agent0")), _batch((1, "agent1"), (2, "agent2"))])
+    follow_up, history = prompts[1]
+    assert "Do thing" not in follow_up
+    assert "Status changes" in follow_up
+    assert [m["role"] for m in history] == ["user", "assistant"]
+    # The task list with descriptions went out once; the conversation keeps an index of it
+    assert "task2" in history[0]["content"]
+    assert all("Do thing" not in m["content"] for _, history in prompts[1:] for m in history)
+
+
+def test_unchanged_state_reuses_cached_decision():
+    tasks, agents = _setup(count=1)
+    process = Process(tasks=tasks, agents=agents, manager_llm="gpt-4o-mini", manager_mode="batch")
+    calls = []
+
+    def fake_manager(manager_task, prompt, model, history=None):
+        calls.append(prompt)
+        return _batch((0, "agent0"))
+
+    process._get_manager_instructions_with_fallback = fake_manager
+    dispatched = 0
+    for item in process.hierarchical():
+        if isinstance(item, Task):
+            item.id = 1
+            tasks[1] = item
+            continue
+        dispatched += 1  # never completes, so the state never changes
+    assert len(calls) == 1
+    assert dispatched == Process.DEFAULT_RETRY_LIMIT
+
+
+def test_async_loop_dispatches_the_same_batches():
+    tasks, agents = _setup()
+    process = Process(tasks=tasks, agents=agents, manager_llm="gpt-4o-mini", manager_mode="batch")
+    decisions = [_batch((0, "agent0"), (1, "agent1")), _batch((2, "agent2"))]
+    prompts = []
+
+    def fake_manager(manager_task, prompt, model, history=None):
+        prompts.append((prompt, list(history or [])))
+        return decisions.pop(0)
+
+    process._get_manager_instructions_with_fallback = fake_manager
+
+    async def main():
+        batches = []
+        generator = process.ahierarchical()
+        item = await generator.__anext__()
+        while True:
+            if isinstance(item, Task):
+                item.id = len(tasks)
+                tasks[item.id] = item
+                reply = item.id
+            else:
+                batches.append(item)
+                for tid in item:
+                    tasks[tid].status = "completed"
+                reply = None
+            try:
+                item = await generator.asend(reply)
+            except StopAsyncIteration:
+                return batches
+
+    assert asyncio.run(main()) == [[0, 1], [2]]
+    assert "Status changes" in prompts[1][0]
+    assert all("Do thing" not in m["content"] for m in prompts[1][1])
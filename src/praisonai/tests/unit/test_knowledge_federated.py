@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for searching several Knowledge collections concurrently and merging their results
+"""
+
+import gc
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents import Agent
+from praisonaiagents.knowledge import FederatedKnowledge, Knowledge, KnowledgeSource
+from praisonaiagents.knowledge.federated import normalize_scores
+
+
+class Collection:
+    """Knowledge double returning fixed scored results, optionally blocking until released"""
+
+    def __init__(self, results, gate=None, error=None):
+        self.results = results
+        self.gate = gate
+        self.error = error
+        self.calls = []
+
+    def search(self, query, **kwargs):
+        self.calls.append(kwargs)
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.error:
+            raise self.error
+        return {"results": [{"memory": text, "score": score} for text, score in self.results]}
+
+
+def test_scores_are_normalized_per_source_and_merged_best_first():
+    distances = Collection([("close", 0.1), ("middle", 0.4), ("far", 0.9)])
+    similarities = Collection([("strong", 0.8), ("weak", 0.2)])
+    federated = FederatedKnowledge({"docs": KnowledgeSource(distances, lower_is_better=True),
+                                    "faq": KnowledgeSource(similarities, weight=0.5, lower_is_better=False)})
+    found = federated.search("q", agent_id="a", limit=4)
+    results = found["results"]
+    assert [r["memory"] for r in results] == ["close", "middle", "strong", "far"]
+    assert [r["collection"] for r in results] == ["docs", "docs", "faq", "docs"]
+    assert results[0]["score"] == 1.0 and results[0]["raw_score"] == 0.1
+    assert results[2]["score"] == 0.5
+    assert found["sources"]["faq"]["status"] == "ok" and found["sources"]["docs"]["results"] == 3
+    assert distances.calls == [{"agent_id": "a", "limit": 4}]
+
+    assert normalize_scores([{"score": 2.0}, {"score": 2.0}]) == [1.0, 1.0]
+    assert normalize_scores([{"memory": "a"}, {"memory": "b"}]) == [1.0, 0.5]
+
+
+def test_slow_source_times_out_without_stalling_the_search():
+    gate = threading.Event()
+    slow = Collection([("late", 1.0)], gate=gate)
+    federated = FederatedKnowledge([KnowledgeSource(Collection([("quick", 0.9)]), name="fast", lower_is_better=False),
+                                    KnowledgeSource(slow, name="slow", timeout=0.1)])
+    try:
+        started = time.perf_counter()
+        found = federated.search("q", user_id="u")
+        assert time.perf_counter() - started < 1.0
+        assert [r["memory"] for r in found["results"]] == ["quick"]
+        assert found["sources"]["slow"]["status"] == "timeout"
+
+        # Still running: skipped instead of queueing another search behind it
+        assert federated.search("q", user_id="u")["sources"]["slow"]["status"] == "busy"
+        assert len(slow.calls) == 1
+        gate.set()
+        time.sleep(0.05)
+        found = federated.search("q", user_id="u")
+        assert found["sources"]["slow"]["status"] == "ok" and len(found["results"]) == 2
+    finally:
+        gate.set()
+        federated.close()
+
+
+def test_failing_sources_and_source_filters():
+    broken = Collection([], error=RuntimeError("store is down"))
+    scoped = Collection([("team note", 0.5)])
+    federated = FederatedKnowledge([KnowledgeSource(broken, name="broken"),
+                                    KnowledgeSource(scoped, name="team", filters={"user_id": "team"})])
+    found = federated.search("q", agent_id="agent")
+    assert found["sources"]["broken"]["status"] == "error"
+    assert [r["memory"] for r in found["results"]] == ["team note"]
+    assert scoped.calls[0] == {"user_id": "team", "limit": 20}
+
+    with pytest.raises(ValueError):
+        FederatedKnowledge([KnowledgeSource(scoped, name="x"), KnowledgeSource(broken, name="x")])
+
+
+def test_sources_are_named_and_scored_from_their_config():
+    chroma = Knowledge(config={"vector_store": {"config": {"collection_name": "manuals"}}})
+    quantized = Knowledge(config={"vector_store": {"config": {"collection_name": "tickets", "quantization": "int8"}}})
+    federated = FederatedKnowledge([chroma, quantized, Collection([])])
+    assert [s.name for s in federated.sources] == ["manuals", "tickets", "knowledge_2"]
+    assert [s.lower_is_better for s in federated.sources] == [True, False, False]
+
+
+def test_agent_searches_knowledge_collections_together():
+    docs = Collection([("The office opens at 9", 0.2)])
+    faq = Collection([("Parking is free on weekends", 0.7)])
+    agent = Agent(name="Helper", instructions="Answer questions",
+                  knowledge=[docs, KnowledgeSource(faq, name="faq", lower_is_better=False)],
+                  knowledge_config={"federated": {"timeout": 1.0}, "context": {"token_budget": 50}})
+    assert isinstance(agent.knowledge, FederatedKnowledge) and agent.knowledge.timeout == 1.0
+    prompt = agent._add_knowledge("When does the office open?")
+    assert "The office opens at 9" in prompt and "Parking is free on weekends" in prompt
+    # Collections the agent did not populate are not searched under its own agent_id
+    assert docs.calls[0] == {"user_id": agent.user_id, "limit": 20}
+    assert agent.last_knowledge_context.tokens <= 50
+
+
+class ScopedCollection:
+    """Knowledge double that, like mem0, only returns memories stored under the searched scope"""
+
+    def __init__(self, memories):
+        self.memories = memories  # (text, scope) pairs
+
+    def search(self, query, user_id=None, agent_id=None, run_id=None, limit=100):
+        filters = {k: v for k, v in (("user_id", user_id), ("agent_id", agent_id), ("run_id", run_id)) if v}
+        if not filters:
+            raise ValueError("One of the filters: user_id, agent_id or run_id is required")
+        found = [text for text, scope in self.memories if all(scope.get(k) == v for k, v in filters.items())]
+        return {"results": [{"memory": text, "score": 0.5} for text in found[:limit]]}
+
+
+def test_agent_finds_memories_in_existing_collections():
+    shared = ScopedCollection([("Refunds take 5 days", {"user_id": "support"}),
+                               ("Internal escalation path", {"user_id": "staff"})])
+    team = ScopedCollection([("Standup is at 10", {"user_id": "team", "agent_id": "planner"})])
+    agent = Agent(name="Helper", instructions="Answer questions", user_id="support",
+                  knowledge=[shared, KnowledgeSource(team, name="team", filters={"agent_id": "planner"})])
+    found = agent.knowledge.search("refunds", agent_id=agent.agent_id)
+    assert sorted(r["memory"] for r in found["results"]) == ["Refunds take 5 days", "Standup is at 10"]
+    assert all(report["status"] == "ok" for report in found["sources"].values())
+
+
+def test_search_threads_stop_when_the_federation_is_dropped():
+    federated = FederatedKnowledge([Collection([("a", 1.0)])])
+    federated.search("q", user_id="u")
+    executor = federated._executor
+    del federated
+    gc.collect()
+    assert executor._shutdown
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the staged ingestion pipeline behind Knowledge.add of many files
+"""
+
+import sys
+import os
+import time
+import itertools
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents.knowledge import Knowledge
+from praisonaiagents.knowledge.ingest import expand_inputs
+from praisonaiagents.knowledge.knowledge import SUPPORTED_EXTENSIONS
+
+
+class SlowMemory:
+    """Vector store double taking ``delay`` seconds per stored chunk"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.stored = {}
+        self.ids = itertools.count()
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def add(self, messages, user_id=None, agent_id=None, run_id=None, metadata=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            memory_id = f"m{next(self.ids)}"
+            self.stored[memory_id] = (messages[0]["content"], metadata)
+        return {"results": [{"id": memory_id, "memory": messages[0]["content"], "event": "ADD"}]}
+
+    def delete(self, memory_id):
+        with self.lock:
+            del self.stored[memory_id]
+
+
+def _knowledge(tmp_path, memory, collection="docs"):
+    config = {"vector_store": {"provider": "chroma", "config": {"path": str(tmp_path / "store")}}}
+    if collection:
+        config["vector_store"]["config"]["collection_name"] = collection
+    knowledge = Knowledge(config=config)
+    knowledge.memory = memory
+    return knowledge
+
+
+def _corpus(tmp_path, count=12):
+    docs = tmp_path / "docs"
+    (docs / "nested").mkdir(parents=True)
+    for i in range(count):
+        folder = docs / "nested" if i % 2 else docs
+        (folder / f"doc{i}.{'md' if i % 3 else 'txt'}").write_text(f"Document number {i}")
+    (docs / "script.py").write_text("print('not knowledge')")
+    return docs
+
+
+def test_directory_is_expanded_to_supported_files(tmp_path):
+    docs = _corpus(tmp_path, count=4)
+    files = expand_inputs([str(docs)], SUPPORTED_EXTENSIONS)
+    assert sorted(os.path.basename(f) for f in files) == ["doc0.txt", "doc1.md", "doc2.md", "doc3.txt"]
+    assert expand_inputs([str(docs / "**" / "*.md")], SUPPORTED_EXTENSIONS) == sorted(
+        f for f in files if f.endswith(".md"))
+    assert expand_inputs(["what is 2*3?"], SUPPORTED_EXTENSIONS) == ["what is 2*3?"]
+
+
+def test_directory_ingest_stores_every_file_and_reports_throughput(tmp_path):
+    memory = SlowMemory()
+    knowledge = _knowledge(tmp_path, memory)
+    result = knowledge.add(str(_corpus(tmp_path)), agent_id="agent")
+    stats = result["stats"]
+    assert stats["documents"] == 12 and stats["chunks"] == 12 and stats["failed"] == {}
+    assert stats["docs_per_sec"] > 0 and stats["chunks_per_sec"] > 0
+    assert sorted(text for text, _ in memory.stored.values()) == sorted(f"Document number {i}" for i in range(12))
+    assert {meta["filename"] for _, meta in memory.stored.values()} == {
+        f"doc{i}.{'md' if i % 3 else 'txt'}" for i in range(12)}
+
+    again = knowledge.add(str(tmp_path / "docs" / "**" / "*.*"), agent_id="agent")
+    assert again["stats"]["skipped"] == 12 and again["results"] == []
+
+
+def test_writes_run_in_parallel(tmp_path):
+    memory = SlowMemory(delay=0.05)
+    knowledge = _knowledge(tmp_path, memory, collection=None)
+    start = time.perf_counter()
+    result = knowledge.ingest(str(_corpus(tmp_path, count=16)), write_workers=8, batch_size=1)
+    elapsed = time.perf_counter() - start
+    assert result["stats"]["chunks"] == 16
+    assert memory.max_active > 1
+    assert elapsed < 16 * memory.delay
+
+
+def test_failed_files_are_reported_without_stopping_the_others(tmp_path):
+    docs = _corpus(tmp_path, count=3)
+    (docs / "empty.txt").write_text("")
+    (docs / "slides.pdf").write_bytes(b"%PDF-1.4")
+    knowledge = _knowledge(tmp_path, SlowMemory())
+    result = knowledge.ingest([str(docs), "Some raw text"], processes=0)
+    stats = result["stats"]
+    assert stats["documents"] == 3
+    assert set(os.path.basename(path) for path in stats["failed"]) == {"empty.txt", "slides.pdf"}
+    assert "some raw text" in [r["memory"] for r in result["results"]]
+
+
+def test_shared_parts_are_built_before_the_stage_threads(tmp_path, monkeypatch):
+    from praisonaiagents.knowledge.ingest import IngestionPipeline
+
+    knowledge = _knowledge(tmp_path, SlowMemory())
+    ready = []
+    start = IngestionPipeline._start
+
+    def record(target, count, name):
+        ready.append({part for part in ("manifest", "chunker", "writer") if part in vars(knowledge)})
+        return start(target, count, name)
+
+    monkeypatch.setattr(IngestionPipeline, "_start", staticmethod(record))
+    result = knowledge.add(str(_corpus(tmp_path, count=4)), agent_id="agent")
+    assert result["stats"]["documents"] == 4
+    assert ready and all(parts == {"manifest", "chunker", "writer"} for parts in ready)
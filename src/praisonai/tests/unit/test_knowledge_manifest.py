@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental re-indexing of files added to Knowledge
+"""
+
+import sys
+import os
+import json
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents.knowledge import Knowledge
+from praisonaiagents.knowledge.manifest import Manifest, plan_chunks
+
+
+class RecordingMemory:
+    """Vector store double recording what Knowledge stores and deletes"""
+
+    def __init__(self):
+        self.stored = {}
+        self.deleted = []
+        self.fail = False
+
+    def add(self, messages, user_id=None, agent_id=None, run_id=None, metadata=None):
+        if self.fail:
+            raise RuntimeError("store unavailable")
+        memory_id = f"m{len(self.stored) + len(self.deleted)}"
+        self.stored[memory_id] = messages[0]["content"]
+        return {"results": [{"id": memory_id, "memory": messages[0]["content"], "event": "ADD"}]}
+
+    def delete(self, memory_id):
+        self.deleted.append(memory_id)
+        del self.stored[memory_id]
+
+    def reset(self):
+        self.stored.clear()
+
+
+def _knowledge(tmp_path, collection="docs", memory=None):
+    config = {"vector_store": {"provider": "chroma", "config": {"path": str(tmp_path / "store")}}}
+    if collection:
+        config["vector_store"]["config"]["collection_name"] = collection
+    knowledge = Knowledge(config=config)
+    knowledge.memory = memory or RecordingMemory()
+    return knowledge
+
+
+def test_unchanged_file_is_skipped_across_instances(tmp_path):
+    doc = tmp_path / "notes.txt"
+    doc.write_text("Paris is the capital of France")
+    first = _knowledge(tmp_path)
+    assert len(first.add(str(doc))["results"]) == 1
+
+    memory = RecordingMemory()
+    second = _knowledge(tmp_path, memory=memory)
+    assert second.add(str(doc)) == {"results": [], "relations": []}
+    assert memory.stored == {}
+    assert os.path.exists(tmp_path / "store" / "manifests" / "docs.json")
+
+
+def test_touched_file_is_hashed_but_not_stored(tmp_path):
+    doc = tmp_path / "notes.txt"
+    doc.write_text("unchanged")
+    knowledge = _knowledge(tmp_path)
+    knowledge.add(str(doc))
+    os.utime(doc, ns=(1, 1))
+    assert knowledge.add(str(doc))["results"] == []
+    entry = next(iter(json.loads((tmp_path / "store" / "manifests" / "docs.json").read_text())["files"].values()))
+    assert entry["mtime_ns"] == 1
+
+
+def test_modified_file_replaces_only_its_changed_chunks(tmp_path):
+    doc = tmp_path / "notes.txt"
+    doc.write_text("old text")
+    memory = RecordingMemory()
+    knowledge = _knowledge(tmp_path, memory=memory)
+    knowledge.add(str(doc))
+    doc.write_text("new text, longer")
+    result = knowledge.add(str(doc))
+    assert [r["memory"] for r in result["results"]] == ["new text, longer"]
+    assert memory.deleted == ["m0"]
+    assert list(memory.stored.values()) == ["new text, longer"]
+
+
+def test_scopes_are_indexed_separately(tmp_path):
+    doc = tmp_path / "notes.txt"
+    doc.write_text("shared")
+    knowledge = _knowledge(tmp_path)
+    assert knowledge.add(str(doc), agent_id="a")["results"]
+    assert knowledge.add(str(doc), agent_id="b")["results"]
+    assert not knowledge.add(str(doc), agent_id="a")["results"]
+
+
+def test_failed_chunks_are_retried(tmp_path):
+    doc = tmp_path / "notes.txt"
+    doc.write_text("retry me")
+    memory = RecordingMemory()
+    memory.fail = True
+    knowledge = _knowledge(tmp_path, memory=memory)
+    assert knowledge.add(str(doc))["results"] == []
+    memory.fail = False
+    assert len(knowledge.add(str(doc))["results"]) == 1
+
+
+def test_reset_forgets_indexed_files(tmp_path):
+    doc = tmp_path / "notes.txt"
+    doc.write_text("again")
+    knowledge = _knowledge(tmp_path)
+    knowledge.add(str(doc))
+    knowledge.reset()
+    assert len(knowledge.add(str(doc))["results"]) == 1
+
+
+def test_default_collection_has_no_manifest(tmp_path):
+    doc = tmp_path / "notes.txt"
+    doc.write_text("every time")
+    knowledge = _knowledge(tmp_path, collection=None)
+    assert knowledge.manifest is None
+    knowledge.add(str(doc))
+    assert len(knowledge.add(str(doc))["results"]) == 1
+
+
+def test_plan_chunks_matches_repeated_chunks_one_for_one():
+    old = [{"hash": "a", "ids": ["1"]}, {"hash": "b", "ids": ["2"]}, {"hash": "b", "ids": ["3"]}]
+    kept, to_store, stale = plan_chunks(old, ["b", "c", "a", "c"])
+    assert sorted(c["hash"] for c in kept) == ["a", "b"]
+    assert to_store == [1, 3]
+    assert [c["hash"] for c in stale] == ["b"]
+
+
+def test_forget_drops_matching_scopes(tmp_path):
+    manifest = Manifest(str(tmp_path / "m.json"))
+    stat = os.stat(__file__)
+    manifest.record(Manifest.key("a.txt", "u1", "agent"), stat, "x", [])
+    manifest.record(Manifest.key("a.txt", "u2", "agent"), stat, "x", [])
+    manifest.forget(user_id="u1")
+    assert len(manifest) == 1
+    manifest.save()
+    assert len(Manifest(str(tmp_path / "m.json"))) == 1
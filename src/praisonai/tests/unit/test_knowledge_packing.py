@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for packing Knowledge search results into a token-budgeted prompt context
+"""
+
+import sys
+import os
+import itertools
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents import Agent
+from praisonaiagents.knowledge import Knowledge
+from praisonaiagents.knowledge.packing import pack_results
+
+
+def _result(text, filename=None, index=None):
+    metadata = {}
+    if filename:
+        metadata["filename"] = filename
+    if index is not None:
+        metadata["chunk_index"] = index
+    return {"memory": text, "metadata": metadata}
+
+
+def test_duplicates_and_contained_results_are_dropped():
+    packed = pack_results({"results": [
+        _result("The capital of France is Paris."),
+        _result("the capital of  France is Paris."),
+        _result("capital of France"),
+        _result("Berlin is the capital of Germany."),
+    ]})
+    assert packed.text == "The capital of France is Paris.\nBerlin is the capital of Germany."
+    assert packed.results == 4 and packed.passages == 2 and packed.tokens_saved > 0
+
+
+def test_adjacent_and_overlapping_chunks_of_a_file_are_merged():
+    first = "Installation requires Python 3.10 or later and a working C compiler toolchain."
+    overlapping = "or later and a working C compiler toolchain. Then run pip install praisonaiagents to finish."
+    packed = pack_results({"results": [
+        _result("Step two: configure the API key.", "guide.md", 4),
+        _result(first, "guide.md", 1),
+        _result("Step one: install the package.", "guide.md", 3),
+        _result(first.replace("Installation", "Building"), "other.md"),
+        _result(overlapping, "guide.md"),
+    ]})
+    assert packed.text.split("\n") == [
+        "Step one: install the package.",
+        "Step two: configure the API key.",
+        first + " Then run pip install praisonaiagents to finish.",
+        first.replace("Installation", "Building"),
+    ]
+
+
+def test_passages_are_packed_best_first_into_the_budget():
+    results = [_result(f"{i} " + "x" * 396) for i in range(10)]  # 100 tokens each
+    packed = pack_results({"results": results}, token_budget=350)
+    assert packed.text.split("\n") == [r["memory"] for r in results[:3]]
+    assert packed.tokens <= 350 and packed.original_tokens > 990
+    assert packed.tokens_saved == packed.original_tokens - packed.tokens
+
+    huge = pack_results(["y" * 4000, "short"], token_budget=50)
+    assert huge.text.startswith("y" * 100) and huge.text.endswith("[truncated]")
+    assert huge.tokens <= 50
+
+    assert pack_results(["a", "b"]).text == "a\nb"
+    assert pack_results({"results": []}).text == ""
+
+
+class ChunkMemory:
+    def __init__(self):
+        self.ids = itertools.count()
+        self.stored = []
+
+    def add(self, messages, metadata=None, **kwargs):
+        self.stored.append({"id": str(next(self.ids)), "memory": messages[0]["content"], "metadata": metadata})
+        return {"results": [self.stored[-1]]}
+
+    def search(self, query, **kwargs):
+        # Best match first: the stored chunks in reverse, repeated
+        return {"results": list(reversed(self.stored)) * 2}
+
+
+def test_agent_prompt_gets_packed_knowledge(tmp_path):
+    path = tmp_path / "notes.md"
+    path.write_text("\n\n".join(f"# Section {i}\n\n" + f"Fact {i}. " * 200 for i in range(6)))
+    knowledge = Knowledge(config={"context": {"token_budget": 1000}})
+    knowledge.memory = memory = ChunkMemory()
+    knowledge.config = {"reranker": {"default_rerank": False}}  # the default one creates a Chroma client
+    knowledge.add(str(path))
+    assert [s["metadata"]["chunk_index"] for s in memory.stored] == list(range(len(memory.stored)))
+
+    agent = Agent(name="Reader", instructions="Answer from the notes")
+    agent.knowledge = knowledge
+    prompt = agent._add_knowledge("What is fact 5?")
+    context = agent.last_knowledge_context
+    assert prompt == f"What is fact 5?\n\nKnowledge: {context.text}"
+    assert context.tokens <= 1000 and context.tokens_saved > 0
+    # Adjacent chunks came back separately and were merged in file order
+    assert context.text.index("Fact 5.") > context.text.index("Section 5") > 0
+    assert knowledge.pack(memory.search("q"), token_budget=100).tokens <= 100
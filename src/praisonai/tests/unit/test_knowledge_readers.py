@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming, format-aware readers used to chunk text files in Knowledge
+"""
+
+import sys
+import os
+import csv
+import json
+import itertools
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents.knowledge import Knowledge
+from praisonaiagents.knowledge.readers import (
+    csv_sections, iter_sections, json_sections, markdown_sections, text_sections
+)
+
+
+def test_csv_row_groups_repeat_the_header(tmp_path):
+    path = tmp_path / "people.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "notes"])
+        for i in range(200):
+            writer.writerow([f"person{i}", "line one\nline two" if i == 7 else f"note {i}"])
+    sections = list(csv_sections(str(path), 300))
+    assert len(sections) > 1
+    assert all(section.startswith("name,notes\n") and len(section) <= 300 for section in sections)
+    rows = [row for section in sections for row in list(csv.reader(section.splitlines(True)))[1:]]
+    assert [row[0] for row in rows] == [f"person{i}" for i in range(200)]
+    assert rows[7][1] == "line one\nline two"
+
+
+def test_json_array_is_streamed_record_by_record(tmp_path):
+    path = tmp_path / "records.json"
+    records = [{"id": i, "text": "x" * 50} for i in range(3000)]
+    path.write_text(json.dumps(records, indent=1))  # larger than one read block
+    sections = list(json_sections(str(path), 500))
+    decoded = [json.loads(line) for section in sections for line in section.splitlines()]
+    assert decoded == records
+    assert all(len(section) <= 500 for section in sections)
+
+
+def test_json_lines_and_single_objects(tmp_path):
+    lines = tmp_path / "lines.json"
+    lines.write_text('{"a": 1}\n{"a": 2}\n')
+    assert list(json_sections(str(lines), 1000)) == ['{"a": 1}\n{"a": 2}']
+    single = tmp_path / "config.json"
+    single.write_text(json.dumps({"model": "gpt", "tools": ["search"]}))
+    assert list(json_sections(str(single), 20)) == ['{"model": "gpt"}', '{"tools": ["search"]}']
+    broken = tmp_path / "broken.json"
+    broken.write_text("not json at all")
+    assert list(json_sections(str(broken), 100)) == ["not json at all"]
+
+
+def test_large_single_object_is_split_into_its_records(tmp_path):
+    path = tmp_path / "export.json"
+    users = [{"id": i, "name": f"user {i}", "bio": "y" * 200} for i in range(20000)]
+    path.write_text(json.dumps({"meta": {"count": len(users)}, "data": {"users": users}}))
+    assert path.stat().st_size > 4 * 2**20
+    sections = list(json_sections(str(path), 2000))
+    assert all(len(section) <= 2000 for section in sections)
+    records = [json.loads(line) for section in sections for line in section.splitlines()]
+    assert records[0] == {"meta": {"count": 20000}}
+    assert [r["data"]["users"][0] for r in records[1:]] == users
+
+
+def test_markdown_sections_carry_their_heading_path(tmp_path):
+    path = tmp_path / "guide.md"
+    path.write_text(
+        "Intro text.\n\n"
+        "# Guide\n\nWelcome.\n\n"
+        "## Install\n\nRun pip.\n\n```bash\n# not a heading\npip install x\n```\n\n"
+        "## Usage\n\nCall it.\n"
+    )
+    assert list(markdown_sections(str(path), 1000)) == [
+        "Intro text.",
+        "Guide\n\nWelcome.",
+        "Guide > Install\n\nRun pip.\n\n```bash\n# not a heading\npip install x\n```",
+        "Guide > Usage\n\nCall it.",
+    ]
+
+
+def test_text_windows_are_bounded(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_text("\n\n".join(f"paragraph {i} " * 20 for i in range(500)) + "\n" + "y" * 10000)
+    sections = list(text_sections(str(path), 4000))
+    assert all(len(section) <= 4000 for section in sections)
+    assert "".join(sections).count("paragraph 499") == 20
+    assert sum(section.count("y") for section in sections) == 10000
+    assert iter_sections(str(path), 100).__name__ == "text_sections"
+
+
+class CountingMemory:
+    """Vector store double that only counts what it stores"""
+
+    def __init__(self):
+        self.ids = itertools.count()
+        self.longest = 0
+
+    def add(self, messages, **kwargs):
+        self.longest = max(self.longest, len(messages[0]["content"]))
+        return {"results": [{"id": str(next(self.ids)), "memory": "", "event": "ADD"}]}
+
+
+def test_large_csv_is_chunked_with_bounded_memory(tmp_path):
+    path = tmp_path / "big.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "city", "comment"])
+        for i in range(40000):
+            writer.writerow([i, "Paris", f"Some Comment About Row {i}"])
+    size = os.path.getsize(path)
+    knowledge = Knowledge()
+    knowledge.memory = memory = CountingMemory()
+    # Imports made on first use are not part of the file's footprint
+    warmup = tmp_path / "small.csv"
+    warmup.write_text("id\n1\n")
+    knowledge.add(str(warmup))
+
+    tracemalloc.start()
+    try:
+        knowledge.add(str(path))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    chunks = next(memory.ids)
+    assert chunks >= size // (knowledge.chunker.chunk_size * 4 * 2)
+    assert memory.longest <= knowledge.chunker.chunk_size * 4
+    # What remains is the per-chunk results returned by add(), not the text
+    assert peak < size / 3
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the process-wide registry of chunkers, tokenizers and embedding models
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents.knowledge import Chunking, Knowledge
+from praisonaiagents.knowledge.registry import (
+    DEFAULT_CHUNKING, InstanceRegistry, freeze, get_chunking, get_embedding_model, get_tokenizer, warmup
+)
+
+
+def test_instances_are_created_once_per_key():
+    registry = InstanceRegistry()
+    created = []
+
+    def factory(name):
+        def create():
+            created.append(name)
+            return object()
+        return create
+
+    first = registry.get("model", "a", factory("a"))
+    assert registry.get("model", "a", factory("a")) is first
+    assert registry.get("model", "b", factory("b")) is not first
+    assert registry.get("tokenizer", "a", factory("a")) is not first
+    assert created == ["a", "b", "a"]
+    assert registry.stats["model"]["created"] == 2 and registry.stats["model"]["hits"] == 1
+    registry.clear()
+    assert len(registry) == 0
+
+
+def test_concurrent_requests_share_one_slow_load():
+    registry = InstanceRegistry()
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("model", "slow", load)))
+               for _ in range(8)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    # Another key is not held back by the slow one
+    assert registry.get("model", "fast", object) is not None
+    assert time.perf_counter() - start < 0.1
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(results) == 8 and all(result is results[0] for result in results)
+
+
+def test_config_keys():
+    assert freeze({"b": [1, 2], "a": {"c": 3}}) == freeze({"a": {"c": 3}, "b": (1, 2)})
+    model = type("Model", (), {"__hash__": None})()
+    assert freeze(model) == ("id", id(model))
+
+
+def test_chunking_is_shared_by_configuration():
+    chunking = get_chunking(**DEFAULT_CHUNKING)
+    assert get_chunking('recursive', chunk_size=512, chunk_overlap=50) is chunking
+    assert get_chunking('recursive', chunk_size=256, chunk_overlap=50) is not chunking
+    assert isinstance(chunking, Chunking) and chunking.chunk_size == 512
+
+
+def test_knowledge_instances_share_their_chunker():
+    first = Knowledge().chunker
+    start = time.perf_counter()
+    for _ in range(1000):
+        assert Knowledge().chunker is first
+    # Constructing a Knowledge and getting its chunker costs microseconds
+    assert (time.perf_counter() - start) / 1000 < 0.001
+
+
+def test_objects_pass_through():
+    tokenizer = object()
+    assert get_tokenizer(tokenizer) is tokenizer
+    assert get_tokenizer("character") == "character"
+    assert get_embedding_model(None) is None
+
+
+def test_background_warmup_reports_errors_without_raising():
+    thread = warmup({'chunker_type': 'token', 'chunk_size': 64, 'chunk_overlap': 8}, background=True)
+    thread.join(timeout=60)
+    assert not thread.is_alive()
+
+
+def test_real_chunkers_and_tokenizers_are_shared():
+    pytest.importorskip("chonkie")
+    warmup()
+    first = Chunking('recursive', chunk_size=512, chunk_overlap=50)
+    second = Chunking('recursive', chunk_size=512, chunk_overlap=50)
+    assert first is not second and first.chunker is second.chunker
+    assert Knowledge().chunker.chunker is first.chunker
+    other = Chunking('token', chunk_size=128, chunk_overlap=16)
+    assert other.chunker is not first.chunker
+    assert get_tokenizer("gpt2") is get_tokenizer("gpt2")
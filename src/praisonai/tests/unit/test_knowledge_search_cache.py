@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the Knowledge.search result cache and its invalidation on writes
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents.knowledge import Knowledge
+from praisonaiagents.knowledge.search_cache import SearchCache, bump_version
+
+
+class SearchMemory:
+    """Vector store double counting searches; results name the write count"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.searches = 0
+        self.writes = 0
+
+    def search(self, query, **kwargs):
+        self.searches += 1
+        writes = self.writes
+        time.sleep(self.delay)
+        return {"results": [{"memory": f"{query} after {writes} writes", "filters": kwargs}]}
+
+    def add(self, messages, **kwargs):
+        self.writes += 1
+        return {"results": [{"id": str(self.writes), "memory": messages[0]["content"], "event": "ADD"}]}
+
+    def update(self, memory_id, data):
+        self.writes += 1
+
+    def delete(self, memory_id):
+        self.writes += 1
+
+    def delete_all(self, **kwargs):
+        self.writes += 1
+
+    def reset(self):
+        self.writes += 1
+
+
+def _knowledge(collection="docs", search_cache=None):
+    config = {"vector_store": {"provider": "chroma", "config": {"collection_name": collection, "path": "/tmp/cache-tests"}},
+              "manifest": False}
+    if search_cache is not None:
+        config["search_cache"] = search_cache
+    knowledge = Knowledge(config=config)
+    knowledge.memory = SearchMemory()
+    return knowledge
+
+
+def test_repeated_searches_are_answered_from_the_cache():
+    knowledge = _knowledge("repeat")
+    first = knowledge.search("what is praison", agent_id="a", rerank=False)
+    first["results"][0]["memory"] = "modified by the caller"
+    assert knowledge.search("what is praison", agent_id="a", rerank=False)["results"][0]["memory"] == \
+        "what is praison after 0 writes"
+    assert knowledge.memory.searches == 1
+    # Filters and the rerank flag are part of the key
+    knowledge.search("what is praison", agent_id="b", rerank=False)
+    knowledge.search("what is praison", agent_id="a", rerank=True)
+    knowledge.search("what is praison", agent_id="a", rerank=False, limit=3)
+    assert knowledge.memory.searches == 4
+    knowledge.search("what is praison", agent_id="a", rerank=False, cache=False)
+    assert knowledge.memory.searches == 5
+    stats = knowledge.search_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 4 and stats["hit_rate"] == pytest.approx(0.2)
+
+
+@pytest.mark.parametrize("write", [
+    lambda k: k.store("new fact"),
+    lambda k: k.update("1", "changed"),
+    lambda k: k.delete("1"),
+    lambda k: k.delete_all(agent_id="a"),
+    lambda k: k.reset(),
+])
+def test_writes_invalidate_cached_results(write):
+    knowledge = _knowledge(f"writes-{id(write)}")
+    knowledge.search("q", rerank=False)
+    write(knowledge)
+    assert knowledge.search("q", rerank=False)["results"][0]["memory"] == "q after 1 writes"
+    assert knowledge.search_cache.stats()["invalidations"] == 1
+
+
+def test_instances_on_a_collection_share_cache_and_version():
+    writer, reader = _knowledge("shared"), _knowledge("shared")
+    reader.memory = writer.memory
+    assert reader.search_cache is writer.search_cache
+    writer.search("q", rerank=False)
+    reader.search("q", rerank=False)
+    assert writer.memory.searches == 1
+    writer.store("fact")
+    assert reader.search("q", rerank=False)["results"][0]["memory"] == "q after 1 writes"
+    assert _knowledge("other").search_cache is not writer.search_cache
+
+
+def test_search_overlapping_a_write_is_not_kept():
+    knowledge = _knowledge("overlap")
+    knowledge.memory.delay = 0.2
+    searcher = threading.Thread(target=knowledge.search, args=("q",), kwargs={"rerank": False})
+    searcher.start()
+    time.sleep(0.05)
+    knowledge.store("fact")
+    searcher.join()
+    knowledge.memory.delay = 0
+    assert knowledge.search("q", rerank=False)["results"][0]["memory"] == "q after 1 writes"
+
+
+def test_lru_eviction_ttl_and_disabling():
+    cache = SearchCache("lru", max_size=2, ttl=0.1)
+    for key in "abc":
+        cache.put(key, key, cache.version)
+    assert cache.get("a") == (False, None) and cache.get("c") == (True, "c")
+    time.sleep(0.15)
+    assert cache.get("c") == (False, None)
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["expirations"] == 1 and stats["size"] == 1
+
+    version = cache.version
+    bump_version("lru")
+    cache.put("d", "d", version)
+    assert len(cache) == 1
+
+    knowledge = _knowledge("disabled", search_cache=False)
+    assert knowledge.search_cache is None
+    knowledge.search("q", rerank=False)
+    knowledge.search("q", rerank=False)
+    assert knowledge.memory.searches == 2
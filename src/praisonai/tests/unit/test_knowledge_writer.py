@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for storing Knowledge file chunks straight into the vector store, bypassing Memory.add
+"""
+
+import sys
+import os
+import json
+import threading
+from types import SimpleNamespace
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents.knowledge import Knowledge
+from praisonaiagents.knowledge.writer import VectorStoreWriter
+
+
+class Embeddings:
+    """OpenAI client double: one vector per input, counting requests"""
+
+    def __init__(self):
+        self.requests = []
+
+    def create(self, input, model, dimensions=None):
+        self.requests.append(list(input))
+        # Answered out of order, like the API may
+        data = [SimpleNamespace(index=i, embedding=[float(len(text)), float(i)]) for i, text in enumerate(input)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+class VectorStore:
+    def __init__(self):
+        self.rows = {}
+        self.inserts = 0
+        self.lock = threading.Lock()
+
+    def insert(self, vectors, payloads=None, ids=None):
+        with self.lock:
+            self.inserts += 1
+            for vector, payload, memory_id in zip(vectors, payloads, ids):
+                self.rows[memory_id] = (vector, payload)
+
+
+class Mem0Memory:
+    """mem0 Memory double: search reads payloads the way mem0 does"""
+
+    def __init__(self):
+        self.embedding_model = SimpleNamespace(client=SimpleNamespace(embeddings=Embeddings()),
+                                               config=SimpleNamespace(model="text-embedding-3-small",
+                                                                      embedding_dims=2),
+                                               embed=None)  # one text per request: not used
+        self.vector_store = VectorStore()
+        self.adds = 0
+
+    def add(self, messages, **kwargs):
+        self.adds += 1
+        return {"results": []}
+
+    def search(self, query, user_id=None, agent_id=None, run_id=None, **kwargs):
+        filters = {k: v for k, v in (("user_id", user_id), ("agent_id", agent_id), ("run_id", run_id)) if v}
+        results = []
+        for memory_id, (_, payload) in self.vector_store.rows.items():
+            if all(payload.get(k) == v for k, v in filters.items()) and query in payload["data"]:
+                metadata = {k: v for k, v in payload.items() if k not in ("data", "hash", "created_at") | filters.keys()}
+                results.append({"id": memory_id, "memory": payload["data"], "metadata": metadata, **filters})
+        return {"results": results}
+
+
+def _knowledge(memory, **config):
+    knowledge = Knowledge(config=config or None)
+    knowledge.memory = memory
+    return knowledge
+
+
+def test_chunks_are_embedded_and_inserted_in_batches(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for i in range(10):
+        (docs / f"doc{i}.txt").write_text(f"Document {i} talks about topic {i % 3}")
+    memory = Mem0Memory()
+    knowledge = _knowledge(memory)
+    result = knowledge.ingest(str(docs), agent_id="reader", batch_size=4, write_workers=1)
+    assert result["stats"]["chunks"] == 10 and memory.adds == 0
+    store = memory.vector_store
+    assert len(store.rows) == 10 and store.inserts <= 5
+    requests = memory.embedding_model.client.embeddings.requests
+    assert sum(len(r) for r in requests) == 10 and len(requests) == store.inserts
+
+    vector, payload = next(v for v in store.rows.values() if v[1]["data"] == "Document 4 talks about topic 1")
+    assert vector == [float(len(payload["data"])), vector[1]]
+    assert payload["agent_id"] == "reader" and payload["filename"] == "doc4.txt"
+    assert {"hash", "created_at", "chunk_index"} <= payload.keys()
+
+    found = knowledge.search("topic 1", agent_id="reader", rerank=False)["results"]
+    assert sorted(r["memory"] for r in found) == [f"Document {i} talks about topic 1" for i in (1, 4, 7)]
+    assert knowledge.search("topic 1", agent_id="someone else", rerank=False)["results"] == []
+
+
+def test_single_file_chunks_are_batched(tmp_path):
+    path = tmp_path / "records.json"
+    path.write_text(json.dumps([{"text": "x" * 1500} for _ in range(70)]))
+    memory = Mem0Memory()
+    knowledge = _knowledge(memory)
+    results = knowledge.add(str(path))["results"]
+    assert len(results) == 70 and memory.vector_store.inserts == 3
+
+
+def test_mem0_path_when_disabled_or_unsupported(tmp_path):
+    path = tmp_path / "note.txt"
+    path.write_text("Just one note")
+    memory = Mem0Memory()
+    _knowledge(memory, direct_writes=False).add(str(path))
+    assert memory.adds == 1 and memory.vector_store.inserts == 0
+    assert not VectorStoreWriter.supports(SimpleNamespace(add=None))
+
+
+def test_generic_embedders_and_write_errors():
+    class Embedder:
+        def embed(self, text, memory_action=None):
+            assert memory_action == "add"
+            return [1.0]
+
+    store = VectorStore()
+    writer = VectorStoreWriter(SimpleNamespace(embedding_model=Embedder(), vector_store=store))
+    results = writer.write([("a", {"k": 1}), ("b", None)], user_id="u")
+    assert [r[0]["memory"] for r in results] == ["a", "b"]
+    assert [p for _, p in store.rows.values()][0]["user_id"] == "u"
+
+    memory = Mem0Memory()
+    memory.vector_store.insert = lambda **kwargs: (_ for _ in ()).throw(RuntimeError("store is down"))
+    knowledge = _knowledge(memory)
+    assert knowledge._store_batch([("a", {}), ("b", {})]) == [[], []]
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for streamed responses from the launch() HTTP endpoints
+"""
+
+import sys
+import os
+import json
+import time
+import socket
+import threading
+from types import SimpleNamespace
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+httpx = pytest.importorskip("httpx")
+
+from praisonaiagents import Agent, PraisonAIAgents
+from praisonaiagents.streaming import relay_stream
+
+
+def shout(text: str) -> str:
+    """Upper-case the text."""
+    return text.upper()
+
+
+class FakeLLMStream:
+    """Chat-completion chunks produced slowly, recording whether it was closed"""
+
+    def __init__(self, words, delay):
+        self.words = words
+        self.delay = delay
+        self.produced = 0
+        self.closed = False
+
+    def __iter__(self):
+        for word in self.words:
+            if self.closed:
+                return
+            time.sleep(self.delay)
+            self.produced += 1
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word + " "))])
+
+    def close(self):
+        self.closed = True
+
+
+class StreamingAgent(Agent):
+    words = ["one", "two", "three"]
+    delay = 0.0
+
+    def chat(self, prompt, *args, **kwargs):
+        loud = self.execute_tool("shout", {"text": prompt})
+        self.last_stream = FakeLLMStream(self.words, self.delay)
+        return "".join(chunk.choices[0].delta.content for chunk in relay_stream(self.last_stream)) + loud
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _launch(target, path):
+    port = _free_port()
+    # launch() blocks the calling thread once the server is up
+    threading.Thread(target=target.launch, kwargs=dict(path=path, port=port, host="127.0.0.1"),
+                     daemon=True).start()
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            httpx.get(f"{base}/docs")
+            return base
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    pytest.skip("launch() server did not start")
+
+
+def _sse_events(text):
+    return [json.loads(line[len("data: "):]) for line in text.splitlines() if line.startswith("data: ")]
+
+
+def test_agent_streams_tokens_and_tool_events_as_sse():
+    base = _launch(StreamingAgent(name="Streamer", llm="gpt-4o-mini", tools=[shout]), "/stream")
+    with httpx.stream("POST", base + "/stream", json={"query": "hi", "stream": True}) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _sse_events(response.read().decode())
+    types = [event["type"] for event in events]
+    assert types == ["tool_call", "tool_result", "token", "token", "token", "response"]
+    assert events[0] == {"type": "tool_call", "name": "shout", "arguments": {"text": "hi"}}
+    assert events[1]["result"] == "HI"
+    assert events[-1]["response"] == "one two three HI"
+
+
+def test_ndjson_when_requested():
+    base = _launch(StreamingAgent(name="Lines", llm="gpt-4o-mini", tools=[shout]), "/lines")
+    response = httpx.post(base + "/lines?stream=true", json={"query": "hi"},
+                          headers={"Accept": "application/x-ndjson"})
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[-1] == {"type": "response", "response": "one two three HI"}
+
+
+def test_disconnect_stops_upstream_generation():
+    agent = StreamingAgent(name="Long", llm="gpt-4o-mini", tools=[shout])
+    agent.words = [str(i) for i in range(100)]
+    agent.delay = 0.05
+    base = _launch(agent, "/long")
+    with httpx.stream("POST", base + "/long", json={"query": "hi", "stream": True}) as response:
+        for line in response.iter_lines():
+            if '"token"' in line:
+                break
+    deadline = time.time() + 5
+    metrics = ""
+    while time.time() < deadline:
+        metrics = httpx.get(base + "/metrics").text
+        if 'praisonai_requests_cancelled_total{path="/long"} 1' in metrics:
+            break
+        time.sleep(0.1)
+    assert 'praisonai_requests_cancelled_total{path="/long"} 1' in metrics
+
+
+def test_multi_agent_stream_marks_each_agent():
+    first = StreamingAgent(name="First", llm="gpt-4o-mini", tools=[shout])
+    second = StreamingAgent(name="Second", llm="gpt-4o-mini", tools=[shout])
+    base = _launch(PraisonAIAgents(agents=[first, second]), "/team")
+    response = httpx.post(base + "/team", json={"query": "hi", "stream": True})
+    events = _sse_events(response.text)
+    assert [e["name"] for e in events if e["type"] == "agent"] == ["First", "Second"]
+    final = events[-1]
+    assert final["type"] == "response"
+    assert final["response"]["final_response"] == "one two three ONE TWO THREE HI"
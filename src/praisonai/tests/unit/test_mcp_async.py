@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for native async MCP tool calls over stdio and SSE
+"""
+
+import sys
+import os
+import time
+import socket
+import asyncio
+import textwrap
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from praisonaiagents.mcp import MCP
+from praisonaiagents.process_pool import arun_tool
+
+ECHO_SERVER = textwrap.dedent('''
+    import asyncio
+    import sys
+    try:
+        from mcp.server.fastmcp import FastMCP
+    except ImportError:
+        from mcp.server.mcpserver import MCPServer as FastMCP
+
+    server = FastMCP("echo")
+
+    @server.tool()
+    async def echo(text: str, delay: float = 0.0) -> str:
+        """Echo text back after an optional delay."""
+        await asyncio.sleep(delay)
+        return text
+
+    if len(sys.argv) > 1:
+        try:
+            server.run("sse", port=int(sys.argv[1]))
+        except TypeError:
+            server.settings.port = int(sys.argv[1])
+            server.run("sse")
+    else:
+        server.run()
+''')
+
+
+@pytest.fixture(scope="module")
+def script(tmp_path_factory):
+    path = tmp_path_factory.mktemp("mcp") / "echo_server.py"
+    path.write_text(ECHO_SERVER)
+    return path
+
+
+def _single_thread_loop():
+    # With one executor thread, anything that goes through run_in_executor is serialised
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+    return loop
+
+
+def _gather_echo(tool, count=8, delay=0.2):
+    async def main():
+        return await asyncio.gather(*[arun_tool(tool, {"text": str(i), "delay": delay}) for i in range(count)])
+
+    loop = _single_thread_loop()
+    try:
+        start = time.perf_counter()
+        results = loop.run_until_complete(main())
+        return results, time.perf_counter() - start
+    finally:
+        loop.close()
+
+
+def test_stdio_calls_run_concurrently_on_one_session(script):
+    mcp = MCP(f"{sys.executable} {script}", timeout=30, shared=False, cache_tools=False)
+    try:
+        tool = next(t for t in mcp if t.__name__ == "echo")
+        results, elapsed = _gather_echo(tool)
+        assert results == [str(i) for i in range(8)]
+        # 8 x 0.2s would take 1.6s if each call held an executor thread
+        assert elapsed < 1.0
+    finally:
+        mcp.close()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_sse_server(script, port):
+    proc = subprocess.Popen([sys.executable, str(script), str(port)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    pytest.skip("SSE echo server did not start")
+
+
+def _stop(proc):
+    proc.kill()
+    proc.wait()
+
+
+@pytest.fixture(scope="module")
+def sse_url(script):
+    port = _free_port()
+    proc = _start_sse_server(script, port)
+    yield f"http://127.0.0.1:{port}/sse"
+    _stop(proc)
+
+
+def test_sse_calls_are_native_async_and_shared(sse_url):
+    first = MCP(sse_url, timeout=30, cache_tools=False)
+    second = MCP(sse_url, timeout=30, cache_tools=False)
+    try:
+        assert first.sse_client is second.sse_client
+        tool = next(t for t in first if t.__name__ == "echo")
+        results, elapsed = _gather_echo(tool)
+        assert results == [str(i) for i in range(8)]
+        assert elapsed < 1.0
+    finally:
+        first.close()
+        second.close()
+
+
+def test_sse_reconnects_after_the_server_restarts(script):
+    port = _free_port()
+    proc = _start_sse_server(script, port)
+    mcp = MCP(f"http://127.0.0.1:{port}/sse", timeout=30, shared=False, cache_tools=False)
+    client = mcp.sse_client
+    try:
+        tool = next(t for t in mcp if t.__name__ == "echo")
+        assert tool(text="before") == "before"
+        old_session = client.session
+        _stop(proc)
+        proc = _start_sse_server(script, port)
+        deadline = time.time() + 20
+        while client.session in (None, old_session) and time.time() < deadline:
+            time.sleep(0.05)
+        assert client.reconnects >= 1
+        assert tool(text="after") == "after"
+    finally:
+        mcp.close()
+        _stop(proc)
+
+
+def test_sse_cached_tools_connect_once_the_server_is_up(script, tmp_path):
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/sse"
+    proc = _start_sse_server(script, port)
+    MCP(url, timeout=30, shared=False, catalog_dir=str(tmp_path)).close()
+    _stop(proc)
+
+    # The server is down at startup: the saved catalog is used and the client keeps trying
+    mcp = MCP(url, timeout=30, shared=False, catalog_dir=str(tmp_path))
+    proc = None
+    try:
+        tool = next(t for t in mcp if t.__name__ == "echo")
+        time.sleep(0.5)
+        proc = _start_sse_server(script, port)
+        assert tool(text="up") == "up"
+        assert mcp.sse_client.reconnects >= 1
+    finally:
+        mcp.close()
+        if proc is not None:
+            _stop(proc)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for cached MCP tool catalogs and tools/list_changed handling
+"""
+
+import sys
+import os
+import time
+import textwrap
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from praisonaiagents.mcp import MCP
+from praisonaiagents.mcp.catalog import ToolCatalogCache, CachedTool
+
+SERVER = textwrap.dedent('''
+    try:
+        from mcp.server.fastmcp import FastMCP, Context
+    except ImportError:
+        from mcp.server.mcpserver import MCPServer as FastMCP, Context
+
+    server = FastMCP("growing")
+
+    @server.tool()
+    async def echo(text: str) -> str:
+        """Echo text back."""
+        return text
+
+    @server.tool()
+    async def grow(ctx: Context) -> str:
+        """Register another tool and tell the client."""
+        def extra() -> str:
+            """A tool added at runtime."""
+            return "extra"
+        server.add_tool(extra)
+        await ctx.session.send_tool_list_changed()
+        return "grown"
+
+    server.run()
+''')
+
+
+@pytest.fixture
+def setup(tmp_path):
+    script = tmp_path / "server.py"
+    script.write_text(SERVER)
+    return f"{sys.executable} {script}", str(tmp_path / "catalogs")
+
+
+def _names(mcp):
+    return sorted(tool.__name__ for tool in mcp)
+
+
+def test_catalog_roundtrip(tmp_path):
+    cache = ToolCatalogCache(str(tmp_path))
+    identity = {"command": "python", "args": ["app.py"], "cwd": ""}
+    cache.save(identity, [CachedTool("a", "A tool", {"type": "object", "properties": {"x": {"type": "string"}}})],
+               {"name": "app", "version": "1.0"})
+    entry = cache.load(identity)
+    assert entry["server"]["version"] == "1.0"
+    assert entry["tools"][0].name == "a"
+    assert cache.load({**identity, "args": ["other.py"]}) is None
+
+
+def test_second_start_uses_saved_catalog(setup):
+    command, catalog_dir = setup
+    first = MCP(command, timeout=30, shared=False, catalog_dir=catalog_dir)
+    assert _names(first) == ["echo", "grow"]
+    first.close()
+
+    start = time.perf_counter()
+    second = MCP(command, timeout=30, shared=False, catalog_dir=catalog_dir)
+    assert time.perf_counter() - start < 0.2  # no wait for the server
+    assert second._wrappers is None  # wrappers are built lazily
+    assert _names(second) == ["echo", "grow"]
+    assert second.runner.call_tool("echo", {"text": "hi"}) == "hi"
+    second.close()
+
+
+def test_list_changed_refreshes_tools_and_catalog(setup):
+    command, catalog_dir = setup
+    mcp = MCP(command, timeout=30, shared=False, catalog_dir=catalog_dir)
+    assert mcp.runner.call_tool("grow", {}) == "grown"
+    identity = {"command": sys.executable, "args": command.split()[1:], "cwd": ""}
+
+    def saved_names():
+        saved = ToolCatalogCache(catalog_dir).load(identity)
+        return [tool.name for tool in saved["tools"]] if saved else []
+
+    deadline = time.time() + 5
+    while "extra" not in saved_names() and time.time() < deadline:
+        time.sleep(0.05)
+    assert "extra" in saved_names()
+    assert "extra" in _names(mcp)
+    mcp.close()
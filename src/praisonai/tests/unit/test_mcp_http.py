@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for the streamable HTTP MCP transport against an in-process server
+"""
+
+import sys
+import os
+import time
+import socket
+import asyncio
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+pytest.importorskip("mcp")
+uvicorn = pytest.importorskip("uvicorn")
+
+try:
+    from mcp.server.fastmcp import FastMCP
+except ImportError:
+    from mcp.server.mcpserver import MCPServer as FastMCP
+
+from praisonaiagents.mcp import MCP, get_connection_manager
+from praisonaiagents.process_pool import arun_tool
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class InProcessServer:
+    """A streamable HTTP echo server running in a background thread"""
+
+    def __init__(self, port):
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}/mcp"
+        self.server = None
+        self.calls = []
+
+    def start(self):
+        mcp = FastMCP("echo")
+
+        @mcp.tool()
+        async def echo(text: str, delay: float = 0.0) -> str:
+            """Echo text back after an optional delay."""
+            self.calls.append(text)
+            await asyncio.sleep(delay)
+            return text
+
+        config = uvicorn.Config(mcp.streamable_http_app(), host="127.0.0.1", port=self.port,
+                                log_level="warning", timeout_graceful_shutdown=1)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+        self.thread.start()
+        deadline = time.time() + 10
+        while not self.server.started:
+            if time.time() > deadline:
+                pytest.skip("in-process MCP server did not start")
+            time.sleep(0.05)
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(10)
+
+
+@pytest.fixture
+def server():
+    server = InProcessServer(_free_port())
+    server.start()
+    yield server
+    server.stop()
+
+
+def _client(url, **kwargs):
+    return MCP(url, transport="http", timeout=20, cache_tools=False, **kwargs)
+
+
+def test_lists_and_calls_tools(server):
+    mcp = _client(server.url, shared=False)
+    try:
+        tool = next(t for t in mcp if t.__name__ == "echo")
+        assert tool(text="hello") == "hello"
+        assert mcp.sse_client.session_id
+    finally:
+        mcp.close()
+
+
+def test_concurrent_calls_share_one_session(server):
+    mcp = _client(server.url, shared=False)
+    try:
+        tool = next(t for t in mcp if t.__name__ == "echo")
+
+        async def main():
+            return await asyncio.gather(*[arun_tool(tool, {"text": str(i), "delay": 0.2}) for i in range(10)])
+
+        start = time.perf_counter()
+        assert asyncio.run(main()) == [str(i) for i in range(10)]
+        assert time.perf_counter() - start < 1.5
+    finally:
+        mcp.close()
+
+
+def test_reconnect_resumes_session(server):
+    mcp = _client(server.url, shared=False)
+    client = mcp.sse_client
+    try:
+        session_id = client.session_id
+        # Simulate a dropped connection
+        client.loop.call_soon_threadsafe(client._lost.set)
+        tool = next(t for t in mcp if t.__name__ == "echo")
+        deadline = time.time() + 10
+        while client.reconnects == 0 and time.time() < deadline:
+            time.sleep(0.05)
+        assert tool(text="again") == "again"
+        assert client.reconnects >= 1
+        assert client.session_id == session_id
+    finally:
+        mcp.close()
+
+
+def test_server_restart_starts_new_session(server):
+    mcp = _client(server.url, shared=False)
+    client = mcp.sse_client
+    try:
+        tool = next(t for t in mcp if t.__name__ == "echo")
+        assert tool(text="before") == "before"
+        old_session = client.session_id
+        server.stop()
+        server.start()
+        assert tool(text="after") == "after"
+        assert client.session_id != old_session
+    finally:
+        mcp.close()
+
+
+@pytest.mark.parametrize("retry", [False, True])
+def test_interrupted_call_is_retried_only_when_asked(server, retry):
+    mcp = _client(server.url, shared=False, retry_interrupted_calls=retry)
+    try:
+        tool = next(t for t in mcp if t.__name__ == "echo")
+        results = []
+        caller = threading.Thread(target=lambda: results.append(tool(text="once", delay=3)))
+        caller.start()
+        deadline = time.time() + 10
+        while not server.calls and time.time() < deadline:
+            time.sleep(0.05)
+        # The server goes away while the call is running
+        server.stop()
+        server.start()
+        caller.join(30)
+        if retry:
+            assert results == ["once"] and server.calls == ["once", "once"]
+        else:
+            assert results[0].startswith("Error") and server.calls == ["once"]
+    finally:
+        mcp.close()
+
+
+def test_shared_clients_per_url(server):
+    first = _client(server.url)
+    second = _client(server.url)
+    try:
+        assert first.sse_client is second.sse_client
+        stats = [s for s in get_connection_manager().stats() if s.get("url") == server.url]
+        assert stats == [{"url": server.url, "transport": "http", "users": 2}]
+    finally:
+        first.close()
+        second.close()
+    assert not [s for s in get_connection_manager().stats() if s.get("url") == server.url]
+
+
+def test_unknown_transport_rejected():
+    with pytest.raises(ValueError):
+        MCP("http://127.0.0.1:1/mcp", transport="websocket")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared MCP connection manager
+"""
+
+import sys
+import os
+import asyncio
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from mcp import StdioServerParameters
+from praisonaiagents.mcp import MCP, get_connection_manager
+from praisonaiagents.mcp.manager import MCPServerPool
+
+SERVER = textwrap.dedent('''
+    import asyncio
+    import os
+    try:
+        from mcp.server.fastmcp import FastMCP
+    except ImportError:
+        from mcp.server.mcpserver import MCPServer as FastMCP
+
+    server = FastMCP("pids")
+
+    @server.tool()
+    async def pid(delay: float = 0.0) -> str:
+        """Return the server process id."""
+        await asyncio.sleep(delay)
+        return str(os.getpid())
+
+    @server.tool()
+    async def crash() -> str:
+        """Exit the server immediately."""
+        os._exit(1)
+
+    server.run()
+''')
+
+
+@pytest.fixture
+def server_command(tmp_path):
+    script = tmp_path / "pid_server.py"
+    script.write_text(SERVER)
+    yield f"{sys.executable} {script}"
+    get_connection_manager().shutdown()
+
+
+def test_same_server_is_shared(server_command):
+    first = MCP(server_command, timeout=30, cache_tools=False)
+    second = MCP(server_command, timeout=30, cache_tools=False)
+    assert first.runner is second.runner
+    assert get_connection_manager().stats()[0]["users"] == 2
+    first.close()
+    assert second.runner.call_tool("pid", {}).isdigit()
+    second.close()
+    assert get_connection_manager().stats() == []
+
+
+def test_unshared_instances_get_their_own_server(server_command):
+    first = MCP(server_command, timeout=30, shared=False, cache_tools=False)
+    second = MCP(server_command, timeout=30, shared=False, cache_tools=False)
+    try:
+        assert first.runner.call_tool("pid", {}) != second.runner.call_tool("pid", {})
+    finally:
+        first.close()
+        second.close()
+
+
+def test_calls_are_balanced_across_replicas(server_command):
+    mcp = MCP(server_command, timeout=30, replicas=3, health_interval=None, cache_tools=False)
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        pids = set(pool.map(lambda _: mcp.runner.call_tool("pid", {"delay": 0.1}), range(6)))
+    assert len(pids) == 3
+    mcp.close()
+
+
+def test_crashed_replica_is_restarted(server_command):
+    mcp = MCP(server_command, timeout=30, replicas=1, health_interval=None, cache_tools=False)
+    before = mcp.runner.call_tool("pid", {})
+    assert mcp.runner.call_tool("crash", {}, timeout=5).startswith("Error:")
+    after = mcp.runner.call_tool("pid", {})
+    assert after.isdigit() and after != before
+    assert mcp.runner.restarts == 1
+    mcp.close()
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_replica_that_crashed_at_start_is_restarted_on_call(tmp_path, use_async):
+    script = tmp_path / "flaky_server.py"
+    marker = tmp_path / "started_once"
+    # The first start exits before answering; later starts serve normally
+    script.write_text(f"import os, sys\nif not os.path.exists({str(marker)!r}):\n"
+                      f"    open({str(marker)!r}, 'w').close()\n    sys.exit(1)\n" + SERVER)
+    pool = MCPServerPool(StdioServerParameters(command=sys.executable, args=[str(script)]), timeout=30,
+                         health_interval=None)
+    try:
+        assert pool.initialized.wait(30) and pool.replicas[0].session is None
+        pool.replicas[0].join(30)
+        if use_async:
+            result = asyncio.run(pool.acall_tool("pid", {}))
+        else:
+            result = pool.call_tool("pid", {})
+        assert result.isdigit() and pool.restarts == 1
+    finally:
+        pool.shutdown()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the event-driven MCPToolRunner against a local stdio echo server
+"""
+
+import sys
+import os
+import time
+import asyncio
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from mcp import StdioServerParameters
+from praisonaiagents.mcp.mcp import MCPToolRunner
+
+ECHO_SERVER = textwrap.dedent('''
+    import asyncio
+    try:
+        from mcp.server.fastmcp import FastMCP
+    except ImportError:
+        from mcp.server.mcpserver import MCPServer as FastMCP
+
+    server = FastMCP("echo")
+
+    @server.tool()
+    async def echo(text: str, delay: float = 0.0) -> str:
+        """Echo text back after an optional delay."""
+        await asyncio.sleep(delay)
+        return text
+
+    server.run()
+''')
+
+
+@pytest.fixture(scope="module")
+def runner(tmp_path_factory):
+    script = tmp_path_factory.mktemp("mcp") / "echo_server.py"
+    script.write_text(ECHO_SERVER)
+    runner = MCPToolRunner(StdioServerParameters(command=sys.executable, args=[str(script)]), timeout=30)
+    assert runner.initialized.wait(30)
+    if runner.session is None:
+        pytest.skip(f"echo server did not start: {runner.init_error}")
+    yield runner
+    runner.shutdown()
+
+
+def test_tools_listed(runner):
+    assert [tool.name for tool in runner.tools] == ["echo"]
+
+
+def test_concurrent_calls_get_their_own_results(runner):
+    # Later calls finish first, so a shared result queue would mix them up
+    def call(i):
+        return runner.call_tool("echo", {"text": str(i), "delay": (10 - i) * 0.02})
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(call, range(10)))
+    elapsed = time.perf_counter() - start
+    assert results == [str(i) for i in range(10)]
+    # Calls overlap instead of running one at a time (~1.1s sequentially)
+    assert elapsed < 0.8
+
+
+def test_per_call_timeout(runner):
+    result = runner.call_tool("echo", {"text": "slow", "delay": 2}, timeout=0.1)
+    assert result.startswith("Error:") and "timed out" in result
+    assert runner.call_tool("echo", {"text": "still works"}) == "still works"
+
+
+def test_async_callers(runner):
+    async def main():
+        return await asyncio.gather(*[runner.acall_tool("echo", {"text": str(i)}) for i in range(5)])
+
+    assert asyncio.run(main()) == [str(i) for i in range(5)]
+
+
+def test_runner_thread_can_be_joined_after_a_failed_start(tmp_path):
+    script = tmp_path / "broken_server.py"
+    script.write_text("raise SystemExit(1)\n")
+    runner = MCPToolRunner(StdioServerParameters(command=sys.executable, args=[str(script)]), timeout=5)
+    assert runner.initialized.wait(30) and runner.session is None
+    runner.join(30)
+    assert not runner.is_alive()
+    runner.shutdown()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the request scheduler behind launch(protocol="mcp")
+"""
+
+import sys
+import os
+import time
+import socket
+import asyncio
+import threading
+from types import SimpleNamespace
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+pytest.importorskip("mcp")
+pytest.importorskip("uvicorn")
+httpx = pytest.importorskip("httpx")
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from praisonaiagents import Agent, PraisonAIAgents
+from praisonaiagents.streaming import relay_stream
+
+
+class CountingAgent(Agent):
+    """Answers with how many turns its own history holds, after generating ``words`` slowly"""
+
+    words = 1
+    delay = 0.0
+
+    def chat(self, prompt, *args, **kwargs):
+        chunks = (SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="."))])
+                  for _ in range(self.words))
+        for _ in relay_stream(chunks):
+            time.sleep(self.delay)
+        self.chat_history.append({"role": "user", "content": prompt})
+        self.chat_history.append({"role": "assistant", "content": prompt})
+        return f"{len(self.chat_history) // 2}:{prompt}"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _launch(target, path, **kwargs):
+    port = _free_port()
+    # launch() blocks the calling thread once the server is up
+    threading.Thread(target=target.launch,
+                     kwargs=dict(path=path, port=port, host="127.0.0.1", protocol="mcp", **kwargs),
+                     daemon=True).start()
+    base = f"http://127.0.0.1:{port}{path.rstrip('/')}"
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base}/metrics").status_code == 200:
+                return base
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    pytest.skip("launch(protocol='mcp') server did not start")
+
+
+async def _calls(url, tool, queries):
+    async with sse_client(url) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            results = []
+            for query in queries:
+                result = await session.call_tool(tool, {"prompt" if "task" in tool else "query": query})
+                results.append(result.content[0].text)
+            return results
+
+
+def _metric(base, name):
+    for line in httpx.get(base + "/metrics").text.splitlines():
+        if line.startswith(name + "{"):
+            return float(line.rsplit(" ", 1)[1])
+
+
+def test_each_client_gets_its_own_agent():
+    base = _launch(CountingAgent(name="Counter", llm="gpt-4o-mini"), "/counter")
+
+    async def main():
+        return await asyncio.gather(*[_calls(base + "/sse", "execute_counter_task", [f"{c}a", f"{c}b"])
+                                      for c in ("x", "y", "z")])
+
+    assert asyncio.run(main()) == [[f"1:{c}a", f"2:{c}b"] for c in ("x", "y", "z")]
+    assert _metric(base, "praisonai_requests_total") == 6
+    # Disconnected clients' sessions are dropped
+    assert _metric(base, "praisonai_sessions") == 0
+
+
+def test_disconnect_cancels_running_call():
+    agent = CountingAgent(name="Slow", llm="gpt-4o-mini")
+    agent.words, agent.delay = 200, 0.05
+    base = _launch(agent, "/slow")
+
+    async def call_and_leave():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(_calls(base + "/sse", "execute_slow_task", ["hi"]), 1.0)
+
+    asyncio.run(call_and_leave())
+    deadline = time.time() + 5
+    while time.time() < deadline and _metric(base, "praisonai_requests_cancelled_total") != 1:
+        time.sleep(0.1)
+    assert _metric(base, "praisonai_requests_cancelled_total") == 1
+    assert _metric(base, "praisonai_requests_in_progress") == 0
+
+
+def test_full_pool_rejects_calls():
+    agent = CountingAgent(name="Busy", llm="gpt-4o-mini")
+    agent.words, agent.delay = 10, 0.05
+    base = _launch(agent, "/busy", max_concurrency=1, max_queue=0)
+
+    async def main():
+        return await asyncio.gather(*[_calls(base + "/sse", "execute_busy_task", [str(i)]) for i in range(3)])
+
+    answers = [r[0] for r in asyncio.run(main())]
+    assert sum(a.startswith("1:") for a in answers) >= 1
+    assert "Error: server busy, retry later" in answers
+    assert _metric(base, "praisonai_requests_rejected_total") >= 1
+
+
+def test_workflow_clients_are_isolated():
+    team = PraisonAIAgents(agents=[CountingAgent(name="First", llm="gpt-4o-mini"),
+                                   CountingAgent(name="Second", llm="gpt-4o-mini")], name="team")
+    base = _launch(team, "/team")
+
+    async def main():
+        return await asyncio.gather(*[_calls(base + "/sse", "execute_team_workflow", ["a", "b"]) for _ in range(2)])
+
+    # The second agent answers to the first one's output, each counting its own turns
+    assert asyncio.run(main()) == [["1:1:a", "2:2:b"]] * 2
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the process-pool executor used by CPU-heavy tools and tasks
+"""
+
+import sys
+import os
+import time
+import asyncio
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+from praisonaiagents.process_pool import ProcessPool, process_tool, tool_executor, run_tool, get_process_pool, shutdown_process_pool
+from praisonaiagents.task.task import Task
+
+
+def worker_pid() -> int:
+    return os.getpid()
+
+
+def nap(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+@process_tool(timeout=10)
+def add_one(x: int) -> int:
+    """Add one to x"""
+    return x + 1
+
+
+@pytest.fixture
+def pool():
+    with ProcessPool(max_workers=2, timeout=5) as pool:
+        yield pool
+
+
+def test_runs_in_worker_process(pool):
+    assert pool.run(worker_pid) != os.getpid()
+    assert pool.stats["completed"] == 1
+
+
+def test_timeout_recycles_pool(pool):
+    with pytest.raises(TimeoutError):
+        pool.run(nap, 5, timeout=0.2)
+    assert pool.stats["timeouts"] == 1
+    assert pool.stats["restarts"] == 1
+    assert pool.run(nap, 0) == 0
+
+
+@pytest.mark.parametrize("max_tasks_per_worker", [None, 1])
+def test_timeout_terminates_the_busy_worker(max_tasks_per_worker):
+    with ProcessPool(max_workers=2, max_tasks_per_worker=max_tasks_per_worker) as pool:
+        with pytest.raises(TimeoutError):
+            pool.run(nap, 30, timeout=0.5)
+        workers = pool._context.processes()
+        for process in workers:
+            process.join(5)
+        assert workers and not any(process.is_alive() for process in workers)
+
+
+def test_async_run_does_not_block_loop(pool):
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.ensure_future(ticker())
+        await pool.arun(nap, 0.2)
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(main()) >= 5
+
+
+def test_unpicklable_callable_is_rejected(pool):
+    with pytest.raises(TypeError, match="not picklable"):
+        pool.run(lambda: 1)
+
+
+def test_process_tool_keeps_metadata_and_runs_remotely():
+    try:
+        assert add_one.__name__ == "add_one"
+        assert add_one.__doc__ == "Add one to x"
+        assert add_one(1) == 2
+    finally:
+        shutdown_process_pool()
+
+
+def test_task_executor_routes_plain_tools():
+    try:
+        assert run_tool(worker_pid, {}) == os.getpid()
+        with tool_executor("process"):
+            assert run_tool(worker_pid, {}) != os.getpid()
+            # closures cannot be pickled, so they fall back to running in-process
+            assert run_tool(lambda: os.getpid(), {}) == os.getpid()
+        assert get_process_pool().stats["completed"] == 1
+    finally:
+        shutdown_process_pool()
+
+
+def test_invalid_task_executor():
+    with pytest.raises(ValueError):
+        Task(description="x", executor="gpu")
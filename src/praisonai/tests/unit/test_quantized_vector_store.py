@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the quantized local vector store used by Knowledge and Memory
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from praisonaiagents.knowledge.vector_store import QuantizedVectorStore
+
+
+def _vectors(count, dims=64, seed=0):
+    """Vectors around 16 topics shared by every seed, so queries land among the stored vectors"""
+    centers = np.random.default_rng(0).normal(size=(16, dims))
+    rng = np.random.default_rng(seed)
+    return (centers[rng.integers(0, 16, count)] + rng.normal(size=(count, dims))).astype(np.float32)
+
+
+def _exact(vectors, query, k):
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return list(np.argsort(-(unit @ (query / np.linalg.norm(query))))[:k])
+
+
+@pytest.mark.parametrize("quantization", ["int8", "binary", None])
+def test_search_recall_against_exact_search(tmp_path, quantization):
+    vectors = _vectors(3000, seed=1)
+    store = QuantizedVectorStore("docs", str(tmp_path), quantization=quantization)
+    store.insert(vectors, [{"n": i} for i in range(len(vectors))], [f"v{i}" for i in range(len(vectors))])
+    queries = _vectors(20, seed=2)
+    recall = []
+    for query in queries:
+        found = store.search("q", query, limit=10)
+        assert [r.score for r in found] == sorted((r.score for r in found), reverse=True)
+        recall.append(len({int(r.id[1:]) for r in found} & set(_exact(vectors, query, 10))) / 10)
+    assert np.mean(recall) >= (0.99 if quantization != "binary" else 0.9)
+    if quantization == "int8":
+        assert store.memory_bytes < vectors.nbytes / 3
+    if quantization == "binary":
+        assert store.memory_bytes < vectors.nbytes / 20
+
+
+def test_mem0_interface_and_filters(tmp_path):
+    vectors = _vectors(100)
+    store = QuantizedVectorStore("mem", str(tmp_path))
+    store.insert(vectors, [{"data": f"text {i}", "user_id": "a" if i % 2 else "b"} for i in range(100)],
+                 [str(i) for i in range(100)])
+    found = store.search("q", vectors[7], limit=3, filters={"user_id": "a"})
+    assert found[0].id == "7" and found[0].score == pytest.approx(1.0, abs=1e-5)
+    assert all(r.payload["user_id"] == "a" for r in found)
+    assert store.get("8").payload["data"] == "text 8"
+    assert len(store.list(filters={"user_id": "b"})[0]) == 50
+
+    store.update("7", payload={"data": "changed", "user_id": "a"})
+    assert store.get("7").payload["data"] == "changed"
+    store.update("7", vector=vectors[9])
+    assert store.search("q", vectors[9], limit=2, filters={"user_id": "a"})[0].id in {"7", "9"}
+    store.delete("9")
+    assert store.get("9") is None
+    assert "9" not in [r.id for r in store.search("q", vectors[9], limit=5)]
+    with pytest.raises(ValueError):
+        store.search("q", vectors[0], filters={"user_id') OR 1=1 --": "x"})
+
+    # Reopened from disk, deletions and updates are kept
+    reopened = QuantizedVectorStore("mem", str(tmp_path))
+    assert reopened.col_info()["count"] == 99
+    assert reopened.search("q", vectors[9], limit=1)[0].id == "7"
+    reopened.reset()
+    assert reopened.search("q", vectors[0]) == [] and reopened.col_info()["count"] == 0
+    with pytest.raises(ValueError):
+        QuantizedVectorStore("mem", str(tmp_path), quantization="binary")
+
+
+def test_chroma_collection_interface(tmp_path):
+    vectors = _vectors(20)
+    store = QuantizedVectorStore("memory_store", str(tmp_path), quantization="binary")
+    store.add(ids=[f"m{i}" for i in range(20)], embeddings=vectors.tolist(),
+              documents=[f"memory {i}" for i in range(20)], metadatas=[{"quality": i / 20} for i in range(20)])
+    response = store.query(query_embeddings=[vectors[3].tolist()], n_results=2,
+                           include=["documents", "metadatas", "distances"])
+    assert response["ids"][0][0] == "m3" and response["documents"][0][0] == "memory 3"
+    assert response["metadatas"][0][0] == {"quality": 0.15}
+    assert response["distances"][0][0] == pytest.approx(0.0, abs=1e-5)
+
+
+def test_knowledge_and_memory_use_the_quantized_store(tmp_path, monkeypatch):
+    from praisonaiagents.knowledge import Knowledge
+    from praisonaiagents.memory.memory import Memory
+
+    config = {"vector_store": {"config": {"collection_name": "docs", "path": str(tmp_path), "quantization": "binary"}}}
+    store = Knowledge(config=config).quantized_store
+    assert isinstance(store, QuantizedVectorStore) and store.quantization == "binary"
+    assert Knowledge(config=config).quantized_store is store
+    assert store.directory == os.path.join(str(tmp_path), "vectors", "docs")
+    assert Knowledge(config={"vector_store": {"config": {"collection_name": "docs"}}}).quantized_store is None
+
+    monkeypatch.chdir(tmp_path)
+    memory = Memory({"provider": "rag", "use_embedding": True, "quantization": "int8",
+                     "rag_db_path": str(tmp_path / "rag")})
+    assert memory.use_rag and isinstance(memory.chroma_col, QuantizedVectorStore)
+    memory.chroma_col.add(ids=["m1"], embeddings=[[1.0, 0.0]], documents=["remembered"], metadatas=[{}])
+    memory.reset_long_term()
+    assert memory.chroma_col.col_info()["count"] == 0
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for remote Session chat, streaming and batching against launch() endpoints
+"""
+
+import sys
+import os
+import time
+import socket
+import asyncio
+import threading
+from types import SimpleNamespace
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+httpx = pytest.importorskip("httpx")
+
+from praisonaiagents import Agent, Session
+from praisonaiagents.session import (aclose_async_remote_client, close_remote_clients, get_async_remote_client,
+                                     get_remote_client)
+from praisonaiagents.streaming import relay_stream
+
+
+class CountingAgent(Agent):
+    """Streams its answer word by word and numbers the turns of its conversation"""
+
+    delay = 0.0
+
+    def chat(self, prompt, *args, **kwargs):
+        time.sleep(self.delay)
+        chunks = (SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word + " "))])
+                  for word in prompt.split())
+        text = "".join(chunk.choices[0].delta.content for chunk in relay_stream(chunks)).strip()
+        self.chat_history.append({"role": "user", "content": prompt})
+        self.chat_history.append({"role": "assistant", "content": text})
+        return f"{len(self.chat_history) // 2}:{text}"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _launch(agent, path, **options):
+    port = _free_port()
+    threading.Thread(target=agent.launch, kwargs=dict(path=path, port=port, host="127.0.0.1", **options),
+                     daemon=True).start()
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health")
+            return f"127.0.0.1:{port}{path}"
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    pytest.skip("launch() server did not start")
+
+
+def test_construction_does_not_probe_and_first_request_reports_failure():
+    session = Session(agent_url=f"127.0.0.1:{_free_port()}/agent", timeout=2)
+    with pytest.raises(ConnectionError, match="Failed to connect"):
+        session.chat("hello")
+
+
+def test_chat_and_achat_continue_the_session_on_pooled_connections():
+    url = _launch(CountingAgent(name="Counter", llm="gpt-4o-mini"), "/count")
+    session = Session(agent_url=url)
+    assert session.chat("first") == "1:first"
+    assert asyncio.run(session.achat("second")) == "2:second"
+    assert session.chat("third") == "3:third"
+    assert Session(agent_url=url).chat("other") == "1:other"
+    assert get_remote_client() is get_remote_client()
+
+
+def test_stream_yields_tokens_then_response():
+    url = _launch(CountingAgent(name="Streamer", llm="gpt-4o-mini"), "/words")
+    session = Session(agent_url=url)
+    events = list(session.stream("one two three"))
+    assert [e["content"] for e in events if e["type"] == "token"] == ["one ", "two ", "three "]
+    assert events[-1] == {"type": "response", "response": "1:one two three"}
+
+    async def collect():
+        return [event async for event in session.astream("four")]
+
+    assert asyncio.run(collect())[-1] == {"type": "response", "response": "2:four"}
+
+
+def test_chat_many_runs_concurrently_in_order_outside_the_session():
+    agent = CountingAgent(name="Batch", llm="gpt-4o-mini")
+    agent.delay = 0.3
+    url = _launch(agent, "/batch", max_concurrency=8)
+    session = Session(agent_url=url)
+    messages = [f"m{i}" for i in range(8)]
+    start = time.perf_counter()
+    answers = session.chat_many(messages, max_concurrency=8)
+    elapsed = time.perf_counter() - start
+    assert answers == [f"1:m{i}" for i in range(8)]
+    assert elapsed < 8 * agent.delay / 2
+    # The session's own conversation is untouched
+    assert session.chat("mine") == "1:mine"
+
+
+def test_busy_agent_is_retried():
+    agent = CountingAgent(name="Busy", llm="gpt-4o-mini")
+    agent.delay = 0.3
+    url = _launch(agent, "/busy", max_concurrency=1, max_queue=1)
+    answers = Session(agent_url=url).chat_many(["a", "b", "c"], max_concurrency=3)
+    assert answers == ["1:a", "1:b", "1:c"]
+
+
+def test_chat_many_fails_fast_on_unreachable_agent():
+    session = Session(agent_url=f"127.0.0.1:{_free_port()}/agent", timeout=2)
+    with pytest.raises(ConnectionError):
+        session.chat_many(["a", "b"], return_exceptions=True)
+
+
+def test_shared_clients_are_closed_and_recreated():
+    client = get_remote_client()
+    close_remote_clients()
+    assert client.is_closed and get_remote_client() is not client
+
+    async def on_loop():
+        client = get_async_remote_client()
+        assert get_async_remote_client() is client
+        await aclose_async_remote_client()
+        assert client.is_closed and get_async_remote_client() is not client
+        await aclose_async_remote_client()
+
+    asyncio.run(on_loop())
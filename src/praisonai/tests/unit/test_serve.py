@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-process ``praisonai serve`` command
+"""
+
+import sys
+import os
+import time
+import signal
+import socket
+import subprocess
+import textwrap
+from collections import Counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+httpx = pytest.importorskip("httpx")
+serve = pytest.importorskip("praisonai.serve")
+
+AGENTS_MODULE = textwrap.dedent('''
+    import os
+    from praisonaiagents import Agent, PraisonAIAgents
+
+    VERSION = "v1"
+
+
+    class PidAgent(Agent):
+        def chat(self, prompt, *args, **kwargs):
+            self.chat_history.append({"role": "user", "content": prompt})
+            self.chat_history.append({"role": "assistant", "content": prompt})
+            return f"{VERSION}:{os.getpid()}:{len(self.chat_history) // 2}:{prompt}"
+
+
+    class Upper(Agent):
+        def chat(self, prompt, *args, **kwargs):
+            return prompt.upper()
+
+
+    helper = PidAgent(name="Helper", llm="gpt-4o-mini")
+    team = PraisonAIAgents(agents=[PidAgent(name="First", llm="gpt-4o-mini"), Upper(name="Second", llm="gpt-4o-mini")])
+''')
+
+
+@pytest.fixture
+def agents_file(tmp_path):
+    path = tmp_path / "served_agents.py"
+    path.write_text(AGENTS_MODULE)
+    return path
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_load_targets_from_module(agents_file):
+    targets = serve.load_targets(str(agents_file))
+    assert sorted(targets) == ["/helper", "/team"]
+    assert list(serve.load_targets(f"{agents_file}:helper")) == ["/helper"]
+
+
+def test_app_serves_agents_and_chains(agents_file):
+    from fastapi.testclient import TestClient
+
+    client = TestClient(serve.build_app(serve.load_targets(str(agents_file))))
+    first = client.post("/helper", json={"query": "a", "session_id": "s"}).json()
+    second = client.post("/helper", json={"query": "b", "session_id": "s"}).json()
+    assert first["response"].endswith(":1:a") and second["response"].endswith(":2:b")
+
+    team = client.post("/team", json={"query": "hi"}).json()["response"]
+    assert [r["agent"] for r in team["results"]] == ["First", "Second"]
+    assert team["final_response"].endswith(":1:HI")
+    # Sessionless requests leave the served agents' histories untouched
+    assert client.post("/team", json={"query": "hi"}).json()["response"]["final_response"].endswith(":1:HI")
+    assert 'praisonai_requests_total{path="/team"} 2' in client.get("/metrics").text
+
+
+def test_workers_share_the_port_and_reload(agents_file):
+    port = _free_port()
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "praisonai.serve", str(agents_file), "--workers", "2",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env, cwd=str(agents_file.parent),
+    )
+    base = f"http://127.0.0.1:{port}"
+
+    def ask():
+        return httpx.post(base + "/helper", json={"query": "hi"}, timeout=10).json()["response"]
+
+    try:
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                ask()
+                break
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        else:
+            pytest.fail("praisonai serve did not start")
+
+        answers = Counter(ask().rsplit(":", 2)[0] for _ in range(20))
+        assert len(answers) == 2 and all(a.startswith("v1:") for a in answers)
+
+        metrics = httpx.get(base + "/metrics").text
+        assert metrics.count('praisonai_requests_total{path="/helper",worker=') == 2
+
+        agents_file.write_text(AGENTS_MODULE.replace('"v1"', '"v2"'))
+        process.send_signal(signal.SIGHUP)
+        deadline = time.time() + 30
+        while time.time() < deadline and not ask().startswith("v2:"):
+            time.sleep(0.2)
+        reloaded = Counter(ask().rsplit(":", 2)[0] for _ in range(20))
+        assert all(a.startswith("v2:") for a in reloaded)
+        assert not set(reloaded) & set(answers)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=30) == 0
+
+
+ECHO_SERVER = textwrap.dedent('''
+    import sys
+    try:
+        from mcp.server.fastmcp import FastMCP
+    except ImportError:
+        from mcp.server.mcpserver import MCPServer as FastMCP
+
+    server = FastMCP("echo")
+
+
+    @server.tool()
+    def echo(text: str) -> str:
+        """Echo text back."""
+        return text
+
+
+    try:
+        server.run("sse", port=int(sys.argv[1]))
+    except TypeError:
+        server.settings.port = int(sys.argv[1])
+        server.run("sse")
+''')
+
+MCP_AGENTS_MODULE = textwrap.dedent('''
+    import os
+    from praisonaiagents import Agent
+    from praisonaiagents.mcp import MCP
+
+
+    class EchoAgent(Agent):
+        def chat(self, prompt, *args, **kwargs):
+            tool = next(t for t in self.tools[0] if t.__name__ == "echo")
+            return tool(text=prompt)
+
+
+    helper = EchoAgent(name="Helper", llm="gpt-4o-mini",
+                       tools=[MCP(os.environ["ECHO_MCP_URL"], timeout=20, cache_tools=False)])
+''')
+
+
+def test_workers_connect_their_own_mcp_clients(tmp_path):
+    pytest.importorskip("mcp")
+    (tmp_path / "echo_server.py").write_text(ECHO_SERVER)
+    (tmp_path / "mcp_agents.py").write_text(MCP_AGENTS_MODULE)
+    mcp_port, port = _free_port(), _free_port()
+    echo = subprocess.Popen([sys.executable, str(tmp_path / "echo_server.py"), str(mcp_port)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), ECHO_MCP_URL=f"http://127.0.0.1:{mcp_port}/sse")
+    process = None
+    try:
+        deadline = time.time() + 20
+        while time.time() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", mcp_port), timeout=0.2).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        process = subprocess.Popen(
+            [sys.executable, "-m", "praisonai.serve", str(tmp_path / "mcp_agents.py"), "--workers", "2",
+             "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            env=env, cwd=str(tmp_path),
+        )
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/health", timeout=5)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        else:
+            pytest.fail("praisonai serve did not start")
+        # On the parent's connection, whose event loop thread is gone after the fork, calls would hang
+        answers = [httpx.post(f"http://127.0.0.1:{port}/helper", json={"query": str(i)}, timeout=15).json()
+                   for i in range(6)]
+        assert [a["response"] for a in answers] == [str(i) for i in range(6)]
+    finally:
+        if process is not None:
+            process.send_signal(signal.SIGTERM)
+            assert process.wait(timeout=30) == 0
+        echo.kill()
+        echo.wait()
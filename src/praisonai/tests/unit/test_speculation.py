@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for speculative execution of decision-task branches
+"""
+
+import sys
+import os
+import time
+import threading
+from types import SimpleNamespace
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'praisonai-agents'))
+
+from praisonaiagents.agents import PraisonAIAgents, SpeculationConfig
+from praisonaiagents.agents.speculation import BranchSpeculator
+from praisonaiagents.task.task import Task
+from praisonaiagents.main import TaskOutput
+
+
+def _workflow(speculative=True, decision="yes", branch_delay=0.0, delays=None):
+    agents = [SimpleNamespace(name=n, chat_history=[]) for n in ("judge", "alpha", "beta")]
+    judge = Task(name="judge", description="Decide", agent=agents[0], task_type="decision",
+                 is_start=True, condition={"yes": ["alpha"], "no": ["beta"]})
+    alpha = Task(name="alpha", description="Alpha branch", agent=agents[1])
+    beta = Task(name="beta", description="Beta branch", agent=agents[2])
+    workflow = PraisonAIAgents(agents=agents, tasks=[judge, alpha, beta], process="workflow", speculative=speculative)
+    calls = []
+    lock = threading.Lock()
+
+    def fake_execute_task(task_id, task=None, stream=None):
+        task = task or workflow.tasks[task_id]
+        with lock:
+            calls.append((task.name, threading.current_thread().name))
+        if task.name == "judge":
+            time.sleep(0.05)
+            raw = decision
+        else:
+            time.sleep((delays or {}).get((task.name, threading.current_thread().name.startswith("praison-speculate")),
+                                          branch_delay))
+            task.agent.chat_history.append({"role": "assistant", "content": task.name})
+            raw = f"{task.name} done"
+        task.result = TaskOutput(description=task.description, raw=raw, agent=task.agent.name)
+        return task.result
+
+    workflow.execute_task = fake_execute_task
+    return workflow, agents, calls
+
+
+def test_chosen_branch_is_adopted_and_other_discarded():
+    workflow, agents, calls = _workflow()
+    workflow.run_all_tasks()
+    alpha = workflow.tasks[1]
+    assert alpha.status == "completed"
+    assert alpha.result.raw == "alpha done"
+    # alpha only ran speculatively, never again on the main thread
+    assert [c for c in calls if c[0] == "alpha"][0][1].startswith("praison-speculate")
+    assert len([c for c in calls if c[0] == "alpha"]) == 1
+    # The adopted branch's history is moved to its agent; beta's speculative
+    # run only touched a copy, and the workflow's fallback then runs it normally
+    assert agents[1].chat_history == [{"role": "assistant", "content": "alpha"}]
+    assert agents[2].chat_history == [{"role": "assistant", "content": "beta"}]
+    metrics = workflow.speculation_metrics
+    assert metrics.branches_started == 2
+    assert metrics.branches_used == 1
+    assert metrics.branches_discarded == 1
+
+
+def test_over_budget_branch_falls_back_to_normal_run():
+    workflow, _, calls = _workflow(speculative=SpeculationConfig(max_seconds=0.01), branch_delay=0.2)
+    workflow.run_all_tasks()
+    assert workflow.tasks[1].result.raw == "alpha done"
+    assert workflow.speculation_metrics.branches_over_budget == 1
+    assert workflow.speculation_metrics.branches_used == 0
+
+
+def test_disabled_by_default():
+    workflow, _, calls = _workflow(speculative=False)
+    workflow.run_all_tasks()
+    assert workflow.speculation_metrics is None
+    assert [c[0] for c in calls] == ["judge", "alpha", "beta"]
+    assert all(not thread.startswith("praison-speculate") for _, thread in calls)
+
+
+def test_candidates_prefer_previously_chosen_branch():
+    workflow, _, _ = _workflow(speculative=SpeculationConfig(max_branches=1))
+    speculator = BranchSpeculator(workflow, workflow.speculation_config)
+    judge = workflow.tasks[0]
+    assert speculator._candidates(judge) == [1]
+    speculator._history["judge"]["beta"] += 1
+    assert speculator._candidates(judge) == [2]
+    speculator.shutdown()
+
+
+def test_discarded_branch_finishing_late_leaves_the_real_run_alone():
+    # beta's speculative run is still going when the decision discards it,
+    # and finishes after the workflow has run beta for real
+    workflow, agents, calls = _workflow(delays={("beta", True): 0.4})
+    workflow.run_all_tasks()
+    metrics = workflow.speculation_metrics
+    assert metrics.branches_discarded == 1
+    assert metrics.wasted_tokens == 0
+    time.sleep(0.6)
+    assert agents[2].chat_history == [{"role": "assistant", "content": "beta"}]
+    # Charged once the branch actually finished
+    assert metrics.wasted_tokens > 0 and metrics.wasted_seconds >= 0.3
+
+
+def test_token_budget_counts_the_whole_prompt():
+    workflow, agents, calls = _workflow(speculative=SpeculationConfig(max_tokens=50))
+    agents[2].instructions = "Follow the style guide. " * 20
+    workflow.run_all_tasks()
+    assert workflow.speculation_metrics.branches_started == 1
+    assert [c for c in calls if c[0] == "beta"][0][1] == threading.current_thread().name